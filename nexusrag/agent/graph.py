@@ -7,6 +7,7 @@ from typing import Callable
 from nexusrag.agent.prompts import build_messages
 from nexusrag.domain.state import AgentState
 from nexusrag.persistence.repos.messages import list_messages
+from nexusrag.providers.retrieval.filters import MetadataFilters
 from nexusrag.services.costs.metering import estimate_tokens
 
 
@@ -20,6 +21,8 @@ def build_graph(
     retrieval_callback: Callable[[str, int], None] | None = None,
     max_output_tokens: int | None = None,
     token_estimator_ratio: float | None = None,
+    retrieval_filters: MetadataFilters | None = None,
+    retrieval_corpus_ids: list[str] | None = None,
 ):
     # Lazy import so module load on Vercel cold-start does not require the
     # full langgraph dependency tree (~30 MB). Heavy deps live in the
@@ -38,12 +41,23 @@ def build_graph(
 
     async def retrieve(state: AgentState) -> dict:
         started = time.monotonic()
-        retrieved = await retriever.retrieve(
-            state["tenant_id"],
-            state["corpus_id"],
-            state["user_message"],
-            top_k,
-        )
+        if retrieval_corpus_ids:
+            # Multi-corpus runs fan out concurrently and merge into one ranking.
+            retrieved = await retriever.retrieve_many(
+                state["tenant_id"],
+                retrieval_corpus_ids,
+                state["user_message"],
+                top_k,
+                filters=retrieval_filters,
+            )
+        else:
+            retrieved = await retriever.retrieve(
+                state["tenant_id"],
+                state["corpus_id"],
+                state["user_message"],
+                top_k,
+                filters=retrieval_filters,
+            )
         if retrieval_callback is not None:
             # Surface provider and chunk counts for optional debug SSE events.
             provider_name = getattr(retriever, "last_provider", "unknown")
@@ -122,6 +136,8 @@ async def run_graph(
     retrieval_callback: Callable[[str, int], None] | None = None,
     max_output_tokens: int | None = None,
     token_estimator_ratio: float | None = None,
+    retrieval_filters: MetadataFilters | None = None,
+    retrieval_corpus_ids: list[str] | None = None,
 ) -> AgentState:
     graph = build_graph(
         retriever=retriever,
@@ -132,5 +148,7 @@ async def run_graph(
         retrieval_callback=retrieval_callback,
         max_output_tokens=max_output_tokens,
         token_estimator_ratio=token_estimator_ratio,
+        retrieval_filters=retrieval_filters,
+        retrieval_corpus_ids=retrieval_corpus_ids,
     )
     return await graph.ainvoke(state)
@@ -4,6 +4,7 @@ import asyncio
 import json
 import logging
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from email.utils import format_datetime
 from uuid import UUID, uuid4
@@ -55,9 +56,12 @@ from nexusrag.apps.api.routes.sso import router as sso_router
 from nexusrag.apps.api.routes.stats import router as stats_router
 from nexusrag.apps.api.routes.ui import router as ui_router
 from nexusrag.core.logging import configure_logging
+from nexusrag.ingestion.embeddings import close_embedding_clients
 from nexusrag.persistence.db import SessionLocal
 from nexusrag.persistence.guards import TenantPredicateError
 from nexusrag.persistence.repos.query_log import record_query
+from nexusrag.providers.clients import close_provider_clients
+from nexusrag.providers.retrieval.config_cache import run_corpus_config_listener
 from nexusrag.services.telemetry import record_request
 
 _LEGACY_SUNSET_DAYS = 90
@@ -106,13 +110,25 @@ async def _record_query_async(
         _telemetry_log.warning("query_log insert failed", exc_info=exc)
 
 
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    # Follow corpus config invalidations published by any replica.
+    config_listener = asyncio.create_task(run_corpus_config_listener())
+    yield
+    config_listener.cancel()
+    await asyncio.gather(config_listener, return_exceptions=True)
+    # Close shared provider SDK clients and pooled HTTP connections on shutdown.
+    await close_provider_clients()
+    await close_embedding_clients()
+
+
 def create_app() -> FastAPI:
     configure_logging()
     # Disable FastAPI's default /docs and /openapi.json so the canonical
     # versioned paths (/v1/docs, /v1/openapi.json) and the /docs redirect
     # are the single source of truth. Without this, FastAPI's default
     # /docs serves Swagger UI directly (200) and shadows our redirect.
-    app = FastAPI(title="NexusRAG API", docs_url=None, redoc_url=None, openapi_url=None)
+    app = FastAPI(title="NexusRAG API", docs_url=None, redoc_url=None, openapi_url=None, lifespan=_lifespan)
 
     @app.middleware("http")
     async def request_context_middleware(request: Request, call_next):  # type: ignore[override]
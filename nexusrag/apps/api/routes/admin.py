@@ -48,6 +48,8 @@ from nexusrag.services.maintenance import (
     compliance_evaluate_scheduled,
     compliance_prune_old_evidence,
     prune_audit_events,
+    prune_chunk_generations,
+    prune_embedding_cache,
     prune_idempotency,
     prune_retention_all,
     prune_usage_counters,
@@ -633,7 +635,7 @@ async def run_maintenance_task(
     request: Request,
     task: str = Query(
         ...,
-        pattern="^(prune_idempotency|prune_audit|cleanup_actions|prune_usage|prune_retention_all|backup_create_scheduled|backup_prune_retention|restore_drill_scheduled|compliance_evaluate_scheduled|compliance_bundle_periodic|compliance_prune_old_evidence)$",
+        pattern="^(prune_idempotency|prune_audit|cleanup_actions|prune_usage|prune_retention_all|backup_create_scheduled|backup_prune_retention|restore_drill_scheduled|compliance_evaluate_scheduled|compliance_bundle_periodic|compliance_prune_old_evidence|prune_embedding_cache|prune_chunk_generations)$",
     ),
     principal: Principal = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db),
@@ -652,6 +654,8 @@ async def run_maintenance_task(
         "compliance_evaluate_scheduled": compliance_evaluate_scheduled,
         "compliance_bundle_periodic": compliance_bundle_periodic,
         "compliance_prune_old_evidence": compliance_prune_old_evidence,
+        "prune_embedding_cache": prune_embedding_cache,
+        "prune_chunk_generations": prune_chunk_generations,
     }
     runner = task_map.get(task)
     if runner is None and task != "prune_retention_all":
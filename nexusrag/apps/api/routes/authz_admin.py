@@ -22,6 +22,7 @@ from nexusrag.apps.api.response import SuccessEnvelope, success_response
 from nexusrag.core.config import get_settings
 from nexusrag.domain.models import AuthorizationPolicy, DocumentPermission
 from nexusrag.persistence.repos import authz as authz_repo
+from nexusrag.persistence.repos import corpora as corpora_repo
 from nexusrag.persistence.repos import documents as documents_repo
 from nexusrag.services.audit import get_request_context, record_event
 from nexusrag.services.authz.abac import evaluate_policy_set, validate_policy_condition
@@ -767,6 +768,9 @@ async def grant_document_permission(
         payload=payload,
         granted_by=principal.api_key_id,
     )
+    if created:
+        # Grants change what retrieval returns, so cached results must miss.
+        await corpora_repo.bump_corpus_version_for_documents(db, [document_id])
     await db.commit()
     await db.refresh(permission)
 
@@ -846,6 +850,8 @@ async def bulk_grant_document_permissions(
         )
         if created:
             created_permissions.append(permission)
+    if created_permissions:
+        await corpora_repo.bump_corpus_version_for_documents(db, [document_id])
     await db.commit()
     for permission in created_permissions:
         await db.refresh(permission)
@@ -923,6 +929,7 @@ async def revoke_document_permission(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"code": "AUTHZ_PERMISSION_NOT_FOUND", "message": "Permission not found"},
         )
+    await corpora_repo.bump_corpus_version_for_documents(db, [document_id])
     await db.commit()
 
     request_ctx = get_request_context(request)
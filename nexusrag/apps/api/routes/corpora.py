@@ -19,8 +19,11 @@ from nexusrag.apps.api.deps import (
 from nexusrag.apps.api.openapi import DEFAULT_ERROR_RESPONSES
 from nexusrag.apps.api.response import SuccessEnvelope, success_response
 from nexusrag.core.errors import RetrievalConfigError
+from nexusrag.persistence.repos import chunks as chunks_repo
 from nexusrag.persistence.repos import corpora as corpora_repo
+from nexusrag.persistence.repos import embedding_generations as generations_repo
 from nexusrag.providers.retrieval.config import normalize_provider_config
+from nexusrag.providers.retrieval.config_cache import invalidate_corpus_config
 from nexusrag.services.audit import get_request_context, record_event
 from nexusrag.services.entitlements import (
     FEATURE_CORPORA_PATCH_PROVIDER,
@@ -34,6 +37,15 @@ from nexusrag.services.idempotency import (
     compute_request_hash,
     store_idempotency_response,
 )
+from nexusrag.services.ingest.embedding_migration import (
+    EmbeddingMigrationError,
+    activate_generation,
+    collect_generation,
+    corpus_embedding_space,
+    enqueue_embedding_migration,
+    generation_audit_metadata,
+    start_embedding_migration,
+)
 
 router = APIRouter(prefix="/corpora", tags=["corpora"], responses=DEFAULT_ERROR_RESPONSES)
 
@@ -54,6 +66,31 @@ class CorpusPatchRequest(BaseModel):
     model_config = {"extra": "forbid"}
 
 
+class EmbeddingGenerationResponse(BaseModel):
+    id: str
+    corpus_id: str
+    generation: int
+    provider: str
+    model: str
+    embedding_dim: int
+    status: str
+    chunks_total: int
+    chunks_embedded: int
+    error_message: str | None
+    created_at: str
+    activated_at: str | None
+    retired_at: str | None
+
+
+class EmbeddingGenerationCreateRequest(BaseModel):
+    provider: str
+    model: str | None = Field(default=None)
+    # Defaults to the corpus's current retrieval.embedding_dim.
+    embedding_dim: int | None = Field(default=None)
+
+    model_config = {"extra": "forbid"}
+
+
 def _to_response(corpus) -> CorpusResponse:
     # Serialize datetimes for JSON output while keeping response fields explicit.
     created_at: datetime = corpus.created_at
@@ -166,6 +203,19 @@ async def patch_corpus(
     if payload.provider_config_json is not None:
         updated_fields.append("provider_config_json")
 
+    if provider_config_json is not None:
+        current = await corpora_repo.get_by_tenant_and_id(db, tenant_id, corpus_id)
+        if (
+            current is not None
+            and corpus_embedding_space(current.provider_config_json) != corpus_embedding_space(provider_config_json)
+            and await chunks_repo.corpus_has_chunks(db, corpus_id)
+        ):
+            # Existing vectors belong to the old model/dimension; switching in place would mix vector spaces.
+            raise HTTPException(
+                status_code=409,
+                detail="embedding settings cannot change while the corpus has chunks; start an embedding migration",
+            )
+
     try:
         corpus = await corpora_repo.update_fields(
             db,
@@ -183,6 +233,9 @@ async def patch_corpus(
         await db.rollback()
         # Surface a generic error and keep the transaction clean for the caller.
         raise HTTPException(status_code=500, detail="Database error while updating corpus") from exc
+    if provider_config_json is not None:
+        # Drop the cached retrieval config here and on every other replica.
+        await invalidate_corpus_config(tenant_id, corpus_id)
 
     # Record the corpus mutation after the update succeeds.
     await record_event(
@@ -211,3 +264,195 @@ async def patch_corpus(
         response_body=jsonable_encoder(payload_body),
     )
     return payload_body
+
+
+def _generation_response(generation) -> EmbeddingGenerationResponse:
+    return EmbeddingGenerationResponse(
+        id=generation.id,
+        corpus_id=generation.corpus_id,
+        generation=generation.generation,
+        provider=generation.provider,
+        model=generation.model,
+        embedding_dim=generation.embedding_dim,
+        status=generation.status,
+        chunks_total=generation.chunks_total,
+        chunks_embedded=generation.chunks_embedded,
+        error_message=generation.error_message,
+        created_at=generation.created_at.isoformat(),
+        activated_at=generation.activated_at.isoformat() if generation.activated_at else None,
+        retired_at=generation.retired_at.isoformat() if generation.retired_at else None,
+    )
+
+
+async def _record_generation_event(
+    *,
+    db: AsyncSession,
+    request: Request,
+    principal: Principal,
+    corpus_id: str,
+    event_type: str,
+    generation,
+) -> None:
+    request_ctx = get_request_context(request)
+    await record_event(
+        session=db,
+        tenant_id=principal.tenant_id,
+        actor_type="api_key",
+        actor_id=principal.api_key_id,
+        actor_role=principal.role,
+        event_type=event_type,
+        outcome="success",
+        resource_type="corpus",
+        resource_id=corpus_id,
+        request_id=request_ctx["request_id"],
+        ip_address=request_ctx["ip_address"],
+        user_agent=request_ctx["user_agent"],
+        metadata=generation_audit_metadata(generation),
+        commit=True,
+        best_effort=True,
+    )
+
+
+@router.get(
+    "/{corpus_id}/embedding-generations",
+    response_model=SuccessEnvelope[list[EmbeddingGenerationResponse]] | list[EmbeddingGenerationResponse],
+)
+async def list_embedding_generations(
+    corpus_id: str,
+    request: Request,
+    principal: Principal = Depends(require_role("reader")),
+    db: AsyncSession = Depends(get_db),
+) -> SuccessEnvelope[list[EmbeddingGenerationResponse]] | list[EmbeddingGenerationResponse]:
+    # chunks_embedded / chunks_total is the backfill progress of a building generation.
+    tenant_id = principal.tenant_id
+    if await corpora_repo.get_by_tenant_and_id(db, tenant_id, corpus_id) is None:
+        raise HTTPException(status_code=404, detail="Corpus not found")
+    generations = await generations_repo.list_generations(db, tenant_id, corpus_id)
+    return success_response(request=request, data=[_generation_response(item) for item in generations])
+
+
+@router.post(
+    "/{corpus_id}/embedding-generations",
+    status_code=202,
+    response_model=SuccessEnvelope[EmbeddingGenerationResponse] | EmbeddingGenerationResponse,
+)
+async def create_embedding_generation(
+    corpus_id: str,
+    request: Request,
+    payload: EmbeddingGenerationCreateRequest,
+    _reject_tenant: None = Depends(reject_tenant_id_in_body),
+    principal: Principal = Depends(require_role("editor")),
+    db: AsyncSession = Depends(get_db),
+) -> SuccessEnvelope[EmbeddingGenerationResponse] | EmbeddingGenerationResponse:
+    # Re-embed the corpus into a shadow generation; retrieval keeps serving the active one meanwhile.
+    tenant_id = principal.tenant_id
+    await require_feature(session=db, tenant_id=tenant_id, feature_key=FEATURE_CORPORA_PATCH_PROVIDER)
+    try:
+        generation = await start_embedding_migration(
+            db,
+            tenant_id=tenant_id,
+            corpus_id=corpus_id,
+            provider=payload.provider,
+            model=payload.model,
+            embedding_dim=payload.embedding_dim,
+        )
+        await db.commit()
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except RetrievalConfigError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except EmbeddingMigrationError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except SQLAlchemyError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error while starting embedding migration") from exc
+    await enqueue_embedding_migration(generation.id, request_id=get_request_context(request)["request_id"])
+    await db.refresh(generation)
+    await _record_generation_event(
+        db=db,
+        request=request,
+        principal=principal,
+        corpus_id=corpus_id,
+        event_type="corpora.embedding_generation.started",
+        generation=generation,
+    )
+    return success_response(request=request, data=_generation_response(generation))
+
+
+@router.post(
+    "/{corpus_id}/embedding-generations/{generation_id}/activate",
+    response_model=SuccessEnvelope[EmbeddingGenerationResponse] | EmbeddingGenerationResponse,
+)
+async def activate_embedding_generation(
+    corpus_id: str,
+    generation_id: str,
+    request: Request,
+    principal: Principal = Depends(require_role("editor")),
+    db: AsyncSession = Depends(get_db),
+) -> SuccessEnvelope[EmbeddingGenerationResponse] | EmbeddingGenerationResponse:
+    # Cut over to a ready generation, or roll back to a retired one that has not been collected.
+    tenant_id = principal.tenant_id
+    try:
+        generation = await activate_generation(
+            db,
+            tenant_id=tenant_id,
+            corpus_id=corpus_id,
+            generation_id=generation_id,
+            request_id=get_request_context(request)["request_id"],
+        )
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except EmbeddingMigrationError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except SQLAlchemyError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error while activating embedding generation") from exc
+    await db.refresh(generation)
+    await _record_generation_event(
+        db=db,
+        request=request,
+        principal=principal,
+        corpus_id=corpus_id,
+        event_type="corpora.embedding_generation.activated",
+        generation=generation,
+    )
+    return success_response(request=request, data=_generation_response(generation))
+
+
+@router.delete(
+    "/{corpus_id}/embedding-generations/{generation_id}",
+    response_model=SuccessEnvelope[EmbeddingGenerationResponse] | EmbeddingGenerationResponse,
+)
+async def collect_embedding_generation(
+    corpus_id: str,
+    generation_id: str,
+    request: Request,
+    principal: Principal = Depends(require_role("editor")),
+    db: AsyncSession = Depends(get_db),
+) -> SuccessEnvelope[EmbeddingGenerationResponse] | EmbeddingGenerationResponse:
+    # Drop a non-active generation's shadow vectors (cancelling its backfill); rollback to it is then gone.
+    tenant_id = principal.tenant_id
+    try:
+        generation = await collect_generation(
+            db,
+            tenant_id=tenant_id,
+            corpus_id=corpus_id,
+            generation_id=generation_id,
+        )
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except EmbeddingMigrationError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except SQLAlchemyError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error while collecting embedding generation") from exc
+    await db.refresh(generation)
+    await _record_generation_event(
+        db=db,
+        request=request,
+        principal=principal,
+        corpus_id=corpus_id,
+        event_type="corpora.embedding_generation.collected",
+        generation=generation,
+    )
+    return success_response(request=request, data=_generation_response(generation))
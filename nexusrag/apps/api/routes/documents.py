@@ -7,7 +7,7 @@ import time
 from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 from uuid import uuid4
 
 from fastapi import (
@@ -39,6 +39,7 @@ from nexusrag.core.config import get_settings
 from nexusrag.core.errors import ServiceBusyError
 from nexusrag.domain.models import Chunk, Document, DocumentLabel, DocumentPermission
 from nexusrag.ingestion.chunking import CHUNK_OVERLAP_CHARS, CHUNK_SIZE_CHARS
+from nexusrag.ingestion.loaders import DocumentLoader, loader_for_content_type
 from nexusrag.persistence.repos import corpora as corpora_repo
 from nexusrag.persistence.repos import documents as documents_repo
 from nexusrag.services.audit import get_request_context, record_event
@@ -65,7 +66,7 @@ from nexusrag.services.idempotency import (
     compute_request_hash,
     store_idempotency_response,
 )
-from nexusrag.services.ingest.ingestion import write_text_to_storage
+from nexusrag.services.ingest.ingestion import write_source_to_storage, write_text_to_storage
 from nexusrag.services.ingest.queue import IngestionJobPayload, enqueue_ingestion_job
 from nexusrag.services.rollouts import resolve_kill_switch
 from nexusrag.services.sla.evaluator import evaluate_tenant_sla
@@ -135,6 +136,8 @@ class TextIngestRequest(BaseModel):
 class ReindexRequest(BaseModel):
     chunk_size_chars: int | None = Field(default=None, ge=1)
     chunk_overlap_chars: int | None = Field(default=None, ge=0)
+    # "incremental" keeps chunk rows (and vectors) whose text is unchanged.
+    mode: Literal["full", "incremental"] = Field(default="full")
 
     # Reject unknown fields so tenant_id cannot be supplied in the payload.
     model_config = {"extra": "forbid"}
@@ -199,6 +202,27 @@ def _parse_text(upload: UploadFile, body: bytes) -> str:
     raise HTTPException(status_code=415, detail="Unsupported content type")
 
 
+def _resolve_loader(upload: UploadFile) -> DocumentLoader | None:
+    # PDF, HTML, DOCX and CSV are stored as uploaded and extracted by the worker.
+    loader = loader_for_content_type(upload.content_type)
+    if loader is not None and not loader.available:
+        raise HTTPException(
+            status_code=415,
+            detail=f"{loader.name.upper()} extraction is not available on this deployment",
+        )
+    return loader
+
+
+def _remove_replaced_source(previous_path: str | None, storage_path: str) -> None:
+    # An overwrite in another format stores under a new extension; drop the old source.
+    if not previous_path or previous_path == storage_path:
+        return
+    try:
+        Path(previous_path).unlink(missing_ok=True)
+    except OSError:
+        logger.warning("Failed to remove replaced document storage %s", previous_path)
+
+
 def _validate_text_payload(text: str) -> None:
     # Reject empty text early to avoid storing empty documents.
     if not text.strip():
@@ -633,8 +657,18 @@ async def upload_document(
             labels=None,
             request=request,
         )
-    text = _parse_text(file, body)
-    _validate_text_payload(text)
+    loader = _resolve_loader(file)
+    if loader is None:
+        text = _parse_text(file, body)
+        _validate_text_payload(text)
+    else:
+        # Extraction runs on the worker, so only the raw upload can be checked here.
+        text = ""
+        if not body.strip():
+            raise HTTPException(
+                status_code=422,
+                detail=_error_detail("INGEST_VALIDATION_ERROR", "Document must not be empty"),
+            )
     request_id = str(uuid4())
     # Enforce SLA admission decisions before budget checks and enqueue work.
     response.headers.update(
@@ -652,12 +686,18 @@ async def upload_document(
         tenant_id=tenant_id,
     )
     if cost_controls_enabled or cost_visibility_enabled:
+        tokens_override = None
+        if loader is not None:
+            # Estimate loader formats from the upload size, as reindex does for stored sources.
+            ratio = get_settings().cost_estimator_token_chars_ratio or 4.0
+            tokens_override = max(1, int(len(body) / ratio))
         projected_cost, estimated, _estimate_meta = await _estimate_ingest_cost(
             session=db,
             settings=get_settings(),
             text=text,
             byte_count=len(body),
             chunk_size=CHUNK_SIZE_CHARS,
+            tokens_override=tokens_override,
         )
         decision = await evaluate_budget_guardrail(
             session=db,
@@ -676,7 +716,11 @@ async def upload_document(
         if cost_visibility_enabled:
             response.headers.update(cost_headers(decision))
     document_id = document_id or str(uuid4())
-    storage_path = write_text_to_storage(document_id, text)
+    if loader is None:
+        storage_path = write_text_to_storage(document_id, text)
+    else:
+        storage_path = write_source_to_storage(document_id, body, loader)
+    previous_storage_path = existing.storage_path if existing is not None else None
     queued_at = _utc_now()
 
     try:
@@ -722,6 +766,7 @@ async def upload_document(
             status_code=500,
             detail=_error_detail("DB_ERROR", "Database error while creating document"),
         ) from exc
+    _remove_replaced_source(previous_storage_path, storage_path)
 
     payload = IngestionJobPayload(
         tenant_id=tenant_id,
@@ -961,6 +1006,7 @@ async def ingest_text_document(
         if cost_visibility_enabled:
             response.headers.update(cost_headers(decision))
     storage_path = write_text_to_storage(document_id, payload.text)
+    previous_storage_path = existing.storage_path if existing is not None else None
     queued_at = _utc_now()
 
     try:
@@ -1020,6 +1066,7 @@ async def ingest_text_document(
             status_code=500,
             detail=_error_detail("DB_ERROR", "Database error while creating document"),
         ) from exc
+    _remove_replaced_source(previous_storage_path, storage_path)
 
     ingest_payload = IngestionJobPayload(
         tenant_id=tenant_id,
@@ -1264,6 +1311,7 @@ async def reindex_document(
         return build_replay_response(replay)
 
     chunk_size, chunk_overlap = _resolve_chunk_params(payload)
+    reindex_mode = payload.mode if payload else "full"
     request_id = str(uuid4())
     # Enforce SLA admission decisions before budget checks and queueing.
     response.headers.update(
@@ -1345,6 +1393,7 @@ async def reindex_document(
         chunk_overlap_chars=chunk_overlap,
         request_id=request_id,
         is_reindex=True,
+        reindex_mode=reindex_mode,
     )
     await _enqueue_or_fail(db, document_id, ingest_payload)
     # Record queue costs for reindex jobs; failures should not block ingestion.
@@ -1382,6 +1431,7 @@ async def reindex_document(
             "ingest_source": doc.ingest_source,
             "chunk_size_chars": chunk_size,
             "chunk_overlap_chars": chunk_overlap,
+            "reindex_mode": reindex_mode,
         },
         commit=True,
         best_effort=True,
@@ -1479,6 +1529,8 @@ async def delete_document(
         await db.execute(delete(DocumentPermission).where(DocumentPermission.document_id == document_id))
         await db.execute(delete(DocumentLabel).where(DocumentLabel.document_id == document_id))
         await db.execute(delete(Chunk).where(Chunk.document_id == document_id))
+        # Invalidate cached retrieval results in the same transaction as the chunk delete.
+        await corpora_repo.bump_corpus_version(db, [doc.corpus_id])
         await db.execute(delete(Document).where(Document.id == document_id))
         await db.commit()
     except SQLAlchemyError as exc:
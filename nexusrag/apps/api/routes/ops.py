@@ -221,6 +221,11 @@ async def _get_queue_depth() -> int | None:
     return await ingest_queue.get_queue_depth()
 
 
+async def _get_pipeline_stats() -> dict[str, Any] | None:
+    # Per-stage ingestion pipeline stats published by live workers.
+    return await ingest_queue.get_pipeline_stats()
+
+
 async def _get_worker_heartbeat() -> datetime | None:
     # Use the heartbeat timestamp for worker health reporting.
     return await ingest_queue.get_worker_heartbeat()
@@ -477,6 +482,7 @@ async def ops_ingestion(
 
     queue_depth = await _get_queue_depth()
     worker_last_seen = await _get_worker_heartbeat()
+    pipeline = await _get_pipeline_stats()
 
     payload = {
         "window_hours": hours,
@@ -494,6 +500,7 @@ async def ops_ingestion(
         "top_failure_reasons": top_failure_reasons,
         "queue_depth": queue_depth,
         "worker_last_seen_at": worker_last_seen.isoformat() if worker_last_seen else None,
+        "pipeline": pipeline,
     }
     request_ctx = get_request_context(request)
     # Record ops views for administrative investigations.
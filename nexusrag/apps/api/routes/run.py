@@ -51,11 +51,12 @@ from nexusrag.persistence.repos import checkpoints as checkpoints_repo
 from nexusrag.persistence.repos import messages as messages_repo
 from nexusrag.persistence.repos import sessions as sessions_repo
 from nexusrag.providers.llm.factory import get_llm_provider
-from nexusrag.providers.retrieval.router import RetrievalRouter
+from nexusrag.providers.retrieval.filters import MAX_FILTERS, MetadataFilter
+from nexusrag.providers.retrieval.router import MAX_FANOUT_CORPORA, RetrievalRouter
 from nexusrag.providers.tts.factory import get_tts_provider
 from nexusrag.services.audio.storage import save_audio
 from nexusrag.services.audit import get_request_context, record_event
-from nexusrag.services.authz.abac import authorize_corpus_action
+from nexusrag.services.authz.abac import authorize_corpus_action, build_retrieval_access
 from nexusrag.services.costs.budget_guardrails import cost_headers, evaluate_budget_guardrail
 from nexusrag.services.costs.metering import estimate_cost, estimate_tokens, record_cost_event
 from nexusrag.services.entitlements import (
@@ -81,6 +82,10 @@ class RunRequest(BaseModel):
     corpus_id: str
     message: str
     top_k: int = Field(default=5, ge=1, le=50)
+    # ANDed conditions on document metadata, applied inside the retrieval query.
+    filters: list[MetadataFilter] | None = Field(default=None, max_length=MAX_FILTERS)
+    # Further corpora searched concurrently with corpus_id; hits merge into one ranking.
+    corpus_ids: list[str] | None = Field(default=None, max_length=MAX_FANOUT_CORPORA - 1)
     audio: bool = False
 
     # Reject unknown fields so tenant_id cannot be supplied in the payload.
@@ -93,6 +98,10 @@ class RunRequest(BaseModel):
                     "corpus_id": "corpus_abc",
                     "message": "Summarize the latest roadmap notes.",
                     "top_k": 5,
+                    "filters": [
+                        {"op": "eq", "key": "language", "value": "en"},
+                        {"op": "range", "key": "published_at", "gte": "2026-01-01"},
+                    ],
                     "audio": False,
                 }
             ]
@@ -530,35 +539,46 @@ async def run(
             error_message="Request shed by operator control",
             sla_headers=sla_headers,
         )
+    # Multi-corpus runs search corpus_id plus corpus_ids; each one is authorized like corpus_id.
+    fanout_corpus_ids = list(dict.fromkeys([payload.corpus_id, *(payload.corpus_ids or [])]))
+    retrieval_corpus_ids = fanout_corpus_ids if len(fanout_corpus_ids) > 1 else None
     # Enforce ABAC policies for corpus-scoped run access.
     try:
-        await authorize_corpus_action(
-            session=db,
-            principal=principal,
-            corpus_id=payload.corpus_id,
-            action="run",
-            request=http_request,
-        )
+        for corpus_id in fanout_corpus_ids:
+            await authorize_corpus_action(
+                session=db,
+                principal=principal,
+                corpus_id=corpus_id,
+                action="run",
+                request=http_request,
+            )
     except HTTPException as exc:
         _release_and_raise(exc)
+    # Compile the caller's document grants and policies once; retrieval enforces them in SQL.
+    retrieval_access = None
+    if settings.authz_retrieval_document_acl:
+        retrieval_access = await build_retrieval_access(session=db, principal=principal, request=http_request)
     # Resolve retrieval provider entitlements early to return stable 403s.
-    retriever = RetrievalRouter(db)
+    retriever = RetrievalRouter(db, access=retrieval_access)
     resolved_provider: str | None = None
-    try:
-        provider = await retriever.resolve_provider(principal.tenant_id, payload.corpus_id)
-    except RetrievalConfigError:
-        # Preserve existing run error behavior when corpus config is invalid.
-        pass
-    except HTTPException as exc:
-        _release_and_raise(exc)
-    else:
-        resolved_provider = provider
-        if provider in {"aws_bedrock_kb", "gcp_vertex"}:
-            if await resolve_kill_switch("kill.external_retrieval"):
-                _release_and_raise(_feature_disabled("External retrieval is temporarily disabled"))
-            rollout_pct = await resolve_canary_percentage("rollout.external_retrieval")
-            if not deterministic_canary(principal.tenant_id, rollout_pct):
-                _release_and_raise(_feature_disabled("External retrieval is not enabled for this tenant yet"))
+    external_provider_resolved = False
+    for corpus_id in fanout_corpus_ids:
+        try:
+            provider = await retriever.resolve_provider(principal.tenant_id, corpus_id)
+        except RetrievalConfigError:
+            # Preserve existing run error behavior when corpus config is invalid.
+            continue
+        except HTTPException as exc:
+            _release_and_raise(exc)
+        if corpus_id == payload.corpus_id:
+            resolved_provider = provider
+        external_provider_resolved = external_provider_resolved or provider in {"aws_bedrock_kb", "gcp_vertex"}
+    if external_provider_resolved:
+        if await resolve_kill_switch("kill.external_retrieval"):
+            _release_and_raise(_feature_disabled("External retrieval is temporarily disabled"))
+        rollout_pct = await resolve_canary_percentage("rollout.external_retrieval")
+        if not deterministic_canary(principal.tenant_id, rollout_pct):
+            _release_and_raise(_feature_disabled("External retrieval is not enabled for this tenant yet"))
 
     # Evaluate tenant SLA state before budget and generation flows.
     sla_decision = await evaluate_tenant_sla(
@@ -715,7 +735,7 @@ async def run(
                 effective_audio = False
             if budget_decision.degrade_actions.max_output_tokens:
                 max_output_tokens = budget_decision.degrade_actions.max_output_tokens
-            if resolved_provider in {"aws_bedrock_kb", "gcp_vertex"}:
+            if external_provider_resolved:
                 # Prefer local retrieval during degraded mode to reduce external spend.
                 retriever.set_forced_provider("local_pgvector")
                 effective_retrieval_provider = "local_pgvector"
@@ -885,6 +905,7 @@ async def run(
         metadata={
             "session_id": payload.session_id,
             "corpus_id": payload.corpus_id,
+            "corpus_ids": fanout_corpus_ids,
             "top_k_requested": payload.top_k,
             "top_k_effective": effective_top_k,
             "audio_requested": payload.audio,
@@ -956,6 +977,8 @@ async def run(
                 session=db,
                 state=state,
                 top_k=effective_top_k,
+                retrieval_filters=payload.filters,
+                retrieval_corpus_ids=retrieval_corpus_ids,
                 token_callback=token_callback,
                 retrieval_callback=retrieval_callback,
                 max_output_tokens=max_output_tokens,
@@ -9,7 +9,17 @@ Honesty contract: every number is computed here, from the fixed committed
 fixture against the same retrieval path the product uses. Nothing is seeded. The
 artifact records `embedding_provider`, so a lexical `fake` run is never read as
 semantic. Adversarial cases (no relevant doc) are scored separately as a
-false-confidence signal, not folded into recall/precision.
+false-confidence signal, not folded into recall/precision. An `ann` section
+compares the HNSW index against an exact scan (recall vs exact, p50/p95) across
+an ef_search sweep so index settings can be tuned, plus a skewed case where a
+large filler corpus shares the index with the small fixture corpora, a `modes` section scores
+vector-only against hybrid (lexical + vector RRF) retrieval, and a
+`quantization` section trades recall vs exact against ANN index size for the
+halfvec and binary first-pass indexes across over-fetch factors, and a
+`dimensions` section scores Matryoshka-truncated embedding widths against the
+native one, overall and per corpus. A `loaders` section reports per-format
+extraction throughput (MB/s, chars/s) through the worker's loader process pool,
+on synthetic PDF/HTML/DOCX/CSV renderings of the fixture.
 
 Run:  python -m nexusrag.benchmark.runner
 A real semantic run sets EMBEDDING_PROVIDER=openai (or vertex) with the matching
@@ -18,25 +28,61 @@ key; tests run it with the default fake provider and an ephemeral pgvector DB.
 from __future__ import annotations
 
 import asyncio
+import csv
+import html
+import io
 import json
+import math
+import random
 import sys
+import tempfile
+import time
+import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import delete
+from sqlalchemy import delete, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from nexusrag.benchmark import scoring
-from nexusrag.core.config import EMBED_DIM, get_settings
+from nexusrag.core.config import EMBED_DIM, SUPPORTED_EMBED_DIMS, get_settings
 from nexusrag.domain.models import Chunk, Corpus
-from nexusrag.ingestion.embeddings import embed_text
+from nexusrag.ingestion.embeddings import truncate_embedding
+from nexusrag.ingestion.loaders import extract_file, list_loaders
 from nexusrag.persistence.db import SessionLocal
+from nexusrag.persistence.repos import chunks as chunks_repo
+from nexusrag.persistence.repos import corpora as corpora_repo
+from nexusrag.persistence.repos.corpora import bump_corpus_version, get_corpus_for_tenant
+from nexusrag.providers.retrieval.local_pgvector import LocalPgVectorRetriever
 from nexusrag.providers.retrieval.router import RetrievalRouter
+from nexusrag.services.ingest.embedding_cache import embed_with_cache, text_sha256
 
 FIXTURE_VERSION = "benchmark-v1"
 BENCHMARK_TENANT = "benchmark"
 TOP_K = 10
+# hnsw.ef_search values swept by ann_check; the deployment default sits in the middle.
+ANN_EF_SEARCH_SWEEP = (20, 40, 100)
+# ann_check's skewed case: filler rows near the fixture vectors, in a corpus sharing the ANN index.
+ANN_SKEW_CORPUS = "skew-filler"
+ANN_SKEW_FILLER_ROWS = 2000
+# Local retrieval modes scored side by side; each maps to retrieval config overrides.
+RETRIEVAL_MODES: dict[str, dict[str, Any]] = {"vector": {"mode": "vector"}, "hybrid": {"mode": "hybrid"}}
+# Over-fetch factors swept per quantisation type by quantization_check.
+QUANTIZATION_OVERSAMPLE_SWEEP = (1, 4, 10)
+# ANN index backing each first pass (migrations 0033 and 0038).
+QUANTIZATION_INDEXES = {
+    "full": "ix_chunks_embedding_hnsw",
+    "halfvec": "ix_chunks_embedding_halfvec_hnsw",
+    "binary": "ix_chunks_embedding_bq_hnsw",
+}
+# Embedding widths scored by dimension_check, widest last.
+EMBEDDING_DIM_SWEEP = SUPPORTED_EMBED_DIMS
+# loader_check renders the fixture this many times per synthetic document, and extracts this many at once.
+LOADER_FIXTURE_COPIES = 20
+LOADER_DOCUMENTS = 8
 
 # Fixture lives at <repo>/examples/benchmark-v1; runner is nexusrag/benchmark/runner.py.
 _FIXTURE_DIR = Path(__file__).resolve().parents[2] / "examples" / FIXTURE_VERSION
@@ -67,7 +113,8 @@ async def _allow_entitlement(**_kwargs: object) -> None:
 async def index_fixture(session: AsyncSession, docs: list[dict]) -> None:
     """Create one isolated corpus per fixture group and embed each doc as one chunk.
 
-    Idempotent: re-running drops the prior benchmark chunks first, so the index
+    Every chunk also carries each truncated width, so dimension_check can score
+    all of them against the same rows. Idempotent: re-running drops the prior benchmark chunks first, so the index
     always reflects the current fixture and never accumulates stale vectors.
     """
     config = {"retrieval": {"provider": "local_pgvector", "top_k_default": TOP_K}}
@@ -75,43 +122,82 @@ async def index_fixture(session: AsyncSession, docs: list[dict]) -> None:
         cid = _corpus_id(corpus)
         existing = await session.get(Corpus, cid)
         if existing is None:
-            session.add(
-                Corpus(id=cid, tenant_id=BENCHMARK_TENANT, name=f"benchmark/{corpus}", provider_config_json=config)
+            await corpora_repo.create_corpus(
+                session,
+                corpus_id=cid,
+                tenant_id=BENCHMARK_TENANT,
+                name=f"benchmark/{corpus}",
+                provider_config_json=config,
             )
         else:
             existing.tenant_id = BENCHMARK_TENANT
             existing.provider_config_json = config
-        await session.execute(delete(Chunk).where(Chunk.corpus_id == cid))
+            await session.execute(delete(Chunk).where(Chunk.corpus_id == cid))
+            # Corpora from runs before partitioning was enabled get theirs now that they are empty.
+            await chunks_repo.ensure_corpus_partition(session, cid)
     await session.flush()
 
-    for doc in docs:
-        embedding = embed_text(doc["text"])
+    # Reruns against an unchanged fixture are served from the embedding cache.
+    embeddings = await embed_with_cache(session, [doc["text"] for doc in docs])
+    rows = []
+    for doc, embedding in zip(docs, embeddings, strict=True):
         if len(embedding) != EMBED_DIM:
             raise ValueError(f"embedding dim {len(embedding)} != EMBED_DIM {EMBED_DIM}")
-        session.add(
-            Chunk(
-                id=uuid4(),
-                corpus_id=_corpus_id(doc["corpus"]),
-                document_uri=doc["doc_id"],
-                chunk_index=0,
-                text=doc["text"],
-                embedding=embedding,
-                metadata_json={
+        rows.append(
+            {
+                "id": uuid4(),
+                "tenant_id": BENCHMARK_TENANT,
+                "corpus_id": _corpus_id(doc["corpus"]),
+                "document_id": None,
+                "document_uri": doc["doc_id"],
+                "chunk_index": 0,
+                "text": doc["text"],
+                "content_hash": text_sha256(doc["text"]),
+                "embedding": embedding,
+                **{
+                    chunks_repo.embedding_column_name(dim): truncate_embedding(embedding, dim)
+                    for dim in EMBEDDING_DIM_SWEEP
+                    if dim != EMBED_DIM
+                },
+                "metadata_json": {
                     "doc_id": doc["doc_id"],
                     "corpus": doc["corpus"],
                     "title": doc.get("title", ""),
                     "source_type": "benchmark",
                 },
-            )
+            }
         )
+    # Same COPY path as ingestion so benchmark indexing time tracks production writes.
+    await chunks_repo.copy_chunks(session, rows, batch_size=get_settings().ingest_write_batch_rows)
+    await bump_corpus_version(session, [_corpus_id(corpus) for corpus in {d["corpus"] for d in docs}])
     await session.commit()
 
 
+def _override_loader(overrides: dict[str, Any]):
+    # Score alternative retrieval settings against the same indexed corpora
+    # without rewriting the stored provider config.
+    async def loader(session: AsyncSession, corpus_id: str, tenant_id: str) -> Any:
+        corpus = await get_corpus_for_tenant(session, corpus_id, tenant_id)
+        if corpus is None:
+            return None
+        config = dict(corpus.provider_config_json)
+        config["retrieval"] = {**config.get("retrieval", {}), **overrides}
+        return SimpleNamespace(provider_config_json=config)
+
+    return loader
+
+
 async def run_cases(
-    session: AsyncSession, cases: list[dict]
+    session: AsyncSession,
+    cases: list[dict],
+    retrieval_overrides: dict[str, Any] | None = None,
 ) -> tuple[list[dict], list[dict], dict[str, list[dict]]]:
     """Retrieve for every case and score answerable vs adversarial separately."""
-    router = RetrievalRouter(session, entitlement_checker=_allow_entitlement)
+    router = RetrievalRouter(
+        session,
+        corpus_loader=_override_loader(retrieval_overrides) if retrieval_overrides else None,
+        entitlement_checker=_allow_entitlement,
+    )
     answerable: list[dict] = []
     adversarial: list[dict] = []
     per_corpus: dict[str, list[dict]] = {}
@@ -143,6 +229,346 @@ async def run_cases(
     return answerable, adversarial, per_corpus
 
 
+def _percentile(values: list[float], pct: float) -> float:
+    # Nearest-rank percentile; enough resolution for a few dozen benchmark queries.
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return round(ordered[rank - 1], 3)
+
+
+async def _timed_retrieve(
+    retriever: LocalPgVectorRetriever, corpus_id: str, query: str
+) -> tuple[list[str], float]:
+    started = time.perf_counter()
+    results = await retriever.retrieve(BENCHMARK_TENANT, corpus_id, query, TOP_K)
+    return [r["source"] for r in results], (time.perf_counter() - started) * 1000.0
+
+
+async def ann_check(
+    session: AsyncSession,
+    cases: list[dict],
+    ef_search_values: tuple[int, ...] = ANN_EF_SEARCH_SWEEP,
+    filler_rows: int = ANN_SKEW_FILLER_ROWS,
+) -> dict:
+    """Compare HNSW results against an exact scan for every case query.
+
+    recall_vs_exact_at_k is the fraction of the exact top-k the ANN path also
+    returns, independent of ground-truth labels, so it isolates index loss from
+    embedding quality. Use it with the latency percentiles to pick ef_search.
+    The skewed section repeats the comparison after adding filler_rows to a
+    separate corpus, so the fixture corpora are a sliver of the shared index.
+    """
+    baseline, exact_latencies = await _exact_baseline(session, cases)
+    sweep: list[dict] = []
+    for ef_search in ef_search_values:
+        ann = LocalPgVectorRetriever(
+            session,
+            retrieval_config={"ann": {"ef_search": ef_search, "exact_scan_threshold": 0}},
+        )
+        sweep.append({"ef_search": ef_search, **await _score_against_exact(ann, baseline)})
+    # End the read transaction so the transaction-scoped search settings are discarded.
+    await session.rollback()
+    skewed = await _skewed_corpora_check(session, baseline, filler_rows)
+
+    return {
+        "top_k": TOP_K,
+        "queries": len(baseline),
+        "exact": {"p50_ms": _percentile(exact_latencies, 50), "p95_ms": _percentile(exact_latencies, 95)},
+        "ann": sweep,
+        "skewed": skewed,
+    }
+
+
+async def _skewed_corpora_check(
+    session: AsyncSession, baseline: list[tuple[str, str, list[str]]], filler_rows: int
+) -> dict:
+    """Score the small fixture corpora while a much larger corpus crowds the same index.
+
+    Unless chunks is partitioned by corpus, HNSW returns the nearest ef_search rows
+    across every corpus and the corpus scope is applied afterwards, so a small corpus
+    next to near-duplicate filler can come back with fewer than top_k rows.
+    rows_vs_exact below 1.0 is that starvation; iterative scans should hold it at 1.0.
+    """
+    corpus_ids = sorted({corpus_id for corpus_id, _query, _expected in baseline})
+    result = await session.execute(select(Chunk.embedding).where(Chunk.corpus_id.in_(corpus_ids)))
+    seeds = [[float(value) for value in embedding] for embedding in result.scalars() if embedding is not None]
+    filler_id = _corpus_id(ANN_SKEW_CORPUS)
+    if not seeds or filler_rows <= 0:
+        return {"filler_rows": 0}
+
+    await _drop_skew_filler(session)
+    await corpora_repo.create_corpus(
+        session, corpus_id=filler_id, tenant_id=BENCHMARK_TENANT, name=f"benchmark/{ANN_SKEW_CORPUS}"
+    )
+    # Seeded noise keeps every run comparable while pulling filler rows into each query's neighbourhood.
+    rng = random.Random(0)
+    rows = (
+        {
+            "id": uuid4(),
+            "tenant_id": BENCHMARK_TENANT,
+            "corpus_id": filler_id,
+            "document_id": None,
+            "document_uri": f"{ANN_SKEW_CORPUS}-{index}",
+            "chunk_index": 0,
+            "text": "",
+            "content_hash": None,
+            "embedding": [value + rng.gauss(0.0, 0.01) for value in seeds[index % len(seeds)]],
+            "metadata_json": {"source_type": "benchmark"},
+        }
+        for index in range(filler_rows)
+    )
+    await chunks_repo.copy_chunks(session, rows, batch_size=get_settings().ingest_write_batch_rows)
+    await session.commit()
+    try:
+        ann = LocalPgVectorRetriever(session, retrieval_config={"ann": {"exact_scan_threshold": 0}})
+        scored = await _score_against_exact(ann, baseline)
+        await session.rollback()
+    finally:
+        await _drop_skew_filler(session)
+        await session.commit()
+    settings = get_settings()
+    return {
+        "filler_rows": filler_rows,
+        "partitioned": await chunks_repo.is_partitioned(session),
+        "iterative_scan": settings.retrieval_filter_iterative_scan,
+        **scored,
+    }
+
+
+async def _drop_skew_filler(session: AsyncSession) -> None:
+    filler_id = _corpus_id(ANN_SKEW_CORPUS)
+    await session.execute(delete(Chunk).where(Chunk.corpus_id == filler_id))
+    await session.execute(delete(Corpus).where(Corpus.id == filler_id))
+
+
+async def _exact_baseline(
+    session: AsyncSession, cases: list[dict]
+) -> tuple[list[tuple[str, str, list[str]]], list[float]]:
+    # A huge threshold forces the exact path; 0 disables the small-corpus fallback.
+    exact = LocalPgVectorRetriever(session, retrieval_config={"ann": {"exact_scan_threshold": 2**31 - 1}})
+    baseline: list[tuple[str, str, list[str]]] = []
+    latencies: list[float] = []
+    for case in cases:
+        corpus_id = _corpus_id(case["corpus"])
+        sources, elapsed_ms = await _timed_retrieve(exact, corpus_id, case["query"])
+        baseline.append((corpus_id, case["query"], sources))
+        latencies.append(elapsed_ms)
+    return baseline, latencies
+
+
+async def _score_against_exact(
+    retriever: LocalPgVectorRetriever, baseline: list[tuple[str, str, list[str]]]
+) -> dict:
+    overlaps: list[float] = []
+    filled: list[float] = []
+    latencies: list[float] = []
+    for corpus_id, query, expected in baseline:
+        sources, elapsed_ms = await _timed_retrieve(retriever, corpus_id, query)
+        latencies.append(elapsed_ms)
+        if expected:
+            overlaps.append(len(set(sources) & set(expected)) / len(expected))
+            # Rows lost to filtering after the index scan show up here even when the survivors rank well.
+            filled.append(min(len(sources), len(expected)) / len(expected))
+    return {
+        "recall_vs_exact_at_k": _mean(overlaps),
+        "rows_vs_exact": _mean(filled),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+    }
+
+
+async def _index_bytes(session: AsyncSession, index_name: str) -> int | None:
+    # None when the index is missing (e.g. a database migrated before 0038).
+    result = await session.execute(
+        text("SELECT pg_relation_size(to_regclass(:name))"), {"name": index_name}
+    )
+    value = result.scalar_one_or_none()
+    return int(value) if value is not None else None
+
+
+async def quantization_check(
+    session: AsyncSession,
+    cases: list[dict],
+    oversample_values: tuple[int, ...] = QUANTIZATION_OVERSAMPLE_SWEEP,
+) -> dict:
+    """Measure recall lost by each quantised first pass against the memory it saves.
+
+    Recall is scored against the exact scan like ann_check. index_bytes are the
+    on-disk sizes of the ANN indexes (the working set the first pass must keep
+    hot); they cover the whole chunks table, not just the benchmark tenant.
+    """
+    baseline, _latencies = await _exact_baseline(session, cases)
+    index_bytes = {name: await _index_bytes(session, index) for name, index in QUANTIZATION_INDEXES.items()}
+    full_bytes = index_bytes["full"]
+    sweep: list[dict] = []
+    for quantization_type in ("halfvec", "binary"):
+        quantized_bytes = index_bytes[quantization_type]
+        saved = (
+            round(1.0 - quantized_bytes / full_bytes, 4) if full_bytes and quantized_bytes is not None else None
+        )
+        for oversample in oversample_values:
+            retriever = LocalPgVectorRetriever(
+                session,
+                retrieval_config={
+                    "ann": {"exact_scan_threshold": 0},
+                    "quantization": {"type": quantization_type, "oversample": oversample},
+                },
+            )
+            row = {"type": quantization_type, "oversample": oversample}
+            row.update(await _score_against_exact(retriever, baseline))
+            row["index_bytes_saved_ratio"] = saved
+            sweep.append(row)
+    await session.rollback()
+
+    return {"top_k": TOP_K, "queries": len(baseline), "index_bytes": index_bytes, "sweep": sweep}
+
+
+async def dimension_check(
+    session: AsyncSession,
+    cases: list[dict],
+    dims: tuple[int, ...] = EMBEDDING_DIM_SWEEP,
+    corpus: str | None = None,
+) -> dict:
+    """Score ground-truth retrieval quality at each embedding width.
+
+    Each width retrieves through the router with a retrieval.embedding_dim
+    override, so the query is truncated and searched exactly as a corpus
+    configured that way would be. Pass `corpus` to restrict the sweep to one
+    fixture group; the recall cost of truncation depends on the data. index_bytes
+    is the width's ANN index size across the whole chunks table.
+    """
+    selected = [case for case in cases if corpus is None or case["corpus"] == corpus]
+    sweep: list[dict] = []
+    for dim in dims:
+        answerable, _adversarial, per_corpus = await run_cases(session, selected, {"embedding_dim": dim})
+        index_name = f"ix_{Chunk.__tablename__}_{chunks_repo.embedding_column_name(dim)}_hnsw"
+        sweep.append(
+            {
+                "embedding_dim": dim,
+                **_agg(answerable),
+                "per_corpus": {name: _agg(rows) for name, rows in sorted(per_corpus.items())},
+                "index_bytes": await _index_bytes(session, index_name),
+            }
+        )
+    return {"top_k": TOP_K, "corpus": corpus, "sweep": sweep}
+
+
+def _pdf_literal(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return escaped.encode("latin-1", errors="replace").decode("latin-1")
+
+
+def _synthetic_pdf(sections: list[tuple[str, str]]) -> bytes:
+    # Minimal uncompressed PDF, one page per section, so the benchmark needs no PDF writer.
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids: list[str] = []
+    for title, body in sections:
+        words = f"{title}. {body}".split()
+        lines = [" ".join(words[i : i + 12]) for i in range(0, len(words), 12)]
+        stream = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(f"({_pdf_literal(line)}) Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode("latin-1"))
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>".encode("latin-1")
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode("latin-1")
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    out.write("".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+    return out.getvalue()
+
+
+def _synthetic_html(sections: list[tuple[str, str]]) -> bytes:
+    parts = [f"<h2>{html.escape(title)}</h2><p>{html.escape(body)}</p>" for title, body in sections]
+    return f"<html><head><title>benchmark</title></head><body>{''.join(parts)}</body></html>".encode()
+
+
+def _synthetic_docx(sections: list[tuple[str, str]]) -> bytes:
+    def paragraph(value: str, style: str | None = None) -> str:
+        props = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+        return f"<w:p>{props}<w:r><w:t>{html.escape(value)}</w:t></w:r></w:p>"
+
+    body = "".join(paragraph(title, "Heading1") + paragraph(text) for title, text in sections)
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", document)
+    return out.getvalue()
+
+
+def _synthetic_csv(sections: list[tuple[str, str]]) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["title", "text"])
+    writer.writerows(sections)
+    return out.getvalue().encode()
+
+
+_SYNTHETIC_SOURCES = {
+    "pdf": _synthetic_pdf,
+    "html": _synthetic_html,
+    "docx": _synthetic_docx,
+    "csv": _synthetic_csv,
+}
+
+
+async def loader_check(
+    docs: list[dict],
+    copies: int = LOADER_FIXTURE_COPIES,
+    documents: int = LOADER_DOCUMENTS,
+) -> dict:
+    """Measure extraction throughput per loader format through the loader pool.
+
+    Each format renders the fixture `copies` times into one document (a page,
+    heading section or row per fixture doc) and extracts `documents` of them
+    concurrently, so the rate includes pool dispatch and the process count set
+    by ingest_loader_processes. Formats whose parser is not installed report
+    available: false.
+    """
+    sections = [(doc["title"], doc["text"]) for doc in docs] * copies
+    formats: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for loader in list_loaders():
+            render = _SYNTHETIC_SOURCES.get(loader.name)
+            if render is None:
+                continue
+            if not loader.available:
+                formats[loader.name] = {"available": False}
+                continue
+            source = render(sections)
+            path = Path(directory) / f"source.{loader.extension}"
+            path.write_bytes(source)
+            # Warm the pool so process start-up is not billed to the first format.
+            await extract_file(loader, path)
+            started = time.perf_counter()
+            extracted = await asyncio.gather(*(extract_file(loader, path) for _ in range(documents)))
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            chars = sum(len(item.text) for item in extracted)
+            formats[loader.name] = {
+                "available": True,
+                "documents": documents,
+                "bytes_per_document": len(source),
+                "spans_per_document": len(extracted[0].spans),
+                "seconds": round(elapsed, 4),
+                "mb_per_s": round(len(source) * documents / elapsed / 1_000_000, 3),
+                "chars_per_s": round(chars / elapsed, 1),
+            }
+    return {"processes": get_settings().ingest_loader_processes, "formats": formats}
+
+
 def _mean(values: list[float]) -> float:
     return round(sum(values) / len(values), 4) if values else 0.0
 
@@ -159,6 +585,15 @@ def _agg(rows: list[dict]) -> dict:
     }
 
 
+async def score_modes(session: AsyncSession, cases: list[dict]) -> dict:
+    """Score each local retrieval mode on the answerable cases, keyed by mode name."""
+    modes: dict[str, dict] = {}
+    for name, overrides in RETRIEVAL_MODES.items():
+        answerable, _adversarial, _per_corpus = await run_cases(session, cases, overrides)
+        modes[name] = _agg(answerable)
+    return modes
+
+
 def aggregate(answerable: list[dict], adversarial: list[dict], per_corpus: dict[str, list[dict]]) -> dict:
     return {
         "retrieval": _agg(answerable),
@@ -209,7 +644,17 @@ async def _run() -> int:
     async with SessionLocal() as session:
         await index_fixture(session, docs)
         answerable, adversarial, per_corpus = await run_cases(session, cases)
+        modes = await score_modes(session, cases)
+        ann = await ann_check(session, cases)
+        quantization = await quantization_check(session, cases)
+        dimensions = await dimension_check(session, cases)
+    loaders = await loader_check(docs)
     metrics = aggregate(answerable, adversarial, per_corpus)
+    metrics["modes"] = modes
+    metrics["ann"] = ann
+    metrics["quantization"] = quantization
+    metrics["dimensions"] = dimensions
+    metrics["loaders"] = loaders
     payload = write_artifact(metrics, len(answerable) + len(adversarial), provider)
     print(json.dumps(payload["latest"], indent=2))
     return 0
@@ -7,6 +7,8 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Keep embedding dimension centralized to prevent drift across DB and retrieval logic.
 EMBED_DIM = 768
+# Per-corpus Matryoshka truncations; each has its own chunks column and HNSW index (migration 0042).
+SUPPORTED_EMBED_DIMS = (256, 512, EMBED_DIM)
 
 
 class Settings(BaseSettings):
@@ -25,6 +27,22 @@ class Settings(BaseSettings):
     ingest_max_retries: int = 3
     # Inline mode executes ingestion immediately for deterministic tests.
     ingest_execution_mode: str = "queue"
+    # Chunk rows read, embedded, and written per pipeline batch; peak worker memory scales with this, not document size.
+    ingest_write_batch_rows: int = 500
+    # Run worker ingestion as a staged read -> embed -> write pipeline shared by concurrent jobs.
+    ingest_pipeline_enabled: bool = True
+    # Documents reading and chunking at once; further jobs wait for a read slot.
+    ingest_pipeline_read_concurrency: int = 4
+    # Batches embedding at once across all documents.
+    ingest_pipeline_embed_concurrency: int = 4
+    # Batches writing (COPY + commit) at once; each holds a database connection.
+    ingest_pipeline_write_concurrency: int = 2
+    # Batches buffered between stages; a full queue blocks the stage feeding it.
+    ingest_pipeline_queue_batches: int = 8
+    # Window for per-stage throughput and busy ratios reported to /ops.
+    ingest_pipeline_stats_window_s: int = 60
+    # Processes extracting PDF/HTML/DOCX/CSV sources per worker; 0 extracts on a thread instead.
+    ingest_loader_processes: int = 2
     # Emit worker heartbeats for ops health and alerting.
     worker_heartbeat_interval_s: int = 10
     # Treat stale heartbeats as degraded to surface worker outages.
@@ -43,6 +61,8 @@ class Settings(BaseSettings):
     authz_default_deny: bool = True
     # Allow admin role to bypass document ACLs when explicitly enabled.
     authz_admin_bypass_document_acl: bool = False
+    # Enforce document ACLs and document ABAC policies inside local retrieval queries.
+    authz_retrieval_document_acl: bool = True
     # Enforce maximum serialized policy size to bound evaluation cost.
     authz_max_policy_bytes: int = 16384
     # Enforce maximum policy nesting depth to keep evaluation deterministic.
@@ -389,6 +409,72 @@ class Settings(BaseSettings):
     embedding_provider: str = "fake"
     vertex_embedding_model: str = "text-embedding-004"
     openai_embedding_model: str = "text-embedding-3-small"
+    # Texts per embeddings request (OpenAI array input / Vertex get_embeddings; Vertex caps at 250).
+    embedding_batch_size: int = 64
+    # Concurrent embedding requests per embed_many call; also sizes the pooled HTTP client.
+    embedding_max_concurrency: int = 4
+    # Per-request timeout for embedding provider calls.
+    embedding_timeout_s: float = 30.0
+    # Reuse persisted vectors for byte-identical chunk text (paid providers only).
+    embedding_cache_enabled: bool = True
+    # Evict cache entries unused for this many days.
+    embedding_cache_retention_days: int = 30
+    # Upper bound on cache rows; the least recently used rows beyond it are evicted.
+    embedding_cache_max_entries: int = 1_000_000
+    # In-process query embedding cache ceiling per API process (0 disables caching).
+    query_embedding_cache_max_mb: int = 64
+    # Seconds a cached query embedding stays valid.
+    query_embedding_cache_ttl_s: float = 3600.0
+    # Share of ingest bulkhead slots embedding-generation backfills may hold (always at least one).
+    embedding_migration_capacity_share: float = 0.25
+    # Chunks embedded and written per backfill transaction.
+    embedding_migration_batch_size: int = 256
+    # Seconds a backfill waits before retrying when its share (or ingest capacity) is in use.
+    embedding_migration_backoff_s: float = 1.0
+
+    # Read by migration 0040: rebuild chunks LIST-partitioned by corpus_id (one partition, with its own ANN indexes, per corpus).
+    chunks_partition_by_corpus: bool = False
+
+    # Default HNSW candidate list size for local pgvector ANN queries (per-corpus override: retrieval.ann.ef_search).
+    retrieval_ann_ef_search: int = 40
+    # Corpora at or below this many chunks skip the ANN index and use an exact scan (0 disables the fallback).
+    retrieval_exact_scan_max_chunks: int = 5000
+    # Quantised first pass over-fetches top_k * this many candidates for full-precision re-ranking.
+    retrieval_quantization_oversample: int = 4
+    # pgvector iterative index scan mode for filtered ANN queries, including corpus scope on unpartitioned chunks (off, relaxed_order, strict_order).
+    retrieval_filter_iterative_scan: str = "relaxed_order"
+    # Shared deadline for multi-corpus retrieval; corpora that miss it are dropped from the merged results.
+    retrieval_fanout_timeout_ms: int = 2500
+    # Hedge slow external retrieval calls (Bedrock KB / Vertex) with a duplicate or the corpus's fallback provider.
+    retrieval_hedge_enabled: bool = True
+    # Hedge once a call outlives this latency percentile of recent successful calls to the same integration.
+    retrieval_hedge_percentile: float = 95.0
+    retrieval_hedge_window_s: int = 300
+    # No timed hedging until the window holds this many successful samples.
+    retrieval_hedge_min_samples: int = 20
+    # Hedges per primary call (0.1 = at most 10% extra upstream load), with a small burst allowance.
+    retrieval_hedge_budget_ratio: float = 0.1
+    retrieval_hedge_budget_burst: int = 10
+    # Shared provider SDK clients are rebuilt after this many consecutive failed calls.
+    provider_client_max_consecutive_failures: int = 3
+    # Rebuild shared provider SDK clients older than this so credentials and connections refresh (0 disables).
+    provider_client_max_age_s: float = 3600.0
+    # Parsed per-corpus retrieval configs kept in-process so warm corpora skip the config read (0 disables).
+    corpus_config_cache_ttl_s: float = 300.0
+    corpus_config_cache_max_entries: int = 10000
+    # Redis pub/sub channel carrying corpus config invalidations to every API replica.
+    corpus_config_cache_channel: str = "nexusrag:corpus-config"
+    # Cache retrieval results per (tenant, corpus, corpus_version, provider, query, top_k).
+    retrieval_cache_enabled: bool = True
+    # In-process retrieval result cache ceiling per API process.
+    retrieval_cache_max_mb: int = 32
+    # Local results are invalidated exactly by corpus_version; this TTL only ages out cold entries.
+    retrieval_cache_ttl_s: float = 3600.0
+    # External providers (Bedrock KB / Vertex) index outside our DB, so their results expire by TTL (0 disables).
+    retrieval_cache_external_ttl_s: float = 300.0
+    # Optional shared tier so API replicas reuse each other's results.
+    retrieval_cache_redis_enabled: bool = False
+    retrieval_cache_redis_prefix: str = "nexusrag:retrieval"
 
     # TTS provider selection: none/openai/fake for local development.
     tts_provider: str = "none"
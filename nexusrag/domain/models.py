@@ -8,9 +8,11 @@ from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
     BigInteger,
     Boolean,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
+    ForeignKeyConstraint,
     Index,
     Integer,
     Numeric,
@@ -20,7 +22,7 @@ from sqlalchemy import (
     func,
     text,
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 from nexusrag.core.config import EMBED_DIM
@@ -1320,6 +1322,23 @@ class Corpus(Base):
     tenant_id: Mapped[str] = mapped_column(String, index=True)
     name: Mapped[str] = mapped_column(String)
     provider_config_json: Mapped[dict[str, Any]] = mapped_column(JSONB)
+    # Bumped from a shared sequence whenever chunks or retrieval config change; keys the retrieval result cache.
+    corpus_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text("nextval('corpora_version_seq')")
+    )
+    # Embedding generation retrieval reads from chunk_embedding_shadows (migration 0045);
+    # NULL serves the chunks embedding columns. An embedding cutover only moves this pointer.
+    embedding_generation_id: Mapped[str | None] = mapped_column(
+        String,
+        # Generations reference corpora too; create_all adds this side after both tables exist.
+        ForeignKey(
+            "corpus_embedding_generations.id",
+            name="fk_corpora_embedding_generation",
+            ondelete="SET NULL",
+            use_alter=True,
+        ),
+        nullable=True,
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
@@ -1363,6 +1382,8 @@ class Document(Base):
     last_reindexed_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # Chunk generation retrieval serves; a reindex writes the next one alongside and flips this.
+    active_generation: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
 
 
 class DocumentPermission(Base):
@@ -1430,20 +1451,131 @@ class PrincipalAttribute(Base):
 
 class Chunk(Base):
     __tablename__ = "chunks"
+    # Target of the chunk_embedding_shadows FK; a corpus-partitioned table's primary key is (id, corpus_id).
+    __table_args__ = (UniqueConstraint("id", "corpus_id", name="uq_chunks_id_corpus_id"),)
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    # Denormalised from corpora.tenant_id (migration 0040) so retrieval can scope rows without a join.
+    tenant_id: Mapped[str | None] = mapped_column(String, nullable=True)
     corpus_id: Mapped[str] = mapped_column(String, index=True)
     document_id: Mapped[str | None] = mapped_column(String, ForeignKey("documents.id"), nullable=True)
     document_uri: Mapped[str] = mapped_column(String)
     chunk_index: Mapped[int] = mapped_column(Integer)
     text: Mapped[str] = mapped_column(Text)
+    # sha256 of the chunk text; incremental reindex keeps rows whose hash is unchanged.
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     # Keep vector dimension aligned with embedding generation and retrieval.
-    embedding: Mapped[list[float]] = mapped_column(Vector(EMBED_DIM))
+    # Corpora with a truncated retrieval.embedding_dim leave it NULL and fill their own column.
+    embedding: Mapped[list[float] | None] = mapped_column(Vector(EMBED_DIM), nullable=True)
+    embedding_256: Mapped[list[float] | None] = mapped_column(Vector(256), nullable=True, deferred=True)
+    embedding_512: Mapped[list[float] | None] = mapped_column(Vector(512), nullable=True, deferred=True)
+    # Postgres maintains the lexical vector for hybrid retrieval; deferred so ORM loads skip it.
+    text_tsv: Mapped[Any] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', text)", persisted=True),
+        nullable=True,
+        deferred=True,
+    )
     metadata_json: Mapped[dict[str, Any]] = mapped_column(JSONB)
+    # Rows are visible only while this matches documents.active_generation (migration 0044).
+    generation: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+
+    # Content-addressed key: identical chunk text under the same provider/model reuses the vector.
+    provider: Mapped[str] = mapped_column(String, primary_key=True)
+    model: Mapped[str] = mapped_column(String, primary_key=True)
+    text_sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    embedding: Mapped[list[float]] = mapped_column(Vector(EMBED_DIM))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Refreshed on reuse so eviction can drop cold entries first.
+    last_used_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class CorpusEmbeddingGeneration(Base):
+    __tablename__ = "corpus_embedding_generations"
+    __table_args__ = (
+        UniqueConstraint("corpus_id", "generation", name="uq_corpus_embedding_generations_generation"),
+    )
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String, index=True)
+    corpus_id: Mapped[str] = mapped_column(String, index=True)
+    # Monotonic per corpus; the vectors present when the first migration starts become generation 1.
+    generation: Mapped[int] = mapped_column(Integer)
+    provider: Mapped[str] = mapped_column(String)
+    model: Mapped[str] = mapped_column(String)
+    embedding_dim: Mapped[int] = mapped_column(Integer)
+    # building -> ready -> active -> retired -> collected; failed when the backfill job gives up.
+    status: Mapped[str] = mapped_column(String)
+    # The generation whose vectors live in the chunks embedding columns (at most one per corpus);
+    # every other generation keeps its vectors in chunk_embedding_shadows under its own ANN index.
+    vectors_in_chunks: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    chunks_total: Mapped[int] = mapped_column(Integer, default=0)
+    chunks_embedded: Mapped[int] = mapped_column(Integer, default=0)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    activated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    retired_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class ChunkEmbeddingShadow(Base):
+    __tablename__ = "chunk_embedding_shadows"
+    __table_args__ = (
+        # Deleting a chunk drops its vectors in every generation (migration 0045).
+        ForeignKeyConstraint(
+            ["chunk_id", "corpus_id"],
+            ["chunks.id", "chunks.corpus_id"],
+            name="fk_chunk_embedding_shadows_chunk",
+            ondelete="CASCADE",
+        ),
+    )
+
+    # Vectors of every generation not stored in the chunks columns: backfilled before
+    # cutover, served while the corpus points at the generation, kept for rollback after.
+    generation_id: Mapped[str] = mapped_column(
+        String, ForeignKey("corpus_embedding_generations.id", ondelete="CASCADE"), primary_key=True
+    )
+    chunk_id: Mapped[UUID] = mapped_column(primary_key=True, index=True)
+    corpus_id: Mapped[str] = mapped_column(String)
+    # Unconstrained width: a generation may target any supported embedding_dim. Each
+    # generation's partial HNSW index casts to its own width (embedding_generations.ensure_vector_index).
+    embedding: Mapped[list[float]] = mapped_column(Vector())
 
 
 Index("ix_chunks_corpus_id", Chunk.corpus_id)
+Index("ix_chunks_text_tsv", Chunk.text_tsv, postgresql_using="gin")
+Index("ix_embedding_cache_last_used_at", EmbeddingCacheEntry.last_used_at)
+# ANN index for cosine-distance retrieval; built CONCURRENTLY by migration 0033.
+Index(
+    "ix_chunks_embedding_hnsw",
+    Chunk.embedding,
+    postgresql_using="hnsw",
+    postgresql_with={"m": 16, "ef_construction": 64},
+    postgresql_ops={"embedding": "vector_cosine_ops"},
+)
+# Quantised first-pass expression indexes (halfvec, binary_quantize) live only in migration 0038.
+# Truncated-dimension ANN indexes (migration 0042); NULL rows from other corpora are not indexed.
+Index(
+    "ix_chunks_embedding_256_hnsw",
+    Chunk.embedding_256,
+    postgresql_using="hnsw",
+    postgresql_with={"m": 16, "ef_construction": 64},
+    postgresql_ops={"embedding_256": "vector_cosine_ops"},
+)
+Index(
+    "ix_chunks_embedding_512_hnsw",
+    Chunk.embedding_512,
+    postgresql_using="hnsw",
+    postgresql_with={"m": 16, "ef_construction": 64},
+    postgresql_ops={"embedding_512": "vector_cosine_ops"},
+)
 Index("ix_documents_status_queued_at", Document.status, Document.queued_at.desc())
 Index("ix_documents_status_processing_started_at", Document.status, Document.processing_started_at.desc())
 Index("ix_documents_status_completed_at", Document.status, Document.completed_at.desc())
@@ -1,24 +1,96 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Iterator
 
 # Chunking constants keep ingestion deterministic across runs.
 CHUNK_SIZE_CHARS = 1200
 CHUNK_OVERLAP_CHARS = 150
+PARAGRAPH_SEPARATOR = "\n\n"
 
 
-def _window_text(text: str, size: int, overlap: int) -> Iterable[tuple[str, int, int]]:
+def _window_text(text: str, size: int, overlap: int, offset: int = 0) -> Iterable[tuple[str, int, int]]:
     # Use a stable sliding window for long paragraphs to preserve order.
     start = 0
     length = len(text)
     while start < length:
         end = min(length, start + size)
-        yield text[start:end], start, end
+        yield text[start:end], offset + start, offset + end
         if end == length:
             break
         start = max(0, end - overlap)
 
 
+def _finish_paragraph(
+    raw: str, offset: int, *, windowing: bool, size: int, overlap: int
+) -> Iterable[tuple[str, int, int]]:
+    if windowing:
+        # The paragraph already emitted windows; raw starts at the next window.
+        yield from _window_text(raw.rstrip(), size, overlap, offset)
+        return
+    paragraph = raw.strip()
+    if not paragraph:
+        return
+    start = offset + len(raw) - len(raw.lstrip())
+    if len(paragraph) <= size:
+        yield paragraph, start, start + len(paragraph)
+        return
+    yield from _window_text(paragraph, size, overlap, start)
+
+
+def iter_chunks(
+    parts: Iterable[str],
+    *,
+    chunk_size: int = CHUNK_SIZE_CHARS,
+    chunk_overlap: int = CHUNK_OVERLAP_CHARS,
+) -> Iterator[tuple[str, int, int]]:
+    """Chunk a stream of text pieces, yielding (chunk, start, end) in source offsets.
+
+    Produces the same chunks as splitting the joined text on blank lines, but
+    scans each character once and only buffers the current paragraph tail, so
+    memory is bounded by the piece size rather than the document size. Long
+    paragraphs emit their windows as soon as a later non-space character
+    proves the window is not the final one.
+    """
+    buffer = ""
+    # Absolute offset of buffer[0] within the joined source text.
+    base = 0
+    windowing = False
+    step = chunk_size - chunk_overlap
+    for part in parts:
+        if not part:
+            continue
+        # Re-check one trailing char so separators split across pieces are found.
+        search_from = max(0, len(buffer) - 1)
+        buffer += part
+        # Start of the open paragraph; the buffer is trimmed once per piece, not per paragraph.
+        pos = 0
+        while (index := buffer.find(PARAGRAPH_SEPARATOR, search_from)) != -1:
+            yield from _finish_paragraph(
+                buffer[pos:index], base + pos, windowing=windowing, size=chunk_size, overlap=chunk_overlap
+            )
+            pos = search_from = index + len(PARAGRAPH_SEPARATOR)
+            windowing = False
+
+        # Flush windows of an open long paragraph once content extends past them.
+        content_end = len(buffer.rstrip())
+        cursor = pos
+        if not windowing:
+            while cursor < content_end and buffer[cursor].isspace():
+                cursor += 1
+        emitted = False
+        while content_end > cursor + chunk_size:
+            yield buffer[cursor : cursor + chunk_size], base + cursor, base + cursor + chunk_size
+            cursor += step
+            emitted = True
+        if emitted:
+            pos = cursor
+            windowing = True
+        buffer = buffer[pos:]
+        base += pos
+
+    yield from _finish_paragraph(buffer, base, windowing=windowing, size=chunk_size, overlap=chunk_overlap)
+
+
 def chunk_text(
     text: str,
     *,
@@ -26,14 +98,4 @@ def chunk_text(
     chunk_overlap: int = CHUNK_OVERLAP_CHARS,
 ) -> Iterable[tuple[str, int, int]]:
     # Prefer paragraph boundaries for readability; fall back to windows for long blocks.
-    paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-    cursor = 0
-    for paragraph in paragraphs:
-        if len(paragraph) <= chunk_size:
-            start = text.find(paragraph, cursor)
-            end = start + len(paragraph)
-            cursor = end
-            yield paragraph, start, end
-            continue
-        for chunk, start, end in _window_text(paragraph, chunk_size, chunk_overlap):
-            yield chunk, start, end
+    return iter_chunks([text], chunk_size=chunk_size, chunk_overlap=chunk_overlap)
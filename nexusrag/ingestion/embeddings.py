@@ -1,71 +1,122 @@
 from __future__ import annotations
 
+import abc
+import asyncio
 import hashlib
 import logging
-import math
 import re
-from typing import Any
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Any, Protocol, Sequence
 
 import httpx
+import numpy as np
 
 from nexusrag.core.config import EMBED_DIM, get_settings
 from nexusrag.core.errors import ProviderConfigError
+from nexusrag.services.caching import AsyncLRUCache
+from nexusrag.services.telemetry import record_external_call
 
 logger = logging.getLogger(__name__)
 
 _TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
+_OPENAI_EMBEDDINGS_URL = "https://api.openai.com/v1/embeddings"
+# Vertex rejects get_embeddings requests with more than 250 instances.
+_VERTEX_MAX_BATCH = 250
+# Distinct tokens memoised by the fake embedder; bounded so long-lived workers stay flat.
+_TOKEN_CACHE_SIZE = 65536
+# Per-entry bookkeeping (tuple key, ndarray header, LRU node) counted against the query cache ceiling.
+_QUERY_CACHE_ENTRY_OVERHEAD = 256
 
 
+@lru_cache(maxsize=_TOKEN_CACHE_SIZE)
 def _hash_token(token: str) -> tuple[int, float]:
-    digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    # Memoised: token frequencies are Zipfian, so most lookups skip the sha256.
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
     # Hash to a stable index within the fixed embedding dimension.
-    idx = int(digest[:8], 16) % EMBED_DIM
-    sign = 1.0 if int(digest[8:12], 16) % 2 == 0 else -1.0
-    magnitude = (int(digest[12:20], 16) % 1000) / 1000.0
+    # Byte slices match hex digits [:8], [8:12], and [12:20] of the hexdigest.
+    idx = int.from_bytes(digest[0:4], "big") % EMBED_DIM
+    sign = 1.0 if int.from_bytes(digest[4:6], "big") % 2 == 0 else -1.0
+    magnitude = (int.from_bytes(digest[6:10], "big") % 1000) / 1000.0
     return idx, sign * (0.2 + magnitude)
 
 
-def _embed_text_fake(text: str) -> list[float]:
-    """Deterministic hashed-bag-of-words embedding.
+def _embed_many_fake(texts: Sequence[str]) -> list[list[float]]:
+    """Deterministic hashed-bag-of-words embeddings for a batch of texts.
 
     NOT semantic: it captures lexical token overlap only (synonyms and
     paraphrases hash to unrelated buckets). It requires no credentials, so
     it is the default for local/dev/CI. Real semantic retrieval requires
     embedding_provider="vertex".
+
+    Bit-for-bit identical to summing token values per bucket and normalising
+    in plain Python: bincount and cumsum both accumulate sequentially in input
+    order, unlike pairwise-summing reductions.
     """
-    # Always allocate the full embedding dimension to match the DB schema.
-    vector = [0.0] * EMBED_DIM
-    tokens = _TOKEN_RE.findall(text.lower())
-    if not tokens:
-        return vector
+    if not texts:
+        return []
+    rows = len(texts)
+    # Flatten (row, bucket) into one index so the whole batch is a single bincount.
+    flat: list[int] = []
+    values: list[float] = []
+    for row, text in enumerate(texts):
+        offset = row * EMBED_DIM
+        for token in _TOKEN_RE.findall(text.lower()):
+            idx, value = _hash_token(token)
+            flat.append(offset + idx)
+            values.append(value)
+    matrix = np.bincount(
+        np.asarray(flat, dtype=np.intp),
+        weights=np.asarray(values, dtype=np.float64),
+        minlength=rows * EMBED_DIM,
+    ).reshape(rows, EMBED_DIM)
+    norms = np.sqrt(np.cumsum(matrix * matrix, axis=1)[:, -1])
+    # Rows without tokens stay all-zero instead of dividing by zero.
+    normalized = matrix / np.where(norms == 0, 1.0, norms)[:, None]
+    if normalized.shape[1] != EMBED_DIM:
+        # Defensive guard: retrieval expects a fixed-size vector.
+        raise ValueError("embedding dimension mismatch")
+    return normalized.tolist()
 
-    for token in tokens:
-        idx, value = _hash_token(token)
-        vector[idx] += value
 
-    norm = math.sqrt(sum(v * v for v in vector))
-    if norm == 0:
-        return vector
+def truncate_embedding(vector: Sequence[float], dim: int) -> list[float]:
+    """Shorten an embedding to its first `dim` components and rescale to unit length.
 
-    normalized = [v / norm for v in vector]
-    if len(normalized) != EMBED_DIM:
-        # Defensive guard: retrieval expects a fixed-size vector.
-        raise ValueError("embedding dimension mismatch")
-    return normalized
+    Matryoshka-trained models (OpenAI text-embedding-3, Vertex
+    text-embedding-004/005) front-load information, so a prefix is itself a
+    usable embedding; this matches what their `dimensions` /
+    `output_dimensionality` options return. Truncating here instead keeps one
+    native vector per text in the embedding cache for every corpus width. The
+    fake hashed-BoW vectors are not Matryoshka: a prefix simply drops the
+    tokens hashed past it.
+    """
+    if dim == len(vector):
+        return list(vector)
+    if not 0 < dim < len(vector):
+        raise ValueError(f"cannot truncate a {len(vector)}-dim embedding to {dim}")
+    head = np.asarray(vector[:dim], dtype=np.float64)
+    norm = float(np.sqrt(np.dot(head, head)))
+    # An all-zero prefix (e.g. a tokenless fake embedding) stays zero.
+    return (head / norm if norm else head).tolist()
+
+
+def _embed_text_fake(text: str) -> list[float]:
+    # Always allocate the full embedding dimension to match the DB schema.
+    return _embed_many_fake([text])[0]
 
 
-# Lazy, cached Vertex embedding model. init() + from_pretrained() are
-# expensive, so build once per process and reuse across calls.
-_vertex_model: Any = None
-_vertex_model_name: str | None = None
+# Lazy, cached Vertex embedding models keyed by name. init() + from_pretrained()
+# are expensive, so build once per process and reuse across calls; a corpus
+# mid-migration queries one model while its shadow generation embeds with another.
+_vertex_models: dict[str, Any] = {}
 
 
-def _get_vertex_model() -> Any:
-    global _vertex_model, _vertex_model_name
+def _get_vertex_model(model_name: str | None = None) -> Any:
     settings = get_settings()
     project = settings.google_cloud_project
     location = settings.google_cloud_location
-    model_name = settings.vertex_embedding_model
+    model_name = model_name or settings.vertex_embedding_model
     missing = []
     if not project:
         missing.append("GOOGLE_CLOUD_PROJECT")
@@ -75,8 +126,9 @@ def _get_vertex_model() -> Any:
         raise ProviderConfigError(
             f"Vertex embeddings config missing: set {', '.join(missing)} in .env."
         )
-    if _vertex_model is not None and _vertex_model_name == model_name:
-        return _vertex_model
+    cached = _vertex_models.get(model_name)
+    if cached is not None:
+        return cached
     try:
         from vertexai import init
         from vertexai.language_models import TextEmbeddingModel
@@ -85,9 +137,8 @@ def _get_vertex_model() -> Any:
             "Vertex AI SDK not available. Install google-cloud-aiplatform."
         ) from exc
     init(project=project, location=location)
-    _vertex_model = TextEmbeddingModel.from_pretrained(model_name)
-    _vertex_model_name = model_name
-    return _vertex_model
+    _vertex_models[model_name] = TextEmbeddingModel.from_pretrained(model_name)
+    return _vertex_models[model_name]
 
 
 def _embed_text_vertex(text: str) -> list[float]:
@@ -132,9 +183,9 @@ def _embed_text_openai(text: str) -> list[float]:
     if not api_key:
         raise ProviderConfigError("OPENAI_API_KEY is required for embedding_provider=openai.")
     try:
-        with httpx.Client(timeout=30.0) as client:
+        with httpx.Client(timeout=settings.embedding_timeout_s) as client:
             resp = client.post(
-                "https://api.openai.com/v1/embeddings",
+                _OPENAI_EMBEDDINGS_URL,
                 headers={"Authorization": f"Bearer {api_key}"},
                 json={
                     "model": settings.openai_embedding_model,
@@ -162,9 +213,10 @@ def embed_text(text: str) -> list[float]:
 
     Dispatches on settings.embedding_provider: "openai" or "vertex" for real
     semantic embeddings (each needs its own key/creds), otherwise the
-    deterministic hashed-bag-of-words fallback. Same signature for every caller
-    (ingestion + query-time retrieval), so flipping the provider needs no
-    call-site edits.
+    deterministic hashed-bag-of-words fallback. Blocking: async callers
+    (ingestion + query-time retrieval) use embed_texts / embed_query, which
+    batch through the same providers without stalling the event loop. This
+    sync path remains for scripts.
     """
     provider = (get_settings().embedding_provider or "fake").lower()
     if provider == "openai":
@@ -172,3 +224,288 @@ def embed_text(text: str) -> list[float]:
     if provider == "vertex":
         return _embed_text_vertex(text)
     return _embed_text_fake(text)
+
+
+class EmbeddingProvider(Protocol):
+    """Async batch embedding interface shared by ingestion and query-time retrieval.
+
+    Implementations return one EMBED_DIM vector per input text, in input order,
+    and raise (never fall back) on config, transport, or dimension errors.
+    """
+
+    name: str
+    model: str
+    # Whether vectors are worth persisting in the embedding cache (paid/remote providers).
+    cacheable: bool
+
+    async def embed_many(self, texts: Sequence[str]) -> list[list[float]]: ...
+
+
+class FakeEmbeddingProvider:
+    name = "fake"
+    model = "sha256-bow-v1"
+    # Hashing is cheaper than a cache round trip.
+    cacheable = False
+
+    async def embed_many(self, texts: Sequence[str]) -> list[list[float]]:
+        # Pure CPU and vectorised per batch; no I/O to overlap.
+        return _embed_many_fake(texts)
+
+
+class _BatchingEmbeddingProvider(abc.ABC):
+    """Split inputs into provider-sized batches and run them with bounded concurrency.
+
+    Subclasses implement _embed_batch for one provider request.
+    """
+
+    name = "batching"
+    cacheable = True
+    max_batch_size: int | None = None
+
+    def __init__(self, *, model: str, batch_size: int, max_concurrency: int) -> None:
+        self.model = model
+        if self.max_batch_size is not None:
+            batch_size = min(batch_size, self.max_batch_size)
+        self._batch_size = max(1, batch_size)
+        self._max_concurrency = max(1, max_concurrency)
+
+    async def embed_many(self, texts: Sequence[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        batches = [list(texts[i : i + self._batch_size]) for i in range(0, len(texts), self._batch_size)]
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def _run(batch: list[str]) -> list[list[float]]:
+            async with semaphore:
+                return await self._embed_batch(batch)
+
+        results = await asyncio.gather(*(_run(batch) for batch in batches))
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
+    @abc.abstractmethod
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed one batch of at most max_batch_size texts, in input order."""
+
+
+# One pooled AsyncClient per event loop keeps TLS connections warm across
+# queries and batches; httpx clients cannot be shared across loops.
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client, _http_client_loop
+    current_loop = asyncio.get_running_loop()
+    if _http_client is not None and _http_client_loop is current_loop and not _http_client.is_closed:
+        return _http_client
+    settings = get_settings()
+    _http_client = httpx.AsyncClient(
+        timeout=settings.embedding_timeout_s,
+        limits=httpx.Limits(
+            max_connections=max(1, settings.embedding_max_concurrency),
+            max_keepalive_connections=max(1, settings.embedding_max_concurrency),
+        ),
+    )
+    _http_client_loop = current_loop
+    return _http_client
+
+
+async def close_embedding_clients() -> None:
+    # Release pooled connections on shutdown; the next call lazily rebuilds.
+    global _http_client, _http_client_loop
+    client = _http_client
+    _http_client = None
+    _http_client_loop = None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+class OpenAIEmbeddingProvider(_BatchingEmbeddingProvider):
+    """OpenAI embeddings with array `input` batches over a pooled AsyncClient."""
+
+    name = "openai"
+
+    def __init__(self, *, api_key: str, model: str, batch_size: int, max_concurrency: int) -> None:
+        super().__init__(model=model, batch_size=batch_size, max_concurrency=max_concurrency)
+        self._api_key = api_key
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        started = time.monotonic()
+        success = False
+        try:
+            try:
+                resp = await _get_http_client().post(
+                    _OPENAI_EMBEDDINGS_URL,
+                    headers={"Authorization": f"Bearer {self._api_key}"},
+                    json={"model": self.model, "input": texts, "dimensions": EMBED_DIM},
+                )
+            except httpx.HTTPError as exc:
+                raise ProviderConfigError(f"OpenAI embeddings request failed: {exc}") from exc
+            if resp.status_code in {401, 403}:
+                raise ProviderConfigError("OpenAI embeddings auth error: check OPENAI_API_KEY.")
+            if resp.status_code >= 400:
+                raise ProviderConfigError(f"OpenAI embeddings error: HTTP {resp.status_code}")
+            # The API documents `index` per item; sort rather than trust response order.
+            data = sorted(resp.json()["data"], key=lambda item: item["index"])
+            if len(data) != len(texts):
+                raise ProviderConfigError(
+                    f"OpenAI embeddings returned {len(data)} vectors for {len(texts)} inputs"
+                )
+            vectors = [list(item["embedding"]) for item in data]
+            for values in vectors:
+                if len(values) != EMBED_DIM:
+                    raise ValueError(
+                        f"OpenAI embedding dim {len(values)} != EMBED_DIM {EMBED_DIM}; "
+                        f"openai_embedding_model must support dimensions={EMBED_DIM}."
+                    )
+            success = True
+            return vectors
+        finally:
+            record_external_call(
+                integration="embeddings.openai",
+                latency_ms=(time.monotonic() - started) * 1000.0,
+                success=success,
+            )
+
+
+class VertexEmbeddingProvider(_BatchingEmbeddingProvider):
+    """Vertex text-embedding batches via get_embeddings, run off the event loop."""
+
+    name = "vertex"
+    max_batch_size = _VERTEX_MAX_BATCH
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        started = time.monotonic()
+        success = False
+        try:
+            # Model init and the SDK call are blocking; keep both off the event loop.
+            model = await asyncio.to_thread(_get_vertex_model, self.model)
+            try:
+                result = await asyncio.to_thread(model.get_embeddings, texts)
+            except Exception as exc:  # noqa: BLE001 - surface as config error, never fall back to fake
+                raise ProviderConfigError(
+                    f"Vertex embeddings request failed (check creds + model access): {exc}"
+                ) from exc
+            if len(result) != len(texts):
+                raise ProviderConfigError(
+                    f"Vertex embeddings returned {len(result)} vectors for {len(texts)} inputs"
+                )
+            vectors = [list(item.values) for item in result]
+            for values in vectors:
+                if len(values) != EMBED_DIM:
+                    raise ValueError(
+                        f"Vertex embedding dim {len(values)} != EMBED_DIM {EMBED_DIM}; "
+                        f"pick a {EMBED_DIM}-dim vertex_embedding_model."
+                    )
+            success = True
+            return vectors
+        finally:
+            record_external_call(
+                integration="embeddings.vertex",
+                latency_ms=(time.monotonic() - started) * 1000.0,
+                success=success,
+            )
+
+
+def resolve_embedding_model(provider: str | None = None, model: str | None = None) -> tuple[str, str]:
+    """Fill in deployment defaults for a (provider, model) pair.
+
+    Corpora without a pinned retrieval.embedding block follow
+    settings.embedding_provider and its configured model; embedding
+    generations record the resolved pair so a later settings change cannot
+    silently move a corpus to another vector space.
+    """
+    settings = get_settings()
+    name = (provider or settings.embedding_provider or "fake").lower()
+    if name == "openai":
+        return name, model or settings.openai_embedding_model
+    if name == "vertex":
+        return name, model or settings.vertex_embedding_model
+    return "fake", FakeEmbeddingProvider.model
+
+
+def get_embedding_provider(provider: str | None = None, model: str | None = None) -> EmbeddingProvider:
+    """Build the async provider for (provider, model), defaulting to settings.
+
+    Mirrors embed_text's dispatch, including the no-silent-fallback contract:
+    a misconfigured real provider raises ProviderConfigError instead of
+    degrading to the fake lexical embedding.
+    """
+    settings = get_settings()
+    name, model_name = resolve_embedding_model(provider, model)
+    if name == "openai":
+        if not settings.openai_api_key:
+            raise ProviderConfigError("OPENAI_API_KEY is required for embedding_provider=openai.")
+        return OpenAIEmbeddingProvider(
+            api_key=settings.openai_api_key,
+            model=model_name,
+            batch_size=settings.embedding_batch_size,
+            max_concurrency=settings.embedding_max_concurrency,
+        )
+    if name == "vertex":
+        return VertexEmbeddingProvider(
+            model=model_name,
+            batch_size=settings.embedding_batch_size,
+            max_concurrency=settings.embedding_max_concurrency,
+        )
+    return FakeEmbeddingProvider()
+
+
+async def embed_texts(texts: Sequence[str]) -> list[list[float]]:
+    # Batch entry point for ingestion; order matches the input texts.
+    return await get_embedding_provider().embed_many(texts)
+
+
+def normalize_query_text(text: str) -> str:
+    # Collapse whitespace and Unicode forms so retries and trivially different
+    # spellings of the same question share a cache entry.
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def _query_entry_size(key: tuple[str, str, str], value: np.ndarray) -> int:
+    # Vector bytes plus the key text and a fixed allowance for container overhead.
+    return int(value.nbytes) + len(key[2]) + _QUERY_CACHE_ENTRY_OVERHEAD
+
+
+_query_cache: AsyncLRUCache[tuple[str, str, str], np.ndarray] | None = None
+
+
+def get_query_embedding_cache() -> AsyncLRUCache[tuple[str, str, str], np.ndarray]:
+    # Built lazily so QUERY_EMBEDDING_CACHE_* settings are read at first use.
+    global _query_cache
+    if _query_cache is None:
+        settings = get_settings()
+        _query_cache = AsyncLRUCache(
+            max_bytes=int(settings.query_embedding_cache_max_mb) * 1024 * 1024,
+            ttl_s=settings.query_embedding_cache_ttl_s,
+            size_of=_query_entry_size,
+        )
+    return _query_cache
+
+
+def reset_query_embedding_cache() -> None:
+    # Drop cached query vectors (tests, provider/model switches).
+    global _query_cache
+    _query_cache = None
+
+
+async def embed_query(text: str, provider: EmbeddingProvider | None = None) -> list[float]:
+    """Query-time entry point for retrieval.
+
+    Vectors are cached per (provider, model, normalised text) and concurrent
+    identical misses share one provider call. The normalised text is what gets
+    embedded, so a cached vector is always the one a miss would produce.
+    `provider` defaults to the deployment's; corpora pinned to an embedding
+    generation pass their own.
+    """
+    provider = provider or get_embedding_provider()
+    normalized = normalize_query_text(text)
+
+    async def _load() -> np.ndarray:
+        vectors = await provider.embed_many([normalized])
+        # float64 keeps cached values identical to uncached ones at a quarter of list overhead.
+        return np.asarray(vectors[0], dtype=np.float64)
+
+    vector = await get_query_embedding_cache().get_or_load((provider.name, provider.model, normalized), _load)
+    # Hand out a fresh list so callers can never mutate the cached vector.
+    return vector.tolist()
@@ -1,3 +1,430 @@
 from __future__ import annotations
 
-# Placeholder for future document loaders.
+import asyncio
+import csv
+import io
+import multiprocessing
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from xml.etree import ElementTree
+
+# pypdf is an optional dependency (installed via the `loaders` extra); without
+# it the PDF loader stays registered but reports itself unavailable.
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover
+    PdfReader = None  # type: ignore[assignment,misc]
+
+from nexusrag.core.config import get_settings
+from nexusrag.ingestion.streaming import READ_CHUNK_CHARS, iter_text_file
+
+# Blocks are joined with the chunker's paragraph separator so chunks never span two blocks.
+BLOCK_SEPARATOR = "\n\n"
+# Upper bound on the inflated DOCX body; guards the worker against zip bombs.
+MAX_DOCX_XML_BYTES = 64 * 1024 * 1024
+
+
+class DocumentExtractionError(ValueError):
+    """The source could not be parsed; ingestion fails without retrying."""
+
+
+class LoaderUnavailableError(DocumentExtractionError):
+    """The loader's optional parser is not installed in this process."""
+
+
+@dataclass(frozen=True)
+class SourceSpan:
+    # Text offsets [start, end) that share one location, e.g. {"page": 3} or {"section": "Intro"}.
+    start: int
+    end: int
+    location: dict[str, Any]
+
+
+@dataclass
+class ExtractedDocument:
+    text: str
+    spans: list[SourceSpan] = field(default_factory=list)
+
+    def locate(self, start: int, end: int) -> dict[str, Any]:
+        """Location of the block holding `start`; `page_end`/`row_end` when the range crosses into later ones."""
+        return _locate(self.spans, start, end)
+
+
+@dataclass
+class SpooledDocument:
+    # Extracted text left in a file by the pool process; only the spans cross the process boundary.
+    path: Path
+    spans: list[SourceSpan] = field(default_factory=list)
+
+    def iter_text(self, *, chunk_chars: int = READ_CHUNK_CHARS) -> Iterator[str]:
+        # newline="" keeps carriage returns, so offsets line up with the spans.
+        return iter_text_file(self.path, chunk_chars=chunk_chars, newline="")
+
+    def locate(self, start: int, end: int) -> dict[str, Any]:
+        return _locate(self.spans, start, end)
+
+
+def _locate(spans: list[SourceSpan], start: int, end: int) -> dict[str, Any]:
+    first = _span_at(spans, start)
+    if first is None:
+        return {}
+    location = dict(first.location)
+    last = _span_at(spans, max(start, end - 1))
+    if last is not None and last is not first:
+        for key in ("page", "row"):
+            if key in location and last.location.get(key) != location[key]:
+                location[f"{key}_end"] = last.location.get(key)
+    return location
+
+
+def _span_at(spans: list[SourceSpan], offset: int) -> SourceSpan | None:
+    # Spans are sorted and disjoint; offsets in a separator resolve to the next span.
+    low, high = 0, len(spans)
+    while low < high:
+        mid = (low + high) // 2
+        if spans[mid].end <= offset:
+            low = mid + 1
+        else:
+            high = mid
+    return spans[low] if low < len(spans) else None
+
+
+class _TextBuilder:
+    # Accumulates blocks and the spans locating them, merging neighbours at the same location.
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._length = 0
+        self.spans: list[SourceSpan] = []
+
+    def add(self, block: str, location: dict[str, Any]) -> None:
+        block = block.strip()
+        if not block:
+            return
+        if self._parts:
+            self._parts.append(BLOCK_SEPARATOR)
+            self._length += len(BLOCK_SEPARATOR)
+        start = self._length
+        self._parts.append(block)
+        self._length += len(block)
+        if self.spans and self.spans[-1].location == location:
+            self.spans[-1] = SourceSpan(self.spans[-1].start, self._length, location)
+        else:
+            self.spans.append(SourceSpan(start, self._length, location))
+
+    def build(self) -> ExtractedDocument:
+        return ExtractedDocument(text="".join(self._parts), spans=self.spans)
+
+
+def extract_pdf(data: bytes) -> ExtractedDocument:
+    # One block per page; chunks cite the 1-based page they start on.
+    if PdfReader is None:
+        raise LoaderUnavailableError("PDF extraction requires the pypdf package")
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        if reader.is_encrypted:
+            raise DocumentExtractionError("Encrypted PDFs are not supported")
+        builder = _TextBuilder()
+        for number, page in enumerate(reader.pages, start=1):
+            builder.add(page.extract_text() or "", {"page": number})
+    except DocumentExtractionError:
+        raise
+    except Exception as exc:  # noqa: BLE001 - pypdf raises assorted types on malformed input
+        raise DocumentExtractionError("PDF could not be parsed") from exc
+    return builder.build()
+
+
+_HTML_SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "title", "svg"})
+_HTML_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption",
+        "figure", "footer", "form", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+        "section", "table", "tr", "ul",
+    }
+)
+_HTML_HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+
+
+class _HTMLTextParser(HTMLParser):
+    # Emits one block per block-level element; headings open the section later blocks cite.
+    def __init__(self, builder: _TextBuilder) -> None:
+        super().__init__(convert_charrefs=True)
+        self._builder = builder
+        self._parts: list[str] = []
+        self._skip = 0
+        self._pre = 0
+        self._heading = False
+        self._section: str | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _HTML_SKIP_TAGS:
+            self._skip += 1
+        elif tag in _HTML_BLOCK_TAGS or tag in _HTML_HEADING_TAGS:
+            self._flush()
+            self._heading = tag in _HTML_HEADING_TAGS
+            if tag == "pre":
+                self._pre += 1
+        elif tag in {"td", "th"} and self._parts:
+            # Cells of one table row share a block.
+            self._parts.append(" | ")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _HTML_SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _HTML_BLOCK_TAGS or tag in _HTML_HEADING_TAGS:
+            self._flush()
+            if tag == "pre":
+                self._pre = max(0, self._pre - 1)
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip:
+            self._parts.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+    def _flush(self) -> None:
+        raw = "".join(self._parts)
+        self._parts = []
+        block = raw.strip("\n") if self._pre else " ".join(raw.split())
+        if self._heading and block:
+            self._section = block
+        self._heading = False
+        self._builder.add(block, {"section": self._section} if self._section else {})
+
+
+def extract_html(data: bytes) -> ExtractedDocument:
+    builder = _TextBuilder()
+    parser = _HTMLTextParser(builder)
+    parser.feed(data.decode("utf-8", errors="ignore"))
+    parser.close()
+    return builder.build()
+
+
+def _csv_column(names: list[str], index: int) -> str:
+    # Cells past the header, or under a blank header, are named by position.
+    return names[index] if index < len(names) and names[index] else f"column {index + 1}"
+
+
+def extract_csv(data: bytes) -> ExtractedDocument:
+    # One block per record rendered as "column: value" pairs so each chunk is self-describing.
+    # Rows are numbered as a spreadsheet shows them: the header is row 1.
+    content = data.decode("utf-8-sig", errors="ignore")
+    try:
+        dialect: Any = csv.Sniffer().sniff(content[:4096], delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+    builder = _TextBuilder()
+    try:
+        reader = csv.reader(io.StringIO(content), dialect)
+        header = next(reader, None)
+        if header is None:
+            return builder.build()
+        names = [name.strip() for name in header]
+        for number, record in enumerate(reader, start=2):
+            fields = [
+                f"{_csv_column(names, index)}: {value.strip()}" for index, value in enumerate(record) if value.strip()
+            ]
+            builder.add("; ".join(fields), {"row": number})
+    except csv.Error as exc:
+        raise DocumentExtractionError(f"CSV could not be parsed: {exc}") from exc
+    return builder.build()
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_HEADING_STYLE = re.compile(r"^(title|heading\s*\d+)$", re.IGNORECASE)
+
+
+def _docx_paragraph(paragraph: ElementTree.Element) -> tuple[str, int, bool]:
+    # Returns (text, page breaks, whether a break came before any text).
+    parts: list[str] = []
+    breaks = 0
+    leading = False
+    for node in paragraph.iter():
+        if node.tag == f"{_W}t" and node.text:
+            parts.append(node.text)
+        elif node.tag == f"{_W}tab":
+            parts.append("\t")
+        elif node.tag == f"{_W}lastRenderedPageBreak" or (
+            node.tag == f"{_W}br" and node.get(f"{_W}type") == "page"
+        ):
+            breaks += 1
+            leading = leading or not "".join(parts).strip()
+    return "".join(parts), breaks, leading
+
+
+def extract_docx(data: bytes) -> ExtractedDocument:
+    # Heading and Title styles open sections. Pages come from the page-break markers
+    # Word saves; files without any stay section-only rather than claiming page 1.
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            if archive.getinfo("word/document.xml").file_size > MAX_DOCX_XML_BYTES:
+                raise DocumentExtractionError("DOCX body is too large to extract")
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+    except DocumentExtractionError:
+        raise
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise DocumentExtractionError("DOCX could not be parsed") from exc
+    body = root.find(f"{_W}body")
+    blocks: list[tuple[str, int, str | None]] = []
+    page = 1
+    section: str | None = None
+    for element in body if body is not None else ():
+        if element.tag == f"{_W}p":
+            text, breaks, leading = _docx_paragraph(element)
+            if leading:
+                page += 1
+                breaks -= 1
+            style = element.find(f"{_W}pPr/{_W}pStyle")
+            if style is not None and _DOCX_HEADING_STYLE.match(style.get(f"{_W}val", "")) and text.strip():
+                section = text.strip()
+            blocks.append((text, page, section))
+            page += breaks
+        elif element.tag == f"{_W}tbl":
+            rows = [
+                " | ".join(_docx_paragraph(cell)[0].strip() for cell in row.iter(f"{_W}tc"))
+                for row in element.iter(f"{_W}tr")
+            ]
+            blocks.append(("\n".join(rows), page, section))
+    paged = page > 1
+    builder = _TextBuilder()
+    for text, block_page, block_section in blocks:
+        location: dict[str, Any] = {"page": block_page} if paged else {}
+        if block_section:
+            location["section"] = block_section
+        builder.add(text, location)
+    return builder.build()
+
+
+@dataclass(frozen=True)
+class DocumentLoader:
+    # `extract` must be a module-level function: it is pickled by reference into pool processes.
+    name: str
+    content_types: tuple[str, ...]
+    extension: str
+    extract: Callable[[bytes], ExtractedDocument]
+    available: bool = True
+
+
+_LOADERS: dict[str, DocumentLoader] = {}
+
+
+def register_loader(loader: DocumentLoader) -> None:
+    # Later registrations replace earlier ones for the same name.
+    _LOADERS[loader.name] = loader
+
+
+def _normalize_content_type(content_type: str | None) -> str:
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def loader_for_content_type(content_type: str | None) -> DocumentLoader | None:
+    normalized = _normalize_content_type(content_type)
+    for loader in _LOADERS.values():
+        if normalized in loader.content_types:
+            return loader
+    return None
+
+
+def loader_for_path(path: str | Path) -> DocumentLoader | None:
+    # Stored sources keep their loader's extension, so workers resolve the format without a DB read.
+    suffix = Path(path).suffix.lstrip(".").lower()
+    for loader in _LOADERS.values():
+        if suffix == loader.extension:
+            return loader
+    return None
+
+
+def list_loaders() -> list[DocumentLoader]:
+    return list(_LOADERS.values())
+
+
+register_loader(
+    DocumentLoader("pdf", ("application/pdf",), "pdf", extract_pdf, available=PdfReader is not None)
+)
+register_loader(DocumentLoader("html", ("text/html", "application/xhtml+xml"), "html", extract_html))
+register_loader(
+    DocumentLoader(
+        "docx",
+        ("application/vnd.openxmlformats-officedocument.wordprocessingml.document",),
+        "docx",
+        extract_docx,
+    )
+)
+register_loader(DocumentLoader("csv", ("text/csv", "application/csv"), "csv", extract_csv))
+
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    processes = get_settings().ingest_loader_processes
+    if processes < 1:
+        return None
+    if _pool is None:
+        # Spawned children never inherit the parent's event loop, sockets or DB pool.
+        _pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_loader_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _extract_path(extract: Callable[[bytes], ExtractedDocument], path: str) -> ExtractedDocument:
+    # Runs in the pool process; reading the file there keeps large sources out of the pickle.
+    return extract(Path(path).read_bytes())
+
+
+def _spool_path(extract: Callable[[bytes], ExtractedDocument], path: str, spool_path: str) -> list[SourceSpan]:
+    # Runs in the pool process; the text goes to disk so the caller never holds it whole.
+    extracted = _extract_path(extract, path)
+    with open(spool_path, "w", encoding="utf-8", newline="") as handle:
+        handle.write(extracted.text)
+    return extracted.spans
+
+
+async def _run_extraction(loader: DocumentLoader, path: str | Path, func: Callable[..., Any], *args: Any) -> Any:
+    if not Path(path).is_file():
+        raise FileNotFoundError(str(path))
+    if not loader.available:
+        raise LoaderUnavailableError(f"{loader.name} extraction is not available on this worker")
+    pool = _get_pool()
+    if pool is None:
+        return await asyncio.to_thread(func, loader.extract, str(path), *args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, loader.extract, str(path), *args)
+    except BrokenProcessPool:
+        shutdown_loader_pool()
+        raise
+
+
+async def extract_file(loader: DocumentLoader, path: str | Path) -> ExtractedDocument:
+    """Extract a stored source in the loader process pool, off the caller's event loop.
+
+    With ingest_loader_processes = 0 extraction runs on a thread instead, which
+    still frees the loop but shares the GIL with it. A crashed pool process
+    raises BrokenProcessPool (a RuntimeError, so the job retries) and the pool
+    is recreated on the next call.
+    """
+    return await _run_extraction(loader, path, _extract_path)
+
+
+async def spool_file(loader: DocumentLoader, path: str | Path, spool_path: str | Path) -> SpooledDocument:
+    """Extract like extract_file, but write the text to spool_path instead of returning it.
+
+    Ingestion streams the spooled text to the chunker in bounded pieces; the
+    caller owns spool_path and removes it when done.
+    """
+    spans = await _run_extraction(loader, path, _spool_path, str(spool_path))
+    return SpooledDocument(path=Path(spool_path), spans=spans)
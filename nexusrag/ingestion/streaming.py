@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Characters decoded per read; bounds the chunker's buffer for huge source files.
+READ_CHUNK_CHARS = 1 << 20
+_DONE = object()
+
+
+def iter_text_file(
+    path: str | Path, *, chunk_chars: int = READ_CHUNK_CHARS, newline: str | None = None
+) -> Iterator[str]:
+    # Incremental text-mode reads let the codec handle UTF-8 sequences split across reads.
+    with open(path, encoding="utf-8", newline=newline) as handle:
+        while piece := handle.read(chunk_chars):
+            yield piece
+
+
+async def prefetch_batches(
+    items: Iterable[T],
+    *,
+    batch_size: int,
+    max_pending: int = 1,
+) -> AsyncIterator[list[T]]:
+    """Pull batches from a blocking iterable on a worker thread.
+
+    The producer runs at most max_pending batches ahead of the consumer: a
+    bounded queue applies backpressure, so reading and chunking the next batch
+    overlaps with embedding and writing the current one without buffering the
+    whole source.
+    """
+    iterator = iter(items)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_pending))
+
+    def _next_batch() -> list[T]:
+        return list(islice(iterator, batch_size))
+
+    async def _produce() -> None:
+        try:
+            while batch := await asyncio.to_thread(_next_batch):
+                await queue.put(batch)
+            await queue.put(_DONE)
+        except Exception as exc:  # noqa: BLE001 - re-raised on the consumer side
+            await queue.put(exc)
+
+    producer = asyncio.create_task(_produce())
+    try:
+        while (item := await queue.get()) is not _DONE:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Stop reading ahead when the consumer fails or exits early.
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
@@ -0,0 +1,32 @@
+"""add hnsw index on chunks.embedding
+
+Revision ID: 0033_chunks_embedding_hnsw
+Revises: 0032_benchmark_runs
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0033_chunks_embedding_hnsw"
+down_revision = "0032_benchmark_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build the ANN index without blocking chunk writes; CONCURRENTLY cannot run
+    # inside a transaction, so step out of Alembic's migration transaction.
+    # Cosine ops match LocalPgVectorRetriever's cosine_distance ordering.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chunks_embedding_hnsw "
+            "ON chunks USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chunks_embedding_hnsw")
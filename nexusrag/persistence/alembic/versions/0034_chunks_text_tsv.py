@@ -0,0 +1,36 @@
+"""add generated tsvector column on chunks for hybrid retrieval
+
+Revision ID: 0034_chunks_text_tsv
+Revises: 0033_chunks_embedding_hnsw
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0034_chunks_text_tsv"
+down_revision = "0033_chunks_embedding_hnsw"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Stored generated column keeps the lexical vector in sync with chunk text
+    # without touching ingestion; the config must match LocalPgVectorRetriever.
+    op.execute(
+        "ALTER TABLE chunks ADD COLUMN IF NOT EXISTS text_tsv tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', text)) STORED"
+    )
+    # Build the GIN index without blocking writes once the column exists.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chunks_text_tsv "
+            "ON chunks USING gin (text_tsv)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chunks_text_tsv")
+    op.execute("ALTER TABLE chunks DROP COLUMN IF EXISTS text_tsv")
@@ -0,0 +1,40 @@
+"""add embedding_cache table
+
+Revision ID: 0035_embedding_cache
+Revises: 0034_chunks_text_tsv
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from pgvector.sqlalchemy import Vector
+
+from nexusrag.core.config import EMBED_DIM
+
+revision = "0035_embedding_cache"
+down_revision = "0034_chunks_text_tsv"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Content-addressed vectors keyed by provider/model/text hash so reindexing
+    # unchanged text never pays for a second embedding call.
+    op.create_table(
+        "embedding_cache",
+        sa.Column("provider", sa.String(), primary_key=True),
+        sa.Column("model", sa.String(), primary_key=True),
+        sa.Column("text_sha256", sa.String(length=64), primary_key=True),
+        sa.Column("embedding", Vector(EMBED_DIM), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    # Eviction scans oldest-first by last use.
+    op.create_index("ix_embedding_cache_last_used_at", "embedding_cache", ["last_used_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_embedding_cache_last_used_at", table_name="embedding_cache")
+    op.drop_table("embedding_cache")
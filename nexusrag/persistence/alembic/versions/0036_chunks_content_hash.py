@@ -0,0 +1,26 @@
+"""add content_hash to chunks for incremental reindexing
+
+Revision ID: 0036_chunks_content_hash
+Revises: 0035_embedding_cache
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0036_chunks_content_hash"
+down_revision = "0035_embedding_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable with no backfill: rewriting every chunk row would churn the vector
+    # index, and incremental reindex hashes legacy rows in SQL when it meets them.
+    op.add_column("chunks", sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("chunks", "content_hash")
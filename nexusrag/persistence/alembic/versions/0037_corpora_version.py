@@ -0,0 +1,37 @@
+"""add corpus_version to corpora for retrieval cache invalidation
+
+Revision ID: 0037_corpora_version
+Revises: 0036_chunks_content_hash
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0037_corpora_version"
+down_revision = "0036_chunks_content_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Versions come from one shared sequence rather than a per-row counter, so a
+    # corpus deleted and recreated under the same id can never reuse a version
+    # that cached retrieval results were keyed on.
+    op.execute("CREATE SEQUENCE IF NOT EXISTS corpora_version_seq")
+    op.add_column(
+        "corpora",
+        sa.Column(
+            "corpus_version",
+            sa.BigInteger(),
+            nullable=False,
+            server_default=sa.text("nextval('corpora_version_seq')"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("corpora", "corpus_version")
+    op.execute("DROP SEQUENCE IF EXISTS corpora_version_seq")
@@ -0,0 +1,42 @@
+"""add quantised hnsw indexes on chunks.embedding
+
+Revision ID: 0038_chunks_quantized_hnsw
+Revises: 0037_corpora_version
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+from nexusrag.core.config import EMBED_DIM
+
+revision = "0038_chunks_quantized_hnsw"
+down_revision = "0037_corpora_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # halfvec and binary_quantize need pgvector >= 0.7; pick up the image's newer extension.
+    op.execute("ALTER EXTENSION vector UPDATE")
+    # Expression indexes quantise on the fly, so the heap keeps a single full-precision
+    # copy for re-ranking while the first pass walks a 2x (halfvec) or 32x (bit) smaller
+    # graph. The expressions must match LocalPgVectorRetriever's ORDER BY exactly.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chunks_embedding_halfvec_hnsw "
+            f"ON chunks USING hnsw ((embedding::halfvec({EMBED_DIM})) halfvec_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chunks_embedding_bq_hnsw "
+            f"ON chunks USING hnsw ((binary_quantize(embedding)::bit({EMBED_DIM})) bit_hamming_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chunks_embedding_bq_hnsw")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chunks_embedding_halfvec_hnsw")
@@ -0,0 +1,93 @@
+"""move document-level metadata off chunk rows onto documents
+
+Revision ID: 0039_chunks_document_metadata
+Revises: 0038_chunks_quantized_hnsw
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import logging
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0039_chunks_document_metadata"
+down_revision = "0038_chunks_quantized_hnsw"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Keys ingestion used to copy from the documents row into every chunk.
+_DOCUMENT_KEYS = "ARRAY['filename', 'content_type', 'document_metadata']"
+
+
+def _metadata_sizes() -> tuple[int, int]:
+    # Stored (post-TOAST-compression) bytes of chunks.metadata_json, plus the whole relation.
+    row = op.get_bind().execute(
+        sa.text(
+            "SELECT COALESCE(SUM(pg_column_size(metadata_json)), 0), pg_total_relation_size('chunks') FROM chunks"
+        )
+    ).one()
+    return int(row[0]), int(row[1])
+
+
+def upgrade() -> None:
+    column_before, relation_before = _metadata_sizes()
+    # Backfill: documents whose own metadata is empty adopt the copy their first chunk carried.
+    op.execute(
+        """
+        UPDATE documents AS d
+        SET metadata_json = c.metadata_json -> 'document_metadata'
+        FROM (
+            SELECT DISTINCT ON (document_id) document_id, metadata_json
+            FROM chunks
+            WHERE document_id IS NOT NULL AND metadata_json ? 'document_metadata'
+            ORDER BY document_id, chunk_index
+        ) AS c
+        WHERE d.id = c.document_id AND (d.metadata_json IS NULL OR d.metadata_json = '{}'::jsonb)
+        """
+    )
+    # Dedupe: chunks with a documents row keep only chunk-local keys (offsets);
+    # retrieval joins the document fields back for its top_k rows.
+    result = op.get_bind().execute(
+        sa.text(
+            f"""
+            UPDATE chunks AS c
+            SET metadata_json = c.metadata_json - {_DOCUMENT_KEYS}
+            FROM documents AS d
+            WHERE d.id = c.document_id AND c.metadata_json ?| {_DOCUMENT_KEYS}
+            """
+        )
+    )
+    column_after, relation_after = _metadata_sizes()
+    saved = column_before - column_after
+    logger.info(
+        "chunks.metadata_json deduplicated: rows=%d bytes %d -> %d (saved %d, %.1f%%); "
+        "chunks relation %d -> %d bytes until VACUUM reclaims the old row versions",
+        result.rowcount or 0,
+        column_before,
+        column_after,
+        saved,
+        100.0 * saved / column_before if column_before else 0.0,
+        relation_before,
+        relation_after,
+    )
+
+
+def downgrade() -> None:
+    # Restore the per-chunk copies older releases read directly from chunk rows.
+    op.execute(
+        """
+        UPDATE chunks AS c
+        SET metadata_json = jsonb_build_object('filename', d.filename, 'content_type', d.content_type)
+            || c.metadata_json
+            || CASE
+                WHEN d.metadata_json IS NULL OR d.metadata_json = '{}'::jsonb THEN '{}'::jsonb
+                ELSE jsonb_build_object('document_metadata', d.metadata_json)
+            END
+        FROM documents AS d
+        WHERE d.id = c.document_id
+        """
+    )
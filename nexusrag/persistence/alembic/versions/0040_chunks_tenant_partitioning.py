@@ -0,0 +1,119 @@
+"""add tenant_id to chunks and optional LIST partitioning by corpus
+
+Revision ID: 0040_chunks_tenant_partitioning
+Revises: 0039_chunks_document_metadata
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+from nexusrag.core.config import EMBED_DIM, get_settings
+from nexusrag.persistence.repos.chunks import DEFAULT_PARTITION
+
+revision = "0040_chunks_tenant_partitioning"
+down_revision = "0039_chunks_document_metadata"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = (
+    "id, tenant_id, corpus_id, document_id, document_uri, chunk_index, text, "
+    "content_hash, embedding, metadata_json, created_at"
+)
+# Every index chunks carries after 0038. On a partitioned parent each one is
+# created per partition, including partitions added later for new corpora.
+_INDEXES = (
+    "CREATE INDEX ix_chunks_corpus_id ON chunks (corpus_id)",
+    "CREATE INDEX ix_chunks_document_id ON chunks (document_id)",
+    "CREATE INDEX ix_chunks_tenant_id_corpus_id ON chunks (tenant_id, corpus_id)",
+    "CREATE INDEX ix_chunks_text_tsv ON chunks USING gin (text_tsv)",
+    "CREATE INDEX ix_chunks_embedding_hnsw ON chunks USING hnsw (embedding vector_cosine_ops) "
+    "WITH (m = 16, ef_construction = 64)",
+    "CREATE INDEX ix_chunks_embedding_halfvec_hnsw "
+    f"ON chunks USING hnsw ((embedding::halfvec({EMBED_DIM})) halfvec_cosine_ops) "
+    "WITH (m = 16, ef_construction = 64)",
+    "CREATE INDEX ix_chunks_embedding_bq_hnsw "
+    f"ON chunks USING hnsw ((binary_quantize(embedding)::bit({EMBED_DIM})) bit_hamming_ops) "
+    "WITH (m = 16, ef_construction = 64)",
+)
+_INDEX_NAMES = tuple(statement.split()[2] for statement in _INDEXES)
+# Must match chunks_repo.corpus_partition_name so runtime DDL finds migrated partitions.
+_PARTITION_NAME_SQL = "'chunks_c_' || left(encode(sha256(convert_to(cid, 'UTF8')), 'hex'), 24)"
+
+
+def _is_partitioned() -> bool:
+    result = op.get_bind().execute(
+        sa.text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('chunks'))")
+    )
+    return bool(result.scalar())
+
+
+def _rebuild(*, partitioned: bool) -> None:
+    # Partitioning cannot be switched on in place: build the new table, copy, swap.
+    # Holds an exclusive lock on chunks for the copy, so run it in a maintenance window.
+    op.execute("ALTER TABLE chunks RENAME TO chunks_old")
+    # Free the constraint and index names for the new table.
+    op.execute("ALTER TABLE chunks_old DROP CONSTRAINT IF EXISTS fk_chunks_document_id")
+    op.execute("ALTER TABLE chunks_old DROP CONSTRAINT IF EXISTS chunks_pkey")
+    for name in _INDEX_NAMES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    layout = " PARTITION BY LIST (corpus_id)" if partitioned else ""
+    op.execute(f"CREATE TABLE chunks (LIKE chunks_old INCLUDING DEFAULTS INCLUDING GENERATED){layout}")
+    # Unique constraints on a partitioned table must include the partition key.
+    op.execute(f"ALTER TABLE chunks ADD PRIMARY KEY ({'id, corpus_id' if partitioned else 'id'})")
+    op.execute(
+        "ALTER TABLE chunks ADD CONSTRAINT fk_chunks_document_id "
+        "FOREIGN KEY (document_id) REFERENCES documents (id)"
+    )
+    if partitioned:
+        op.execute(
+            f"""
+            DO $$
+            DECLARE cid text;
+            BEGIN
+                FOR cid IN SELECT id FROM corpora UNION SELECT DISTINCT corpus_id FROM chunks_old LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF chunks FOR VALUES IN (%L)', {_PARTITION_NAME_SQL}, cid
+                    );
+                END LOOP;
+            END $$
+            """
+        )
+        op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF chunks DEFAULT")
+    op.execute(f"INSERT INTO chunks ({_COLUMNS}) SELECT {_COLUMNS} FROM chunks_old")
+    # Indexes are built after the copy, which is far cheaper than maintaining them per row.
+    for statement in _INDEXES:
+        op.execute(statement)
+    op.execute("DROP TABLE chunks_old")
+
+
+def upgrade() -> None:
+    op.add_column("chunks", sa.Column("tenant_id", sa.String(), nullable=True))
+    op.execute(
+        "UPDATE chunks AS c SET tenant_id = co.tenant_id FROM corpora AS co WHERE co.id = c.corpus_id"
+    )
+    # Rows whose corpus row is gone can still be attributed through their document.
+    op.execute(
+        "UPDATE chunks AS c SET tenant_id = d.tenant_id FROM documents AS d "
+        "WHERE c.tenant_id IS NULL AND d.id = c.document_id"
+    )
+    if get_settings().chunks_partition_by_corpus:
+        _rebuild(partitioned=True)
+    else:
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chunks_tenant_id_corpus_id "
+                "ON chunks (tenant_id, corpus_id)"
+            )
+
+
+def downgrade() -> None:
+    if _is_partitioned():
+        _rebuild(partitioned=False)
+        op.execute("DROP INDEX IF EXISTS ix_chunks_tenant_id_corpus_id")
+    else:
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chunks_tenant_id_corpus_id")
+    op.drop_column("chunks", "tenant_id")
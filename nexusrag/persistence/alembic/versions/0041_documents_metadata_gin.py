@@ -0,0 +1,32 @@
+"""add a jsonb_path_ops GIN index for retrieval metadata filters
+
+Revision ID: 0041_documents_metadata_gin
+Revises: 0040_chunks_tenant_partitioning
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0041_documents_metadata_gin"
+down_revision = "0040_chunks_tenant_partitioning"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # hnsw.iterative_scan, used for filtered ANN queries, needs pgvector >= 0.8.
+    op.execute("ALTER EXTENSION vector UPDATE")
+    # jsonb_path_ops serves the @> and @? operators retrieval filters compile to,
+    # at a fraction of the default jsonb_ops index size.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_metadata_json_path "
+            "ON documents USING gin (metadata_json jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_documents_metadata_json_path")
@@ -0,0 +1,55 @@
+"""add truncated-dimension embedding columns and hnsw indexes on chunks
+
+Revision ID: 0042_chunks_embedding_dims
+Revises: 0041_documents_metadata_gin
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from pgvector.sqlalchemy import Vector
+
+from nexusrag.core.config import EMBED_DIM, SUPPORTED_EMBED_DIMS
+
+revision = "0042_chunks_embedding_dims"
+down_revision = "0041_documents_metadata_gin"
+branch_labels = None
+depends_on = None
+
+_DIMS = tuple(dim for dim in SUPPORTED_EMBED_DIMS if dim != EMBED_DIM)
+
+
+def _is_partitioned() -> bool:
+    result = op.get_bind().execute(
+        sa.text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('chunks'))")
+    )
+    return bool(result.scalar())
+
+
+def upgrade() -> None:
+    # Nullable columns are a catalog-only change; only corpora with a matching
+    # retrieval.embedding_dim fill them, and their chunks leave `embedding` NULL,
+    # so each corpus stores one vector per chunk at its own width.
+    for dim in _DIMS:
+        op.add_column("chunks", sa.Column(f"embedding_{dim}", Vector(dim), nullable=True))
+    # A partitioned parent cannot build indexes CONCURRENTLY; the plain build
+    # cascades to every partition (and to partitions created later).
+    concurrently = "" if _is_partitioned() else "CONCURRENTLY "
+    with op.get_context().autocommit_block():
+        for dim in _DIMS:
+            op.execute(
+                f"CREATE INDEX {concurrently}IF NOT EXISTS ix_chunks_embedding_{dim}_hnsw "
+                f"ON chunks USING hnsw (embedding_{dim} vector_cosine_ops) "
+                "WITH (m = 16, ef_construction = 64)"
+            )
+
+
+def downgrade() -> None:
+    concurrently = "" if _is_partitioned() else "CONCURRENTLY "
+    with op.get_context().autocommit_block():
+        for dim in _DIMS:
+            op.execute(f"DROP INDEX {concurrently}IF EXISTS ix_chunks_embedding_{dim}_hnsw")
+    for dim in _DIMS:
+        op.drop_column("chunks", f"embedding_{dim}")
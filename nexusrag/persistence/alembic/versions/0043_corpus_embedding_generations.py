@@ -0,0 +1,69 @@
+"""add corpus embedding generations and shadow vectors
+
+Revision ID: 0043_corpus_embedding_generations
+Revises: 0042_chunks_embedding_dims
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from pgvector.sqlalchemy import Vector
+from sqlalchemy.dialects import postgresql
+
+revision = "0043_corpus_embedding_generations"
+down_revision = "0042_chunks_embedding_dims"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One row per embedding space a corpus has been (or is being) indexed in.
+    # Mirrors CorpusEmbeddingGeneration in nexusrag/domain/models.py.
+    op.create_table(
+        "corpus_embedding_generations",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("tenant_id", sa.String(), nullable=False),
+        sa.Column("corpus_id", sa.String(), nullable=False),
+        sa.Column("generation", sa.Integer(), nullable=False),
+        sa.Column("provider", sa.String(), nullable=False),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("embedding_dim", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("chunks_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunks_embedded", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("activated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("retired_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("corpus_id", "generation", name="uq_corpus_embedding_generations_generation"),
+    )
+    op.create_index(
+        "ix_corpus_embedding_generations_tenant_id", "corpus_embedding_generations", ["tenant_id"]
+    )
+    op.create_index(
+        "ix_corpus_embedding_generations_corpus_id", "corpus_embedding_generations", ["corpus_id"]
+    )
+    # Shadow vectors are only ever joined by (generation_id, chunk_id), so the
+    # primary key is the one index; no ANN index is built on them.
+    op.create_table(
+        "chunk_embedding_shadows",
+        sa.Column(
+            "generation_id",
+            sa.String(),
+            sa.ForeignKey("corpus_embedding_generations.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("chunk_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("corpus_id", sa.String(), nullable=False),
+        sa.Column("embedding", Vector(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chunk_embedding_shadows")
+    op.drop_index("ix_corpus_embedding_generations_corpus_id", table_name="corpus_embedding_generations")
+    op.drop_index("ix_corpus_embedding_generations_tenant_id", table_name="corpus_embedding_generations")
+    op.drop_table("corpus_embedding_generations")
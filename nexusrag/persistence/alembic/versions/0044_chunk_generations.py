@@ -0,0 +1,36 @@
+"""add chunk generations and documents.active_generation
+
+Revision ID: 0044_chunk_generations
+Revises: 0043_corpus_embedding_generations
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0044_chunk_generations"
+down_revision = "0043_corpus_embedding_generations"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Constant defaults are catalog-only on Postgres 11+, so existing rows become
+    # generation 0 of documents whose active generation is 0 without a rewrite.
+    op.add_column(
+        "chunks", sa.Column("generation", sa.BigInteger(), nullable=False, server_default="0")
+    )
+    op.add_column(
+        "documents", sa.Column("active_generation", sa.BigInteger(), nullable=False, server_default="0")
+    )
+    # Reindex jobs draw generation numbers from one sequence so concurrent jobs
+    # for the same document never share one and numbers only grow.
+    op.execute("CREATE SEQUENCE IF NOT EXISTS chunk_generation_seq START WITH 1")
+
+
+def downgrade() -> None:
+    op.execute("DROP SEQUENCE IF EXISTS chunk_generation_seq")
+    op.drop_column("documents", "active_generation")
+    op.drop_column("chunks", "generation")
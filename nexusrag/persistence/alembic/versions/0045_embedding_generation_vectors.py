@@ -0,0 +1,90 @@
+"""serve embedding generations from their own vectors behind a corpus pointer
+
+Revision ID: 0045_embedding_generation_vectors
+Revises: 0044_chunk_generations
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0045_embedding_generation_vectors"
+down_revision = "0044_chunk_generations"
+branch_labels = None
+depends_on = None
+
+
+def _is_partitioned() -> bool:
+    result = op.get_bind().execute(
+        sa.text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('chunks'))")
+    )
+    return bool(result.scalar())
+
+
+def upgrade() -> None:
+    # The generation retrieval reads from chunk_embedding_shadows; NULL serves the chunks columns.
+    op.add_column(
+        "corpora",
+        sa.Column(
+            "embedding_generation_id",
+            sa.String(),
+            sa.ForeignKey(
+                "corpus_embedding_generations.id", name="fk_corpora_embedding_generation", ondelete="SET NULL"
+            ),
+            nullable=True,
+        ),
+    )
+    # Until now every cutover copied the active generation into the chunks columns,
+    # so the active generation is the one whose vectors live there.
+    op.add_column(
+        "corpus_embedding_generations",
+        sa.Column("vectors_in_chunks", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.execute("UPDATE corpus_embedding_generations SET vectors_in_chunks = true WHERE status = 'active'")
+    # Shadow rows of chunks deleted since they were written; the FK below keeps new ones from piling up.
+    op.execute(
+        "DELETE FROM chunk_embedding_shadows AS s WHERE NOT EXISTS "
+        "(SELECT 1 FROM chunks AS c WHERE c.id = s.chunk_id AND c.corpus_id = s.corpus_id)"
+    )
+    partitioned = _is_partitioned()
+    with op.get_context().autocommit_block():
+        # Cascading chunk deletes look shadow rows up by chunk id.
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chunk_embedding_shadows_chunk_id "
+            "ON chunk_embedding_shadows (chunk_id)"
+        )
+        if not partitioned:
+            # A partitioned chunks table already has (id, corpus_id) as its primary key.
+            op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_chunks_id_corpus_id ON chunks (id, corpus_id)")
+    if not partitioned:
+        op.execute("ALTER TABLE chunks ADD CONSTRAINT uq_chunks_id_corpus_id UNIQUE USING INDEX uq_chunks_id_corpus_id")
+    op.execute(
+        "ALTER TABLE chunk_embedding_shadows ADD CONSTRAINT fk_chunk_embedding_shadows_chunk "
+        "FOREIGN KEY (chunk_id, corpus_id) REFERENCES chunks (id, corpus_id) ON DELETE CASCADE"
+    )
+    # Per-generation ANN indexes are partial indexes built CONCURRENTLY by the backfill
+    # job (embedding_generations.ensure_vector_index); existing generations get theirs
+    # the next time they are activated.
+
+
+def downgrade() -> None:
+    # Before 0045 the active generation had to live in the chunks columns.
+    pointed = op.get_bind().execute(
+        sa.text("SELECT count(*) FROM corpora WHERE embedding_generation_id IS NOT NULL")
+    )
+    if pointed.scalar():
+        raise RuntimeError("activate each corpus's vectors_in_chunks embedding generation before downgrading")
+    op.execute("ALTER TABLE chunk_embedding_shadows DROP CONSTRAINT IF EXISTS fk_chunk_embedding_shadows_chunk")
+    if not _is_partitioned():
+        op.execute("ALTER TABLE chunks DROP CONSTRAINT IF EXISTS uq_chunks_id_corpus_id")
+    op.execute("DROP INDEX IF EXISTS ix_chunk_embedding_shadows_chunk_id")
+    op.execute(
+        "DO $$ DECLARE name text; BEGIN "
+        "FOR name IN SELECT indexname FROM pg_indexes "
+        "WHERE tablename = 'chunk_embedding_shadows' AND indexname LIKE 'ix_chunk_embedding_shadows_g%' LOOP "
+        "EXECUTE format('DROP INDEX IF EXISTS %I', name); END LOOP; END $$"
+    )
+    op.drop_column("corpus_embedding_generations", "vectors_in_chunks")
+    op.drop_column("corpora", "embedding_generation_id")
@@ -6,6 +6,7 @@ from typing import Any
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from nexusrag.core.config import get_settings
+from nexusrag.persistence.vector_codec import install_vector_codec
 
 settings = get_settings()
 _engine_kwargs: dict[str, Any] = {"pool_pre_ping": True}
@@ -20,6 +21,8 @@ if not settings.database_url.startswith("sqlite"):
             "server_settings": {"statement_timeout": str(int(settings.api_db_statement_timeout_ms))}
         }
 engine = create_async_engine(settings.database_url, **_engine_kwargs)
+# Vectors travel in pgvector's binary format, which COPY requires.
+install_vector_codec(engine)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 
@@ -1,11 +1,253 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+import hashlib
+import json
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import BigInteger, Integer, String, column, delete, func, insert, literal, select, text, values
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from nexusrag.domain.models import Chunk
+from nexusrag.core.config import EMBED_DIM, SUPPORTED_EMBED_DIMS
+from nexusrag.domain.models import Chunk, ChunkEmbeddingShadow
+from nexusrag.persistence.vector_codec import VECTOR_CODEC_INFO_KEY, register_vector_codec
+
+# Columns written by the bulk path; id/created_at defaults and the generated
+# text_tsv column are left to Postgres or supplied explicitly by callers.
+COPY_COLUMNS = (
+    "id",
+    "tenant_id",
+    "corpus_id",
+    "document_id",
+    "document_uri",
+    "chunk_index",
+    "text",
+    "content_hash",
+    "embedding",
+    *(f"embedding_{dim}" for dim in SUPPORTED_EMBED_DIMS if dim != EMBED_DIM),
+    "metadata_json",
+    "generation",
+)
+EMBEDDING_COLUMNS = tuple(name for name in COPY_COLUMNS if name.startswith("embedding"))
+# Rows from callers that predate chunk generations land in the legacy generation 0.
+_COPY_DEFAULTS = {"generation": 0}
+# Reindex jobs number the chunk generations they write from this sequence (migration 0044).
+CHUNK_GENERATION_SEQUENCE = "chunk_generation_seq"
+
+# With CHUNKS_PARTITION_BY_CORPUS (migration 0040) chunks is LIST-partitioned by
+# corpus_id; rows for a corpus without its own partition land here.
+DEFAULT_PARTITION = "chunks_default"
+
+
+def embedding_column_name(embedding_dim: int) -> str:
+    # Native vectors keep the original column; each truncated width has its own (migration 0042).
+    return "embedding" if embedding_dim == EMBED_DIM else f"embedding_{embedding_dim}"
+
+
+def corpus_partition_name(corpus_id: str) -> str:
+    # Corpus ids are free-form, so name partitions by digest to stay a valid identifier.
+    return f"chunks_c_{hashlib.sha256(corpus_id.encode('utf-8')).hexdigest()[:24]}"
+
+
+async def is_partitioned(session: AsyncSession) -> bool:
+    result = await session.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('chunks'))")
+    )
+    return bool(result.scalar())
+
+
+async def _partition_exists(session: AsyncSession, name: str) -> bool:
+    result = await session.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+    return bool(result.scalar())
+
+
+async def ensure_corpus_partition(session: AsyncSession, corpus_id: str) -> bool:
+    """Create the corpus's chunks partition when chunks is partitioned and it is missing.
+
+    Partition DDL locks the parent table, so callers commit straight after
+    rather than holding the lock through a long write. Indexes on the parent,
+    including the ANN indexes, are created on the new partition automatically.
+    Returns True when a partition was created.
+    """
+    if not await is_partitioned(session):
+        return False
+    name = corpus_partition_name(corpus_id)
+    if await _partition_exists(session, name):
+        return False
+    # DDL cannot take bind parameters, so let Postgres quote the identifier and value.
+    ddl = await session.execute(
+        text("SELECT format('CREATE TABLE IF NOT EXISTS %I PARTITION OF chunks FOR VALUES IN (%L)', :name, :value)"),
+        {"name": name, "value": corpus_id},
+    )
+    await session.execute(text(ddl.scalar_one()))
+    return True
+
+
+async def drop_corpus_partition(session: AsyncSession, corpus_id: str) -> int | None:
+    """Drop a corpus's chunks partition instead of deleting its rows.
+
+    Returns the number of rows dropped, or None when chunks is not partitioned
+    or the corpus has no partition of its own; callers then delete rows.
+    """
+    if not await is_partitioned(session):
+        return None
+    name = corpus_partition_name(corpus_id)
+    if not await _partition_exists(session, name):
+        return None
+    count = await session.execute(text(f"SELECT count(*) FROM {name}"))
+    rows = int(count.scalar() or 0)
+    # Detaching a partition that embedding-generation vectors still reference would fail their FK.
+    await session.execute(delete(ChunkEmbeddingShadow).where(ChunkEmbeddingShadow.corpus_id == corpus_id))
+    # Detach first so the drop never has to consider the parent's other partitions.
+    await session.execute(text(f"ALTER TABLE chunks DETACH PARTITION {name}"))
+    await session.execute(text(f"DROP TABLE {name}"))
+    return rows
+
+
+async def corpus_has_chunks(session: AsyncSession, corpus_id: str) -> bool:
+    result = await session.execute(select(Chunk.id).where(Chunk.corpus_id == corpus_id).limit(1))
+    return result.first() is not None
 
 
 async def list_chunks(session: AsyncSession, corpus_id: str) -> list[Chunk]:
     result = await session.execute(select(Chunk).where(Chunk.corpus_id == corpus_id))
     return list(result.scalars().all())
+
+
+async def next_generation(session: AsyncSession) -> int:
+    result = await session.execute(select(func.nextval(CHUNK_GENERATION_SEQUENCE)))
+    return int(result.scalar_one())
+
+
+async def clone_chunks(session: AsyncSession, clones: list[dict[str, Any]], *, generation: int) -> int:
+    """Copy stored chunk rows into another generation without re-embedding them.
+
+    Each clone names its new id, the source row id, and the chunk_index,
+    content_hash and metadata_json the copy takes; text, every embedding
+    column and the source's vectors in every embedding generation are copied
+    server-side, so vectors never round-trip through Python.
+    Returns the number of rows written.
+    """
+    if not clones:
+        return 0
+    chunks = Chunk.__table__
+    moved = values(
+        column("id", UUID(as_uuid=True)),
+        column("source_id", UUID(as_uuid=True)),
+        column("chunk_index", Integer),
+        column("content_hash", String),
+        column("metadata_json", JSONB),
+        name="moved",
+    ).data(
+        [
+            (clone["id"], clone["source_id"], clone["chunk_index"], clone["content_hash"], clone["metadata_json"])
+            for clone in clones
+        ]
+    )
+    source = (
+        select(
+            moved.c.id,
+            chunks.c.tenant_id,
+            chunks.c.corpus_id,
+            chunks.c.document_id,
+            chunks.c.document_uri,
+            moved.c.chunk_index,
+            chunks.c.text,
+            moved.c.content_hash,
+            *(chunks.c[name] for name in EMBEDDING_COLUMNS),
+            moved.c.metadata_json,
+            literal(generation, BigInteger),
+        )
+        .select_from(chunks)
+        .join(moved, moved.c.source_id == chunks.c.id)
+    )
+    result = await session.execute(insert(chunks).from_select(list(COPY_COLUMNS), source))
+    shadows = ChunkEmbeddingShadow.__table__
+    await session.execute(
+        insert(shadows).from_select(
+            ["generation_id", "chunk_id", "corpus_id", "embedding"],
+            select(shadows.c.generation_id, moved.c.id, shadows.c.corpus_id, shadows.c.embedding)
+            .select_from(shadows)
+            .join(moved, moved.c.source_id == shadows.c.chunk_id),
+        )
+    )
+    return int(result.rowcount or 0)
+
+
+async def count_generation(session: AsyncSession, document_id: str, generation: int) -> int:
+    result = await session.execute(
+        select(func.count()).select_from(Chunk).where(Chunk.document_id == document_id, Chunk.generation == generation)
+    )
+    return int(result.scalar_one())
+
+
+async def delete_generation(session: AsyncSession, document_id: str, generation: int) -> int:
+    # Discards one (never activated) generation, e.g. after a failed or superseded reindex.
+    result = await session.execute(
+        delete(Chunk).where(Chunk.document_id == document_id, Chunk.generation == generation)
+    )
+    return int(result.rowcount or 0)
+
+
+async def delete_superseded_generations(session: AsyncSession, document_id: str, active_generation: int) -> int:
+    # Generations only grow and a flip requires the one it replaces, so anything
+    # older than the active generation can never become visible again.
+    result = await session.execute(
+        delete(Chunk).where(Chunk.document_id == document_id, Chunk.generation < active_generation)
+    )
+    return int(result.rowcount or 0)
+
+
+def _batches(rows: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _record(row: dict[str, Any]) -> tuple[Any, ...]:
+    # asyncpg's binary jsonb codec takes JSON text, not Python objects.
+    return tuple(
+        json.dumps(row["metadata_json"]) if name == "metadata_json" else row.get(name, _COPY_DEFAULTS.get(name))
+        for name in COPY_COLUMNS
+    )
+
+
+async def copy_chunks(
+    session: AsyncSession,
+    rows: Iterable[dict[str, Any]],
+    *,
+    batch_size: int,
+) -> int:
+    """Bulk-insert chunk rows inside the session's transaction.
+
+    On asyncpg, rows stream through binary COPY (copy_records_to_table) in
+    batches of batch_size, so only one batch of records is materialized at a
+    time. Other drivers fall back to executemany INSERTs with the same
+    batching. Returns the number of rows written.
+    """
+    batch_size = max(1, int(batch_size))
+    # Reuse the session's connection so COPY joins the caller's transaction.
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    driver = getattr(raw, "driver_connection", None)
+    written = 0
+    if not hasattr(driver, "copy_records_to_table"):
+        for batch in _batches(rows, batch_size):
+            await session.execute(insert(Chunk), batch)
+            written += len(batch)
+        return written
+
+    # Binary COPY needs the binary vector codec, normally registered when the pool
+    # connects; connections opened before the extension existed get it here, once.
+    info = getattr(raw, "info", {})
+    if not info.get(VECTOR_CODEC_INFO_KEY):
+        info[VECTOR_CODEC_INFO_KEY] = await register_vector_codec(driver)
+    for batch in _batches(rows, batch_size):
+        await driver.copy_records_to_table(
+            Chunk.__tablename__,
+            records=[_record(row) for row in batch],
+            columns=list(COPY_COLUMNS),
+        )
+        written += len(batch)
+    return written
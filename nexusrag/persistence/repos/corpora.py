@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from typing import Any, Iterable
+
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from nexusrag.domain.models import Corpus
+from nexusrag.domain.models import Corpus, Document
 from nexusrag.persistence.guards import require_tenant_id, tenant_predicate
+from nexusrag.persistence.repos.chunks import ensure_corpus_partition
+
+# Shared sequence behind corpora.corpus_version (migration 0037).
+CORPUS_VERSION_SEQUENCE = "corpora_version_seq"
 
 
 async def get_corpus(session: AsyncSession, corpus_id: str) -> Corpus | None:
@@ -12,6 +18,49 @@ async def get_corpus(session: AsyncSession, corpus_id: str) -> Corpus | None:
     return result.scalar_one_or_none()
 
 
+async def lock_corpus_for_chunk_write(session: AsyncSession, corpus_id: str) -> Corpus | None:
+    # FOR KEY SHARE lets concurrent ingests (and their corpus_version bumps) proceed
+    # while an embedding-generation cutover's FOR UPDATE waits for this transaction,
+    # so no document goes live with vectors from the generation being switched away from.
+    result = await session.execute(
+        select(Corpus).where(Corpus.id == corpus_id).with_for_update(read=True, key_share=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def lock_corpus_for_cutover(session: AsyncSession, corpus_id: str, tenant_id: str) -> Corpus | None:
+    # Exclusive row lock: waits for in-flight chunk writes and holds off new ones until commit.
+    require_tenant_id(tenant_id)
+    result = await session.execute(
+        select(Corpus)
+        .where(Corpus.id == corpus_id, tenant_predicate(Corpus, tenant_id))
+        .with_for_update()
+    )
+    return result.scalar_one_or_none()
+
+
+async def create_corpus(
+    session: AsyncSession,
+    *,
+    corpus_id: str,
+    tenant_id: str,
+    name: str,
+    provider_config_json: dict[str, Any] | None = None,
+) -> Corpus:
+    """Insert a corpus together with its chunks partition when chunks is partitioned.
+
+    The partition DDL takes an exclusive lock on the chunks parent, so it runs
+    once here, before the corpus has any rows, rather than on an ingest path.
+    Callers commit straight after so the lock is held only briefly.
+    """
+    require_tenant_id(tenant_id)
+    corpus = Corpus(id=corpus_id, tenant_id=tenant_id, name=name, provider_config_json=provider_config_json or {})
+    session.add(corpus)
+    await session.flush()
+    await ensure_corpus_partition(session, corpus_id)
+    return corpus
+
+
 async def get_corpus_for_tenant(session: AsyncSession, corpus_id: str, tenant_id: str) -> Corpus | None:
     # Ensure tenant scoping to prevent cross-tenant corpus access.
     require_tenant_id(tenant_id)
@@ -21,6 +70,15 @@ async def get_corpus_for_tenant(session: AsyncSession, corpus_id: str, tenant_id
     return result.scalar_one_or_none()
 
 
+async def get_corpus_version(session: AsyncSession, corpus_id: str, tenant_id: str) -> int | None:
+    # Single-column read for callers that already hold the corpus config; None if the corpus is gone.
+    require_tenant_id(tenant_id)
+    result = await session.execute(
+        select(Corpus.corpus_version).where(Corpus.id == corpus_id, tenant_predicate(Corpus, tenant_id))
+    )
+    return result.scalar_one_or_none()
+
+
 async def list_corpora_by_tenant(session: AsyncSession, tenant_id: str) -> list[Corpus]:
     # Stable ordering avoids non-deterministic API responses for the same tenant.
     require_tenant_id(tenant_id)
@@ -54,4 +112,33 @@ async def update_fields(
         corpus.name = name
     if provider_config_json is not None:
         corpus.provider_config_json = provider_config_json
+        # Retrieval settings shape results, so cached results for the old config must miss.
+        corpus.corpus_version = func.nextval(CORPUS_VERSION_SEQUENCE)
     return corpus
+
+
+async def bump_corpus_version(session: AsyncSession, corpus_ids: Iterable[str]) -> None:
+    # Runs in the caller's transaction, so the new version is visible exactly when
+    # the chunk change commits and cached results for the old version stop matching.
+    ids = list(dict.fromkeys(corpus_ids))
+    if not ids:
+        return
+    await session.execute(
+        update(Corpus)
+        .where(Corpus.id.in_(ids))
+        .values(corpus_version=func.nextval(CORPUS_VERSION_SEQUENCE))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def bump_corpus_version_for_documents(session: AsyncSession, document_ids: Iterable[str]) -> None:
+    # Resolve owning corpora in SQL; call before the documents themselves are deleted.
+    ids = list(dict.fromkeys(document_ids))
+    if not ids:
+        return
+    await session.execute(
+        update(Corpus)
+        .where(Corpus.id.in_(select(Document.corpus_id).where(Document.id.in_(ids))))
+        .values(corpus_version=func.nextval(CORPUS_VERSION_SEQUENCE))
+        .execution_options(synchronize_session=False)
+    )
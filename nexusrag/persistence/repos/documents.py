@@ -74,8 +74,10 @@ async def get_document_by_id(session: AsyncSession, document_id: str) -> Documen
 
 
 async def count_chunks(session: AsyncSession, document_id: str) -> int:
+    # Count only the served generation; a reindex in flight writes the next one alongside.
+    active = select(Document.active_generation).where(Document.id == document_id).scalar_subquery()
     result = await session.execute(
-        select(func.count()).select_from(Chunk).where(Chunk.document_id == document_id)
+        select(func.count()).select_from(Chunk).where(Chunk.document_id == document_id, Chunk.generation == active)
     )
     return int(result.scalar() or 0)
 
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nexusrag.domain.models import EmbeddingCacheEntry
+
+
+async def get_many(
+    session: AsyncSession,
+    *,
+    provider: str,
+    model: str,
+    text_hashes: list[str],
+) -> dict[str, list[float]]:
+    # Resolve every key in one round trip; missing hashes are simply absent.
+    if not text_hashes:
+        return {}
+    result = await session.execute(
+        select(EmbeddingCacheEntry.text_sha256, EmbeddingCacheEntry.embedding).where(
+            EmbeddingCacheEntry.provider == provider,
+            EmbeddingCacheEntry.model == model,
+            EmbeddingCacheEntry.text_sha256.in_(text_hashes),
+        )
+    )
+    return {text_hash: [float(value) for value in embedding] for text_hash, embedding in result.all()}
+
+
+async def put_many(
+    session: AsyncSession,
+    *,
+    provider: str,
+    model: str,
+    entries: Iterable[tuple[str, list[float]]],
+) -> None:
+    rows = [
+        {"provider": provider, "model": model, "text_sha256": text_hash, "embedding": embedding}
+        for text_hash, embedding in entries
+    ]
+    if not rows:
+        return
+    # Concurrent ingests may embed the same text; the first writer wins and both vectors are equivalent.
+    await session.execute(insert(EmbeddingCacheEntry).values(rows).on_conflict_do_nothing())
+
+
+async def touch_many(
+    session: AsyncSession,
+    *,
+    provider: str,
+    model: str,
+    text_hashes: list[str],
+    now: datetime,
+    stale_before: datetime,
+) -> None:
+    # Only rewrite rows whose last_used_at is stale to avoid a write per hit.
+    if not text_hashes:
+        return
+    await session.execute(
+        update(EmbeddingCacheEntry)
+        .where(
+            EmbeddingCacheEntry.provider == provider,
+            EmbeddingCacheEntry.model == model,
+            EmbeddingCacheEntry.text_sha256.in_(text_hashes),
+            EmbeddingCacheEntry.last_used_at < stale_before,
+        )
+        .values(last_used_at=now)
+    )
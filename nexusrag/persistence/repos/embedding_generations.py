@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import bindparam, delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from nexusrag.domain.models import Chunk, ChunkEmbeddingShadow, CorpusEmbeddingGeneration
+from nexusrag.persistence.guards import require_tenant_id, tenant_predicate
+from nexusrag.persistence.repos.chunks import embedding_column_name
+
+
+async def list_generations(session: AsyncSession, tenant_id: str, corpus_id: str) -> list[CorpusEmbeddingGeneration]:
+    require_tenant_id(tenant_id)
+    result = await session.execute(
+        select(CorpusEmbeddingGeneration)
+        .where(
+            CorpusEmbeddingGeneration.corpus_id == corpus_id,
+            tenant_predicate(CorpusEmbeddingGeneration, tenant_id),
+        )
+        .order_by(CorpusEmbeddingGeneration.generation)
+    )
+    return list(result.scalars().all())
+
+
+async def get_generation(
+    session: AsyncSession,
+    tenant_id: str,
+    corpus_id: str,
+    generation_id: str,
+    *,
+    for_update: bool = False,
+) -> CorpusEmbeddingGeneration | None:
+    require_tenant_id(tenant_id)
+    stmt = select(CorpusEmbeddingGeneration).where(
+        CorpusEmbeddingGeneration.id == generation_id,
+        CorpusEmbeddingGeneration.corpus_id == corpus_id,
+        tenant_predicate(CorpusEmbeddingGeneration, tenant_id),
+    )
+    if for_update:
+        stmt = stmt.with_for_update()
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def get_generation_by_id(
+    session: AsyncSession, generation_id: str, *, for_update: bool = False
+) -> CorpusEmbeddingGeneration | None:
+    # Worker-side lookup; the job payload carries only the generation id.
+    stmt = select(CorpusEmbeddingGeneration).where(CorpusEmbeddingGeneration.id == generation_id)
+    if for_update:
+        stmt = stmt.with_for_update()
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def count_corpus_chunks(session: AsyncSession, corpus_id: str) -> int:
+    result = await session.execute(select(func.count()).select_from(Chunk).where(Chunk.corpus_id == corpus_id))
+    return int(result.scalar_one())
+
+
+def vector_index_name(generation_id: str) -> str:
+    # Generation ids are uuid4 strings; the hex form keeps the name a valid identifier under 63 bytes.
+    return f"ix_chunk_embedding_shadows_g{UUID(generation_id).hex}"
+
+
+def _pending_clause(generation: CorpusEmbeddingGeneration) -> Any:
+    # A chunk still needs a vector in this generation's store.
+    if generation.vectors_in_chunks:
+        return Chunk.__table__.c[embedding_column_name(generation.embedding_dim)].is_(None)
+    shadowed = select(ChunkEmbeddingShadow.chunk_id).where(
+        ChunkEmbeddingShadow.generation_id == generation.id,
+        ChunkEmbeddingShadow.chunk_id == Chunk.id,
+    )
+    return ~shadowed.exists()
+
+
+async def pending_chunks(
+    session: AsyncSession,
+    generation: CorpusEmbeddingGeneration,
+    corpus_id: str,
+    *,
+    after: UUID | None,
+    limit: int,
+) -> list[tuple[UUID, str]]:
+    # Keyset over chunk ids so each backfill batch resumes where the last one committed.
+    stmt = select(Chunk.id, Chunk.text).where(Chunk.corpus_id == corpus_id, _pending_clause(generation))
+    if after is not None:
+        stmt = stmt.where(Chunk.id > after)
+    result = await session.execute(stmt.order_by(Chunk.id).limit(limit))
+    return [(row[0], row[1]) for row in result.all()]
+
+
+async def count_pending_chunks(session: AsyncSession, generation: CorpusEmbeddingGeneration, corpus_id: str) -> int:
+    result = await session.execute(
+        select(func.count()).select_from(Chunk).where(Chunk.corpus_id == corpus_id, _pending_clause(generation))
+    )
+    return int(result.scalar_one())
+
+
+async def store_vectors(
+    session: AsyncSession,
+    generation: CorpusEmbeddingGeneration,
+    corpus_id: str,
+    vectors: Sequence[tuple[UUID, list[float]]],
+) -> int:
+    """Write one backfill batch into the generation's own store.
+
+    Shadow generations insert into chunk_embedding_shadows. The vectors_in_chunks
+    generation only backfills chunks written while another generation served,
+    one batch-sized UPDATE at a time.
+    """
+    if not vectors:
+        return 0
+    if generation.vectors_in_chunks:
+        chunks = Chunk.__table__
+        column = embedding_column_name(generation.embedding_dim)
+        await session.execute(
+            update(chunks)
+            .where(chunks.c.id == bindparam("chunk_id"), chunks.c.corpus_id == corpus_id)
+            .values({column: bindparam("vector")}),
+            [{"chunk_id": chunk_id, "vector": vector} for chunk_id, vector in vectors],
+        )
+        return len(vectors)
+    return await insert_shadow_vectors(session, generation.id, corpus_id, vectors)
+
+
+async def insert_shadow_vectors(
+    session: AsyncSession,
+    generation_id: str,
+    corpus_id: str,
+    vectors: Sequence[tuple[UUID, list[float]]],
+) -> int:
+    # Idempotent so an overlapping retry of the same batch is harmless.
+    if not vectors:
+        return 0
+    result = await session.execute(
+        pg_insert(ChunkEmbeddingShadow)
+        .values(
+            [
+                {"generation_id": generation_id, "chunk_id": chunk_id, "corpus_id": corpus_id, "embedding": vector}
+                for chunk_id, vector in vectors
+            ]
+        )
+        .on_conflict_do_nothing()
+    )
+    return int(result.rowcount or 0)
+
+
+async def has_vector_index(session: AsyncSession, generation_id: str) -> bool:
+    result = await session.execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": vector_index_name(generation_id)},
+    )
+    return bool(result.scalar_one_or_none())
+
+
+async def ensure_vector_index(connection: AsyncConnection, generation_id: str, embedding_dim: int) -> None:
+    """Build the generation's partial HNSW index on chunk_embedding_shadows if it is missing.
+
+    CONCURRENTLY keeps backfill writes and reads of other generations flowing, so
+    `connection` must be in AUTOCOMMIT mode, never a session transaction. An
+    invalid index left by an interrupted build is rebuilt. Retrieval repeats the
+    same cast and generation predicate so the planner matches the index
+    (local_pgvector.generation_vectors).
+    """
+    name = vector_index_name(generation_id)
+    result = await connection.execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    )
+    valid = result.scalar_one_or_none()
+    if valid:
+        return
+    # Index builds outlast the API statement timeout; RESET restores the connection default.
+    await connection.execute(text("SET statement_timeout = 0"))
+    try:
+        if valid is not None:
+            await connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        # DDL cannot take bind parameters; the name and literal both come from a parsed uuid.
+        await connection.execute(
+            text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON chunk_embedding_shadows "
+                f"USING hnsw ((embedding::vector({int(embedding_dim)})) vector_cosine_ops) "
+                "WITH (m = 16, ef_construction = 64) "
+                f"WHERE generation_id = '{UUID(generation_id)}'"
+            )
+        )
+    finally:
+        await connection.execute(text("RESET statement_timeout"))
+
+
+async def drop_vector_index(connection: AsyncConnection, generation_id: str) -> None:
+    # AUTOCOMMIT connection, like ensure_vector_index.
+    await connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {vector_index_name(generation_id)}"))
+
+
+async def delete_shadow_vectors(session: AsyncSession, generation_id: str) -> int:
+    result = await session.execute(
+        delete(ChunkEmbeddingShadow).where(ChunkEmbeddingShadow.generation_id == generation_id)
+    )
+    return int(result.rowcount or 0)
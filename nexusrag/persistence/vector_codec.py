@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pgvector import Vector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Set in a pooled connection's info once its binary vector codec is registered.
+VECTOR_CODEC_INFO_KEY = "nexusrag.vector_binary_codec"
+
+
+def _encode(value: Any) -> bytes:
+    # SQLAlchemy's pgvector type binds vectors as text; COPY records carry lists or Vectors.
+    if isinstance(value, str):
+        value = Vector.from_text(value)
+    elif not isinstance(value, Vector):
+        value = Vector(value)
+    return value.to_binary()
+
+
+async def register_vector_codec(driver: Any) -> bool:
+    """Switch an asyncpg connection to the binary vector codec.
+
+    The schema comes from pg_type, so the extension may live outside public.
+    Returns False when the vector type does not exist yet (before migrations).
+    """
+    schema = await driver.fetchval(
+        "SELECT n.nspname FROM pg_type t JOIN pg_namespace n ON n.oid = t.typnamespace "
+        "WHERE t.oid = to_regtype('vector')"
+    )
+    if schema is None:
+        return False
+    await driver.set_type_codec(
+        "vector", schema=schema, encoder=_encode, decoder=Vector.from_binary, format="binary"
+    )
+    return True
+
+
+def install_vector_codec(engine: AsyncEngine) -> None:
+    # Once per pooled connection: per-statement set/reset costs round trips and
+    # clears asyncpg's prepared statement cache.
+    if engine.dialect.driver != "asyncpg":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register(dbapi_connection: Any, connection_record: Any) -> None:
+        connection_record.info[VECTOR_CODEC_INFO_KEY] = dbapi_connection.run_async(register_vector_codec)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, TypeVar
+
+from nexusrag.core.config import get_settings
+from nexusrag.services.telemetry import increment_counter, set_gauge
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _ClientEntry:
+    client: Any
+    created_at: float
+    close: Callable[[Any], Any] | None
+    failures: int = 0
+
+
+class ProviderClientRegistry:
+    """Process-wide SDK clients keyed by (kind, config).
+
+    Building a boto3 or Google client resolves credentials and opens TLS
+    sessions, so clients are built lazily on first use and shared by every
+    request with the same config. An entry is rebuilt after
+    max_consecutive_failures failed calls (stale credentials, a wedged
+    connection pool) or once it is older than max_age_s. Lookups may come from
+    worker threads (SDK calls run in asyncio.to_thread), so a lock guards the
+    entries; builds run outside it, and concurrent cold lookups of one key
+    wait on a per-key future for a single build. Event-loop callers use
+    `aget`, which never blocks the loop on a build.
+    Evicted clients are only dereferenced, since in-flight calls may still hold
+    them; the synchronous `close` callbacks run at shutdown.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_consecutive_failures: int,
+        max_age_s: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_failures = max(1, int(max_consecutive_failures))
+        self._max_age_s = float(max_age_s)
+        self._clock = clock
+        self._entries: dict[tuple[str, Hashable], _ClientEntry] = {}
+        self._building: dict[tuple[str, Hashable], Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        kind: str,
+        key: Hashable,
+        factory: Callable[[], T],
+        *,
+        close: Callable[[T], Any] | None = None,
+    ) -> T:
+        # Blocks while another thread builds the same client; event-loop callers use aget.
+        with self._lock:
+            client = self._warm(kind, key)
+            if client is not None:
+                return client
+            pending = self._building.get((kind, key))
+            building = pending is None
+            if pending is None:
+                pending = self._building[(kind, key)] = Future()
+        if not building:
+            # Raises the builder's error too, so one bad config does not cost N builds.
+            return pending.result()
+        try:
+            client = factory()
+        except BaseException as exc:
+            with self._lock:
+                del self._building[(kind, key)]
+            pending.set_exception(exc)
+            raise
+        with self._lock:
+            del self._building[(kind, key)]
+            self._entries[(kind, key)] = _ClientEntry(client=client, created_at=self._clock(), close=close)
+            increment_counter(f"provider_client.cold_total.{kind}")
+            set_gauge("provider_client.entries", len(self._entries))
+        pending.set_result(client)
+        return client
+
+    async def aget(
+        self,
+        kind: str,
+        key: Hashable,
+        factory: Callable[[], T],
+        *,
+        close: Callable[[T], Any] | None = None,
+    ) -> T:
+        # Warm hits stay on the loop; builds (credential resolution, TLS) and waits go to a thread.
+        with self._lock:
+            client = self._warm(kind, key)
+        if client is not None:
+            return client
+        return await asyncio.to_thread(self.get, kind, key, factory, close=close)
+
+    def _warm(self, kind: str, key: Hashable) -> Any | None:
+        # Caller holds the lock.
+        entry = self._entries.get((kind, key))
+        if entry is not None and self._max_age_s > 0 and self._clock() - entry.created_at >= self._max_age_s:
+            self._drop(kind, key, reason="age")
+            entry = None
+        if entry is None:
+            return None
+        increment_counter(f"provider_client.warm_total.{kind}")
+        return entry.client
+
+    def record_success(self, kind: str, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None:
+                entry.failures = 0
+
+    def record_failure(self, kind: str, key: Hashable) -> None:
+        # Consecutive failures suggest a broken client; the next call rebuilds it.
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is None:
+                return
+            entry.failures += 1
+            if entry.failures >= self._max_failures:
+                self._drop(kind, key, reason="unhealthy")
+
+    def evict(self, kind: str, key: Hashable) -> None:
+        with self._lock:
+            if (kind, key) in self._entries:
+                self._drop(kind, key, reason="manual")
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    async def aclose(self) -> None:
+        # Called from the API lifespan; clients are rebuilt lazily if used afterwards.
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            set_gauge("provider_client.entries", 0)
+        for entry in entries:
+            _close_client(entry)
+
+    def _drop(self, kind: str, key: Hashable, *, reason: str) -> None:
+        del self._entries[(kind, key)]
+        increment_counter(f"provider_client.evictions_total.{kind}")
+        set_gauge("provider_client.entries", len(self._entries))
+        logger.info("provider_client_evicted kind=%s reason=%s", kind, reason)
+
+
+def _close_client(entry: _ClientEntry) -> None:
+    if entry.close is None:
+        return
+    try:
+        entry.close(entry.client)
+    except Exception as exc:  # noqa: BLE001 - shutdown should release every client it can
+        logger.warning("provider_client_close_failed", exc_info=exc)
+
+
+_registry: ProviderClientRegistry | None = None
+
+
+def get_client_registry() -> ProviderClientRegistry:
+    # Built lazily so PROVIDER_CLIENT_* settings are read at first use.
+    global _registry
+    if _registry is None:
+        settings = get_settings()
+        _registry = ProviderClientRegistry(
+            max_consecutive_failures=settings.provider_client_max_consecutive_failures,
+            max_age_s=settings.provider_client_max_age_s,
+        )
+    return _registry
+
+
+async def close_provider_clients() -> None:
+    # Release pooled SDK clients on shutdown; the next call lazily rebuilds.
+    global _registry
+    registry = _registry
+    _registry = None
+    if registry is not None:
+        await registry.aclose()
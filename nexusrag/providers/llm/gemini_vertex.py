@@ -8,9 +8,13 @@ from typing import Iterable
 
 from nexusrag.core.config import get_settings
 from nexusrag.core.errors import ProviderConfigError, VertexAuthError, VertexTimeoutError
+from nexusrag.providers.clients import get_client_registry
 
 logger = logging.getLogger(__name__)
 
+# Registry kind for shared GenerativeModel handles, keyed by (project, location, model).
+CLIENT_KIND = "gcp.vertex_generative_model"
+
 
 class GeminiVertexProvider:
     def __init__(self, request_id: str | None = None, cancel_event: threading.Event | None = None) -> None:
@@ -56,8 +60,8 @@ class GeminiVertexProvider:
         timeout_s = max(1, int(self._settings.vertex_stream_timeout_s))
 
         try:
-            from google.api_core.exceptions import PermissionDenied, Unauthenticated
-            from google.auth.exceptions import DefaultCredentialsError, RefreshError
+            from google.api_core.exceptions import PermissionDenied, RetryError, ServerError, Unauthenticated
+            from google.auth.exceptions import DefaultCredentialsError, RefreshError, TransportError
             from vertexai import init
             from vertexai.generative_models import GenerativeModel
         except Exception as exc:  # pragma: no cover - import errors are environment-specific
@@ -65,10 +69,16 @@ class GeminiVertexProvider:
                 "Vertex AI SDK not available. Install google-cloud-aiplatform."
             ) from exc
 
+        def _build_model() -> GenerativeModel:
+            # vertexai.init sets process-wide SDK state; run it once per model handle, not per stream.
+            init(project=project, location=location)
+            return GenerativeModel(model_name)
+
+        registry = get_client_registry()
+        client_key = (project, location, model_name)
         try:
             logger.info("vertex_stream_start request_id=%s model=%s", self._request_id, model_name)
-            init(project=project, location=location)
-            model = GenerativeModel(model_name)
+            model = registry.get(CLIENT_KIND, client_key, _build_model)
 
             prompt = self._format_messages(messages)
             responses = model.generate_content(
@@ -87,9 +97,12 @@ class GeminiVertexProvider:
                 if delta:
                     # Yield token deltas immediately to preserve streaming behavior.
                     yield delta
+            registry.record_success(CLIENT_KIND, client_key)
         except ProviderConfigError:
             raise
         except (DefaultCredentialsError, RefreshError, PermissionDenied, Unauthenticated) as exc:
+            # Stale credentials live in the cached handle; count toward rebuilding it.
+            registry.record_failure(CLIENT_KIND, client_key)
             logger.warning("vertex_stream_auth_error request_id=%s", self._request_id)
             raise VertexAuthError(
                 "Vertex auth error: run `gcloud auth application-default login`."
@@ -101,6 +114,9 @@ class GeminiVertexProvider:
             # Allow caller cancellation to bubble up for disconnect handling.
             raise
         except Exception as exc:
+            # Transport failures and 5xx suggest a broken handle; request errors (4xx) say nothing about it.
+            if isinstance(exc, (ConnectionError, TimeoutError, TransportError, RetryError, ServerError)):
+                registry.record_failure(CLIENT_KIND, client_key)
             logger.error("vertex_stream_error request_id=%s", self._request_id)
             raise ProviderConfigError(
                 "Vertex AI request failed. Check credentials and model access."
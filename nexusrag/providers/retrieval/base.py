@@ -2,7 +2,16 @@ from __future__ import annotations
 
 from typing import Protocol
 
+from nexusrag.providers.retrieval.filters import MetadataFilters
+
 
 class RetrievalProvider(Protocol):
-    async def retrieve(self, tenant_id: str, corpus_id: str, query: str, top_k: int) -> list[dict]:
+    async def retrieve(
+        self,
+        tenant_id: str,
+        corpus_id: str,
+        query: str,
+        top_k: int,
+        filters: MetadataFilters | None = None,
+    ) -> list[dict]:
         ...
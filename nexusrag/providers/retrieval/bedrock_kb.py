@@ -18,10 +18,15 @@ except ImportError:  # pragma: no cover
         pass
 
 from nexusrag.core.errors import AwsAuthError, AwsConfigMissingError, AwsRetrievalError
+from nexusrag.providers.clients import get_client_registry
+from nexusrag.providers.retrieval.filters import MetadataFilters, bedrock_filter, matches
 from nexusrag.services.audit import record_system_event
 from nexusrag.services.resilience import CircuitBreaker, get_resilience_redis, retry_async
 from nexusrag.services.telemetry import record_external_call
 
+# Registry kind for shared bedrock-agent-runtime clients, keyed by region.
+CLIENT_KIND = "aws.bedrock_agent_runtime"
+
 
 class BedrockKnowledgeBaseRetriever:
     def __init__(
@@ -56,7 +61,7 @@ class BedrockKnowledgeBaseRetriever:
         )
         return self._breaker
 
-    def _get_client(self) -> Any:
+    async def _get_client(self) -> Any:
         if self._client is not None:
             return self._client
         try:
@@ -64,20 +69,48 @@ class BedrockKnowledgeBaseRetriever:
         except Exception as exc:  # pragma: no cover - environment-specific import
             raise AwsRetrievalError("AWS SDK not available. Install boto3.") from exc
 
-        self._client = boto3.client("bedrock-agent-runtime", region_name=self._region)
-        return self._client
+        # Shared per region so credential resolution and TLS setup happen once per process.
+        return await get_client_registry().aget(
+            CLIENT_KIND,
+            self._region,
+            lambda: boto3.client("bedrock-agent-runtime", region_name=self._region),
+            close=lambda client: client.close(),
+        )
 
-    async def retrieve(self, tenant_id: str, corpus_id: str, query: str, top_k: int) -> list[dict]:
+    def _record_client_health(self, exc: Exception | None) -> None:
+        # Injected clients belong to the caller; request errors (4xx) say nothing about the client.
+        if self._client is not None:
+            return
+        registry = get_client_registry()
+        if exc is None:
+            registry.record_success(CLIENT_KIND, self._region)
+            return
+        status = getattr(exc, "response", {}).get("ResponseMetadata", {}).get("HTTPStatusCode")
+        if isinstance(exc, ClientError) and isinstance(status, int) and 400 <= status < 500 and status not in {401, 403}:
+            return
+        registry.record_failure(CLIENT_KIND, self._region)
+
+    async def retrieve(
+        self,
+        tenant_id: str,
+        corpus_id: str,
+        query: str,
+        top_k: int,
+        filters: MetadataFilters | None = None,
+    ) -> list[dict]:
         # tenant_id/corpus_id are unused for Bedrock KB but kept for a unified interface.
-        client = self._get_client()
+        client = await self._get_client()
         breaker = await self._get_breaker()
         await breaker.before_call()
+        retrieval_filter, residual = bedrock_filter(filters)
+        search_config: dict[str, Any] = {"numberOfResults": top_k}
+        if retrieval_filter is not None:
+            # Bedrock applies the filter inside the vector search, so top_k still fills.
+            search_config["filter"] = retrieval_filter
         request = {
             "knowledgeBaseId": self._knowledge_base_id,
             "retrievalQuery": {"text": query},
-            "retrievalConfiguration": {
-                "vectorSearchConfiguration": {"numberOfResults": top_k}
-            },
+            "retrievalConfiguration": {"vectorSearchConfiguration": search_config},
         }
         start = time.monotonic()
         try:
@@ -94,6 +127,7 @@ class BedrockKnowledgeBaseRetriever:
 
             response = await retry_async(_call, retryable=_retryable)
             await breaker.record_success()
+            self._record_client_health(None)
             record_external_call(
                 integration="retrieval.aws_bedrock",
                 latency_ms=(time.monotonic() - start) * 1000.0,
@@ -101,6 +135,7 @@ class BedrockKnowledgeBaseRetriever:
             )
         except Exception as exc:
             await breaker.record_failure()
+            self._record_client_health(exc)
             record_external_call(
                 integration="retrieval.aws_bedrock",
                 latency_ms=(time.monotonic() - start) * 1000.0,
@@ -139,12 +174,16 @@ class BedrockKnowledgeBaseRetriever:
                 score = 0.0
             score = max(0.0, min(1.0, score))
 
+            metadata = result.get("metadata", {}) if isinstance(result, dict) else {}
+            # Conditions Bedrock cannot express (key-exists, string ranges) are checked here.
+            if residual and not matches(residual, metadata):
+                continue
             items.append(
                 {
                     "text": text,
                     "score": score,
                     "source": source,
-                    "metadata": result.get("metadata", {}) if isinstance(result, dict) else {},
+                    "metadata": metadata,
                 }
             )
         return items
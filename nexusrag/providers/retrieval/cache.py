@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable
+
+import orjson
+
+from nexusrag.core.config import get_settings
+from nexusrag.ingestion.embeddings import normalize_query_text
+from nexusrag.providers.retrieval.filters import MetadataFilters, cache_token
+from nexusrag.services.caching import AsyncLRUCache, CacheStats
+from nexusrag.services.resilience import get_resilience_redis
+from nexusrag.services.telemetry import increment_counter
+
+logger = logging.getLogger(__name__)
+
+# Providers whose index lives in our DB, so corpus_version tracks every change exactly.
+VERSIONED_PROVIDERS = frozenset({"local_pgvector"})
+# Fixed per-entry allowance for the key tuple and LRU bookkeeping.
+_ENTRY_OVERHEAD_BYTES = 256
+
+RetrievalCacheKey = tuple[str, str, int, str, str, int, str, str]
+
+
+def retrieval_cache_key(
+    *,
+    tenant_id: str,
+    corpus_id: str,
+    corpus_version: int,
+    provider: str,
+    query: str,
+    top_k: int,
+    filters: MetadataFilters | None = None,
+    access: str = "",
+) -> RetrievalCacheKey:
+    # access is RetrievalAccess.cache_token(): principals with different document
+    # grants or policy outcomes never share results.
+    return (
+        tenant_id,
+        corpus_id,
+        int(corpus_version),
+        provider,
+        normalize_query_text(query),
+        int(top_k),
+        cache_token(filters),
+        access,
+    )
+
+
+def retrieval_cache_ttl(provider: str, corpus_version: int | None) -> float | None:
+    # None means "do not cache": disabled, unversioned corpus rows, or external TTL of 0.
+    settings = get_settings()
+    if not settings.retrieval_cache_enabled or corpus_version is None:
+        return None
+    if provider in VERSIONED_PROVIDERS:
+        return settings.retrieval_cache_ttl_s
+    ttl_s = settings.retrieval_cache_external_ttl_s
+    return ttl_s if ttl_s > 0 else None
+
+
+class RetrievalResultCache:
+    """Two-tier retrieval result cache: in-process LRU, then optional Redis.
+
+    Results are stored as serialized JSON, so every hit hands out fresh objects
+    and both tiers share one encoding. Redis is best-effort; errors fall back to
+    the provider without failing the request.
+    """
+
+    def __init__(self, *, max_bytes: int, redis_enabled: bool, redis_prefix: str) -> None:
+        self._local: AsyncLRUCache[RetrievalCacheKey, bytes] = AsyncLRUCache(
+            max_bytes=max_bytes,
+            ttl_s=get_settings().retrieval_cache_ttl_s,
+            size_of=lambda _key, payload: len(payload) + _ENTRY_OVERHEAD_BYTES,
+        )
+        self._redis_enabled = redis_enabled
+        self._redis_prefix = redis_prefix
+
+    async def get_or_load(
+        self,
+        key: RetrievalCacheKey,
+        loader: Callable[[], Awaitable[list[dict[str, Any]]]],
+        *,
+        ttl_s: float,
+    ) -> list[dict[str, Any]]:
+        outcome = "local_hits"
+
+        async def _load() -> bytes:
+            nonlocal outcome
+            payload = await self._redis_get(key)
+            if payload is not None:
+                outcome = "redis_hits"
+                return payload
+            outcome = "misses"
+            payload = orjson.dumps(await loader())
+            await self._redis_set(key, payload, ttl_s)
+            return payload
+
+        payload = await self._local.get_or_load(key, _load, ttl_s=ttl_s)
+        increment_counter(f"retrieval_cache.{outcome}")
+        return orjson.loads(payload)
+
+    def stats(self) -> CacheStats:
+        return self._local.stats()
+
+    def _redis_key(self, key: RetrievalCacheKey) -> str:
+        # Hash the key so raw query text never appears in Redis key space.
+        digest = hashlib.sha256(orjson.dumps(list(key))).hexdigest()
+        return f"{self._redis_prefix}:{digest}"
+
+    async def _redis_get(self, key: RetrievalCacheKey) -> bytes | None:
+        if not self._redis_enabled:
+            return None
+        redis = await get_resilience_redis()
+        if redis is None:
+            return None
+        try:
+            value = await redis.get(self._redis_key(key))
+        except Exception as exc:  # noqa: BLE001 - cache tier must not fail retrieval
+            logger.warning("retrieval_cache_redis_get_failed", exc_info=exc)
+            return None
+        return value.encode("utf-8") if isinstance(value, str) else value
+
+    async def _redis_set(self, key: RetrievalCacheKey, payload: bytes, ttl_s: float) -> None:
+        if not self._redis_enabled:
+            return
+        redis = await get_resilience_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(self._redis_key(key), payload.decode("utf-8"), ex=max(1, int(ttl_s)))
+        except Exception as exc:  # noqa: BLE001 - cache tier must not fail retrieval
+            logger.warning("retrieval_cache_redis_set_failed", exc_info=exc)
+
+
+_retrieval_cache: RetrievalResultCache | None = None
+
+
+def get_retrieval_cache() -> RetrievalResultCache:
+    # Built lazily so RETRIEVAL_CACHE_* settings are read at first use.
+    global _retrieval_cache
+    if _retrieval_cache is None:
+        settings = get_settings()
+        _retrieval_cache = RetrievalResultCache(
+            max_bytes=int(settings.retrieval_cache_max_mb) * 1024 * 1024,
+            redis_enabled=settings.retrieval_cache_redis_enabled,
+            redis_prefix=settings.retrieval_cache_redis_prefix,
+        )
+    return _retrieval_cache
+
+
+def reset_retrieval_cache() -> None:
+    # Drop cached results (tests, operational flushes).
+    global _retrieval_cache
+    _retrieval_cache = None
@@ -2,11 +2,162 @@ from __future__ import annotations
 
 from typing import Any
 
+from nexusrag.core.config import EMBED_DIM, SUPPORTED_EMBED_DIMS
 from nexusrag.core.errors import RetrievalConfigError
 
 DEFAULT_PROVIDER = "local_pgvector"
 DEFAULT_TOP_K = 5
 ALLOWED_PROVIDERS = {"local_pgvector", "aws_bedrock_kb", "gcp_vertex"}
+# Bounds mirror pgvector's accepted ranges for hnsw.ef_search and ivfflat.probes.
+ANN_EF_SEARCH_RANGE = (1, 1000)
+ANN_PROBES_RANGE = (1, 32768)
+ANN_KEYS = {"ef_search", "probes", "exact_scan_threshold"}
+# Local retrieval modes: pure vector similarity or lexical + vector rank fusion.
+RETRIEVAL_MODES = {"vector", "hybrid"}
+DEFAULT_RETRIEVAL_MODE = "vector"
+# RRF constant from Cormack et al.; larger values flatten the rank contribution.
+DEFAULT_RRF_K = 60
+DEFAULT_HYBRID_CANDIDATES = 50
+HYBRID_CANDIDATES_RANGE = (1, 200)
+HYBRID_KEYS = {"rrf_k", "candidates"}
+# Quantised first-pass indexes (migration 0038); the shortlist is re-ranked at full precision.
+QUANTIZATION_TYPES = {"halfvec", "binary"}
+QUANTIZATION_KEYS = {"type", "oversample"}
+QUANTIZATION_OVERSAMPLE_RANGE = (1, 50)
+# Pinned embedding model; written by embedding-generation cutovers (absent = deployment default).
+EMBEDDING_KEYS = {"provider", "model"}
+EMBEDDING_MODEL_PROVIDERS = {"fake", "openai", "vertex"}
+# Hedged external retrieval: race a slow call with a duplicate or a fallback provider.
+HEDGE_KEYS = {"enabled", "percentile", "fallback"}
+HEDGE_FALLBACK_PROVIDERS = {"local_pgvector"}
+HEDGE_PERCENTILE_RANGE = (50, 99.9)
+# Set by the router from corpora.embedding_generation_id, never read from provider_config_json.
+VECTOR_GENERATION_KEY = "vector_generation_id"
+
+
+def _is_int(value: Any) -> bool:
+    # bool is an int subclass; reject it so `true` cannot sneak in as 1.
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _validate_ann_config(ann: Any) -> None:
+    # ANN tuning is optional; only validate shape and bounds when provided.
+    if ann is None:
+        return
+    if not isinstance(ann, dict):
+        raise RetrievalConfigError("ann config must be an object")
+    unknown = set(ann) - ANN_KEYS
+    if unknown:
+        raise RetrievalConfigError(f"unsupported ann config keys: {', '.join(sorted(unknown))}")
+    for key, (low, high) in (("ef_search", ANN_EF_SEARCH_RANGE), ("probes", ANN_PROBES_RANGE)):
+        value = ann.get(key)
+        if value is None:
+            continue
+        if not _is_int(value) or not low <= value <= high:
+            raise RetrievalConfigError(f"ann.{key} must be an integer between {low} and {high}")
+    threshold = ann.get("exact_scan_threshold")
+    if threshold is not None and (not _is_int(threshold) or threshold < 0):
+        raise RetrievalConfigError("ann.exact_scan_threshold must be a non-negative integer")
+
+
+def _validate_mode_config(retrieval: dict[str, Any]) -> None:
+    mode = retrieval.get("mode")
+    if mode is not None and mode not in RETRIEVAL_MODES:
+        raise RetrievalConfigError("retrieval mode must be one of: hybrid, vector")
+    hybrid = retrieval.get("hybrid")
+    if hybrid is None:
+        return
+    if not isinstance(hybrid, dict):
+        raise RetrievalConfigError("hybrid config must be an object")
+    unknown = set(hybrid) - HYBRID_KEYS
+    if unknown:
+        raise RetrievalConfigError(f"unsupported hybrid config keys: {', '.join(sorted(unknown))}")
+    rrf_k = hybrid.get("rrf_k")
+    if rrf_k is not None and (not _is_int(rrf_k) or rrf_k < 1):
+        raise RetrievalConfigError("hybrid.rrf_k must be a positive integer")
+    candidates = hybrid.get("candidates")
+    low, high = HYBRID_CANDIDATES_RANGE
+    if candidates is not None and (not _is_int(candidates) or not low <= candidates <= high):
+        raise RetrievalConfigError(f"hybrid.candidates must be an integer between {low} and {high}")
+
+
+def _validate_quantization_config(quantization: Any) -> None:
+    # Quantisation is opt-in per corpus; absent means full-precision ANN only.
+    if quantization is None:
+        return
+    if not isinstance(quantization, dict):
+        raise RetrievalConfigError("quantization config must be an object")
+    unknown = set(quantization) - QUANTIZATION_KEYS
+    if unknown:
+        raise RetrievalConfigError(f"unsupported quantization config keys: {', '.join(sorted(unknown))}")
+    if quantization.get("type") not in QUANTIZATION_TYPES:
+        raise RetrievalConfigError("quantization.type must be one of: binary, halfvec")
+    oversample = quantization.get("oversample")
+    low, high = QUANTIZATION_OVERSAMPLE_RANGE
+    if oversample is not None and (not _is_int(oversample) or not low <= oversample <= high):
+        raise RetrievalConfigError(f"quantization.oversample must be an integer between {low} and {high}")
+
+
+def _validate_embedding_dim(retrieval: dict[str, Any]) -> None:
+    embedding_dim = retrieval.get("embedding_dim")
+    if embedding_dim is None:
+        return
+    if not _is_int(embedding_dim) or embedding_dim not in SUPPORTED_EMBED_DIMS:
+        choices = ", ".join(str(dim) for dim in SUPPORTED_EMBED_DIMS)
+        raise RetrievalConfigError(f"embedding_dim must be one of: {choices}")
+    # Quantised expression indexes (migration 0038) exist only for the native column.
+    if embedding_dim != EMBED_DIM and retrieval.get("quantization") is not None:
+        raise RetrievalConfigError(f"quantization requires embedding_dim {EMBED_DIM}")
+
+
+def corpus_embedding_dim(config_json: dict[str, Any] | None) -> int:
+    # Ingestion and retrieval must pick the same chunks column; configs without the key use the native width.
+    retrieval = (config_json or {}).get("retrieval") or {}
+    return int(retrieval.get("embedding_dim") or EMBED_DIM)
+
+
+def _validate_embedding_model(embedding: Any) -> None:
+    if embedding is None:
+        return
+    if not isinstance(embedding, dict):
+        raise RetrievalConfigError("embedding config must be an object")
+    unknown = set(embedding) - EMBEDDING_KEYS
+    if unknown:
+        raise RetrievalConfigError(f"unsupported embedding config keys: {', '.join(sorted(unknown))}")
+    if embedding.get("provider") not in EMBEDDING_MODEL_PROVIDERS:
+        raise RetrievalConfigError("embedding.provider must be one of: fake, openai, vertex")
+    model = embedding.get("model")
+    if model is not None and (not isinstance(model, str) or not model):
+        raise RetrievalConfigError("embedding.model must be a non-empty string")
+
+
+def corpus_embedding_model(config_json: dict[str, Any] | None) -> tuple[str | None, str | None]:
+    # (None, None) means the deployment's EMBEDDING_PROVIDER; resolve with embeddings.resolve_embedding_model.
+    retrieval = (config_json or {}).get("retrieval") or {}
+    embedding = retrieval.get("embedding") or {}
+    return embedding.get("provider"), embedding.get("model")
+
+
+def _validate_hedge_config(hedge: Any) -> None:
+    # Hedging is on by default for external providers; this only tunes or disables it.
+    if hedge is None:
+        return
+    if not isinstance(hedge, dict):
+        raise RetrievalConfigError("hedge config must be an object")
+    unknown = set(hedge) - HEDGE_KEYS
+    if unknown:
+        raise RetrievalConfigError(f"unsupported hedge config keys: {', '.join(sorted(unknown))}")
+    if not isinstance(hedge.get("enabled", True), bool):
+        raise RetrievalConfigError("hedge.enabled must be a boolean")
+    percentile = hedge.get("percentile")
+    low, high = HEDGE_PERCENTILE_RANGE
+    if percentile is not None and (
+        isinstance(percentile, bool) or not isinstance(percentile, (int, float)) or not low <= percentile <= high
+    ):
+        raise RetrievalConfigError(f"hedge.percentile must be a number between {low} and {high}")
+    fallback = hedge.get("fallback")
+    if fallback is not None and fallback not in HEDGE_FALLBACK_PROVIDERS:
+        raise RetrievalConfigError("hedge.fallback must be one of: local_pgvector")
 
 
 def normalize_provider_config(config_json: dict[str, Any] | None) -> dict[str, Any]:
@@ -33,6 +184,28 @@ def normalize_provider_config(config_json: dict[str, Any] | None) -> dict[str, A
     if top_k_default is not None and not isinstance(top_k_default, int):
         raise RetrievalConfigError("top_k_default must be an integer")
 
+    if provider == "local_pgvector":
+        _validate_ann_config(retrieval.get("ann"))
+        _validate_mode_config(retrieval)
+        _validate_quantization_config(retrieval.get("quantization"))
+        _validate_embedding_dim(retrieval)
+        _validate_embedding_model(retrieval.get("embedding"))
+    elif retrieval.get("mode") not in (None, DEFAULT_RETRIEVAL_MODE):
+        # External providers own their ranking; hybrid fusion only exists for pgvector.
+        raise RetrievalConfigError("hybrid mode is only supported for local_pgvector")
+    elif retrieval.get("quantization") is not None:
+        raise RetrievalConfigError("quantization is only supported for local_pgvector")
+    elif retrieval.get("embedding_dim") is not None:
+        raise RetrievalConfigError("embedding_dim is only supported for local_pgvector")
+    elif retrieval.get("embedding") is not None:
+        raise RetrievalConfigError("embedding is only supported for local_pgvector")
+
+    if provider == "local_pgvector":
+        if retrieval.get("hedge") is not None:
+            raise RetrievalConfigError("hedge is only supported for external providers")
+    else:
+        _validate_hedge_config(retrieval.get("hedge"))
+
     if provider == "aws_bedrock_kb":
         if not retrieval.get("knowledge_base_id") or not retrieval.get("region"):
             raise RetrievalConfigError("knowledge_base_id and region are required")
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import orjson
+
+from nexusrag.core.config import get_settings
+from nexusrag.services.caching import AsyncLRUCache
+from nexusrag.services.resilience import get_resilience_redis
+from nexusrag.services.telemetry import increment_counter
+
+logger = logging.getLogger(__name__)
+
+# Wait between reconnect attempts when the invalidation subscription drops.
+_LISTENER_RETRY_S = 5.0
+
+CorpusConfigKey = tuple[str, str]
+
+
+class CorpusConfigCache:
+    """Parsed retrieval configs keyed by (tenant_id, corpus_id).
+
+    Holds only the validated `retrieval` block; corpus_version is still read
+    per request because ingestion and grant changes bump it far more often
+    than configs change. Entries are dropped explicitly on corpus PATCH (here
+    and, through Redis pub/sub, on every other replica); the TTL bounds
+    staleness when an invalidation message is missed. A load that raced an
+    invalidation is not stored: callers take generation() before reading the
+    row and pass it to put().
+    """
+
+    def __init__(self, *, max_entries: int, ttl_s: float) -> None:
+        # Every entry weighs 1, so the byte ceiling doubles as an entry cap.
+        self._local: AsyncLRUCache[CorpusConfigKey, dict[str, Any]] = AsyncLRUCache(
+            max_bytes=max_entries if ttl_s > 0 else 0,
+            ttl_s=ttl_s,
+            size_of=lambda _key, _value: 1,
+        )
+        self._generation = 0
+
+    def get(self, tenant_id: str, corpus_id: str) -> dict[str, Any] | None:
+        retrieval = self._local.get((tenant_id, corpus_id))
+        increment_counter("corpus_config_cache.hits" if retrieval is not None else "corpus_config_cache.misses")
+        return retrieval
+
+    def generation(self) -> int:
+        return self._generation
+
+    def put(self, tenant_id: str, corpus_id: str, retrieval: dict[str, Any], *, generation: int) -> None:
+        if generation == self._generation:
+            self._local.put((tenant_id, corpus_id), retrieval)
+
+    def discard(self, tenant_id: str, corpus_id: str) -> None:
+        self._generation += 1
+        self._local.discard((tenant_id, corpus_id))
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._local.clear()
+
+    def size(self) -> int:
+        return self._local.stats().entries
+
+
+_corpus_config_cache: CorpusConfigCache | None = None
+
+
+def get_corpus_config_cache() -> CorpusConfigCache:
+    # Built lazily so CORPUS_CONFIG_CACHE_* settings are read at first use.
+    global _corpus_config_cache
+    if _corpus_config_cache is None:
+        settings = get_settings()
+        _corpus_config_cache = CorpusConfigCache(
+            max_entries=settings.corpus_config_cache_max_entries,
+            ttl_s=settings.corpus_config_cache_ttl_s,
+        )
+    return _corpus_config_cache
+
+
+def reset_corpus_config_cache() -> None:
+    # Drop cached configs (tests, operational flushes).
+    global _corpus_config_cache
+    _corpus_config_cache = None
+
+
+async def invalidate_corpus_config(tenant_id: str, corpus_id: str) -> None:
+    # Call after the config change commits so no replica can reload the old row.
+    get_corpus_config_cache().discard(tenant_id, corpus_id)
+    redis = await get_resilience_redis()
+    if redis is None:
+        return
+    message = orjson.dumps({"tenant_id": tenant_id, "corpus_id": corpus_id}).decode("utf-8")
+    try:
+        await redis.publish(get_settings().corpus_config_cache_channel, message)
+    except Exception as exc:  # noqa: BLE001 - peers fall back to the TTL
+        increment_counter("corpus_config_cache.publish_failed")
+        logger.warning("corpus_config_invalidation_publish_failed", exc_info=exc)
+
+
+def apply_invalidation_message(data: Any) -> None:
+    # Malformed payloads flush everything rather than risk keeping a stale entry.
+    try:
+        payload = orjson.loads(data)
+        key = (str(payload["tenant_id"]), str(payload["corpus_id"]))
+    except (orjson.JSONDecodeError, KeyError, TypeError) as exc:
+        logger.warning("corpus_config_invalidation_malformed", exc_info=exc)
+        get_corpus_config_cache().clear()
+        return
+    get_corpus_config_cache().discard(*key)
+    increment_counter("corpus_config_cache.invalidations")
+
+
+async def run_corpus_config_listener() -> None:
+    """Drop cached corpus configs when any replica publishes a change.
+
+    Runs for the lifetime of the API process. Messages sent while the
+    subscription is down are lost, so the local cache is flushed on every
+    (re)subscribe; until Redis comes back, entries expire by TTL.
+    """
+    channel = get_settings().corpus_config_cache_channel
+    while True:
+        redis = await get_resilience_redis()
+        if redis is None:
+            await asyncio.sleep(_LISTENER_RETRY_S)
+            continue
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+            get_corpus_config_cache().clear()
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    apply_invalidation_message(message.get("data"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001 - keep retrying; the TTL bounds staleness meanwhile
+            logger.warning("corpus_config_listener_failed", exc_info=exc)
+        finally:
+            try:
+                await pubsub.reset()
+            except Exception:  # noqa: BLE001 - connection is already broken
+                pass
+        await asyncio.sleep(_LISTENER_RETRY_S)
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import json
+from typing import Annotated, Any, Literal, Union
+
+import orjson
+from pydantic import BaseModel, Field, StrictBool, StrictFloat, StrictInt, StrictStr, field_validator, model_validator
+from sqlalchemy import String, Table, and_, bindparam, func, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, JSONPATH
+from sqlalchemy.sql.elements import ColumnElement
+
+# Filters are ANDed; each one tests a key of the document's metadata_json.
+MAX_FILTERS = 16
+MAX_IN_VALUES = 100
+# Reserved key matched against chunks.document_id rather than document metadata.
+DOCUMENT_ID_KEY = "document_id"
+RANGE_BOUNDS = ("gt", "gte", "lt", "lte")
+_BOUND_OPERATORS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+FilterScalar = Union[StrictBool, StrictInt, StrictFloat, StrictStr]
+FilterKey = Annotated[str, Field(min_length=1, max_length=64, pattern=r"^[A-Za-z0-9_.:-]+$")]
+RangeBound = Union[StrictInt, StrictFloat, StrictStr]
+
+
+class _FilterBase(BaseModel):
+    key: FilterKey
+
+    model_config = {"extra": "forbid", "frozen": True}
+
+
+class EqFilter(_FilterBase):
+    op: Literal["eq"]
+    value: FilterScalar
+
+    @model_validator(mode="after")
+    def _document_id_is_text(self) -> "EqFilter":
+        if self.key == DOCUMENT_ID_KEY and not isinstance(self.value, str):
+            raise ValueError("document_id filters take string values")
+        return self
+
+
+class InFilter(_FilterBase):
+    op: Literal["in"]
+    values: list[FilterScalar] = Field(min_length=1, max_length=MAX_IN_VALUES)
+
+    @model_validator(mode="after")
+    def _document_id_is_text(self) -> "InFilter":
+        if self.key == DOCUMENT_ID_KEY and not all(isinstance(value, str) for value in self.values):
+            raise ValueError("document_id filters take string values")
+        return self
+
+
+class RangeFilter(_FilterBase):
+    """Bounded comparison; ISO-8601 strings compare as dates because they sort lexically."""
+
+    op: Literal["range"]
+    gt: RangeBound | None = None
+    gte: RangeBound | None = None
+    lt: RangeBound | None = None
+    lte: RangeBound | None = None
+
+    @field_validator("key")
+    @classmethod
+    def _not_document_id(cls, key: str) -> str:
+        if key == DOCUMENT_ID_KEY:
+            raise ValueError("document_id supports eq and in only")
+        return key
+
+    @model_validator(mode="after")
+    def _bounds_share_a_type(self) -> "RangeFilter":
+        bounds = list(self.bounds().values())
+        if not bounds:
+            raise ValueError("range filters need at least one of gt, gte, lt, lte")
+        if len({isinstance(bound, str) for bound in bounds}) > 1:
+            raise ValueError("range bounds must be all numbers or all strings")
+        return self
+
+    def bounds(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in RANGE_BOUNDS if getattr(self, name) is not None}
+
+    def value_type(self) -> str:
+        # jsonb_typeof name the stored value must have for the comparison to apply.
+        return "string" if isinstance(next(iter(self.bounds().values())), str) else "number"
+
+
+class ExistsFilter(_FilterBase):
+    op: Literal["exists"]
+
+    @field_validator("key")
+    @classmethod
+    def _not_document_id(cls, key: str) -> str:
+        if key == DOCUMENT_ID_KEY:
+            raise ValueError("document_id supports eq and in only")
+        return key
+
+
+MetadataFilter = Annotated[Union[EqFilter, InFilter, RangeFilter, ExistsFilter], Field(discriminator="op")]
+MetadataFilters = list[MetadataFilter]
+# Hashable SQL shape of a filter list; values are bound separately so one shape
+# maps to one cached, prepared statement.
+FilterShape = tuple[tuple[Any, ...], ...]
+
+
+def filter_shape(filters: MetadataFilters | None) -> FilterShape:
+    shape: list[tuple[Any, ...]] = []
+    for item in filters or []:
+        if item.key == DOCUMENT_ID_KEY:
+            shape.append(("document_id",))
+        elif isinstance(item, InFilter):
+            shape.append(("in", len(item.values)))
+        elif isinstance(item, RangeFilter):
+            shape.append(("range", tuple(item.bounds())))
+        else:
+            shape.append((item.op,))
+    return tuple(shape)
+
+
+def filter_params(filters: MetadataFilters | None) -> dict[str, Any]:
+    # Bind names follow filter position, matching filter_clauses for the same shape.
+    params: dict[str, Any] = {}
+    for index, item in enumerate(filters or []):
+        name = f"mf{index}"
+        if item.key == DOCUMENT_ID_KEY:
+            params[name] = [item.value] if isinstance(item, EqFilter) else list(item.values)
+        elif isinstance(item, EqFilter):
+            params[name] = {item.key: item.value}
+        elif isinstance(item, InFilter):
+            for position, value in enumerate(item.values):
+                params[f"{name}_{position}"] = {item.key: value}
+        elif isinstance(item, RangeFilter):
+            params[f"{name}_key"] = item.key
+            params[f"{name}_type"] = item.value_type()
+            for bound, value in item.bounds().items():
+                params[f"{name}_{bound}"] = value
+        else:
+            # json.dumps quoting is valid jsonpath member syntax for any key.
+            params[name] = f"$.{json.dumps(item.key)}"
+    return params
+
+
+def filter_clauses(shape: FilterShape, chunks: Table, documents: Table) -> list[ColumnElement]:
+    """SQL predicates on chunks for a filter shape.
+
+    Metadata conditions become a semi-join on documents, whose metadata_json
+    carries a GIN jsonb_path_ops index (migration 0041): eq/in compile to @>
+    containment and exists to a @? jsonpath, both index-backed. Ranges compare
+    jsonb to jsonb-encoded bounds behind a jsonb_typeof guard, because jsonb
+    orders values of different types against each other.
+    """
+    chunk_clauses: list[ColumnElement] = []
+    document_clauses: list[ColumnElement] = []
+    metadata = documents.c.metadata_json
+    for index, (op, *args) in enumerate(shape):
+        name = f"mf{index}"
+        if op == "document_id":
+            chunk_clauses.append(chunks.c.document_id == func.any(bindparam(name, type_=ARRAY(String))))
+        elif op == "eq":
+            document_clauses.append(metadata.op("@>")(bindparam(name, type_=JSONB)))
+        elif op == "in":
+            document_clauses.append(
+                or_(*(metadata.op("@>")(bindparam(f"{name}_{position}", type_=JSONB)) for position in range(args[0])))
+            )
+        elif op == "range":
+            value = metadata.op("->", return_type=JSONB)(bindparam(f"{name}_key", type_=String))
+            document_clauses.append(
+                and_(
+                    func.jsonb_typeof(value) == bindparam(f"{name}_type", type_=String),
+                    *(
+                        value.op(_BOUND_OPERATORS[bound])(bindparam(f"{name}_{bound}", type_=JSONB))
+                        for bound in args[0]
+                    ),
+                )
+            )
+        else:
+            document_clauses.append(metadata.op("@?")(bindparam(name, type_=JSONPATH)))
+    if document_clauses:
+        matching = select(documents.c.id).where(
+            documents.c.tenant_id == bindparam("tenant_id"),
+            documents.c.corpus_id == bindparam("corpus_id"),
+            *document_clauses,
+        )
+        chunk_clauses.append(chunks.c.document_id.in_(matching))
+    return chunk_clauses
+
+
+def _matches(item: MetadataFilter, metadata: dict[str, Any]) -> bool:
+    if isinstance(item, ExistsFilter):
+        return item.key in metadata
+    if item.key not in metadata:
+        return False
+    value = metadata[item.key]
+    if isinstance(item, EqFilter):
+        return value == item.value
+    if isinstance(item, InFilter):
+        return value in item.values
+    expected = str if item.value_type() == "string" else (int, float)
+    if not isinstance(value, expected) or isinstance(value, bool):
+        return False
+    checks = {"gt": value.__gt__, "gte": value.__ge__, "lt": value.__lt__, "lte": value.__le__}
+    return all(checks[bound](limit) for bound, limit in item.bounds().items())
+
+
+def matches(filters: MetadataFilters | None, metadata: dict[str, Any] | None) -> bool:
+    # Post-filter for provider results when a condition could not be pushed down.
+    return all(_matches(item, metadata or {}) for item in filters or [])
+
+
+def cache_token(filters: MetadataFilters | None) -> str:
+    # Canonical encoding so equivalent filter lists share a retrieval cache entry.
+    if not filters:
+        return ""
+    return orjson.dumps([item.model_dump(exclude_none=True) for item in filters], option=orjson.OPT_SORT_KEYS).decode()
+
+
+def bedrock_filter(filters: MetadataFilters | None) -> tuple[dict[str, Any] | None, MetadataFilters]:
+    """Translate filters to a Bedrock KB RetrievalFilter.
+
+    Returns (filter, residual); Bedrock has no key-exists operator, so those
+    conditions come back as residual for the caller to apply to results.
+    """
+    clauses: list[dict[str, Any]] = []
+    residual: MetadataFilters = []
+    for item in filters or []:
+        if isinstance(item, EqFilter):
+            clauses.append({"equals": {"key": item.key, "value": item.value}})
+        elif isinstance(item, InFilter):
+            clauses.append({"in": {"key": item.key, "value": list(item.values)}})
+        elif isinstance(item, RangeFilter) and item.value_type() == "number":
+            names = {"gt": "greaterThan", "gte": "greaterThanOrEquals", "lt": "lessThan", "lte": "lessThanOrEquals"}
+            clauses.extend({names[bound]: {"key": item.key, "value": value}} for bound, value in item.bounds().items())
+        else:
+            residual.append(item)
+    if not clauses:
+        return None, residual
+    # andAll needs at least two members.
+    return (clauses[0] if len(clauses) == 1 else {"andAll": clauses}), residual
+
+
+def _vertex_literal(value: Any) -> str:
+    return json.dumps(value) if isinstance(value, str) else repr(value)
+
+
+def vertex_filter(filters: MetadataFilters | None) -> tuple[str | None, MetadataFilters]:
+    """Translate filters to a Discovery Engine filter expression.
+
+    Returns (expression, residual). Text fields match with ANY(), numbers
+    compare directly; booleans, string ranges and key-exists checks are not
+    expressible and come back as residual.
+    """
+    clauses: list[str] = []
+    residual: MetadataFilters = []
+    for item in filters or []:
+        values = [item.value] if isinstance(item, EqFilter) else item.values if isinstance(item, InFilter) else []
+        if values and all(isinstance(value, str) for value in values):
+            clauses.append(f"{item.key}: ANY({', '.join(_vertex_literal(value) for value in values)})")
+        elif (
+            values
+            and len(values) == 1
+            and isinstance(values[0], (int, float))
+            and not isinstance(values[0], bool)
+        ):
+            clauses.append(f"{item.key} = {values[0]!r}")
+        elif isinstance(item, RangeFilter) and item.value_type() == "number":
+            clauses.extend(
+                f"{item.key} {_BOUND_OPERATORS[bound]} {value!r}" for bound, value in item.bounds().items()
+            )
+        else:
+            residual.append(item)
+    return (" AND ".join(clauses) or None), residual
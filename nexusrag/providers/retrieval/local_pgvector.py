@@ -1,57 +1,566 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
+from sqlalchemy import (
+    BindParameter,
+    Float,
+    Select,
+    String,
+    Subquery,
+    and_,
+    bindparam,
+    cast,
+    exists,
+    func,
+    literal_column,
+    select,
+    text,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from nexusrag.core.config import EMBED_DIM
+from nexusrag.core.config import EMBED_DIM, get_settings
 from nexusrag.core.errors import RetrievalError
-from nexusrag.domain.models import Chunk
-from nexusrag.ingestion.embeddings import embed_text
+from nexusrag.domain.models import Chunk, ChunkEmbeddingShadow, Document
+from nexusrag.ingestion.embeddings import embed_query, get_embedding_provider, truncate_embedding
+from nexusrag.persistence.repos import chunks as chunks_repo
+from nexusrag.persistence.repos.chunks import embedding_column_name
+from nexusrag.providers.retrieval.config import (
+    ANN_EF_SEARCH_RANGE,
+    DEFAULT_HYBRID_CANDIDATES,
+    DEFAULT_RETRIEVAL_MODE,
+    DEFAULT_RRF_K,
+    VECTOR_GENERATION_KEY,
+    corpus_embedding_dim,
+    corpus_embedding_model,
+)
+from nexusrag.providers.retrieval.filters import (
+    FilterShape,
+    MetadataFilters,
+    filter_clauses,
+    filter_params,
+    filter_shape,
+)
+from nexusrag.services.authz.retrieval import RetrievalAccess, access_clauses
+
+# Must match the generated chunks.text_tsv column (migration 0034) so the GIN index applies.
+TEXT_SEARCH_CONFIG = "english"
+_QUERY_TERM_RE = re.compile(r"\w+")
+# Retrieval reads plain column tuples from the Core table: no Chunk instances,
+# identity-map entries, or embedding decodes per hit.
+_CHUNKS = Chunk.__table__
+_DOCUMENTS = Document.__table__
+_SHADOWS = ChunkEmbeddingShadow.__table__
+AccessShape = tuple[bool, Any]
+# The only chunk columns a hit returns; the embedding never leaves Postgres.
+RESULT_COLUMNS = ("text", "document_uri", "metadata_json", "document_id")
+# Whether chunks is LIST-partitioned by corpus. Migration 0040 fixes the layout,
+# whatever CHUNKS_PARTITION_BY_CORPUS says now, so it is read once per process.
+_chunks_partitioned: bool | None = None
+
+
+async def chunks_partitioned(session: AsyncSession) -> bool:
+    global _chunks_partitioned
+    if _chunks_partitioned is None:
+        _chunks_partitioned = await chunks_repo.is_partitioned(session)
+    return _chunks_partitioned
+
+
+@dataclass(frozen=True)
+class AnnSearchParams:
+    ef_search: int
+    probes: int | None
+    exact_scan_threshold: int
+
+
+def resolve_ann_params(retrieval_config: dict[str, Any] | None) -> AnnSearchParams:
+    # Merge per-corpus overrides (retrieval.ann) over deployment defaults.
+    settings = get_settings()
+    ann = (retrieval_config or {}).get("ann") or {}
+    ef_search = ann.get("ef_search")
+    threshold = ann.get("exact_scan_threshold")
+    return AnnSearchParams(
+        ef_search=int(ef_search if ef_search is not None else settings.retrieval_ann_ef_search),
+        probes=ann.get("probes"),
+        exact_scan_threshold=int(
+            threshold if threshold is not None else settings.retrieval_exact_scan_max_chunks
+        ),
+    )
+
+
+@dataclass(frozen=True)
+class HybridParams:
+    rrf_k: int
+    candidates: int
+
+
+def resolve_hybrid_params(retrieval_config: dict[str, Any] | None) -> HybridParams | None:
+    # None means plain vector mode; hybrid knobs fall back to module defaults.
+    config = retrieval_config or {}
+    if (config.get("mode") or DEFAULT_RETRIEVAL_MODE) != "hybrid":
+        return None
+    hybrid = config.get("hybrid") or {}
+    return HybridParams(
+        rrf_k=int(hybrid.get("rrf_k") or DEFAULT_RRF_K),
+        candidates=int(hybrid.get("candidates") or DEFAULT_HYBRID_CANDIDATES),
+    )
+
+
+@dataclass(frozen=True)
+class QuantizationParams:
+    type: str
+    oversample: int
+
+
+def resolve_quantization_params(retrieval_config: dict[str, Any] | None) -> QuantizationParams | None:
+    # None keeps the full-precision HNSW index; oversample falls back to the deployment default.
+    quantization = (retrieval_config or {}).get("quantization")
+    if not quantization:
+        return None
+    oversample = quantization.get("oversample")
+    return QuantizationParams(
+        type=quantization["type"],
+        oversample=int(oversample if oversample is not None else get_settings().retrieval_quantization_oversample),
+    )
+
+
+def quantized_distance(quantization_type: str, embedding: Any, query_embedding: Any) -> Any:
+    # Expressions must match the migration 0038 index definitions for the planner to use them.
+    if quantization_type == "halfvec":
+        return cast(embedding, HALFVEC(EMBED_DIM)).cosine_distance(cast(query_embedding, HALFVEC(EMBED_DIM)))
+    # Hamming distance between sign bits; a coarse filter that needs a wider shortlist.
+    return cast(func.binary_quantize(embedding), BIT(EMBED_DIM)).hamming_distance(
+        cast(func.binary_quantize(query_embedding), BIT(EMBED_DIM))
+    )
+
+
+def _scope(filters: FilterShape = (), access: AccessShape | None = None) -> tuple[Any, ...]:
+    # The corpus predicate also prunes a partitioned chunks table to one partition;
+    # the tenant predicate keeps a mis-scoped corpus id from reading another tenant's rows.
+    # Metadata filters and document access checks sit inside every candidate scan,
+    # before its LIMIT, so neither thins the top_k. A reindex writes its chunk
+    # generation alongside the live one, so rows outside documents.active_generation
+    # are skipped; chunks without a document have no generations.
+    return (
+        _CHUNKS.c.corpus_id == bindparam("corpus_id"),
+        _CHUNKS.c.tenant_id == bindparam("tenant_id"),
+        ~exists().where(
+            _DOCUMENTS.c.id == _CHUNKS.c.document_id,
+            _DOCUMENTS.c.active_generation != _CHUNKS.c.generation,
+        ),
+        *filter_clauses(filters, _CHUNKS, _DOCUMENTS),
+        *access_clauses(access, _CHUNKS),
+    )
+
+
+def _query_embedding_param(embedding_dim: int = EMBED_DIM) -> BindParameter:
+    return bindparam("query_embedding", type_=Vector(embedding_dim))
+
+
+def generation_vectors(vector_generation_id: str, embedding_dim: int) -> tuple[Any, Any]:
+    # (from clause, embedding) for a generation served from chunk_embedding_shadows.
+    # The literal id and the cast repeat its partial HNSW index definition
+    # (embedding_generations.ensure_vector_index); a bind would hide the predicate
+    # from the planner. The id is parsed as a uuid before it is inlined.
+    generation = literal_column(f"'{UUID(vector_generation_id)}'")
+    source = _CHUNKS.join(
+        _SHADOWS, and_(_SHADOWS.c.chunk_id == _CHUNKS.c.id, _SHADOWS.c.generation_id == generation)
+    )
+    return source, cast(_SHADOWS.c.embedding, Vector(embedding_dim))
+
+
+def _embedding_source(
+    quantization_type: str | None,
+    filters: FilterShape,
+    access: AccessShape | None,
+    query_embedding: BindParameter,
+    embedding_dim: int,
+    vector_generation_id: str | None,
+    *columns: str,
+) -> tuple[Any, Any, Any]:
+    # (row source, from clause, embedding) for the candidate scan: the corpus's own
+    # dimension column, the embedding generation the corpus points at, or a
+    # quantised shortlist of native vectors.
+    if vector_generation_id is not None:
+        from_clause, embedding = generation_vectors(vector_generation_id, embedding_dim)
+        return _CHUNKS, from_clause, embedding
+    if quantization_type is None:
+        return _CHUNKS, _CHUNKS, _CHUNKS.c[embedding_column_name(embedding_dim)]
+    source = _shortlist(quantization_type, filters, access, query_embedding, *columns)
+    return source, source, source.c.embedding
+
+
+def _shortlist(
+    quantization_type: str,
+    filters: FilterShape,
+    access: AccessShape | None,
+    query_embedding: BindParameter,
+    *columns: str,
+) -> Subquery:
+    # Over-fetch from the quantised index. Callers re-rank on the subquery's own
+    # embedding column, so the outer ORDER BY cannot fall back to the full-precision index.
+    distance_expr = quantized_distance(quantization_type, _CHUNKS.c.embedding, query_embedding)
+    return (
+        select(_CHUNKS.c.id, _CHUNKS.c.embedding, *(_CHUNKS.c[name] for name in columns))
+        .where(*_scope(filters, access))
+        .order_by(distance_expr.asc(), _CHUNKS.c.id.asc())
+        .limit(bindparam("shortlist_limit"))
+        .subquery("quantized_shortlist")
+    )
+
+
+def hit_metadata(
+    chunk_metadata: dict[str, Any] | None,
+    filename: str | None,
+    content_type: str | None,
+    document_metadata: dict[str, Any] | None,
+) -> dict[str, Any]:
+    # Rebuild the per-hit metadata shape from chunk-local offsets plus the
+    # documents row. Chunks without a document (benchmark fixtures) and rows
+    # written before migration 0039 keep whatever they stored.
+    if filename is None:
+        return dict(chunk_metadata or {})
+    metadata: dict[str, Any] = {"filename": filename, "content_type": content_type, **(chunk_metadata or {})}
+    if document_metadata:
+        metadata["document_metadata"] = document_metadata
+    return metadata
+
+
+def _with_documents(top_hits: Subquery, score_column: str, *, descending: bool) -> Select:
+    # Document-level fields are joined only for the top_k rows, after the limit.
+    score = top_hits.c[score_column]
+    return (
+        select(
+            top_hits.c.text,
+            top_hits.c.document_uri,
+            top_hits.c.metadata_json,
+            _DOCUMENTS.c.filename,
+            _DOCUMENTS.c.content_type,
+            _DOCUMENTS.c.metadata_json.label("document_metadata"),
+            score,
+        )
+        .select_from(top_hits.outerjoin(_DOCUMENTS, _DOCUMENTS.c.id == top_hits.c.document_id))
+        .order_by(score.desc() if descending else score.asc(), top_hits.c.id.asc())
+    )
+
+
+# Bounded: filter shapes come from requests, so the set of shapes is open-ended.
+@lru_cache(maxsize=256)
+def vector_statement(
+    quantization_type: str | None,
+    filters: FilterShape = (),
+    access: AccessShape | None = None,
+    embedding_dim: int = EMBED_DIM,
+    vector_generation_id: str | None = None,
+) -> Select:
+    """Projection-only vector query for one statement shape.
+
+    Binds: tenant_id, corpus_id, query_embedding, top_k, plus shortlist_limit when
+    quantised and the filter_params / RetrievalAccess.params binds.
+    Each shape is built once, so SQLAlchemy reuses its compiled form and asyncpg
+    sees identical SQL it can serve from the connection's prepared statements.
+    A vector_generation_id reads that embedding generation's shadow vectors;
+    it is never combined with quantisation.
+    """
+    query_embedding = _query_embedding_param(embedding_dim)
+    source, from_clause, embedding = _embedding_source(
+        quantization_type, filters, access, query_embedding, embedding_dim, vector_generation_id, *RESULT_COLUMNS
+    )
+    # Use cosine distance from pgvector; lower is more similar.
+    distance_expr = embedding.cosine_distance(query_embedding)
+    stmt = select(
+        source.c.id, *(source.c[name] for name in RESULT_COLUMNS), distance_expr.label("distance")
+    ).select_from(from_clause)
+    if quantization_type is None:
+        stmt = stmt.where(*_scope(filters, access))
+    # Secondary ordering keeps tie-breaking deterministic.
+    top_hits = stmt.order_by(distance_expr.asc(), source.c.id.asc()).limit(bindparam("top_k")).subquery("top_hits")
+    return _with_documents(top_hits, "distance", descending=False)
+
+
+@lru_cache(maxsize=256)
+def hybrid_statement(
+    quantization_type: str | None,
+    lexical: bool,
+    filters: FilterShape = (),
+    access: AccessShape | None = None,
+    embedding_dim: int = EMBED_DIM,
+    vector_generation_id: str | None = None,
+) -> Select:
+    """Projection-only hybrid (vector + lexical RRF) query for one statement shape.
+
+    Binds: tenant_id, corpus_id, query_embedding, candidates, rrf_k, top_k, plus
+    lexical_query when lexical, shortlist_limit when quantised and the
+    filter_params / RetrievalAccess.params binds.
+    """
+    # Fuse vector and lexical candidate ranks with RRF in one statement so
+    # hybrid retrieval costs a single round trip.
+    query_embedding = _query_embedding_param(embedding_dim)
+    candidates = bindparam("candidates")
+    rrf_k = bindparam("rrf_k", type_=Float)
+    source, from_clause, embedding = _embedding_source(
+        quantization_type, filters, access, query_embedding, embedding_dim, vector_generation_id
+    )
+    distance_expr = embedding.cosine_distance(query_embedding)
+    vector_stmt = select(source.c.id.label("id"), distance_expr.label("distance")).select_from(from_clause)
+    if quantization_type is None:
+        vector_stmt = vector_stmt.where(*_scope(filters, access))
+    vector_candidates = (
+        vector_stmt.order_by(distance_expr.asc(), source.c.id.asc())
+        .limit(candidates)
+        .subquery("vector_candidates")
+    )
+    vector_ranked = select(
+        vector_candidates.c.id,
+        func.row_number()
+        .over(order_by=(vector_candidates.c.distance.asc(), vector_candidates.c.id.asc()))
+        .label("rank"),
+    ).cte("vector_ranked")
+
+    fused_score = func.coalesce(1.0 / (rrf_k + vector_ranked.c.rank), 0.0)
+    fused_id = vector_ranked.c.id
+    fused_source: Any = vector_ranked
+    if lexical:
+        ts_query = func.to_tsquery(
+            literal_column(f"'{TEXT_SEARCH_CONFIG}'"), bindparam("lexical_query", type_=String)
+        )
+        # Cover-density ranking rewards chunks where matched terms sit close together.
+        lexical_score = func.ts_rank_cd(_CHUNKS.c.text_tsv, ts_query)
+        lexical_candidates = (
+            select(_CHUNKS.c.id.label("id"), lexical_score.label("lexical_score"))
+            .where(*_scope(filters, access), _CHUNKS.c.text_tsv.op("@@")(ts_query))
+            .order_by(lexical_score.desc(), _CHUNKS.c.id.asc())
+            .limit(candidates)
+            .subquery("lexical_candidates")
+        )
+        lexical_ranked = select(
+            lexical_candidates.c.id,
+            func.row_number()
+            .over(
+                order_by=(
+                    lexical_candidates.c.lexical_score.desc(),
+                    lexical_candidates.c.id.asc(),
+                )
+            )
+            .label("rank"),
+        ).cte("lexical_ranked")
+        fused_score = fused_score + func.coalesce(1.0 / (rrf_k + lexical_ranked.c.rank), 0.0)
+        fused_id = func.coalesce(vector_ranked.c.id, lexical_ranked.c.id)
+        fused_source = vector_ranked.join(
+            lexical_ranked, vector_ranked.c.id == lexical_ranked.c.id, full=True
+        )
+
+    fused = select(fused_id.label("id"), fused_score.label("fused")).select_from(fused_source).cte("fused")
+    top_hits = (
+        select(_CHUNKS.c.id, *(_CHUNKS.c[name] for name in RESULT_COLUMNS), fused.c.fused)
+        .select_from(_CHUNKS.join(fused, fused.c.id == _CHUNKS.c.id))
+        .order_by(fused.c.fused.desc(), _CHUNKS.c.id.asc())
+        .limit(bindparam("top_k"))
+        .subquery("top_hits")
+    )
+    return _with_documents(top_hits, "fused", descending=True)
+
+
+def lexical_query_text(query: str) -> str | None:
+    # OR the query terms so partial matches still rank; AND semantics would drop
+    # any chunk missing a single word. \w+ terms never need tsquery quoting.
+    terms = list(dict.fromkeys(term.lower() for term in _QUERY_TERM_RE.findall(query)))
+    if not terms:
+        return None
+    return " | ".join(terms)
 
 
 class LocalPgVectorRetriever:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        retrieval_config: dict[str, Any] | None = None,
+        access: RetrievalAccess | None = None,
+    ) -> None:
         self._session = session
+        # None skips document-level authorization (benchmarks, internal callers).
+        self._access = access
+        self._ann = resolve_ann_params(retrieval_config)
+        self._hybrid = resolve_hybrid_params(retrieval_config)
+        self._quantization = resolve_quantization_params(retrieval_config)
+        # Matryoshka width; selects the chunks column the corpus was ingested into.
+        self._embedding_dim = corpus_embedding_dim({"retrieval": retrieval_config or {}})
+        # Queries must be embedded in the same space as the corpus's active embedding generation.
+        self._embedding_model = corpus_embedding_model({"retrieval": retrieval_config or {}})
+        # Set by the router while the corpus serves a generation from chunk_embedding_shadows.
+        self._vector_generation_id = (retrieval_config or {}).get(VECTOR_GENERATION_KEY)
+        # Expose the chosen scan strategy for benchmarks and debug output.
+        self.last_scan: str | None = None
 
-    async def retrieve(self, tenant_id: str, corpus_id: str, query: str, top_k: int) -> list[dict]:
-        # tenant_id is unused for local retrieval but kept for a consistent interface.
-        query_embedding = embed_text(query)
+    async def retrieve(
+        self,
+        tenant_id: str,
+        corpus_id: str,
+        query: str,
+        top_k: int,
+        filters: MetadataFilters | None = None,
+    ) -> list[dict]:
+        query_embedding = await embed_query(query, provider=get_embedding_provider(*self._embedding_model))
         if len(query_embedding) != EMBED_DIM:
             # Retrieval must fail fast if the embedding dimension doesn't match the schema.
             raise RetrievalError("query embedding dimension mismatch")
+        query_embedding = truncate_embedding(query_embedding, self._embedding_dim)
 
         # Clamp to a small, deterministic range to avoid unbounded queries in dev.
         top_k = max(1, min(int(top_k), 20))
-        # Use cosine distance from pgvector; lower is more similar.
-        distance_expr = Chunk.embedding.cosine_distance(query_embedding)
-
-        stmt = (
-            select(Chunk, distance_expr.label("distance"))
-            .where(Chunk.corpus_id == corpus_id)
-            # Secondary ordering keeps tie-breaking deterministic.
-            .order_by(distance_expr.asc(), Chunk.id.asc())
-            .limit(top_k)
-        )
 
         try:
-            result = await self._session.execute(stmt)
+            exact = await self._use_exact_scan(corpus_id)
+            # Exact scans already read full-precision vectors, so quantisation only shapes the ANN path;
+            # the quantised indexes cover the chunks column, not a shadow generation.
+            quantized = self._quantization is not None and not exact and self._vector_generation_id is None
+            stmt, params = self._statement(
+                tenant_id, corpus_id, query, query_embedding, top_k, quantized=quantized, filters=filters
+            )
+            # Unless chunks is partitioned by corpus, the ANN index spans every corpus and the
+            # corpus/tenant scope is itself a post-scan filter that can leave fewer than top_k
+            # rows, so it needs iterative scans just like metadata filters and document ACLs.
+            filtered = (
+                bool(filters)
+                or (self._access is not None and self._access.restricts)
+                or not await chunks_partitioned(self._session)
+            )
+            # The caller may have turned index scans off itself, so restore its value rather than "on".
+            previous_indexscan = await self._current_setting("enable_indexscan") if exact else None
+            await self._apply_search_params(exact=exact, top_k=top_k, filtered=filtered)
+            result = await self._session.execute(stmt, params)
             rows = result.all()
+            # Only after success: a failed statement aborts the transaction, which rejects further statements.
+            if previous_indexscan is not None:
+                await self._set_local("enable_indexscan", previous_indexscan)
         except SQLAlchemyError as exc:
             # Convert DB errors into a controlled retrieval error for SSE mapping.
             raise RetrievalError("pgvector query failed") from exc
+        self.last_scan = "exact" if exact else "ann"
 
         items: list[dict] = []
-        for chunk, distance in rows:
-            # Convert cosine distance to similarity and clamp to a sane [0, 1] range.
-            score = 1.0 - float(distance)
+        for chunk_text, document_uri, metadata_json, filename, content_type, document_metadata, raw_score in rows:
+            if self._hybrid is not None:
+                # Normalize fused RRF by its ceiling (rank 1 in both lists).
+                score = float(raw_score) * (self._hybrid.rrf_k + 1) / 2.0
+            else:
+                # Convert cosine distance to similarity.
+                score = 1.0 - float(raw_score)
+            # Clamp to a sane [0, 1] range.
             score = max(0.0, min(1.0, score))
             items.append(
                 {
-                    "text": chunk.text,
+                    "text": chunk_text,
                     "score": score,
-                    "source": chunk.document_uri,
-                    "metadata": chunk.metadata_json or {},
+                    "source": document_uri,
+                    "metadata": hit_metadata(metadata_json, filename, content_type, document_metadata),
                 }
             )
         return items
+
+    def _statement(
+        self,
+        tenant_id: str,
+        corpus_id: str,
+        query: str,
+        query_embedding: list[float],
+        top_k: int,
+        *,
+        quantized: bool,
+        filters: MetadataFilters | None = None,
+    ) -> tuple[Select, dict[str, Any]]:
+        # Pick the cached statement shape and bind this query's values to it.
+        quantization_type = self._quantization.type if quantized and self._quantization else None
+        shape = filter_shape(filters)
+        params: dict[str, Any] = {
+            "tenant_id": tenant_id,
+            "corpus_id": corpus_id,
+            "query_embedding": query_embedding,
+            "top_k": top_k,
+            **filter_params(filters),
+            **(self._access.params() if self._access is not None else {}),
+        }
+        access = self._access_shape()
+        shortlist_base = top_k
+        if self._hybrid is None:
+            stmt = vector_statement(
+                quantization_type, shape, access, self._embedding_dim, self._vector_generation_id
+            )
+        else:
+            candidates = max(self._hybrid.candidates, top_k)
+            lexical_text = lexical_query_text(query)
+            stmt = hybrid_statement(
+                quantization_type,
+                lexical_text is not None,
+                shape,
+                access,
+                self._embedding_dim,
+                self._vector_generation_id,
+            )
+            params.update(candidates=candidates, rrf_k=float(self._hybrid.rrf_k))
+            if lexical_text is not None:
+                params["lexical_query"] = lexical_text
+            shortlist_base = candidates
+        if quantization_type is not None and self._quantization is not None:
+            params["shortlist_limit"] = shortlist_base * self._quantization.oversample
+        return stmt, params
+
+    def _access_shape(self) -> AccessShape | None:
+        return self._access.shape if self._access is not None else None
+
+    async def _use_exact_scan(self, corpus_id: str) -> bool:
+        # Tiny corpora are cheaper (and exact) to scan than to walk the ANN graph.
+        threshold = self._ann.exact_scan_threshold
+        if threshold <= 0:
+            return False
+        # Bound the count so large corpora stop counting at threshold + 1 rows.
+        bounded = (
+            select(Chunk.id).where(Chunk.corpus_id == corpus_id).limit(threshold + 1).subquery()
+        )
+        result = await self._session.execute(select(func.count()).select_from(bounded))
+        return int(result.scalar_one()) <= threshold
+
+    async def _apply_search_params(self, *, exact: bool, top_k: int, filtered: bool = False) -> None:
+        if exact:
+            # Steer the planner away from the HNSW index; bitmap scans on corpus_id still apply.
+            await self._set_local("enable_indexscan", "off")
+            return
+        # Transaction-scoped settings keep per-corpus tuning from leaking across pooled connections.
+        ef_search = self._ann.ef_search
+        if self._hybrid is not None:
+            # HNSW returns at most ef_search rows, so widen it to cover the fusion candidates.
+            ef_search = max(ef_search, self._hybrid.candidates)
+        if self._quantization is not None:
+            # Likewise the quantised shortlist must fit inside one HNSW candidate list.
+            limit = max(self._hybrid.candidates, top_k) if self._hybrid is not None else top_k
+            ef_search = max(ef_search, min(limit * self._quantization.oversample, ANN_EF_SEARCH_RANGE[1]))
+        await self._set_local("hnsw.ef_search", str(ef_search))
+        if self._ann.probes is not None:
+            await self._set_local("ivfflat.probes", str(self._ann.probes))
+        iterative_scan = get_settings().retrieval_filter_iterative_scan
+        if filtered and iterative_scan != "off":
+            # A filter applied after the index scan (including the corpus scope on an
+            # unpartitioned table) can leave fewer than LIMIT rows out of ef_search
+            # candidates, starving small corpora next to large ones; iterative scans
+            # (pgvector >= 0.8) keep walking the index until enough rows pass.
+            # relaxed_order is safe because every candidate scan is re-sorted by the
+            # enclosing ORDER BY.
+            await self._set_local("hnsw.iterative_scan", iterative_scan)
+            if self._ann.probes is not None:
+                await self._set_local("ivfflat.iterative_scan", "relaxed_order")
+
+    async def _current_setting(self, name: str) -> str:
+        result = await self._session.execute(text("SELECT current_setting(:setting)"), {"setting": name})
+        return str(result.scalar())
+
+    async def _set_local(self, name: str, value: str) -> None:
+        await self._session.execute(
+            text("SELECT set_config(:name, :value, true)"),
+            {"name": name, "value": value},
+        )
@@ -1,16 +1,95 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
 from typing import Any, Callable
 
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from nexusrag.core.errors import RetrievalConfigError
-from nexusrag.persistence.repos.corpora import get_corpus_for_tenant
+from nexusrag.core.config import get_settings
+from nexusrag.core.errors import RetrievalConfigError, RetrievalError
+from nexusrag.persistence.db import SessionLocal
+from nexusrag.persistence.repos.corpora import get_corpus_for_tenant, get_corpus_version
 from nexusrag.providers.retrieval.bedrock_kb import BedrockKnowledgeBaseRetriever
-from nexusrag.providers.retrieval.config import parse_retrieval_config
+from nexusrag.providers.retrieval.cache import (
+    get_retrieval_cache,
+    retrieval_cache_key,
+    retrieval_cache_ttl,
+)
+from nexusrag.providers.retrieval.config import VECTOR_GENERATION_KEY, parse_retrieval_config
+from nexusrag.providers.retrieval.config_cache import get_corpus_config_cache
+from nexusrag.providers.retrieval.filters import MetadataFilters
 from nexusrag.providers.retrieval.local_pgvector import LocalPgVectorRetriever
 from nexusrag.providers.retrieval.vertex_ai import VertexAIRetriever
+from nexusrag.services.authz.retrieval import RetrievalAccess
 from nexusrag.services.entitlements import require_retrieval_provider
+from nexusrag.services.resilience import get_hedge_budget, hedged_call
+from nexusrag.services.telemetry import external_latency_percentile, increment_counter
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on corpora searched by one retrieve_many call.
+MAX_FANOUT_CORPORA = 8
+# Providers that query through an AsyncSession; fan-out gives each its own session.
+SESSION_BOUND_PROVIDERS = frozenset({"local_pgvector"})
+# Telemetry integration names whose live latency sets the hedge delay.
+EXTERNAL_INTEGRATIONS = {"aws_bedrock_kb": "retrieval.aws_bedrock", "gcp_vertex": "retrieval.gcp_vertex"}
+
+
+@dataclass(frozen=True)
+class _RetrievalPlan:
+    corpus_id: str
+    provider_name: str
+    retrieval: dict[str, Any]
+    corpus_version: int | None
+    top_k: int
+    # hedge.fallback once the tenant's entitlement to it is checked; None disables the fallback hedge.
+    hedge_fallback: str | None = None
+
+
+def _corpus_retrieval_config(corpus: Any) -> dict[str, Any]:
+    # Validated retrieval config plus the embedding generation the corpus serves; an
+    # embedding cutover moves that pointer and invalidates cached configs with it.
+    retrieval = parse_retrieval_config(corpus.provider_config_json)
+    vector_generation_id = getattr(corpus, "embedding_generation_id", None)
+    if vector_generation_id is not None:
+        retrieval[VECTOR_GENERATION_KEY] = vector_generation_id
+    return retrieval
+
+
+def merge_ranked(results: list[tuple[str, list[dict]]], top_k: int) -> list[dict]:
+    """Merge per-corpus hit lists into one ranking.
+
+    Provider scores are not comparable (RRF, cosine similarity, Bedrock and
+    Vertex relevance), so each list is min-max scaled to [0, 1] before merging;
+    a list with one hit or all-equal scores maps every hit to 1.0, its own
+    best, whatever scale the provider used. Hits carry their
+    corpus_id and the provider's own score as raw_score. Duplicate
+    (source, text) pairs keep their best-scored copy.
+    """
+    merged: list[tuple[float, float, int, int, dict]] = []
+    for corpus_index, (corpus_id, items) in enumerate(results):
+        raw = [float(item.get("score") or 0.0) for item in items]
+        low, high = (min(raw), max(raw)) if raw else (0.0, 0.0)
+        for rank, (item, score) in enumerate(zip(items, raw, strict=True)):
+            normalized = (score - low) / (high - low) if high > low else 1.0
+            hit = {**item, "score": normalized, "raw_score": score, "corpus_id": corpus_id}
+            merged.append((-normalized, -score, rank, corpus_index, hit))
+    merged.sort(key=lambda entry: entry[:4])
+    seen: set[tuple[Any, Any]] = set()
+    ranked: list[dict] = []
+    for *_order, hit in merged:
+        identity = (hit.get("source"), hit.get("text"))
+        if identity in seen:
+            continue
+        seen.add(identity)
+        ranked.append(hit)
+        if len(ranked) >= top_k:
+            break
+    return ranked
 
 
 class RetrievalRouter:
@@ -20,10 +99,18 @@ class RetrievalRouter:
         corpus_loader: Callable[[AsyncSession, str, str], Any] | None = None,
         provider_factories: dict[str, Callable[[dict[str, Any]], Any]] | None = None,
         entitlement_checker: Callable[..., Any] | None = None,
+        access: RetrievalAccess | None = None,
+        session_factory: Callable[[], Any] | None = None,
     ) -> None:
         self._session = session
+        # Fan-out runs session-bound providers concurrently, so each needs its own connection.
+        self._session_factory = session_factory or SessionLocal
+        # Caller's document read scope; enforced by local_pgvector and part of the cache key.
+        self._access = access
         # Expose the last provider for optional debug events without changing return types.
         self.last_provider: str | None = None
+        # Per-corpus outcome of the last retrieve_many call (ok, timeout, error).
+        self.last_fanout: dict[str, str] = {}
         # Optional override for degraded-mode routing to lower-cost providers.
         self._forced_provider: str | None = None
         # Track entitlement checks to avoid redundant gating per request.
@@ -32,8 +119,22 @@ class RetrievalRouter:
         self._entitlement_checker = entitlement_checker or require_retrieval_provider
         # Allow injecting loaders/providers for tests without hitting external systems.
         self._corpus_loader = corpus_loader or get_corpus_for_tenant
+        # Injected loaders (tests, benchmark overrides) bypass the shared corpus config cache.
+        self._cache_configs = corpus_loader is None
+        # Builders for session-bound providers on a fan-out session; injected factories opt out.
+        self._session_providers: dict[str, Callable[[dict[str, Any], AsyncSession], Any]] = (
+            {}
+            if provider_factories
+            else {
+                "local_pgvector": lambda cfg, session: LocalPgVectorRetriever(
+                    session,
+                    retrieval_config=cfg,
+                    access=self._access,
+                )
+            }
+        )
         self._provider_factories = provider_factories or {
-            "local_pgvector": lambda _cfg: LocalPgVectorRetriever(self._session),
+            "local_pgvector": lambda cfg: self._session_providers["local_pgvector"](cfg, self._session),
             "aws_bedrock_kb": lambda cfg: BedrockKnowledgeBaseRetriever(
                 knowledge_base_id=cfg["knowledge_base_id"],
                 region=cfg["region"],
@@ -51,7 +152,7 @@ class RetrievalRouter:
 
     async def resolve_provider(self, tenant_id: str, corpus_id: str) -> str:
         # Resolve the provider and enforce plan entitlements before retrieval.
-        retrieval = await self._load_retrieval_config(tenant_id, corpus_id)
+        retrieval, _corpus = await self._load_retrieval_config(tenant_id, corpus_id)
         provider_name = retrieval["provider"]
         await self._entitlement_checker(
             session=self._session,
@@ -62,8 +163,93 @@ class RetrievalRouter:
         self._entitlement_checked_provider = provider_name
         return provider_name
 
-    async def retrieve(self, tenant_id: str, corpus_id: str, query: str, top_k: int) -> list[dict]:
-        retrieval = await self._load_retrieval_config(tenant_id, corpus_id)
+    async def retrieve(
+        self,
+        tenant_id: str,
+        corpus_id: str,
+        query: str,
+        top_k: int,
+        filters: MetadataFilters | None = None,
+    ) -> list[dict]:
+        plan = await self._plan(tenant_id, corpus_id, top_k)
+        return await self._fetch(plan, self._build_provider(plan), tenant_id, query, filters)
+
+    async def retrieve_many(
+        self,
+        tenant_id: str,
+        corpus_ids: list[str],
+        query: str,
+        top_k: int,
+        filters: MetadataFilters | None = None,
+    ) -> list[dict]:
+        """Search several corpora concurrently and merge the hits into one ranking.
+
+        Corpus configs and entitlements resolve first on the request session.
+        Provider calls then share one deadline (retrieval_fanout_timeout_ms);
+        corpora that miss it are cancelled and contribute nothing, so a slow
+        provider costs its own hits rather than stalling the request. Only when
+        no corpus answers does the call fail.
+        """
+        corpus_ids = list(dict.fromkeys(corpus_ids))
+        if not corpus_ids or len(corpus_ids) > MAX_FANOUT_CORPORA:
+            raise RetrievalConfigError(f"retrieve_many takes 1 to {MAX_FANOUT_CORPORA} corpora")
+        if len(corpus_ids) == 1:
+            results = await self.retrieve(tenant_id, corpus_ids[0], query, top_k, filters=filters)
+            self.last_fanout = {corpus_ids[0]: "ok"}
+            return results
+
+        plans = [await self._plan(tenant_id, corpus_id, top_k) for corpus_id in corpus_ids]
+        tasks = {
+            asyncio.create_task(self._fetch_isolated(plan, tenant_id, query, filters)): plan for plan in plans
+        }
+        timeout_s = max(0.0, get_settings().retrieval_fanout_timeout_ms / 1000.0)
+        _done, pending = await asyncio.wait(tasks, timeout=timeout_s)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        outcomes: dict[str, str] = {}
+        answered: list[tuple[str, list[dict]]] = []
+        providers: list[str] = []
+        errors: list[BaseException] = []
+        for task, plan in tasks.items():
+            if task in pending:
+                outcomes[plan.corpus_id] = "timeout"
+                increment_counter("retrieval_fanout_timeout_total")
+                logger.warning(
+                    "retrieval fan-out deadline exceeded corpus_id=%s provider=%s",
+                    plan.corpus_id,
+                    plan.provider_name,
+                )
+                continue
+            exc = task.exception()
+            if exc is not None:
+                outcomes[plan.corpus_id] = "error"
+                increment_counter("retrieval_fanout_error_total")
+                logger.warning(
+                    "retrieval fan-out corpus failed corpus_id=%s provider=%s",
+                    plan.corpus_id,
+                    plan.provider_name,
+                    exc_info=exc,
+                )
+                errors.append(exc)
+                continue
+            outcomes[plan.corpus_id] = "ok"
+            answered.append((plan.corpus_id, task.result()))
+            if plan.provider_name not in providers:
+                providers.append(plan.provider_name)
+        self.last_fanout = outcomes
+        if not answered:
+            if errors:
+                raise errors[0]
+            raise RetrievalError("retrieval deadline exceeded")
+        self.last_provider = ",".join(providers)
+        return merge_ranked(answered, max(plan.top_k for plan in plans))
+
+    async def _plan(self, tenant_id: str, corpus_id: str, top_k: int) -> _RetrievalPlan:
+        # Resolve provider, entitlement and effective top_k; touches only the request session.
+        retrieval, corpus = await self._load_retrieval_config(tenant_id, corpus_id)
         provider_name = self._forced_provider or retrieval["provider"]
         if self._entitlement_checked_provider != provider_name:
             await self._entitlement_checker(
@@ -71,8 +257,7 @@ class RetrievalRouter:
                 tenant_id=tenant_id,
                 provider_name=provider_name,
             )
-        provider_factory = self._provider_factories.get(provider_name)
-        if provider_factory is None:
+        if provider_name not in self._provider_factories:
             raise RetrievalConfigError("retrieval provider not registered")
 
         effective_top_k = top_k or retrieval.get("top_k_default") or 5
@@ -81,12 +266,172 @@ class RetrievalRouter:
 
         # Track provider selection for optional debug output downstream.
         self.last_provider = provider_name
-        provider = provider_factory(retrieval)
-        return await provider.retrieve(tenant_id, corpus_id, query, effective_top_k)
+        return _RetrievalPlan(
+            corpus_id=corpus_id,
+            provider_name=provider_name,
+            retrieval=retrieval,
+            corpus_version=await self._corpus_version(tenant_id, corpus_id, provider_name, corpus),
+            top_k=effective_top_k,
+            hedge_fallback=await self._hedge_fallback(tenant_id, provider_name, retrieval),
+        )
+
+    async def _hedge_fallback(self, tenant_id: str, provider_name: str, retrieval: dict[str, Any]) -> str | None:
+        # The fallback answers in the primary's place, so the tenant must be entitled to it as well.
+        fallback = (retrieval.get("hedge") or {}).get("fallback")
+        if provider_name not in EXTERNAL_INTEGRATIONS or fallback not in self._provider_factories:
+            return None
+        try:
+            await self._entitlement_checker(session=self._session, tenant_id=tenant_id, provider_name=fallback)
+        except HTTPException:
+            # Hedge without it rather than fail a request the primary is entitled to serve.
+            logger.warning("retrieval hedge fallback not entitled tenant_id=%s provider=%s", tenant_id, fallback)
+            return None
+        return fallback
 
-    async def _load_retrieval_config(self, tenant_id: str, corpus_id: str) -> dict[str, Any]:
-        # Fetch and validate retrieval config for provider routing.
+    def _build_provider(self, plan: _RetrievalPlan, session: AsyncSession | None = None) -> Any:
+        if session is not None and plan.provider_name in self._session_providers:
+            return self._session_providers[plan.provider_name](plan.retrieval, session)
+        return self._provider_factories[plan.provider_name](plan.retrieval)
+
+    async def _fetch_isolated(
+        self,
+        plan: _RetrievalPlan,
+        tenant_id: str,
+        query: str,
+        filters: MetadataFilters | None,
+    ) -> list[dict]:
+        # A private session keeps concurrent queries (and cancellation) off the request session.
+        if plan.provider_name not in SESSION_BOUND_PROVIDERS or plan.provider_name not in self._session_providers:
+            return await self._fetch(plan, self._build_provider(plan), tenant_id, query, filters)
+        async with self._session_factory() as session:
+            return await self._fetch(plan, self._build_provider(plan, session), tenant_id, query, filters)
+
+    def _hedge_policy(self, plan: _RetrievalPlan) -> tuple[str, float | None, str | None] | None:
+        # (integration, delay_s, fallback provider) for external corpora, None when not hedged.
+        integration = EXTERNAL_INTEGRATIONS.get(plan.provider_name)
+        settings = get_settings()
+        hedge = plan.retrieval.get("hedge") or {}
+        if integration is None or not settings.retrieval_hedge_enabled or not hedge.get("enabled", True):
+            return None
+        fallback = plan.hedge_fallback
+        latency_ms = external_latency_percentile(
+            integration,
+            float(hedge.get("percentile", settings.retrieval_hedge_percentile)),
+            window_s=settings.retrieval_hedge_window_s,
+            min_samples=settings.retrieval_hedge_min_samples,
+        )
+        delay_s = latency_ms / 1000.0 if latency_ms is not None else None
+        if delay_s is None and fallback is None:
+            return None
+        return integration, delay_s, fallback
+
+    async def _fetch(
+        self,
+        plan: _RetrievalPlan,
+        provider: Any,
+        tenant_id: str,
+        query: str,
+        filters: MetadataFilters | None,
+    ) -> list[dict]:
+        """Fetch one corpus, hedging slow external calls.
+
+        Once an external call outlives the configured percentile of its recent
+        latency, a second request races it: the corpus's hedge.fallback provider
+        when set (which also takes over if the primary fails), otherwise a
+        duplicate call. The first answer wins and the other is cancelled, except
+        that an empty fallback answer only stands in for a failed primary; a
+        per-integration budget caps how many calls get hedged.
+        """
+        policy = self._hedge_policy(plan)
+        if policy is None:
+            return await self._fetch_cached(plan, provider, tenant_id, query, filters)
+        integration, delay_s, fallback = policy
+        if fallback is not None:
+            fallback_plan = replace(plan, provider_name=fallback)
+
+            async def hedge() -> list[dict]:
+                # Isolated session: a cancelled fallback must not disturb the request session.
+                return await self._fetch_isolated(fallback_plan, tenant_id, query, filters)
+        else:
+
+            async def hedge() -> list[dict]:
+                # Bypass the cache: the primary's load is still in flight for this key.
+                return await provider.retrieve(tenant_id, plan.corpus_id, query, plan.top_k, filters=filters)
+
+        results, hedge_won = await hedged_call(
+            lambda: self._fetch_cached(plan, provider, tenant_id, query, filters),
+            hedge,
+            delay_s=delay_s,
+            budget=get_hedge_budget(integration),
+            hedge_on_error=fallback is not None,
+            # A fallback that finds nothing is no reason to drop the primary's answer.
+            accept_hedge=bool if fallback is not None else None,
+        )
+        if hedge_won and fallback is not None:
+            self.last_provider = fallback
+        return results
+
+    async def _fetch_cached(
+        self,
+        plan: _RetrievalPlan,
+        provider: Any,
+        tenant_id: str,
+        query: str,
+        filters: MetadataFilters | None,
+    ) -> list[dict]:
+        ttl_s = retrieval_cache_ttl(plan.provider_name, plan.corpus_version)
+        if ttl_s is not None and self._access is not None and self._access.valid_until is not None:
+            # Never serve a hit past the expiry of a grant that admitted it.
+            ttl_s = min(ttl_s, (self._access.valid_until - datetime.now(timezone.utc)).total_seconds())
+            ttl_s = ttl_s if ttl_s >= 1 else None
+        if ttl_s is None:
+            return await provider.retrieve(tenant_id, plan.corpus_id, query, plan.top_k, filters=filters)
+        key = retrieval_cache_key(
+            tenant_id=tenant_id,
+            corpus_id=plan.corpus_id,
+            corpus_version=plan.corpus_version,
+            provider=plan.provider_name,
+            query=query,
+            top_k=plan.top_k,
+            filters=filters,
+            access=self._access.cache_token() if self._access is not None else "",
+        )
+        return await get_retrieval_cache().get_or_load(
+            key,
+            lambda: provider.retrieve(tenant_id, plan.corpus_id, query, plan.top_k, filters=filters),
+            ttl_s=ttl_s,
+        )
+
+    async def _load_corpus(self, tenant_id: str, corpus_id: str) -> Any:
         corpus = await self._corpus_loader(self._session, corpus_id, tenant_id)
         if corpus is None:
             raise RetrievalConfigError("corpus not found")
-        return parse_retrieval_config(corpus.provider_config_json)
+        return corpus
+
+    async def _load_retrieval_config(self, tenant_id: str, corpus_id: str) -> tuple[dict[str, Any], Any]:
+        # Validated retrieval config, plus the corpus row when it had to be read (None on a cache hit).
+        if not self._cache_configs:
+            corpus = await self._load_corpus(tenant_id, corpus_id)
+            return _corpus_retrieval_config(corpus), corpus
+        cache = get_corpus_config_cache()
+        retrieval = cache.get(tenant_id, corpus_id)
+        if retrieval is not None:
+            return retrieval, None
+        generation = cache.generation()
+        corpus = await self._load_corpus(tenant_id, corpus_id)
+        retrieval = _corpus_retrieval_config(corpus)
+        cache.put(tenant_id, corpus_id, retrieval, generation=generation)
+        return retrieval, corpus
+
+    async def _corpus_version(self, tenant_id: str, corpus_id: str, provider_name: str, corpus: Any) -> int | None:
+        if corpus is not None:
+            # Loaders without a corpus_version (tests, benchmark overrides) are never cached.
+            return getattr(corpus, "corpus_version", None)
+        # Cached config: versions move with every ingest, so read it fresh, and only if results are cacheable.
+        if retrieval_cache_ttl(provider_name, 0) is None:
+            return None
+        corpus_version = await get_corpus_version(self._session, corpus_id, tenant_id)
+        if corpus_version is None:
+            get_corpus_config_cache().discard(tenant_id, corpus_id)
+            raise RetrievalConfigError("corpus not found")
+        return corpus_version
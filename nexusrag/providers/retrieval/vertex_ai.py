@@ -22,10 +22,16 @@ from nexusrag.core.errors import (
     VertexRetrievalConfigError,
     VertexRetrievalError,
 )
+from nexusrag.providers.clients import get_client_registry
+from nexusrag.providers.retrieval.filters import MetadataFilters, matches, vertex_filter
 from nexusrag.services.audit import record_system_event
 from nexusrag.services.resilience import CircuitBreaker, get_resilience_redis, retry_async
 from nexusrag.services.telemetry import record_external_call
 
+# Registry kind for the shared Discovery Engine search client (one per process).
+CLIENT_KIND = "gcp.discoveryengine_search"
+_CLIENT_KEY = "default"
+
 
 class VertexAIRetriever:
     def __init__(
@@ -64,7 +70,7 @@ class VertexAIRetriever:
         )
         return self._breaker
 
-    def _get_client(self) -> Any:
+    async def _get_client(self) -> Any:
         if self._client is not None:
             return self._client
         try:
@@ -74,12 +80,39 @@ class VertexAIRetriever:
                 "Vertex Discovery Engine client not available. Install google-cloud-discoveryengine."
             ) from exc
 
-        self._client = SearchServiceClient()
-        return self._client
+        # Shared so ADC resolution and the gRPC channel are set up once per process.
+        return await get_client_registry().aget(
+            CLIENT_KIND,
+            _CLIENT_KEY,
+            SearchServiceClient,
+            close=lambda client: client.transport.close(),
+        )
 
-    async def retrieve(self, tenant_id: str, corpus_id: str, query: str, top_k: int) -> list[dict]:
+    def _record_client_health(self, exc: Exception | None) -> None:
+        # Injected clients belong to the caller; request errors (4xx) say nothing about the client.
+        if self._client is not None:
+            return
+        registry = get_client_registry()
+        if exc is None:
+            registry.record_success(CLIENT_KIND, _CLIENT_KEY)
+            return
+        code = getattr(exc, "code", None)
+        if callable(code):
+            code = code()
+        if isinstance(exc, GoogleAPICallError) and isinstance(code, int) and 400 <= code < 500 and code not in {401, 403}:
+            return
+        registry.record_failure(CLIENT_KIND, _CLIENT_KEY)
+
+    async def retrieve(
+        self,
+        tenant_id: str,
+        corpus_id: str,
+        query: str,
+        top_k: int,
+        filters: MetadataFilters | None = None,
+    ) -> list[dict]:
         # tenant_id/corpus_id are unused for Vertex retrieval but kept for a unified interface.
-        client = self._get_client()
+        client = await self._get_client()
         breaker = await self._get_breaker()
         await breaker.before_call()
         start = time.monotonic()
@@ -92,6 +125,10 @@ class VertexAIRetriever:
             "query": query,
             "page_size": top_k,
         }
+        filter_expression, residual = vertex_filter(filters)
+        if filter_expression is not None:
+            # Filterable struct_data fields must be marked indexable in the data store schema.
+            request["filter"] = filter_expression
 
         try:
             def _search() -> list[Any]:
@@ -109,6 +146,7 @@ class VertexAIRetriever:
 
             results = await retry_async(lambda: asyncio.to_thread(_search), retryable=_retryable)
             await breaker.record_success()
+            self._record_client_health(None)
             record_external_call(
                 integration="retrieval.gcp_vertex",
                 latency_ms=(time.monotonic() - start) * 1000.0,
@@ -116,6 +154,7 @@ class VertexAIRetriever:
             )
         except Exception as exc:
             await breaker.record_failure()
+            self._record_client_health(exc)
             record_external_call(
                 integration="retrieval.gcp_vertex",
                 latency_ms=(time.monotonic() - start) * 1000.0,
@@ -153,6 +192,9 @@ class VertexAIRetriever:
                 score = 0.0
             score = max(0.0, min(1.0, score))
 
+            # Conditions the filter syntax cannot express (booleans, key-exists) are checked here.
+            if residual and not matches(residual, data):
+                continue
             items.append(
                 {
                     "text": text,
@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from nexusrag.apps.api.deps import Principal
@@ -31,6 +31,7 @@ from nexusrag.services.authz.evaluator import (
     policy_size_bytes,
     validate_condition,
 )
+from nexusrag.services.authz.retrieval import RetrievalAccess, compile_policies
 
 _ACTION_PERMISSIONS: dict[str, set[str]] = {
     # Allow broader permissions to satisfy read actions.
@@ -108,15 +109,7 @@ async def evaluate_policies(
     if not settings.authz_abac_enabled:
         return AbacDecision(allowed=True, reason="abac_disabled", matched_policy_id=None, trace=[])
 
-    stmt = (
-        select(AuthorizationPolicy)
-        .where(
-            AuthorizationPolicy.enabled.is_(True),
-            or_(AuthorizationPolicy.tenant_id == tenant_id, AuthorizationPolicy.tenant_id.is_(None)),
-        )
-        .order_by(AuthorizationPolicy.priority.desc(), AuthorizationPolicy.id.asc())
-    )
-    policies = list((await session.execute(stmt)).scalars().all())
+    policies = await _load_enabled_policies(session=session, tenant_id=tenant_id)
 
     def _matches_scope(policy: AuthorizationPolicy) -> bool:
         return policy.resource_type in {resource_type, "*"} and policy.action in {action, "*"}
@@ -247,6 +240,26 @@ async def build_document_context(
         labels = labels_map.get(document.id, {})
     if principal_attrs is None:
         principal_attrs = await load_principal_attributes(session=session, principal=principal, commit=False)
+    context = _principal_request_context(principal=principal, principal_attrs=principal_attrs, request=request)
+    context["resource"] = {
+        "id": document.id,
+        "tenant_id": document.tenant_id,
+        "corpus_id": document.corpus_id,
+        "status": document.status,
+        "content_type": document.content_type,
+        "labels": labels,
+        "metadata": document.metadata_json,
+    }
+    return context
+
+
+def _principal_request_context(
+    *,
+    principal: Principal,
+    principal_attrs: dict[str, Any],
+    request: Any | None,
+) -> dict[str, Any]:
+    # Principal and request halves of the ABAC context; callers add the resource.
     request_ctx = get_request_context(request) if request is not None else {}
     route_class = route_class_for_request(request) if request is not None else None
     request_path = request.url.path if request is not None else None
@@ -259,15 +272,6 @@ async def build_document_context(
             "groups": principal_attrs.get("groups"),
             "auth_method": principal.auth_method,
         },
-        "resource": {
-            "id": document.id,
-            "tenant_id": document.tenant_id,
-            "corpus_id": document.corpus_id,
-            "status": document.status,
-            "content_type": document.content_type,
-            "labels": labels,
-            "metadata": document.metadata_json,
-        },
         "request": {
             "ip": request_ctx.get("ip_address"),
             "route_class": route_class,
@@ -441,6 +445,54 @@ async def filter_documents_for_principal(
     return filtered
 
 
+async def build_retrieval_access(
+    *,
+    session: AsyncSession,
+    principal: Principal,
+    request: Any | None,
+    action: str = "read",
+) -> RetrievalAccess:
+    # Resolve the document read scope once per query so retrieval can enforce
+    # the same ACL + ABAC decision as filter_documents_for_principal in SQL.
+    settings = get_settings()
+    principal_attrs = await load_principal_attributes(session=session, principal=principal, commit=False)
+    principals = {f"user:{principal.subject_id}", f"role:{principal.role}"}
+    if principal.auth_method == "api_key":
+        principals.add(f"api_key:{principal.api_key_id}")
+    principals.update(f"group:{group}" for group in principal_attrs.get("groups") or [])
+    acl = not (settings.authz_admin_bypass_document_acl and principal.role == "admin")
+    valid_until = None
+    if acl:
+        # Cached results must not outlive the first grant that expires.
+        valid_until = (
+            await session.execute(
+                select(func.min(DocumentPermission.expires_at)).where(
+                    tenant_predicate(DocumentPermission, principal.tenant_id),
+                    (DocumentPermission.principal_type + ":" + DocumentPermission.principal_id).in_(principals),
+                    DocumentPermission.expires_at > _utc_now(),
+                )
+            )
+        ).scalar_one_or_none()
+    policy: Any = True
+    if settings.authz_abac_enabled:
+        policies = await _load_enabled_policies(session=session, tenant_id=principal.tenant_id)
+        policy = compile_policies(
+            policies,
+            action=action,
+            context=_principal_request_context(
+                principal=principal, principal_attrs=principal_attrs, request=request
+            ),
+            default_deny=settings.authz_default_deny,
+        )
+    return RetrievalAccess(
+        acl=acl,
+        principals=tuple(sorted(principals)),
+        permissions=tuple(sorted(_ACTION_PERMISSIONS.get(action, {action}))),
+        policy=policy,
+        valid_until=valid_until,
+    )
+
+
 async def authorize_document_action(
     *,
     session: AsyncSession,
@@ -618,6 +670,19 @@ async def authorize_document_create(
         raise _authz_denied("Access denied by policy")
 
 
+async def _load_enabled_policies(*, session: AsyncSession, tenant_id: str) -> list[AuthorizationPolicy]:
+    # Tenant and global policies in evaluation precedence order.
+    stmt = (
+        select(AuthorizationPolicy)
+        .where(
+            AuthorizationPolicy.enabled.is_(True),
+            or_(AuthorizationPolicy.tenant_id == tenant_id, AuthorizationPolicy.tenant_id.is_(None)),
+        )
+        .order_by(AuthorizationPolicy.priority.desc(), AuthorizationPolicy.id.asc())
+    )
+    return list((await session.execute(stmt)).scalars().all())
+
+
 async def _fetch_plan_id(*, session: AsyncSession, tenant_id: str) -> str | None:
     # Resolve the current tenant plan for ABAC context enrichment.
     result = await session.execute(
@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import orjson
+from sqlalchemy import String, and_, bindparam, exists, false, func, literal, not_, or_, true
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.sql.elements import ColumnElement
+
+from nexusrag.domain.models import AuthorizationPolicy, Document, DocumentLabel, DocumentPermission
+from nexusrag.services.authz.evaluator import PolicyInvalidError, PolicyTooComplexError, evaluate_condition
+
+# Document attributes an ABAC condition can reference as resource.<name>.
+_RESOURCE_COLUMNS = frozenset({"id", "tenant_id", "corpus_id", "status", "content_type"})
+_ORDERING = {"gt": "__gt__", "gte": "__ge__", "lt": "__lt__", "lte": "__le__"}
+_COMPARATORS = {"eq", "ne", "in", "not_in", "contains", "starts_with", *_ORDERING}
+_WINDOWS = {"time_between", "date_between"}
+
+_DOCUMENTS = Document.__table__.alias("acl_documents")
+_LABELS = DocumentLabel.__table__.alias("acl_labels")
+_PERMISSIONS = DocumentPermission.__table__.alias("acl_permissions")
+
+# A compiled document predicate: True/False, or nested tuples
+# ("and" | "or", children), ("not", child), (kind, op, key, value_json) with
+# kind column/label/metadata. Hashable, so it can key a cached statement.
+PolicyPredicate = Any
+
+
+class _Unsupported(Exception):
+    # Raised for conditions on document attributes that have no SQL translation.
+    pass
+
+
+@dataclass(frozen=True)
+class RetrievalAccess:
+    """One principal's document read scope, compiled for retrieval SQL.
+
+    principals are "type:id" keys matched against document_permissions and
+    permissions the grants that imply read; both bind as arrays, so the
+    statement shape depends only on acl and policy. valid_until is the
+    earliest expiry among the principal's grants, bounding result caching.
+    """
+
+    acl: bool
+    principals: tuple[str, ...]
+    permissions: tuple[str, ...]
+    policy: PolicyPredicate
+    valid_until: datetime | None = field(default=None, compare=False)
+
+    @property
+    def restricts(self) -> bool:
+        return self.acl or self.policy is not True
+
+    @property
+    def shape(self) -> tuple[bool, PolicyPredicate]:
+        return (self.acl, self.policy)
+
+    def params(self) -> dict[str, Any]:
+        if not self.acl:
+            return {}
+        return {"acl_principals": list(self.principals), "acl_permissions": list(self.permissions)}
+
+    def cache_token(self) -> str:
+        return orjson.dumps([self.acl, self.principals, self.permissions, self.policy]).decode()
+
+
+def _simplify(kind: str, children: list[PolicyPredicate]) -> PolicyPredicate:
+    # Fold constants so fully-resolved policies add no SQL at all.
+    absorbing, neutral = (False, True) if kind == "and" else (True, False)
+    kept: list[PolicyPredicate] = []
+    for child in children:
+        if child is absorbing:
+            return absorbing
+        if child is not neutral:
+            kept.append(child)
+    if not kept:
+        return neutral
+    return kept[0] if len(kept) == 1 else (kind, tuple(kept))
+
+
+def _negate(predicate: PolicyPredicate) -> PolicyPredicate:
+    if isinstance(predicate, bool):
+        return not predicate
+    return ("not", predicate)
+
+
+def _operands(payload: Any) -> tuple[Any, Any]:
+    # Same payload shapes as evaluator._resolve_operands, left unresolved.
+    if isinstance(payload, list) and len(payload) == 2:
+        return payload[0], payload[1]
+    if isinstance(payload, dict) and "field" in payload:
+        return {"var": payload.get("field")}, payload.get("value")
+    if isinstance(payload, dict) and "left" in payload:
+        return payload.get("left"), payload.get("right")
+    raise PolicyInvalidError("Comparator payload must be list or object with field/value")
+
+
+def _resource_path(operand: Any) -> list[str] | None:
+    if isinstance(operand, dict) and "var" in operand:
+        parts = str(operand.get("var")).split(".")
+        if parts[0] == "resource":
+            return parts[1:]
+    return None
+
+
+def _resolve(operand: Any, context: dict[str, Any]) -> Any:
+    if isinstance(operand, dict) and "var" in operand:
+        node: Any = context
+        for part in str(operand.get("var") or "").split("."):
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        return node
+    return operand
+
+
+def _attribute(path: list[str]) -> tuple[str, str]:
+    if len(path) == 1 and path[0] in _RESOURCE_COLUMNS:
+        return "column", path[0]
+    if len(path) == 2 and path[0] == "labels":
+        return "label", path[1]
+    if len(path) >= 2 and path[0] == "metadata":
+        return "metadata", json.dumps(path[1:])
+    raise _Unsupported
+
+
+def _comparison(operator: str, payload: Any, context: dict[str, Any]) -> PolicyPredicate:
+    left, right = _operands(payload)
+    left_path, right_path = _resource_path(left), _resource_path(right)
+    if left_path is None and right_path is None:
+        # Principal and request attributes are known now; only documents vary.
+        return evaluate_condition({operator: payload}, context)
+    if left_path is None and operator in {"eq", "ne"}:
+        left_path, right = right_path, left
+    elif left_path is None or right_path is not None or operator not in _COMPARATORS:
+        raise _Unsupported
+    kind, key = _attribute(left_path)
+    value = _resolve(right, context)
+    if operator in {"ne", "not_in"}:
+        return _negate((kind, "eq" if operator == "ne" else "in", key, json.dumps(value)))
+    if operator == "in" and not isinstance(value, (list, tuple, set)):
+        return (kind, "eq", key, json.dumps(value)) if value is not None else False
+    return (kind, operator, key, json.dumps(list(value) if isinstance(value, (tuple, set)) else value))
+
+
+def compile_condition(condition: Any, context: dict[str, Any], *, fallback: bool) -> PolicyPredicate:
+    """Partially evaluate a policy condition into a document predicate.
+
+    Non-resource operands resolve against context. Resource comparisons with no
+    SQL form become fallback, flipped under "not", so an untranslatable allow
+    grants nothing and an untranslatable deny denies.
+    """
+    if condition is None or condition == {}:
+        return True
+    if isinstance(condition, bool):
+        return condition
+    if not isinstance(condition, dict) or len(condition) != 1:
+        raise PolicyInvalidError("Condition must be an object with a single operator")
+    operator, payload = next(iter(condition.items()))
+    if operator in {"all", "any"}:
+        if not isinstance(payload, list):
+            raise PolicyInvalidError(f"{operator} expects a list")
+        children = [compile_condition(item, context, fallback=fallback) for item in payload]
+        return _simplify("and" if operator == "all" else "or", children)
+    if operator == "not":
+        return _negate(compile_condition(payload, context, fallback=not fallback))
+    if operator not in _COMPARATORS and operator not in _WINDOWS:
+        raise PolicyInvalidError(f"Unsupported operator: {operator}")
+    try:
+        return _comparison(operator, payload, context)
+    except _Unsupported:
+        return fallback
+
+
+def compile_policies(
+    policies: list[AuthorizationPolicy],
+    *,
+    action: str,
+    context: dict[str, Any],
+    default_deny: bool,
+) -> PolicyPredicate:
+    # Mirrors evaluate_policy_set: denies first, then allows, in priority order;
+    # the first match decides, an invalid policy denies, otherwise the default.
+    scoped = [
+        policy
+        for policy in policies
+        if policy.enabled and policy.resource_type in {"document", "*"} and policy.action in {action, "*"}
+    ]
+    ordered = [policy for policy in scoped if policy.effect == "deny"] + [
+        policy for policy in scoped if policy.effect == "allow"
+    ]
+    decision: PolicyPredicate = not default_deny
+    for policy in reversed(ordered):
+        deny = policy.effect == "deny"
+        try:
+            matched = compile_condition(policy.condition_json or {}, context, fallback=deny)
+        except (PolicyInvalidError, PolicyTooComplexError):
+            decision = False
+            continue
+        if deny:
+            decision = _simplify("and", [_negate(matched), decision])
+        else:
+            decision = _simplify("or", [matched, decision])
+    return decision
+
+
+def _known(clause: ColumnElement) -> ColumnElement:
+    # SQL NULL would survive NOT; policy predicates must be two-valued like Python's.
+    return func.coalesce(clause, false())
+
+
+def _column_clause(op: str, column: Any, value: Any) -> ColumnElement:
+    if op == "eq":
+        if value is None:
+            return column.is_(None)
+        return column.is_not_distinct_from(value) if isinstance(value, str) else false()
+    if op == "in":
+        texts = [item for item in value if isinstance(item, str)]
+        clauses = [and_(column.is_not(None), column.in_(texts))] if texts else []
+        if None in value:
+            clauses.append(column.is_(None))
+        return or_(*clauses) if clauses else false()
+    if op == "contains":
+        return and_(column.is_not(None), column.contains(str(value), autoescape=True))
+    if op == "starts_with":
+        if value is None:
+            return false()
+        return and_(column.is_not(None), column.startswith(str(value), autoescape=True))
+    if not isinstance(value, str):
+        return false()
+    # Python orders str by code point, which is the "C" collation.
+    return and_(column.is_not(None), getattr(column.collate("C"), _ORDERING[op])(value))
+
+
+def _label_clause(op: str, key: str, value: Any) -> ColumnElement:
+    def _label(*conditions: ColumnElement) -> ColumnElement:
+        return exists().where(_LABELS.c.document_id == _DOCUMENTS.c.id, _LABELS.c.key == key, *conditions)
+
+    if op == "eq" and value is None:
+        return not_(_label())
+    if op == "in" and None in value:
+        return or_(not_(_label()), _label_clause("in", key, [item for item in value if item is not None]))
+    if op == "starts_with" and value is None:
+        return false()
+    return _label(_column_clause(op, _LABELS.c.value, value))
+
+
+def _metadata_clause(op: str, path: list[str], value: Any) -> ColumnElement:
+    node = _DOCUMENTS.c.metadata_json[tuple(path)]
+    node_type = func.jsonb_typeof(node)
+    if op == "eq":
+        if value is None:
+            return or_(node.is_(None), node_type == "null")
+        return _known(node == literal(value, JSONB))
+    if op == "in":
+        return or_(*(_metadata_clause("eq", path, item) for item in value)) if value else false()
+    text_value = _DOCUMENTS.c.metadata_json[tuple(path)].astext
+    if op == "contains":
+        # Substring for strings, membership for arrays, as evaluator._contains.
+        return _known(
+            or_(
+                and_(node_type == "string", text_value.contains(str(value), autoescape=True)),
+                and_(node_type == "array", node.op("@>")(literal([value], JSONB))),
+            )
+        )
+    if op == "starts_with":
+        if value is None:
+            return false()
+        return _known(and_(node_type == "string", text_value.startswith(str(value), autoescape=True)))
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return false()
+    expected = "string" if isinstance(value, str) else "number"
+    return _known(and_(node_type == expected, getattr(node, _ORDERING[op])(literal(value, JSONB))))
+
+
+def policy_clause(predicate: PolicyPredicate) -> ColumnElement:
+    # Render a compiled predicate against _DOCUMENTS.
+    if predicate is True:
+        return true()
+    if predicate is False:
+        return false()
+    kind = predicate[0]
+    if kind in {"and", "or"}:
+        children = [policy_clause(child) for child in predicate[1]]
+        return and_(*children) if kind == "and" else or_(*children)
+    if kind == "not":
+        return not_(policy_clause(predicate[1]))
+    _kind, op, key, value_json = predicate
+    value = json.loads(value_json)
+    if kind == "column":
+        return _column_clause(op, _DOCUMENTS.c[key], value)
+    if kind == "label":
+        return _label_clause(op, key, value)
+    return _metadata_clause(op, json.loads(key), value)
+
+
+def access_clauses(shape: tuple[bool, PolicyPredicate] | None, chunks: Any) -> list[ColumnElement]:
+    """Predicates restricting chunks to documents the principal may read.
+
+    Both checks are correlated on the candidate row's document_id and served
+    by the (tenant_id, document_id) permission index and the documents
+    primary key, so cost follows the rows the scan visits, not corpus size.
+    Chunks without a document row carry no document ACL and stay governed by
+    corpus-level authorization.
+    """
+    if shape is None:
+        return []
+    acl, policy = shape
+    document_checks: list[ColumnElement] = []
+    if acl:
+        document_checks.append(
+            exists().where(
+                _PERMISSIONS.c.tenant_id == bindparam("tenant_id"),
+                _PERMISSIONS.c.document_id == chunks.c.document_id,
+                (_PERMISSIONS.c.principal_type + ":" + _PERMISSIONS.c.principal_id)
+                == func.any(bindparam("acl_principals", type_=ARRAY(String))),
+                _PERMISSIONS.c.permission == func.any(bindparam("acl_permissions", type_=ARRAY(String))),
+                or_(_PERMISSIONS.c.expires_at.is_(None), _PERMISSIONS.c.expires_at > func.now()),
+            )
+        )
+    if policy is not True:
+        document_checks.append(
+            exists().where(_DOCUMENTS.c.id == chunks.c.document_id, policy_clause(policy))
+        )
+    if not document_checks:
+        return []
+    return [or_(chunks.c.document_id.is_(None), and_(*document_checks))]
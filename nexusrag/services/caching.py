@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        # Coalesced waiters never reached the loader, so they count as hits.
+        lookups = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+
+class AsyncLRUCache(Generic[K, V]):
+    """In-process LRU + TTL cache with a byte ceiling and single-flight loads.
+
+    Concurrent misses for the same key share one loader task; the task is
+    shielded, so a cancelled caller never aborts the load for the others.
+    Failed loads are not cached. ttl_s is the default lifetime and can be
+    overridden per entry. max_bytes <= 0 disables storage (loads still
+    single-flight).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        ttl_s: float,
+        size_of: Callable[[K, V], int],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_bytes = max(0, int(max_bytes))
+        self._ttl_s = float(ttl_s)
+        self._size_of = size_of
+        self._clock = clock
+        # key -> (expires_at, size, value); ordered oldest-use first.
+        self._entries: OrderedDict[K, tuple[float, int, V]] = OrderedDict()
+        self._inflight: dict[K, asyncio.Task[V]] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, size, value = entry
+        if expires_at <= self._clock():
+            self._drop(key, size)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V, *, ttl_s: float | None = None) -> None:
+        size = self._size_of(key, value)
+        if size > self._max_bytes:
+            # Oversized values (or a disabled cache) are served but never stored.
+            return
+        existing = self._entries.pop(key, None)
+        if existing is not None:
+            self._bytes -= existing[1]
+        self._entries[key] = (self._clock() + (self._ttl_s if ttl_s is None else ttl_s), size, value)
+        self._bytes += size
+        while self._bytes > self._max_bytes:
+            old_key, (_expires_at, old_size, _value) = next(iter(self._entries.items()))
+            self._drop(old_key, old_size)
+            self._evictions += 1
+
+    async def get_or_load(
+        self, key: K, loader: Callable[[], Awaitable[V]], *, ttl_s: float | None = None
+    ) -> V:
+        cached = self.get(key)
+        if cached is not None:
+            self._hits += 1
+            return cached
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self._coalesced += 1
+            return await asyncio.shield(task)
+        self._misses += 1
+        task = asyncio.ensure_future(loader())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done, ttl_s))
+        return await asyncio.shield(task)
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            coalesced=self._coalesced,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            bytes=self._bytes,
+        )
+
+    def discard(self, key: K) -> None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._drop(key, entry[1])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+        self._bytes = 0
+
+    def _finish(self, key: K, task: asyncio.Task[V], ttl_s: float | None) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self.put(key, task.result(), ttl_s=ttl_s)
+
+    def _drop(self, key: K, size: int) -> None:
+        del self._entries[key]
+        self._bytes -= size
@@ -8,7 +8,13 @@ from nexusrag.services.costs.budget_guardrails import (
     cost_headers,
     evaluate_budget_guardrail,
 )
-from nexusrag.services.costs.metering import CostEstimate, estimate_cost, estimate_tokens, record_cost_event
+from nexusrag.services.costs.metering import (
+    CostEstimate,
+    estimate_cost,
+    estimate_tokens,
+    estimate_tokens_for_chars,
+    record_cost_event,
+)
 from nexusrag.services.costs.pricing import PricingRate, rate_metadata, select_pricing_rate
 
 __all__ = [
@@ -20,6 +26,7 @@ __all__ = [
     "CostEstimate",
     "estimate_cost",
     "estimate_tokens",
+    "estimate_tokens_for_chars",
     "record_cost_event",
     "PricingRate",
     "rate_metadata",
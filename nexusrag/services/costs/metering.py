@@ -33,9 +33,14 @@ def _utc_now() -> datetime:
 
 def estimate_tokens(text: str, *, ratio: float) -> int:
     # Deterministically estimate token counts when provider metadata is missing.
-    if not text:
+    return estimate_tokens_for_chars(len(text or ""), ratio=ratio)
+
+
+def estimate_tokens_for_chars(chars: int, *, ratio: float) -> int:
+    # Same estimate from a character count, for sources streamed without a full string.
+    if chars <= 0:
         return 0
-    return max(1, int(len(text) / max(ratio, 0.1)))
+    return max(1, int(chars / max(ratio, 0.1)))
 
 
 def _to_decimal(value: float | int | Decimal) -> Decimal:
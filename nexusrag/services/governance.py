@@ -35,6 +35,8 @@ from nexusrag.domain.models import (
     TenantKey,
     User,
 )
+from nexusrag.persistence.repos import chunks as chunks_repo
+from nexusrag.persistence.repos import corpora as corpora_repo
 from nexusrag.services import backup as backup_service
 from nexusrag.services.audit import record_event
 from nexusrag.services.crypto import CRYPTO_RESOURCE_DSAR, ensure_encryption_available, store_encrypted_blob
@@ -443,6 +445,9 @@ async def run_retention_for_tenant(
             result["skipped_hold"] = len(rows) - len(eligible_ids)
             if not eligible_ids:
                 return result
+            # Both branches change chunk rows, so cached retrieval results must miss.
+            # Bump before the delete while the documents still name their corpora.
+            await corpora_repo.bump_corpus_version_for_documents(session, eligible_ids)
             if mode == "hard_delete":
                 await session.execute(delete(Chunk).where(Chunk.document_id.in_(eligible_ids)))
                 deleted = await session.execute(delete(Document).where(Document.id.in_(eligible_ids)))
@@ -784,7 +789,12 @@ async def _build_dsar_export_payload(session: AsyncSession, request: DsarRequest
                 "created_at": document.created_at.isoformat() if document.created_at else None,
             }
             chunks = (
-                await session.execute(select(Chunk).where(Chunk.document_id == document.id))
+                await session.execute(
+                    select(Chunk).where(
+                        Chunk.document_id == document.id,
+                        Chunk.generation == document.active_generation,
+                    )
+                )
             ).scalars().all()
             payload["records"]["chunks"] = [
                 {"id": str(chunk.id), "chunk_index": chunk.chunk_index, "text": chunk.text}
@@ -852,6 +862,8 @@ async def _apply_dsar_destructive_action(
         document = await session.get(Document, request.subject_id)
         if document is None or document.tenant_id != tenant_id:
             return counts
+        # Deleted or anonymized chunks must never be served from the retrieval cache.
+        await corpora_repo.bump_corpus_version(session, [document.corpus_id])
         if mode == "delete":
             deleted_chunks = await session.execute(delete(Chunk).where(Chunk.document_id == document.id))
             await session.execute(delete(Document).where(Document.id == document.id))
@@ -867,7 +879,13 @@ async def _apply_dsar_destructive_action(
         return counts
 
     # Tenant-scoped destructive requests apply to core tenant-bound records.
+    corpus_ids = (await session.execute(select(Corpus.id).where(Corpus.tenant_id == tenant_id))).scalars().all()
+    # Both branches change what retrieval returns for every tenant corpus.
+    await corpora_repo.bump_corpus_version(session, corpus_ids)
     if mode == "delete":
+        for corpus_id in corpus_ids:
+            # A partitioned corpus is dropped whole instead of deleted and vacuumed row by row.
+            counts["deleted"] += await chunks_repo.drop_corpus_partition(session, corpus_id) or 0
         document_ids = (
             await session.execute(select(Document.id).where(Document.tenant_id == tenant_id))
         ).scalars().all()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nexusrag.core.config import get_settings
+from nexusrag.ingestion.embeddings import EmbeddingProvider, get_embedding_provider
+from nexusrag.persistence.repos import embedding_cache as embedding_cache_repo
+from nexusrag.services.telemetry import record_embedding_cache_lookup
+
+# Skip last_used_at rewrites for entries refreshed within this window.
+TOUCH_INTERVAL = timedelta(hours=1)
+
+
+def text_sha256(text: str) -> str:
+    # Hash the exact UTF-8 bytes so only byte-identical chunk text shares a vector.
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+async def embed_with_cache(
+    session: AsyncSession,
+    texts: Sequence[str],
+    *,
+    provider: EmbeddingProvider | None = None,
+) -> list[list[float]]:
+    """Embed texts, reusing cached vectors keyed by (provider, model, sha256(text)).
+
+    All keys are resolved in one query and only misses reach the provider. New
+    vectors are written in the caller's transaction, so they persist only when
+    the ingest that produced them commits. `provider` defaults to the
+    deployment's; pinned corpora and embedding migrations pass their own.
+    """
+    provider = provider or get_embedding_provider()
+    if not texts:
+        return []
+    if not get_settings().embedding_cache_enabled or not provider.cacheable:
+        return await provider.embed_many(texts)
+
+    hashes = [text_sha256(text) for text in texts]
+    unique_hashes = list(dict.fromkeys(hashes))
+    cached = await embedding_cache_repo.get_many(
+        session, provider=provider.name, model=provider.model, text_hashes=unique_hashes
+    )
+    # Deduplicate misses so repeated text within a document is embedded once.
+    misses: dict[str, str] = {}
+    for text_hash, text in zip(hashes, texts, strict=True):
+        if text_hash not in cached and text_hash not in misses:
+            misses[text_hash] = text
+
+    fresh: dict[str, list[float]] = {}
+    if misses:
+        vectors = await provider.embed_many(list(misses.values()))
+        fresh = dict(zip(misses, vectors, strict=True))
+        await embedding_cache_repo.put_many(
+            session, provider=provider.name, model=provider.model, entries=fresh.items()
+        )
+    if cached:
+        now = datetime.now(timezone.utc)
+        await embedding_cache_repo.touch_many(
+            session,
+            provider=provider.name,
+            model=provider.model,
+            text_hashes=list(cached),
+            now=now,
+            stale_before=now - TOUCH_INTERVAL,
+        )
+
+    hits = sum(1 for text_hash in hashes if text_hash in cached)
+    record_embedding_cache_lookup(hits=hits, misses=len(hashes) - hits)
+    return [cached[text_hash] if text_hash in cached else fresh[text_hash] for text_hash in hashes]
@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from nexusrag.core.config import EMBED_DIM, get_settings
+from nexusrag.domain.models import CorpusEmbeddingGeneration
+from nexusrag.ingestion.embeddings import get_embedding_provider, resolve_embedding_model, truncate_embedding
+from nexusrag.persistence.db import SessionLocal, engine
+from nexusrag.persistence.repos import corpora as corpora_repo
+from nexusrag.persistence.repos import embedding_generations as generations_repo
+from nexusrag.providers.retrieval.config import (
+    corpus_embedding_dim,
+    corpus_embedding_model,
+    normalize_provider_config,
+)
+from nexusrag.providers.retrieval.config_cache import invalidate_corpus_config
+from nexusrag.services.ingest.embedding_cache import embed_with_cache
+from nexusrag.services.ingest.queue import get_redis_pool
+from nexusrag.services.resilience import BulkheadLease, get_embedding_migration_bulkhead, get_ingest_bulkhead
+from nexusrag.services.telemetry import increment_counter
+
+logger = logging.getLogger(__name__)
+
+# Lifecycle: building -> ready -> active -> retired -> collected; failed when the backfill gives up.
+STATUS_BUILDING = "building"
+STATUS_READY = "ready"
+STATUS_ACTIVE = "active"
+STATUS_RETIRED = "retired"
+STATUS_FAILED = "failed"
+STATUS_COLLECTED = "collected"
+# At most one generation per corpus may be in flight towards a cutover.
+IN_FLIGHT_STATUSES = {STATUS_BUILDING, STATUS_READY}
+# Generations whose vectors (after a catch-up backfill if needed) can be pointed at.
+ACTIVATABLE_STATUSES = {STATUS_READY, STATUS_RETIRED, STATUS_FAILED}
+
+MIGRATION_JOB_NAME = "migrate_corpus_embeddings"
+
+
+class EmbeddingMigrationError(RuntimeError):
+    """The generation's state does not allow the requested transition."""
+
+
+class EmbeddingMigrationJobPayload(BaseModel):
+    generation_id: str
+    request_id: str | None = None
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def corpus_embedding_space(config_json: dict[str, Any] | None) -> tuple[str, str, int]:
+    # The (provider, model, dim) a corpus's chunks are embedded in, with deployment defaults resolved.
+    provider, model = resolve_embedding_model(*corpus_embedding_model(config_json))
+    return provider, model, corpus_embedding_dim(config_json)
+
+
+def generation_audit_metadata(generation: CorpusEmbeddingGeneration) -> dict[str, Any]:
+    return {
+        "generation_id": generation.id,
+        "generation": generation.generation,
+        "provider": generation.provider,
+        "model": generation.model,
+        "embedding_dim": generation.embedding_dim,
+    }
+
+
+@asynccontextmanager
+async def _ddl_connection() -> AsyncIterator[AsyncConnection]:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+    async with engine.connect() as connection:
+        yield await connection.execution_options(isolation_level="AUTOCOMMIT")
+
+
+def _pinned_config(config_json: dict[str, Any], generation: CorpusEmbeddingGeneration) -> dict[str, Any]:
+    # Pin the generation's space explicitly so a later EMBEDDING_PROVIDER change cannot move the corpus.
+    pinned = copy.deepcopy(config_json)
+    retrieval = pinned.setdefault("retrieval", {})
+    retrieval["embedding"] = {"provider": generation.provider, "model": generation.model}
+    if generation.embedding_dim == EMBED_DIM:
+        retrieval.pop("embedding_dim", None)
+    else:
+        retrieval["embedding_dim"] = generation.embedding_dim
+    return pinned
+
+
+async def start_embedding_migration(
+    session: AsyncSession,
+    *,
+    tenant_id: str,
+    corpus_id: str,
+    provider: str,
+    model: str | None,
+    embedding_dim: int | None,
+) -> CorpusEmbeddingGeneration:
+    """Record a new building generation for the corpus; the caller commits and enqueues.
+
+    The first migration also records the corpus's current space as generation 1
+    (active), so the vectors it is about to replace can be rolled back to.
+    Raises RetrievalConfigError for a target the corpus config would reject.
+    """
+    # Serialises concurrent starts (and cutovers) so generation numbers and the in-flight check hold.
+    corpus = await corpora_repo.lock_corpus_for_cutover(session, corpus_id, tenant_id)
+    if corpus is None:
+        raise LookupError("Corpus not found")
+    provider, model = resolve_embedding_model(provider, model)
+    target = CorpusEmbeddingGeneration(
+        provider=provider,
+        model=model,
+        embedding_dim=embedding_dim or corpus_embedding_dim(corpus.provider_config_json),
+    )
+    # Same validation as a PATCH that pinned this space (quantization needs native width, etc.).
+    normalize_provider_config(_pinned_config(corpus.provider_config_json, target))
+    current = corpus_embedding_space(corpus.provider_config_json)
+    if (target.provider, target.model, target.embedding_dim) == current:
+        raise EmbeddingMigrationError("corpus is already embedded with this provider, model, and dimension")
+
+    generations = await generations_repo.list_generations(session, tenant_id, corpus.id)
+    if any(item.status in IN_FLIGHT_STATUSES for item in generations):
+        raise EmbeddingMigrationError("an embedding migration is already in progress for this corpus")
+    chunk_count = await generations_repo.count_corpus_chunks(session, corpus.id)
+    now = _utc_now()
+    if not any(item.status == STATUS_ACTIVE for item in generations):
+        baseline = CorpusEmbeddingGeneration(
+            id=str(uuid4()),
+            tenant_id=tenant_id,
+            corpus_id=corpus.id,
+            generation=max((item.generation for item in generations), default=0) + 1,
+            provider=current[0],
+            model=current[1],
+            embedding_dim=current[2],
+            status=STATUS_ACTIVE,
+            # The vectors retrieval serves today stay in the chunks columns.
+            vectors_in_chunks=True,
+            chunks_total=chunk_count,
+            chunks_embedded=chunk_count,
+            activated_at=now,
+        )
+        session.add(baseline)
+        generations.append(baseline)
+    target.id = str(uuid4())
+    target.tenant_id = tenant_id
+    target.corpus_id = corpus.id
+    target.generation = max(item.generation for item in generations) + 1
+    target.status = STATUS_BUILDING
+    target.vectors_in_chunks = False
+    target.chunks_total = chunk_count
+    target.chunks_embedded = 0
+    session.add(target)
+    await session.flush()
+    increment_counter("embedding_migration.started")
+    return target
+
+
+async def enqueue_embedding_migration(generation_id: str, *, request_id: str | None = None) -> None:
+    # Inline mode backfills before returning, mirroring inline ingestion.
+    payload = EmbeddingMigrationJobPayload(generation_id=generation_id, request_id=request_id)
+    settings = get_settings()
+    if settings.ingest_execution_mode.lower() == "inline":
+        await run_embedding_migration(payload.generation_id)
+        return
+    redis = await get_redis_pool()
+    # Unique per enqueue: arq keeps finished job ids, and a catch-up backfill reuses the generation.
+    await redis.enqueue_job(
+        MIGRATION_JOB_NAME,
+        payload.model_dump(),
+        _job_id=f"embedding-migration:{generation_id}:{uuid4().hex}",
+        _queue_name=settings.ingest_queue_name,
+    )
+
+
+async def _acquire_backfill_capacity() -> tuple[BulkheadLease, BulkheadLease]:
+    # Backfills hold a slot of their own share plus an ingest slot, and yield
+    # whenever either is taken, so document ingestion keeps the rest of capacity.
+    backoff_s = max(0.0, get_settings().embedding_migration_backoff_s)
+    while True:
+        share = await get_embedding_migration_bulkhead().acquire()
+        if share is not None:
+            ingest = await get_ingest_bulkhead().acquire()
+            if ingest is not None:
+                return share, ingest
+            share.release()
+        increment_counter("embedding_migration.throttled")
+        await asyncio.sleep(backoff_s)
+
+
+async def _mark_failed(generation_id: str, message: str) -> None:
+    async with SessionLocal() as session:
+        generation = await generations_repo.get_generation_by_id(session, generation_id)
+        if generation is None or generation.status != STATUS_BUILDING:
+            return
+        generation.status = STATUS_FAILED
+        generation.error_message = message
+        await session.commit()
+
+
+async def run_embedding_migration(generation_id: str) -> dict[str, Any]:
+    """Backfill a building generation's vectors, one batch per transaction.
+
+    Progress is durable: each batch commits its vectors and chunks_embedded, and
+    a restarted job picks up the chunks that still lack a vector. Passes repeat
+    until a full pass finds nothing left, which also covers chunks ingested
+    while the backfill ran. A shadow generation then gets its own partial HNSW
+    index, built CONCURRENTLY outside any transaction, and one more pass picks
+    up chunks written during the build. The job stops quietly if the generation
+    leaves `building` (collected, or superseded) between batches.
+    """
+    batch_size = max(1, get_settings().embedding_migration_batch_size)
+    embedded = 0
+    after: UUID | None = None
+    index_ready = False
+    try:
+        async with SessionLocal() as session:
+            generation = await generations_repo.get_generation_by_id(session, generation_id)
+            if generation is None or generation.status != STATUS_BUILDING:
+                return {}
+            corpus_id = generation.corpus_id
+            embedding_dim = generation.embedding_dim
+            # The vectors_in_chunks generation is served by the chunks ANN indexes.
+            index_ready = generation.vectors_in_chunks
+            provider = get_embedding_provider(generation.provider, generation.model)
+        while True:
+            build_index = False
+            share, ingest = await _acquire_backfill_capacity()
+            try:
+                async with SessionLocal() as session:
+                    # Row lock until the batch commits, so a concurrent GC cannot leave this batch's vectors behind.
+                    generation = await generations_repo.get_generation_by_id(
+                        session, generation_id, for_update=True
+                    )
+                    if generation is None or generation.status != STATUS_BUILDING:
+                        return {"embedded": embedded, "stopped": True}
+                    rows = await generations_repo.pending_chunks(
+                        session, generation, corpus_id, after=after, limit=batch_size
+                    )
+                    if not rows and after is not None:
+                        # End of a pass; rescan from the start for chunks ingested behind the cursor.
+                        after = None
+                        continue
+                    if not rows and not index_ready:
+                        # The build waits out every open transaction, this one included.
+                        await session.commit()
+                        build_index = True
+                    elif not rows:
+                        total = await generations_repo.count_corpus_chunks(session, corpus_id)
+                        generation.status = STATUS_READY
+                        generation.chunks_total = total
+                        generation.chunks_embedded = total
+                        generation.error_message = None
+                        await session.commit()
+                        increment_counter("embedding_migration.ready")
+                        return {"embedded": embedded}
+                    else:
+                        vectors = await embed_with_cache(session, [row[1] for row in rows], provider=provider)
+                        written = await generations_repo.store_vectors(
+                            session,
+                            generation,
+                            corpus_id,
+                            [
+                                (chunk_id, truncate_embedding(vector, embedding_dim))
+                                for (chunk_id, _), vector in zip(rows, vectors, strict=True)
+                            ],
+                        )
+                        generation.chunks_embedded += written
+                        await session.commit()
+                        embedded += written
+                        after = rows[-1][0]
+                        increment_counter("embedding_migration.chunks_embedded", written)
+            finally:
+                ingest.release()
+                share.release()
+            if build_index:
+                async with _ddl_connection() as connection:
+                    await generations_repo.ensure_vector_index(connection, generation_id, embedding_dim)
+                index_ready = True
+    except Exception as exc:  # noqa: BLE001 - record the failure; activating the generation re-queues it
+        logger.exception("embedding_migration_failed generation_id=%s", generation_id)
+        increment_counter("embedding_migration.failed")
+        await _mark_failed(generation_id, f"Backfill failed: {type(exc).__name__}")
+        return {"embedded": embedded, "failed": True}
+
+
+async def activate_generation(
+    session: AsyncSession,
+    *,
+    tenant_id: str,
+    corpus_id: str,
+    generation_id: str,
+    request_id: str | None = None,
+) -> CorpusEmbeddingGeneration:
+    """Atomically make `generation_id` the corpus's serving embedding space.
+
+    Every generation keeps its own vectors and ANN index: the vectors_in_chunks
+    generation in the chunks columns, every other one in chunk_embedding_shadows
+    under a partial HNSW index. Cutover therefore moves no vectors. In one short
+    transaction, under an exclusive lock on the corpus row (which holds off
+    document generation flips until commit), corpora.embedding_generation_id is
+    pointed at the target, the corpus config is pinned to the target's
+    provider/model/dim, and corpus_version is bumped. Retrieval sees either the
+    old space or the new one, never a mix. Activating a retired generation is a
+    rollback. A target missing vectors for some chunks (ingested since its
+    backfill finished) or missing its index goes back to `building`, is
+    re-queued, and the cutover is refused.
+    """
+    corpus = await corpora_repo.lock_corpus_for_cutover(session, corpus_id, tenant_id)
+    if corpus is None:
+        raise LookupError("Corpus not found")
+    target = await generations_repo.get_generation(session, tenant_id, corpus_id, generation_id)
+    if target is None:
+        raise LookupError("Embedding generation not found")
+    if target.status not in ACTIVATABLE_STATUSES:
+        raise EmbeddingMigrationError(f"cannot activate a {target.status} generation")
+    generations = await generations_repo.list_generations(session, tenant_id, corpus_id)
+    if any(item.status == STATUS_BUILDING for item in generations):
+        raise EmbeddingMigrationError("another embedding generation is still building")
+
+    # Read-only: an anti-join on the shadow primary key, or a NULL check on the chunks column.
+    pending = await generations_repo.count_pending_chunks(session, target, corpus_id)
+    indexed = target.vectors_in_chunks or await generations_repo.has_vector_index(session, target.id)
+    if pending or not indexed:
+        target.status = STATUS_BUILDING
+        target.chunks_total = await generations_repo.count_corpus_chunks(session, corpus_id)
+        target.chunks_embedded = target.chunks_total - pending
+        target.error_message = None
+        await session.commit()
+        await enqueue_embedding_migration(target.id, request_id=request_id)
+        if pending:
+            raise EmbeddingMigrationError(
+                f"{pending} chunks have no vectors in generation {target.generation} yet; backfill re-queued"
+            )
+        raise EmbeddingMigrationError(f"generation {target.generation} has no vector index yet; build re-queued")
+
+    now = _utc_now()
+    for current in generations:
+        if current.status == STATUS_ACTIVE and current.id != target.id:
+            current.status = STATUS_RETIRED
+            current.retired_at = now
+    corpus.embedding_generation_id = None if target.vectors_in_chunks else target.id
+    # Also bumps corpus_version, so cached results from the old space miss.
+    await corpora_repo.update_fields(
+        session,
+        tenant_id,
+        corpus_id,
+        provider_config_json=_pinned_config(corpus.provider_config_json, target),
+    )
+    rollback = target.status == STATUS_RETIRED
+    target.status = STATUS_ACTIVE
+    target.activated_at = now
+    target.retired_at = None
+    target.error_message = None
+    await session.commit()
+    # Drop cached configs (and their pinned embedding model) here and on every other replica.
+    await invalidate_corpus_config(tenant_id, corpus_id)
+    increment_counter("embedding_migration.rollbacks" if rollback else "embedding_migration.cutovers")
+    return target
+
+
+async def collect_generation(
+    session: AsyncSession,
+    *,
+    tenant_id: str,
+    corpus_id: str,
+    generation_id: str,
+) -> CorpusEmbeddingGeneration:
+    """Garbage-collect a non-active generation; a retired one can no longer be rolled back to.
+
+    A shadow generation's vectors are deleted and its index dropped. The
+    vectors_in_chunks generation's vectors stay in the chunks columns until
+    their rows are rewritten; clearing them in place would rewrite every row.
+    """
+    # Locked first: waits out an in-flight backfill batch, whose vectors the delete then sees.
+    target = await generations_repo.get_generation(session, tenant_id, corpus_id, generation_id, for_update=True)
+    if target is None:
+        raise LookupError("Embedding generation not found")
+    if target.status == STATUS_ACTIVE:
+        raise EmbeddingMigrationError("cannot collect the active generation")
+    if target.status != STATUS_COLLECTED:
+        # A building backfill sees the status change at its next batch and stops.
+        if not target.vectors_in_chunks:
+            await generations_repo.delete_shadow_vectors(session, target.id)
+        target.status = STATUS_COLLECTED
+        await session.commit()
+        if not target.vectors_in_chunks:
+            async with _ddl_connection() as connection:
+                await generations_repo.drop_vector_index(connection, target.id)
+        increment_counter("embedding_migration.collected")
+    return target
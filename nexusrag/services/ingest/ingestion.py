@@ -1,29 +1,48 @@
 from __future__ import annotations
 
 import logging
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, AsyncGenerator, Callable, Iterable, Iterator, Literal, Protocol
 from uuid import uuid4
 
-from sqlalchemy import delete, select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from nexusrag.core.config import EMBED_DIM, get_settings
-from nexusrag.domain.models import Chunk, Document
+from nexusrag.domain.models import Chunk, Corpus, Document
 from nexusrag.ingestion.chunking import (
     CHUNK_OVERLAP_CHARS,
     CHUNK_SIZE_CHARS,
-    chunk_text,
+    iter_chunks,
 )
-from nexusrag.ingestion.embeddings import embed_text
+from nexusrag.ingestion.embeddings import EmbeddingProvider, get_embedding_provider, truncate_embedding
+from nexusrag.ingestion.loaders import DocumentLoader, loader_for_path, spool_file
+from nexusrag.ingestion.streaming import iter_text_file, prefetch_batches
 from nexusrag.persistence.db import SessionLocal
-from nexusrag.services.costs.metering import estimate_tokens, record_cost_event
-from nexusrag.services.telemetry import record_segment_timing, set_gauge
+from nexusrag.persistence.repos import chunks as chunks_repo
+from nexusrag.persistence.repos import corpora as corpora_repo
+from nexusrag.persistence.repos import embedding_generations as generations_repo
+from nexusrag.providers.retrieval.config import corpus_embedding_dim, corpus_embedding_model
+from nexusrag.services.audit import record_event
+from nexusrag.services.costs.metering import estimate_tokens_for_chars, record_cost_event
+from nexusrag.services.ingest.embedding_cache import embed_with_cache, text_sha256
+from nexusrag.services.telemetry import increment_counter, record_segment_timing, set_gauge
 
 logger = logging.getLogger(__name__)
 
 
 DOCUMENT_STORAGE_DIR = Path("var/documents")
+# "full" rewrites every chunk row; "incremental" keeps rows whose text is unchanged.
+ReindexMode = Literal["full", "incremental"]
+
+
+class ChunkGenerationConflict(RuntimeError):
+    """The chunk generation a job wrote can no longer be activated; the job retries."""
 
 
 def _utc_now() -> datetime:
@@ -49,26 +68,406 @@ def write_text_to_storage(document_id: str, text: str) -> str:
     return storage_path
 
 
+def write_source_to_storage(document_id: str, body: bytes, loader: DocumentLoader) -> str:
+    # Keep the original bytes so a reindex re-extracts with the current loaders;
+    # the extension records which loader the worker runs.
+    storage_path = str(_ensure_storage_dir() / f"{document_id}.{loader.extension}")
+    Path(storage_path).write_bytes(body)
+    return storage_path
+
+
 def read_text_from_storage(storage_path: str) -> str:
     # Fail fast if the storage path is missing so callers can report 409.
     return Path(storage_path).read_text(encoding="utf-8")
 
 
+def stream_text_from_storage(storage_path: str) -> Iterator[str]:
+    # Check eagerly so a missing file still fails before the document enters processing.
+    if not Path(storage_path).is_file():
+        raise FileNotFoundError(storage_path)
+    return iter_text_file(storage_path)
+
+
+@dataclass
+class IngestStats:
+    # Per-job chunk accounting surfaced in job results and reindex audit events.
+    mode: str = "full"
+    chunks: int = 0
+    reused: int = 0
+    added: int = 0
+    removed: int = 0
+    renumbered: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "reindex_mode": self.mode,
+            "chunks": self.chunks,
+            "chunks_reused": self.reused,
+            "chunks_added": self.added,
+            "chunks_removed": self.removed,
+            "chunks_renumbered": self.renumbered,
+        }
+
+
+@dataclass(frozen=True)
+class _PlannedChunk:
+    index: int
+    text: str
+    content_hash: str
+    metadata: dict[str, Any]
+
+
+# Maps a chunk's source offsets to its page/section/row in an extracted document.
+SourceLocator = Callable[[int, int], dict[str, Any]]
+
+
+def _chunk_metadata(start: int, end: int, locate: SourceLocator | None = None) -> dict[str, Any]:
+    # Only chunk-local fields are stored per row; filename, content type and
+    # document metadata live once on the documents row and are joined at retrieval.
+    metadata: dict[str, Any] = {"offset_start": start, "offset_end": end}
+    if locate is not None:
+        metadata.update(locate(start, end))
+    return metadata
+
+
+def _plan_chunks(
+    parts: Iterable[str],
+    *,
+    chunk_size: int,
+    chunk_overlap: int,
+    locate: SourceLocator | None = None,
+) -> Iterator[_PlannedChunk]:
+    # Lazily chunk and hash the source; callers pull it one bounded batch at a time.
+    chunks = iter_chunks(parts, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    for index, (chunk_text_value, start, end) in enumerate(chunks):
+        yield _PlannedChunk(
+            index=index,
+            text=chunk_text_value,
+            content_hash=text_sha256(chunk_text_value),
+            metadata=_chunk_metadata(start, end, locate),
+        )
+
+
+async def _load_stored_chunks(
+    session: AsyncSession, document_id: str, generation: int
+) -> dict[str, list[tuple[Any, int, dict[str, Any]]]]:
+    # Index stored rows by content hash; only ids and metadata are loaded, never text or vectors.
+    # Rows written before content_hash existed are hashed in SQL on the fly.
+    hash_expr = func.coalesce(
+        Chunk.content_hash,
+        func.encode(func.sha256(func.convert_to(Chunk.text, "UTF8")), "hex"),
+    )
+    result = await session.execute(
+        select(Chunk.id, Chunk.chunk_index, hash_expr, Chunk.metadata_json)
+        .where(Chunk.document_id == document_id, Chunk.generation == generation)
+        .order_by(Chunk.chunk_index.asc(), Chunk.id.asc())
+    )
+    stored: dict[str, list[tuple[Any, int, dict[str, Any]]]] = defaultdict(list)
+    for chunk_id, chunk_index, content_hash, metadata in result.all():
+        stored[content_hash].append((chunk_id, chunk_index, metadata or {}))
+    return stored
+
+
+def _diff_batch(
+    stored: dict[str, list[tuple[Any, int, dict[str, Any]]]],
+    batch: list[_PlannedChunk],
+) -> tuple[list[_PlannedChunk], list[dict[str, Any]], int]:
+    """Diff one batch of planned chunks against stored rows for an incremental reindex.
+
+    Rows are matched by content hash, preferring the row with the same
+    (offset_start, offset_end) so duplicated text keeps its position. Matched
+    rows keep their vector and are cloned into the new generation with the
+    planned chunk_index and metadata; unmatched planned chunks are embedded and
+    inserted. Matched rows are consumed from stored, so whatever remains after
+    the last batch was removed from the source. Returns (to_embed, clones,
+    renumbered), where renumbered counts clones whose index or metadata moved.
+    """
+    to_embed: list[_PlannedChunk] = []
+    clones: list[dict[str, Any]] = []
+    renumbered = 0
+    for item in batch:
+        candidates = stored.get(item.content_hash)
+        if not candidates:
+            to_embed.append(item)
+            continue
+        offsets = (item.metadata["offset_start"], item.metadata["offset_end"])
+        match = next(
+            (
+                row
+                for row in candidates
+                if (row[2].get("offset_start"), row[2].get("offset_end")) == offsets
+            ),
+            candidates[0],
+        )
+        candidates.remove(match)
+        chunk_id, chunk_index, metadata = match
+        if chunk_index != item.index or metadata != item.metadata:
+            renumbered += 1
+        clones.append(
+            {
+                "id": uuid4(),
+                "source_id": chunk_id,
+                "chunk_index": item.index,
+                "content_hash": item.content_hash,
+                "metadata_json": item.metadata,
+            }
+        )
+    return to_embed, clones, renumbered
+
+
+def _counted(parts: Iterable[str], counter: list[int]) -> Iterator[str]:
+    # Tally source characters as they stream past for cost estimation.
+    for part in parts:
+        counter[0] += len(part)
+        yield part
+
+
 async def _load_document(session: AsyncSession, document_id: str) -> Document | None:
     result = await session.execute(select(Document).where(Document.id == document_id))
     return result.scalar_one_or_none()
 
 
+async def _lock_active_generation(session: AsyncSession, document_id: str) -> int | None:
+    # Row-locks the document; only the column is read so pending ORM changes survive.
+    result = await session.execute(
+        select(Document.active_generation).where(Document.id == document_id).with_for_update()
+    )
+    return result.scalar_one_or_none()
+
+
+def _embedding_settings(corpus: Corpus | None) -> tuple[Any, ...]:
+    # What the written vectors depend on and where they go; an embedding-generation cutover changes it.
+    corpus_config = corpus.provider_config_json if corpus is not None else None
+    vector_generation_id = corpus.embedding_generation_id if corpus is not None else None
+    return (*corpus_embedding_model(corpus_config), corpus_embedding_dim(corpus_config), vector_generation_id)
+
+
+async def _discard_generation(session: AsyncSession, document_id: str, generation: int) -> None:
+    # Best effort: whatever is left behind stays invisible until prune_chunk_generations runs.
+    try:
+        await session.rollback()
+        await chunks_repo.delete_generation(session, document_id, generation)
+        await session.commit()
+    except Exception as exc:  # noqa: BLE001 - the original failure is the one to surface
+        await session.rollback()
+        logger.warning("chunk_generation_discard_failed document_id=%s", document_id, exc_info=exc)
+
+
+@dataclass
+class GenerationWrite:
+    # One job's new chunk generation: where its rows go and what writing them cost.
+    document_id: str
+    tenant_id: str
+    corpus_id: str
+    generation: int
+    embedding_provider: EmbeddingProvider
+    embedding_dim: int
+    stats: IngestStats
+    batch_rows: int
+    # Set while the corpus serves a generation from chunk_embedding_shadows: vectors go there, not to chunks.
+    vector_generation_id: str | None = None
+    embed_ms: float = 0.0
+    write_ms: float = 0.0
+
+    @property
+    def embedding_column(self) -> str:
+        return chunks_repo.embedding_column_name(self.embedding_dim)
+
+
+# (chunks to embed, stored rows to clone) for one batch of a generation.
+GenerationBatch = tuple[list[_PlannedChunk], list[dict[str, Any]]]
+
+
+class GenerationWriter(Protocol):
+    async def write(self, write: GenerationWrite, batches: AsyncGenerator[GenerationBatch, None]) -> None: ...
+
+
+# The ingestion worker installs its staged pipeline here; otherwise batches run in the job's own task.
+_generation_writer: GenerationWriter | None = None
+
+
+def set_generation_writer(writer: GenerationWriter | None) -> None:
+    global _generation_writer
+    _generation_writer = writer
+
+
+async def embed_generation_rows(
+    session: AsyncSession, write: GenerationWrite, items: list[_PlannedChunk]
+) -> list[dict[str, Any]]:
+    # Reuse cached vectors for unchanged text; misses go to the provider in provider-sized batches.
+    if not items:
+        return []
+    embed_started = time.monotonic()
+    embeddings = await embed_with_cache(session, [item.text for item in items], provider=write.embedding_provider)
+    write.embed_ms += (time.monotonic() - embed_started) * 1000.0
+    rows: list[dict[str, Any]] = []
+    for item, embedding in zip(items, embeddings, strict=True):
+        if len(embedding) != EMBED_DIM:
+            raise ValueError(f"Embedding dimension mismatch; expected {EMBED_DIM}.")
+        rows.append(
+            {
+                "id": uuid4(),
+                "tenant_id": write.tenant_id,
+                "corpus_id": write.corpus_id,
+                "document_id": write.document_id,
+                "document_uri": f"document://{write.document_id}",
+                "chunk_index": item.index,
+                "text": item.text,
+                "content_hash": item.content_hash,
+                # Vectors are cached at native width and truncated to the corpus's column on write.
+                write.embedding_column: truncate_embedding(embedding, write.embedding_dim),
+                "metadata_json": item.metadata,
+                "generation": write.generation,
+            }
+        )
+    return rows
+
+
+async def write_generation_rows(
+    session: AsyncSession,
+    write: GenerationWrite,
+    clones: list[dict[str, Any]],
+    rows: list[dict[str, Any]],
+) -> None:
+    # Unchanged text keeps its vectors; rows are copied server-side into the new generation.
+    await chunks_repo.clone_chunks(session, clones, generation=write.generation)
+    if rows:
+        write_started = time.monotonic()
+        vectors: list[tuple[Any, list[float]]] = []
+        if write.vector_generation_id is not None:
+            vectors = [(row["id"], row.pop(write.embedding_column)) for row in rows]
+        write.stats.added += await chunks_repo.copy_chunks(session, rows, batch_size=write.batch_rows)
+        if vectors:
+            await generations_repo.insert_shadow_vectors(
+                session, write.vector_generation_id, write.corpus_id, vectors
+            )
+        write.write_ms += (time.monotonic() - write_started) * 1000.0
+
+
+async def _generation_batches(
+    planned: Iterable[_PlannedChunk],
+    stored: dict[str, list[tuple[Any, int, dict[str, Any]]]] | None,
+    stats: IngestStats,
+    *,
+    batch_rows: int,
+) -> AsyncGenerator[GenerationBatch, None]:
+    # Read/chunk one bounded batch at a time: the reader runs at most one batch
+    # ahead, so peak memory tracks the batch size, not the document.
+    async for batch in prefetch_batches(planned, batch_size=batch_rows):
+        stats.chunks += len(batch)
+        if stored is None:
+            yield batch, []
+            continue
+        to_embed, clones, renumbered = _diff_batch(stored, batch)
+        stats.reused += len(clones)
+        stats.renumbered += renumbered
+        yield to_embed, clones
+
+
+async def _write_batches(
+    session: AsyncSession, write: GenerationWrite, batches: AsyncGenerator[GenerationBatch, None]
+) -> None:
+    # Without a pipeline, embed and write each batch in turn; every batch commits on its own.
+    async for to_embed, clones in batches:
+        rows = await embed_generation_rows(session, write, to_embed)
+        await write_generation_rows(session, write, clones, rows)
+        await session.commit()
+
+
+async def _write_generation(
+    session: AsyncSession,
+    doc: Document,
+    planned: Iterable[_PlannedChunk],
+    stats: IngestStats,
+    *,
+    generation: int,
+    previous: int,
+) -> tuple[Any, ...]:
+    # Batches commit as they are written; the rows stay invisible until the flip.
+    # Returns the embedding settings the vectors were written under.
+    corpus = await corpora_repo.get_corpus(session, doc.corpus_id)
+    corpus_config = corpus.provider_config_json if corpus is not None else None
+    stored: dict[str, list[tuple[Any, int, dict[str, Any]]]] | None = None
+    if stats.mode == "incremental":
+        stored = await _load_stored_chunks(session, doc.id, previous)
+    else:
+        # Every served row is replaced; they are reclaimed once the new generation is active.
+        stats.removed = await chunks_repo.count_generation(session, doc.id, previous)
+    # Close the read transaction so the session does not sit idle in it while batches run.
+    await session.commit()
+
+    write = GenerationWrite(
+        document_id=doc.id,
+        tenant_id=doc.tenant_id,
+        corpus_id=doc.corpus_id,
+        generation=generation,
+        embedding_provider=get_embedding_provider(*corpus_embedding_model(corpus_config)),
+        embedding_dim=corpus_embedding_dim(corpus_config),
+        stats=stats,
+        batch_rows=max(1, int(get_settings().ingest_write_batch_rows)),
+        vector_generation_id=corpus.embedding_generation_id if corpus is not None else None,
+    )
+    batches = _generation_batches(planned, stored, stats, batch_rows=write.batch_rows)
+    if _generation_writer is not None:
+        await _generation_writer.write(write, batches)
+    else:
+        await _write_batches(session, write, batches)
+    if stored is not None:
+        # Stored rows left unmatched after the final batch no longer exist in the source.
+        stats.removed = sum(len(leftovers) for leftovers in stored.values())
+    if stats.added:
+        record_segment_timing(route_class="ingest", segment="embedding", latency_ms=write.embed_ms)
+        record_segment_timing(route_class="ingest", segment="chunk_write", latency_ms=write.write_ms)
+        # Publish write throughput so COPY regressions show up next to latency.
+        set_gauge("ingest.chunk_write_rows_per_s.latest", stats.added / max(write.write_ms / 1000.0, 1e-6))
+    return _embedding_settings(corpus)
+
+
+async def _activate_generation(
+    session: AsyncSession,
+    doc: Document,
+    *,
+    generation: int,
+    previous: int,
+    embedding_settings: tuple[Any, ...],
+) -> None:
+    # The only transaction that changes what retrieval serves: two row locks, one
+    # UPDATE each on the document and corpus, no chunk reads or writes.
+    # KEY SHARE keeps an embedding-generation cutover from landing before the commit.
+    corpus = await corpora_repo.lock_corpus_for_chunk_write(session, doc.corpus_id)
+    if _embedding_settings(corpus) != embedding_settings:
+        raise ChunkGenerationConflict("Corpus embedding settings changed during ingestion")
+    if await _lock_active_generation(session, doc.id) != previous:
+        raise ChunkGenerationConflict("Document was reindexed concurrently")
+    doc.active_generation = generation
+    # Commit the version bump with the flip so cached retrieval results miss exactly when chunks change.
+    await corpora_repo.bump_corpus_version(session, [doc.corpus_id])
+    await session.commit()
+
+
 async def _ingest_with_session(
     session: AsyncSession,
     doc: Document,
-    text: str,
+    parts: Iterable[str],
     *,
     chunk_size: int,
     chunk_overlap: int,
     is_reindex: bool,
     job_id: str | None,
-) -> int:
+    reindex_mode: ReindexMode = "full",
+    locate: SourceLocator | None = None,
+) -> IngestStats:
+    """Write the document's chunks as a new generation, then activate it.
+
+    Batches are embedded and committed one short transaction at a time into a
+    generation retrieval does not serve yet, so the previous chunks stay
+    searchable for the whole job. The final transaction only re-checks the
+    corpus embedding settings and the document's active generation, flips
+    documents.active_generation and bumps corpus_version; superseded rows are
+    deleted afterwards. A changed embedding setting or a concurrent reindex
+    discards the new generation and raises ChunkGenerationConflict so the job
+    retries from the current state.
+    """
     # Mark processing early so operators can see progress on long ingestions.
     started = _utc_now()
     queue_wait_ms: float | None = None
@@ -77,6 +476,11 @@ async def _ingest_with_session(
         # Publish queue wait gauges for ingestion backlog visibility.
         set_gauge("ingest.queue_wait_ms.latest", queue_wait_ms)
         record_segment_timing(route_class="ingest", segment="queue_wait", latency_ms=queue_wait_ms)
+    # Draw the generation under the document lock so generation numbers grow in flip order.
+    active_generation = await _lock_active_generation(session, doc.id)
+    if active_generation is None:
+        return IngestStats(mode=reindex_mode if is_reindex else "full")
+    generation = await chunks_repo.next_generation(session)
     doc.status = "processing"
     doc.error_message = None
     doc.failure_reason = None
@@ -87,40 +491,22 @@ async def _ingest_with_session(
         doc.last_job_id = job_id
     await session.commit()
 
-    await session.execute(delete(Chunk).where(Chunk.document_id == doc.id))
-
-    chunks: list[Chunk] = []
     # Validate chunk parameters to avoid infinite loops in windowing.
     _validate_chunk_params(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-    for index, (chunk_text_value, start, end) in enumerate(
-        chunk_text(text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-    ):
-        embedding = embed_text(chunk_text_value)
-        if len(embedding) != EMBED_DIM:
-            raise ValueError(f"Embedding dimension mismatch; expected {EMBED_DIM}.")
-        metadata = {
-            "filename": doc.filename,
-            "content_type": doc.content_type,
-            "offset_start": start,
-            "offset_end": end,
-        }
-        if doc.metadata_json:
-            # Keep document-level metadata attached to every chunk for retrieval.
-            metadata["document_metadata"] = doc.metadata_json
-        chunks.append(
-            Chunk(
-                id=uuid4(),
-                corpus_id=doc.corpus_id,
-                document_id=doc.id,
-                document_uri=f"document://{doc.id}",
-                chunk_index=index,
-                text=chunk_text_value,
-                embedding=embedding,
-                metadata_json=metadata,
-            )
+    source_chars = [0]
+    planned = _plan_chunks(
+        _counted(parts, source_chars), chunk_size=chunk_size, chunk_overlap=chunk_overlap, locate=locate
+    )
+
+    stats = IngestStats(mode=reindex_mode if is_reindex else "full")
+    try:
+        embedding_settings = await _write_generation(
+            session, doc, planned, stats, generation=generation, previous=active_generation
         )
+    except Exception:
+        await _discard_generation(session, doc.id, generation)
+        raise
 
-    session.add_all(chunks)
     doc.status = "succeeded"
     doc.error_message = None
     doc.failure_reason = None
@@ -133,12 +519,26 @@ async def _ingest_with_session(
     if is_reindex:
         # Use UTC timestamps to keep status fields deterministic across hosts.
         doc.last_reindexed_at = _utc_now()
-    await session.commit()
+    flip_started = time.monotonic()
+    try:
+        await _activate_generation(
+            session,
+            doc,
+            generation=generation,
+            previous=active_generation,
+            embedding_settings=embedding_settings,
+        )
+    except Exception:
+        await _discard_generation(session, doc.id, generation)
+        raise
+    record_segment_timing(
+        route_class="ingest", segment="generation_flip", latency_ms=(time.monotonic() - flip_started) * 1000.0
+    )
     # Record embedding costs after the ingest commit so ingestion state stays consistent.
     try:
         settings = get_settings()
         ratio = settings.cost_estimator_token_chars_ratio or 4.0
-        token_count = estimate_tokens(text, ratio=ratio)
+        token_count = estimate_tokens_for_chars(source_chars[0], ratio=ratio)
         await record_cost_event(
             session=None,
             tenant_id=doc.tenant_id,
@@ -147,66 +547,140 @@ async def _ingest_with_session(
             route_class="ingest",
             component="embedding",
             provider="internal",
-            units={"tokens": token_count, "chunks": len(chunks)},
+            units={"tokens": token_count, "chunks": stats.added},
             rate_type="per_1k_tokens",
             metadata={"estimated": True, "reindex": is_reindex},
         )
     except Exception as exc:  # noqa: BLE001 - best-effort metering should not fail ingestion
         logger.warning("cost_metering_embedding_failed document_id=%s", doc.id, exc_info=exc)
-    return len(chunks)
+    if is_reindex:
+        # Counts are only known once the job commits, so report them on a completion event.
+        await record_event(
+            session=None,
+            tenant_id=doc.tenant_id,
+            actor_type="system",
+            actor_id=None,
+            actor_role=None,
+            event_type="documents.reindex.completed",
+            outcome="success",
+            resource_type="document",
+            resource_id=doc.id,
+            request_id=job_id,
+            metadata={"corpus_id": doc.corpus_id, **stats.as_dict()},
+            best_effort=True,
+        )
+    # Reclaim superseded rows last and outside the flip; a failure only delays freeing the space.
+    document_id = doc.id
+    try:
+        await chunks_repo.delete_superseded_generations(session, document_id, generation)
+        await session.commit()
+    except Exception as exc:  # noqa: BLE001 - prune_chunk_generations sweeps leftovers
+        await session.rollback()
+        logger.warning("chunk_generation_reclaim_failed document_id=%s", document_id, exc_info=exc)
+    return stats
 
 
-async def ingest_document(
+async def _ingest_parts(
     document_id: str,
-    text: str,
+    parts: Iterable[str],
     *,
-    chunk_size: int = CHUNK_SIZE_CHARS,
-    chunk_overlap: int = CHUNK_OVERLAP_CHARS,
-    is_reindex: bool = False,
-    job_id: str | None = None,
-) -> int:
+    chunk_size: int,
+    chunk_overlap: int,
+    is_reindex: bool,
+    job_id: str | None,
+    reindex_mode: ReindexMode,
+    locate: SourceLocator | None = None,
+) -> IngestStats:
     # Run ingestion in a background task with its own DB session.
     async with SessionLocal() as session:
         doc = await _load_document(session, document_id)
         if doc is None:
-            return 0
+            return IngestStats(mode=reindex_mode if is_reindex else "full")
 
         try:
             return await _ingest_with_session(
                 session,
                 doc,
-                text,
+                parts,
                 chunk_size=chunk_size,
                 chunk_overlap=chunk_overlap,
                 is_reindex=is_reindex,
                 job_id=job_id,
+                reindex_mode=reindex_mode,
+                locate=locate,
             )
         except Exception:  # noqa: BLE001 - upstream handles failure state and retries
             await session.rollback()
             raise
 
 
-async def ingest_document_from_storage(
+async def ingest_document(
     document_id: str,
-    storage_path: str,
+    text: str,
     *,
     chunk_size: int = CHUNK_SIZE_CHARS,
     chunk_overlap: int = CHUNK_OVERLAP_CHARS,
     is_reindex: bool = False,
     job_id: str | None = None,
-) -> int:
-    # Read the stored source text to keep ingestion repeatable.
-    text = read_text_from_storage(storage_path)
-    return await ingest_document(
+    reindex_mode: ReindexMode = "full",
+) -> IngestStats:
+    return await _ingest_parts(
         document_id,
-        text,
+        [text],
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         is_reindex=is_reindex,
         job_id=job_id,
+        reindex_mode=reindex_mode,
     )
 
 
+async def ingest_document_from_storage(
+    document_id: str,
+    storage_path: str,
+    *,
+    chunk_size: int = CHUNK_SIZE_CHARS,
+    chunk_overlap: int = CHUNK_OVERLAP_CHARS,
+    is_reindex: bool = False,
+    job_id: str | None = None,
+    reindex_mode: ReindexMode = "full",
+) -> IngestStats:
+    loader = loader_for_path(storage_path)
+    if loader is None:
+        # Stream the stored source text so huge documents never load whole.
+        return await _ingest_parts(
+            document_id,
+            stream_text_from_storage(storage_path),
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            is_reindex=is_reindex,
+            job_id=job_id,
+            reindex_mode=reindex_mode,
+        )
+    # Binary and markup sources are extracted in the loader pool, off the worker's event loop.
+    # The pool spools the text to disk so the worker streams it like a text source.
+    with tempfile.TemporaryDirectory(prefix="nexusrag-extract-") as spool_dir:
+        extract_started = time.monotonic()
+        extracted = await spool_file(loader, storage_path, Path(spool_dir) / "extracted.txt")
+        record_segment_timing(
+            route_class="ingest", segment="extract", latency_ms=(time.monotonic() - extract_started) * 1000.0
+        )
+        increment_counter(f"ingest.loader.{loader.name}.documents")
+        # Loaders only record spans for non-blank blocks.
+        if not extracted.spans:
+            raise ValueError(f"{loader.name.upper()} document has no extractable text")
+        return await _ingest_parts(
+            document_id,
+            extracted.iter_text(),
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            is_reindex=is_reindex,
+            job_id=job_id,
+            reindex_mode=reindex_mode,
+            locate=extracted.locate,
+        )
+
+
 def _validate_chunk_params(*, chunk_size: int, chunk_overlap: int) -> None:
     # Guard against invalid ranges that would cause non-terminating chunking.
     if chunk_size < 1 or chunk_overlap < 0:
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Callable
+
+from nexusrag.core.config import get_settings
+from nexusrag.persistence.db import SessionLocal
+from nexusrag.services.ingest.ingestion import (
+    GenerationBatch,
+    GenerationWrite,
+    embed_generation_rows,
+    set_generation_writer,
+    write_generation_rows,
+)
+from nexusrag.services.telemetry import increment_counter, set_gauge
+
+STAGES = ("read", "embed", "write")
+
+
+class PipelineStoppedError(RuntimeError):
+    """Batches cut off by a worker shutdown fail their job, which retries and discards the generation."""
+
+    def __init__(self) -> None:
+        super().__init__("Ingestion pipeline stopped")
+
+
+@dataclass
+class StageStats:
+    # Rolling per-stage accounting; busy time is only the time spent doing the stage's work.
+    concurrency: int
+    queue_capacity: int | None
+    active: int = 0
+    batches: int = 0
+    chunks: int = 0
+    _samples: deque[tuple[float, int, float]] = field(default_factory=deque)
+
+    def record(self, chunks: int, busy_s: float, *, now: float | None = None) -> None:
+        self.batches += 1
+        self.chunks += chunks
+        self._samples.append((time.monotonic() if now is None else now, chunks, busy_s))
+
+    def snapshot(self, *, queue_depth: int, window_s: float, now: float | None = None) -> dict[str, Any]:
+        now = time.monotonic() if now is None else now
+        while self._samples and self._samples[0][0] < now - window_s:
+            self._samples.popleft()
+        window_chunks = sum(sample[1] for sample in self._samples)
+        busy_s = sum(sample[2] for sample in self._samples)
+        return {
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "queue_depth": queue_depth,
+            "queue_capacity": self.queue_capacity,
+            "batches_total": self.batches,
+            "chunks_total": self.chunks,
+            "chunks_per_s": window_chunks / window_s,
+            # Near 1.0 means every slot was busy for the whole window: the stage limits throughput.
+            "busy_ratio": min(1.0, busy_s / (window_s * max(1, self.concurrency))),
+        }
+
+
+class _PipelineJob:
+    # One document's batches in flight; the job waits until all of them are written or dropped.
+    def __init__(self, write: GenerationWrite) -> None:
+        self.write = write
+        self.error: BaseException | None = None
+        self._pending = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+
+    def add(self) -> None:
+        self._pending += 1
+        self._drained.clear()
+
+    def finish(self, error: BaseException | None = None) -> None:
+        if error is not None and self.error is None:
+            self.error = error
+        self._pending -= 1
+        if self._pending == 0:
+            self._drained.set()
+
+    def fail(self, error: BaseException) -> None:
+        if self.error is None:
+            self.error = error
+
+    async def drained(self) -> None:
+        await self._drained.wait()
+
+
+@dataclass
+class _Batch:
+    job: _PipelineJob
+    to_embed: list[Any]
+    clones: list[dict[str, Any]]
+    rows: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def chunks(self) -> int:
+        return len(self.to_embed) + len(self.clones)
+
+
+class IngestionPipeline:
+    """Staged read -> embed -> write pipeline shared by every ingestion job in a worker.
+
+    Each job reads and chunks its own document (at most read_concurrency at a
+    time) and hands batches to fixed pools of embed and write tasks through
+    bounded queues, so one document's embedding overlaps another's COPY and a
+    slow remote provider no longer idles the worker. A full queue blocks the
+    stage feeding it, bounding memory to the queue sizes. Batches commit
+    independently into the job's unactivated chunk generation; the job returns
+    once all of its batches are written, and raises the first batch error after
+    the rest have drained so it never discards a generation still being written.
+    """
+
+    def __init__(
+        self,
+        *,
+        read_concurrency: int,
+        embed_concurrency: int,
+        write_concurrency: int,
+        queue_batches: int,
+        stats_window_s: float,
+        session_factory: Callable[[], Any] = SessionLocal,
+    ) -> None:
+        queue_batches = max(1, queue_batches)
+        self._read_slots = asyncio.Semaphore(max(1, read_concurrency))
+        self._read_waiting = 0
+        self._embed_queue: asyncio.Queue[_Batch] = asyncio.Queue(maxsize=queue_batches)
+        self._write_queue: asyncio.Queue[_Batch] = asyncio.Queue(maxsize=queue_batches)
+        self._stats = {
+            "read": StageStats(concurrency=max(1, read_concurrency), queue_capacity=None),
+            "embed": StageStats(concurrency=max(1, embed_concurrency), queue_capacity=queue_batches),
+            "write": StageStats(concurrency=max(1, write_concurrency), queue_capacity=queue_batches),
+        }
+        self._stats_window_s = max(1.0, float(stats_window_s))
+        self._session_factory = session_factory
+        self._tasks: list[asyncio.Task] = []
+
+    @classmethod
+    def from_settings(cls) -> IngestionPipeline:
+        settings = get_settings()
+        return cls(
+            read_concurrency=settings.ingest_pipeline_read_concurrency,
+            embed_concurrency=settings.ingest_pipeline_embed_concurrency,
+            write_concurrency=settings.ingest_pipeline_write_concurrency,
+            queue_batches=settings.ingest_pipeline_queue_batches,
+            stats_window_s=settings.ingest_pipeline_stats_window_s,
+        )
+
+    def start(self) -> None:
+        # Install as the process's generation writer; jobs started before keep running inline.
+        self._tasks = [
+            *(asyncio.create_task(self._embed_worker()) for _ in range(self._stats["embed"].concurrency)),
+            *(asyncio.create_task(self._write_worker()) for _ in range(self._stats["write"].concurrency)),
+        ]
+        set_generation_writer(self)
+
+    async def stop(self) -> None:
+        set_generation_writer(None)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Release jobs whose batches were still queued; they fail and discard their generation.
+        for queue in (self._embed_queue, self._write_queue):
+            while not queue.empty():
+                queue.get_nowait().job.finish(PipelineStoppedError())
+
+    async def write(self, write: GenerationWrite, batches: AsyncGenerator[GenerationBatch, None]) -> None:
+        job = _PipelineJob(write)
+        read = self._stats["read"]
+        self._read_waiting += 1
+        try:
+            await self._read_slots.acquire()
+        finally:
+            self._read_waiting -= 1
+        try:
+            read.active += 1
+            try:
+                while job.error is None:
+                    # Only the wait for the reader counts as read time; blocking on a full
+                    # embed queue is downstream backpressure.
+                    started = time.monotonic()
+                    try:
+                        to_embed, clones = await anext(batches)
+                    except StopAsyncIteration:
+                        break
+                    batch = _Batch(job, to_embed, clones)
+                    read.record(batch.chunks, time.monotonic() - started)
+                    increment_counter("ingest.pipeline.read.chunks", batch.chunks)
+                    job.add()
+                    # Batches that only clone stored rows have nothing to embed.
+                    await (self._embed_queue if to_embed else self._write_queue).put(batch)
+            except Exception as exc:  # noqa: BLE001 - raised once in-flight batches drain
+                job.fail(exc)
+            finally:
+                read.active -= 1
+                await batches.aclose()
+        finally:
+            self._read_slots.release()
+        await job.drained()
+        if job.error is not None:
+            raise job.error
+
+    async def _embed_worker(self) -> None:
+        while True:
+            batch = await self._embed_queue.get()
+            try:
+                await self._embed(batch)
+            except asyncio.CancelledError:
+                batch.job.finish(PipelineStoppedError())
+                raise
+
+    async def _embed(self, batch: _Batch) -> None:
+        if batch.job.error is not None:
+            batch.job.finish()
+            return
+        stage = self._stats["embed"]
+        stage.active += 1
+        started = time.monotonic()
+        try:
+            async with self._session_factory() as session:
+                batch.rows = await embed_generation_rows(session, batch.job.write, batch.to_embed)
+                # Persist new embedding cache entries with the batch's own transaction.
+                await session.commit()
+        except Exception as exc:  # noqa: BLE001 - surfaced by the owning job
+            batch.job.finish(exc)
+            return
+        finally:
+            stage.active -= 1
+        stage.record(len(batch.to_embed), time.monotonic() - started)
+        increment_counter("ingest.pipeline.embed.chunks", len(batch.to_embed))
+        await self._write_queue.put(batch)
+
+    async def _write_worker(self) -> None:
+        while True:
+            batch = await self._write_queue.get()
+            try:
+                await self._write(batch)
+            except asyncio.CancelledError:
+                batch.job.finish(PipelineStoppedError())
+                raise
+
+    async def _write(self, batch: _Batch) -> None:
+        if batch.job.error is not None:
+            batch.job.finish()
+            return
+        stage = self._stats["write"]
+        stage.active += 1
+        started = time.monotonic()
+        try:
+            async with self._session_factory() as session:
+                await write_generation_rows(session, batch.job.write, batch.clones, batch.rows)
+                await session.commit()
+        except Exception as exc:  # noqa: BLE001 - surfaced by the owning job
+            batch.job.finish(exc)
+            return
+        finally:
+            stage.active -= 1
+        stage.record(batch.chunks, time.monotonic() - started)
+        increment_counter("ingest.pipeline.write.chunks", batch.chunks)
+        batch.job.finish()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Per-stage queue depth, throughput and busy ratio; also published as gauges."""
+        depths = {
+            "read": self._read_waiting,
+            "embed": self._embed_queue.qsize(),
+            "write": self._write_queue.qsize(),
+        }
+        stages = {
+            stage: self._stats[stage].snapshot(queue_depth=depths[stage], window_s=self._stats_window_s)
+            for stage in STAGES
+        }
+        for stage, values in stages.items():
+            set_gauge(f"ingest.pipeline.{stage}.queue_depth", float(values["queue_depth"]))
+            set_gauge(f"ingest.pipeline.{stage}.chunks_per_s", float(values["chunks_per_s"]))
+            set_gauge(f"ingest.pipeline.{stage}.busy_ratio", float(values["busy_ratio"]))
+        return stages
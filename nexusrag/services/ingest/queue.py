@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from datetime import datetime, timezone
-from typing import Literal
+from typing import Any, Literal
 
 from arq import Retry, create_pool
 from arq.connections import RedisSettings
@@ -27,6 +28,8 @@ _redis_pool_loop = None
 _redis_lock = asyncio.Lock()
 # Keep heartbeat key stable for ops endpoint lookups.
 WORKER_HEARTBEAT_KEY = "nexusrag:worker:heartbeat"
+# Ingestion pipeline stage stats, one hash field per worker process.
+PIPELINE_STATS_KEY = "nexusrag:worker:pipeline"
 
 
 def _queue_key(queue_name: str) -> str:
@@ -49,6 +52,8 @@ class IngestionJobPayload(BaseModel):
     request_id: str
     # Internal flag to reuse ingestion code for reindex jobs.
     is_reindex: bool = False
+    # Reindex strategy: rewrite all chunks or keep rows whose text is unchanged.
+    reindex_mode: Literal["full", "incremental"] = "full"
 
 
 def _utc_now() -> datetime:
@@ -120,6 +125,73 @@ async def get_worker_heartbeat() -> datetime | None:
         return None
 
 
+async def set_pipeline_stats(worker_id: str, stages: dict[str, dict[str, Any]]) -> None:
+    # Published with the heartbeat so ops endpoints in the API process can see worker stages.
+    redis = await get_redis_pool()
+    payload = {"reported_at": _utc_now().isoformat(), "stages": stages}
+    await redis.hset(PIPELINE_STATS_KEY, worker_id, json.dumps(payload))
+    # The key outlives its last publisher by one stale window only.
+    await redis.expire(PIPELINE_STATS_KEY, max(1, get_settings().worker_heartbeat_stale_after_s))
+
+
+async def clear_pipeline_stats(worker_id: str) -> None:
+    redis = await get_redis_pool()
+    await redis.hdel(PIPELINE_STATS_KEY, worker_id)
+
+
+def _aggregate_pipeline_stats(reports: list[dict[str, Any]]) -> dict[str, Any]:
+    # Sum counts and rates across workers; busy_ratio is weighted by each worker's stage concurrency.
+    stages: dict[str, dict[str, Any]] = {}
+    for report in reports:
+        for stage, values in report["stages"].items():
+            merged = stages.setdefault(
+                stage,
+                {
+                    "concurrency": 0,
+                    "active": 0,
+                    "queue_depth": 0,
+                    "queue_capacity": None,
+                    "batches_total": 0,
+                    "chunks_total": 0,
+                    "chunks_per_s": 0.0,
+                    "busy_ratio": 0.0,
+                },
+            )
+            concurrency = int(values.get("concurrency") or 0)
+            merged["busy_ratio"] += float(values.get("busy_ratio") or 0.0) * concurrency
+            merged["concurrency"] += concurrency
+            for key in ("active", "queue_depth", "batches_total", "chunks_total"):
+                merged[key] += int(values.get(key) or 0)
+            merged["chunks_per_s"] += float(values.get("chunks_per_s") or 0.0)
+            if values.get("queue_capacity") is not None:
+                merged["queue_capacity"] = (merged["queue_capacity"] or 0) + int(values["queue_capacity"])
+    for merged in stages.values():
+        merged["busy_ratio"] = merged["busy_ratio"] / merged["concurrency"] if merged["concurrency"] else 0.0
+    return {"workers": len(reports), "stages": stages}
+
+
+async def get_pipeline_stats() -> dict[str, Any] | None:
+    # Return None when Redis is unavailable; workers silent past the heartbeat threshold are dropped.
+    settings = get_settings()
+    if settings.ingest_execution_mode.lower() == "inline":
+        return None
+    try:
+        redis = await get_redis_pool()
+        raw = await redis.hgetall(PIPELINE_STATS_KEY)
+    except Exception:  # noqa: BLE001 - ops endpoints handle degraded Redis
+        return None
+    cutoff = _utc_now().timestamp() - settings.worker_heartbeat_stale_after_s
+    reports: list[dict[str, Any]] = []
+    for value in (raw or {}).values():
+        try:
+            report = json.loads(value)
+            if datetime.fromisoformat(report["reported_at"]).timestamp() >= cutoff:
+                reports.append(report)
+        except (ValueError, KeyError, TypeError):
+            continue
+    return _aggregate_pipeline_stats(reports)
+
+
 async def enqueue_ingestion_job(payload: IngestionJobPayload) -> str:
     # Generate a stable job id so API callers can trace ingestion progress.
     started = _utc_now()
@@ -161,7 +233,7 @@ async def process_ingestion_job(
     job_id: str,
     attempt: int,
     max_retries: int,
-) -> int:
+) -> dict[str, Any]:
     # Centralize ingestion execution so worker and inline mode share behavior.
     try:
         bulkhead = get_ingest_bulkhead()
@@ -170,14 +242,17 @@ async def process_ingestion_job(
             raise ServiceBusyError("Ingestion capacity is saturated")
         storage_path = _resolve_storage_path(payload)
         try:
-            return await ingest_document_from_storage(
+            stats = await ingest_document_from_storage(
                 payload.document_id,
                 storage_path,
                 chunk_size=payload.chunk_size_chars,
                 chunk_overlap=payload.chunk_overlap_chars,
                 is_reindex=payload.is_reindex,
                 job_id=job_id,
+                reindex_mode=payload.reindex_mode,
             )
+            # Return plain counts so arq can serialize the job result.
+            return stats.as_dict()
         finally:
             lease.release()
     except Exception as exc:  # noqa: BLE001 - surface a concise failure reason
@@ -190,7 +265,7 @@ async def process_ingestion_job(
             job_id=job_id,
         )
         logger.exception("Ingestion failed for %s", payload.document_id)
-        return 0
+        return {}
 
 
 async def _run_inline_job(payload: IngestionJobPayload, *, job_id: str, max_retries: int) -> None:
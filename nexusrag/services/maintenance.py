@@ -4,13 +4,16 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Literal
 
-from sqlalchemy import delete, or_, select
+from sqlalchemy import and_, delete, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from nexusrag.core.config import get_settings
 from nexusrag.domain.models import (
     AuditEvent,
     BackupJob,
+    Chunk,
+    Document,
+    EmbeddingCacheEntry,
     IdempotencyRecord,
     LegalHold,
     NotificationAttempt,
@@ -44,6 +47,8 @@ MaintenanceTask = Literal[
     "compliance_evaluate_scheduled",
     "compliance_bundle_periodic",
     "compliance_prune_old_evidence",
+    "prune_embedding_cache",
+    "prune_chunk_generations",
 ]
 
 
@@ -79,6 +84,55 @@ async def prune_usage_counters(session: AsyncSession) -> int:
     return result.rowcount or 0
 
 
+async def prune_embedding_cache(session: AsyncSession) -> int:
+    # Evict vectors unused past the retention window, then trim the coldest rows over the size cap.
+    settings = get_settings()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.embedding_cache_retention_days)
+    aged = await session.execute(delete(EmbeddingCacheEntry).where(EmbeddingCacheEntry.last_used_at < cutoff))
+    deleted = int(aged.rowcount or 0)
+    total = (await session.execute(select(func.count()).select_from(EmbeddingCacheEntry))).scalar_one()
+    overflow = int(total) - max(0, settings.embedding_cache_max_entries)
+    if overflow > 0:
+        coldest = (
+            select(
+                EmbeddingCacheEntry.provider,
+                EmbeddingCacheEntry.model,
+                EmbeddingCacheEntry.text_sha256,
+            )
+            .order_by(EmbeddingCacheEntry.last_used_at.asc())
+            .limit(overflow)
+        )
+        trimmed = await session.execute(
+            delete(EmbeddingCacheEntry).where(
+                tuple_(
+                    EmbeddingCacheEntry.provider,
+                    EmbeddingCacheEntry.model,
+                    EmbeddingCacheEntry.text_sha256,
+                ).in_(coldest)
+            )
+        )
+        deleted += int(trimmed.rowcount or 0)
+    return deleted
+
+
+async def prune_chunk_generations(session: AsyncSession) -> int:
+    # Reindex jobs reclaim the generation they replace; this sweeps what a crashed
+    # or failed job left behind. Generations older than the active one can never
+    # be activated again; newer ones are only kept while a job is still writing them.
+    # The document must be committed as processing before a job writes its first row,
+    # so a job starting after this statement's snapshot is never swept.
+    result = await session.execute(
+        delete(Chunk).where(
+            Chunk.document_id == Document.id,
+            or_(
+                Chunk.generation < Document.active_generation,
+                and_(Chunk.generation > Document.active_generation, Document.status != "processing"),
+            ),
+        )
+    )
+    return int(result.rowcount or 0)
+
+
 async def prune_notification_history(session: AsyncSession) -> int:
     # Delete only terminal notification rows after retention to preserve active delivery state.
     settings = get_settings()
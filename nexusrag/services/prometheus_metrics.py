@@ -11,6 +11,7 @@ from prometheus_client.metrics_core import (
 )
 from prometheus_client.registry import Collector
 
+from nexusrag.ingestion.embeddings import get_query_embedding_cache
 from nexusrag.services import telemetry
 
 # Use a private registry so we don't accidentally expose the default
@@ -128,6 +129,26 @@ class _NexusRAGCollector(Collector):
                 ext_p95.add_metric([integration], stats["p95"])
         yield ext_p95
 
+        # ── Query embedding cache ─────────────────────────────────────────────
+        cache_stats = get_query_embedding_cache().stats()
+        lookups = CounterMetricFamily(
+            "nexusrag_query_embedding_cache_lookups",
+            "Query embedding cache lookups, by outcome (coalesced = joined an in-flight miss).",
+            labels=["outcome"],
+        )
+        lookups.add_metric(["hit"], cache_stats.hits)
+        lookups.add_metric(["coalesced"], cache_stats.coalesced)
+        lookups.add_metric(["miss"], cache_stats.misses)
+        yield lookups
+        for name, help_text, value in (
+            ("hit_ratio", "Share of query embedding lookups served without a provider call.", cache_stats.hit_ratio),
+            ("entries", "Query embeddings currently cached in this process.", cache_stats.entries),
+            ("bytes", "Estimated bytes held by the query embedding cache.", cache_stats.bytes),
+        ):
+            g = GaugeMetricFamily(f"nexusrag_query_embedding_cache_{name}", help_text)
+            g.add_metric([], float(value))
+            yield g
+
 
 _REGISTRY.register(_NexusRAGCollector())
 
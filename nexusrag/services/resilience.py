@@ -6,7 +6,7 @@ import logging
 import random
 import time
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable
+from typing import Any, Awaitable, Callable, TypeVar
 
 from redis.asyncio import Redis
 
@@ -18,6 +18,7 @@ logger = logging.getLogger(__name__)
 
 
 TransientException = (TimeoutError, OSError)
+T = TypeVar("T")
 
 
 _redis_pool: Redis | None = None
@@ -99,6 +100,123 @@ async def retry_async(
             attempt += 1
 
 
+class HedgeBudget:
+    """Token bucket capping hedged calls at a fraction of primary calls.
+
+    Every primary call deposits `ratio` tokens (up to `burst`) and every hedge
+    spends one. When an upstream is slow across the board the bucket drains,
+    so hedging adds at most `ratio` extra load instead of doubling it.
+    """
+
+    def __init__(self, name: str, *, ratio: float, burst: float) -> None:
+        self._name = name
+        self._ratio = max(0.0, float(ratio))
+        self._burst = max(0.0, float(burst))
+        self._tokens = self._burst
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def deposit(self) -> None:
+        self._tokens = min(self._burst, self._tokens + self._ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1.0:
+            increment_counter(f"hedge_budget_exhausted_total.{self._name}")
+            return False
+        self._tokens -= 1.0
+        return True
+
+
+_hedge_budgets: dict[str, HedgeBudget] = {}
+
+
+def get_hedge_budget(name: str) -> HedgeBudget:
+    # One budget per integration per process, sized from settings on first use.
+    budget = _hedge_budgets.get(name)
+    if budget is None:
+        settings = get_settings()
+        budget = HedgeBudget(
+            name,
+            ratio=settings.retrieval_hedge_budget_ratio,
+            burst=settings.retrieval_hedge_budget_burst,
+        )
+        _hedge_budgets[name] = budget
+    return budget
+
+
+def reset_hedge_budgets() -> None:
+    # Allow tests to rebuild budgets after tweaking settings.
+    _hedge_budgets.clear()
+
+
+async def hedged_call(
+    primary: Callable[[], Awaitable[T]],
+    hedge: Callable[[], Awaitable[T]],
+    *,
+    delay_s: float | None,
+    budget: HedgeBudget,
+    hedge_on_error: bool = False,
+    accept_hedge: Callable[[T], bool] | None = None,
+) -> tuple[T, bool]:
+    """Run primary, racing hedge against it once it is slower than delay_s.
+
+    The first successful result wins and the other call is cancelled. The hedge
+    starts only if the budget allows; with hedge_on_error it also starts,
+    without spending budget, as soon as primary fails (fallback providers).
+    A hedge result that accept_hedge rejects does not win the race: primary
+    keeps running, and the rejected result is used only if primary fails.
+    delay_s=None disables the timed hedge. Returns (result, hedge_won); when
+    every started call fails, the primary's error is raised.
+    """
+    budget.deposit()
+    primary_task: asyncio.Task[T] = asyncio.ensure_future(primary())
+    hedge_task: asyncio.Task[T] | None = None
+    running: set[asyncio.Task[T]] = {primary_task}
+    rejected: list[T] = []
+    try:
+        if delay_s is not None:
+            await asyncio.wait(running, timeout=max(0.0, delay_s))
+            if not primary_task.done() and budget.try_spend():
+                increment_counter(f"hedge_started_total.{budget.name}")
+                hedge_task = asyncio.ensure_future(hedge())
+                running.add(hedge_task)
+        while running:
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge_task and accept_hedge is not None and not accept_hedge(task.result()):
+                        rejected.append(task.result())
+                        continue
+                    if task is hedge_task:
+                        increment_counter(f"hedge_won_total.{budget.name}")
+                    return task.result(), task is hedge_task
+                if task is primary_task and hedge_on_error and hedge_task is None:
+                    increment_counter(f"hedge_fallback_total.{budget.name}")
+                    hedge_task = asyncio.ensure_future(hedge())
+                    running.add(hedge_task)
+        if rejected:
+            # Primary failed, so the rejected hedge result beats an error.
+            increment_counter(f"hedge_won_total.{budget.name}")
+            return rejected[0], True
+        primary_error = primary_task.exception()
+        if primary_error is not None:
+            raise primary_error
+        # Unreachable: the loop only exits after every started task failed.
+        raise RuntimeError("hedged_call finished without a result")
+    finally:
+        pending = [task for task in (primary_task, hedge_task) if task is not None and not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
 @dataclass(frozen=True)
 class CircuitBreakerConfig:
     # Store thresholds in settings so operators can tune without code changes.
@@ -267,6 +385,7 @@ class Bulkhead:
 
 _run_bulkhead: Bulkhead | None = None
 _ingest_bulkhead: Bulkhead | None = None
+_embedding_migration_bulkhead: Bulkhead | None = None
 
 
 def get_run_bulkhead() -> Bulkhead:
@@ -293,11 +412,25 @@ def get_ingest_bulkhead() -> Bulkhead:
     return _ingest_bulkhead
 
 
+def get_embedding_migration_bulkhead() -> Bulkhead:
+    # Cap embedding-generation backfills at a share of ingest capacity; batches also hold an ingest slot.
+    global _embedding_migration_bulkhead
+    if _embedding_migration_bulkhead is None:
+        settings = get_settings()
+        share = max(0.0, min(1.0, settings.embedding_migration_capacity_share))
+        _embedding_migration_bulkhead = Bulkhead(
+            "embedding_migration",
+            int(get_ingest_bulkhead().limit * share),
+        )
+    return _embedding_migration_bulkhead
+
+
 def reset_bulkheads() -> None:
     # Allow tests to reset bulkhead limits after tweaking settings.
-    global _run_bulkhead, _ingest_bulkhead
+    global _run_bulkhead, _ingest_bulkhead, _embedding_migration_bulkhead
     _run_bulkhead = None
     _ingest_bulkhead = None
+    _embedding_migration_bulkhead = None
 
 
 def deterministic_canary(tenant_id: str, percentage: int) -> bool:
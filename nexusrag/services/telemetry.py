@@ -93,6 +93,15 @@ def set_gauge(name: str, value: float) -> None:
     _gauges[name] = float(value)
 
 
+def record_embedding_cache_lookup(*, hits: int, misses: int) -> None:
+    # Track embedding cache effectiveness; the ratio is cumulative for the process.
+    increment_counter("embedding_cache.hits", hits)
+    increment_counter("embedding_cache.misses", misses)
+    total = _counters["embedding_cache.hits"] + _counters["embedding_cache.misses"]
+    if total:
+        set_gauge("embedding_cache.hit_ratio", _counters["embedding_cache.hits"] / total)
+
+
 def _window_samples(window_s: int) -> list[RequestSample]:
     cutoff = time.time() - window_s
     return [sample for sample in _request_samples if sample.ts >= cutoff]
@@ -182,6 +191,26 @@ def external_latency_by_integration(window_s: int) -> dict[str, dict[str, float
     return result
 
 
+def external_latency_percentile(
+    integration: str,
+    percentile: float,
+    *,
+    window_s: int,
+    min_samples: int = 1,
+) -> float | None:
+    # Latency at `percentile` over recent successful calls; None until enough samples exist.
+    cutoff = time.time() - window_s
+    latencies = sorted(
+        sample.latency_ms
+        for sample in _external_samples
+        if sample.integration == integration and sample.success and sample.ts >= cutoff
+    )
+    if not latencies or len(latencies) < min_samples:
+        return None
+    idx = max(0, math.ceil(percentile / 100.0 * len(latencies)) - 1)
+    return latencies[min(idx, len(latencies) - 1)]
+
+
 def stream_duration_stats() -> dict[str, float | None]:
     # Summarize recent SSE stream durations.
     if not _stream_samples:
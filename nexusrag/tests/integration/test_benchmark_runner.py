@@ -74,3 +74,80 @@ async def test_runner_write_artifact_carries_previous(tmp_path, monkeypatch) ->
     assert second["latest"]["metrics"]["retrieval"]["recall_at_5"] == 0.9
     assert second["latest"]["embedding_provider"] == "openai"
     assert second["previous_run"]["metrics"]["retrieval"]["recall_at_5"] == 0.4
+
+
+@pytest.mark.asyncio
+async def test_runner_ann_check_reports_recall_and_latency() -> None:
+    docs, cases = runner.load_fixture()
+
+    await _cleanup()
+    try:
+        async with SessionLocal() as session:
+            await runner.index_fixture(session, docs)
+            report = await runner.ann_check(session, cases, ef_search_values=(40,), filler_rows=500)
+    finally:
+        await _cleanup()
+
+    assert report["queries"] == len(cases)
+    assert report["exact"]["p95_ms"] >= report["exact"]["p50_ms"] >= 0.0
+    assert [row["ef_search"] for row in report["ann"]] == [40]
+    assert 0.0 <= report["ann"][0]["recall_vs_exact_at_k"] <= 1.0
+    # 5-doc corpora next to 500 filler rows: iterative scans must still fill every result list.
+    skewed = report["skewed"]
+    assert skewed["filler_rows"] == 500
+    assert skewed["rows_vs_exact"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_runner_scores_vector_and_hybrid_modes() -> None:
+    docs, cases = runner.load_fixture()
+
+    await _cleanup()
+    try:
+        async with SessionLocal() as session:
+            await runner.index_fixture(session, docs)
+            modes = await runner.score_modes(session, cases)
+    finally:
+        await _cleanup()
+
+    assert set(modes) == {"vector", "hybrid"}
+    for name, row in modes.items():
+        assert row["cases"] >= 1
+        assert 0.0 <= row["recall_at_5"] <= 1.0, f"{name} recall out of range"
+
+
+@pytest.mark.asyncio
+async def test_runner_quantization_check_reports_recall_and_index_size() -> None:
+    docs, cases = runner.load_fixture()
+
+    await _cleanup()
+    try:
+        async with SessionLocal() as session:
+            await runner.index_fixture(session, docs)
+            report = await runner.quantization_check(session, cases, oversample_values=(4,))
+    finally:
+        await _cleanup()
+
+    assert set(report["index_bytes"]) == {"full", "halfvec", "binary"}
+    assert [(row["type"], row["oversample"]) for row in report["sweep"]] == [("halfvec", 4), ("binary", 4)]
+    for row in report["sweep"]:
+        assert 0.0 <= row["recall_vs_exact_at_k"] <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_runner_dimension_check_scores_each_width() -> None:
+    docs, cases = runner.load_fixture()
+
+    await _cleanup()
+    try:
+        async with SessionLocal() as session:
+            await runner.index_fixture(session, docs)
+            report = await runner.dimension_check(session, cases, dims=(256, 768), corpus="rag")
+    finally:
+        await _cleanup()
+
+    assert report["corpus"] == "rag"
+    assert [row["embedding_dim"] for row in report["sweep"]] == [256, 768]
+    for row in report["sweep"]:
+        assert set(row["per_corpus"]) <= {"rag"}
+        assert 0.0 <= row["recall_at_5"] <= 1.0
@@ -4,11 +4,14 @@ from uuid import uuid4
 
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy import delete
+from sqlalchemy import delete, select
 
 from nexusrag.apps.api.main import create_app
-from nexusrag.domain.models import Corpus
+from nexusrag.core.config import get_settings
+from nexusrag.domain.models import Chunk, ChunkEmbeddingShadow, Corpus, CorpusEmbeddingGeneration, Document
 from nexusrag.persistence.db import SessionLocal
+from nexusrag.persistence.repos import embedding_generations as generations_repo
+from nexusrag.providers.retrieval.router import RetrievalRouter
 from nexusrag.tests.utils.auth import create_test_api_key
 
 
@@ -120,3 +123,98 @@ async def test_corpora_patch_validation_and_update() -> None:
     async with SessionLocal() as db_session:
         await db_session.execute(delete(Corpus).where(Corpus.id == corpus_id))
         await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_corpora_embedding_generation_cutover_and_rollback(monkeypatch) -> None:
+    # Inline mode runs the shadow backfill inside the create request.
+    monkeypatch.setenv("INGEST_EXECUTION_MODE", "inline")
+    get_settings.cache_clear()
+    app = create_app()
+    corpus_id = f"c-gen-{uuid4()}"
+    provider_config_json = {"retrieval": {"provider": "local_pgvector", "top_k_default": 5}}
+    _raw_key, headers, _user_id, _key_id = await create_test_api_key(tenant_id="t1", role="editor")
+
+    async with SessionLocal() as db_session:
+        db_session.add(
+            Corpus(id=corpus_id, tenant_id="t1", name="Generation Corpus", provider_config_json=provider_config_json)
+        )
+        await db_session.commit()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/documents/text",
+            headers=headers,
+            json={"corpus_id": corpus_id, "text": "Shadow vectors keep retrieval serving during a migration."},
+        )
+        assert response.status_code == 202
+
+        response = await client.post(
+            f"/corpora/{corpus_id}/embedding-generations",
+            headers=headers,
+            json={"provider": "fake", "embedding_dim": 256},
+        )
+        assert response.status_code == 202
+        target = response.json()
+        assert target["generation"] == 2 and target["status"] == "ready"
+        assert target["chunks_embedded"] == target["chunks_total"] > 0
+
+        # Retrieval still reads the native column until the cutover; the target has its own index.
+        async with SessionLocal() as db_session:
+            chunks = (await db_session.execute(select(Chunk).where(Chunk.corpus_id == corpus_id))).scalars().all()
+            assert all(chunk.embedding is not None for chunk in chunks)
+            assert await generations_repo.has_vector_index(db_session, target["id"])
+
+        response = await client.post(
+            f"/corpora/{corpus_id}/embedding-generations/{target['id']}/activate", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["status"] == "active"
+        response = await client.get(f"/corpora/{corpus_id}", headers=headers)
+        retrieval = response.json()["provider_config_json"]["retrieval"]
+        assert retrieval["embedding_dim"] == 256
+        assert retrieval["embedding"] == {"provider": "fake", "model": "sha256-bow-v1"}
+
+        # The cutover moved the corpus pointer; no vectors were copied into chunks.
+        async with SessionLocal() as db_session:
+            corpus = await db_session.get(Corpus, corpus_id)
+            assert corpus is not None and corpus.embedding_generation_id == target["id"]
+            widths = await db_session.execute(select(Chunk.embedding_256).where(Chunk.corpus_id == corpus_id))
+            assert all(vector is None for vector in widths.scalars())
+            results = await RetrievalRouter(db_session).retrieve("t1", corpus_id, "shadow vectors", top_k=3)
+            assert results
+
+        # Rolling back points the corpus at the retired generation, still in the chunks columns.
+        response = await client.get(f"/corpora/{corpus_id}/embedding-generations", headers=headers)
+        baseline = next(item for item in response.json() if item["generation"] == 1)
+        assert baseline["status"] == "retired"
+        response = await client.post(
+            f"/corpora/{corpus_id}/embedding-generations/{baseline['id']}/activate", headers=headers
+        )
+        assert response.status_code == 200
+        async with SessionLocal() as db_session:
+            corpus = await db_session.get(Corpus, corpus_id)
+            assert corpus is not None and corpus.embedding_generation_id is None
+            chunks = (await db_session.execute(select(Chunk).where(Chunk.corpus_id == corpus_id))).scalars().all()
+            assert all(chunk.embedding is not None for chunk in chunks)
+
+        response = await client.delete(f"/corpora/{corpus_id}/embedding-generations/{baseline['id']}", headers=headers)
+        assert response.status_code == 409
+        response = await client.delete(f"/corpora/{corpus_id}/embedding-generations/{target['id']}", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["status"] == "collected"
+        response = await client.post(
+            f"/corpora/{corpus_id}/embedding-generations/{target['id']}/activate", headers=headers
+        )
+        assert response.status_code == 409
+
+    async with SessionLocal() as db_session:
+        shadows = await db_session.execute(select(ChunkEmbeddingShadow).where(ChunkEmbeddingShadow.corpus_id == corpus_id))
+        assert shadows.first() is None
+        assert not await generations_repo.has_vector_index(db_session, target["id"])
+        await db_session.execute(delete(CorpusEmbeddingGeneration).where(CorpusEmbeddingGeneration.corpus_id == corpus_id))
+        await db_session.execute(delete(Chunk).where(Chunk.corpus_id == corpus_id))
+        await db_session.execute(delete(Document).where(Document.corpus_id == corpus_id))
+        await db_session.execute(delete(Corpus).where(Corpus.id == corpus_id))
+        await db_session.commit()
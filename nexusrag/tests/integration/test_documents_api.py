@@ -2,18 +2,27 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone
+from pathlib import Path
 from uuid import uuid4
 
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy import delete
+from sqlalchemy import delete, select
 
 from nexusrag.apps.api.main import create_app
-from nexusrag.core.config import get_settings
-from nexusrag.domain.models import Chunk, Corpus, Document, DocumentLabel, DocumentPermission
+from nexusrag.core.config import EMBED_DIM, get_settings
+from nexusrag.domain.models import (
+    AuditEvent,
+    Chunk,
+    Corpus,
+    Document,
+    DocumentLabel,
+    DocumentPermission,
+)
 from nexusrag.persistence.db import SessionLocal
 from nexusrag.persistence.repos import documents as documents_repo
 from nexusrag.providers.retrieval.router import RetrievalRouter
+from nexusrag.services.maintenance import prune_chunk_generations
 from nexusrag.tests.utils.auth import create_test_api_key
 
 
@@ -121,6 +130,42 @@ async def test_documents_upload_ingest_and_retrieve(monkeypatch) -> None:
     await _cleanup_document(corpus_id, document_id)
 
 
+@pytest.mark.asyncio
+async def test_documents_upload_html_cites_sections(monkeypatch) -> None:
+    # Extract on a thread so the inline test process does not spawn a loader pool.
+    monkeypatch.setenv("INGEST_LOADER_PROCESSES", "0")
+    app = _create_app_with_inline_ingest(monkeypatch)
+    corpus_id = f"c-docs-{uuid4()}"
+    tenant_id = "t1"
+    html = b"<html><body><h1>Setup</h1><p>Install the retrievable widget.</p></body></html>"
+
+    await _create_corpus(corpus_id, tenant_id)
+    headers = await _auth_headers(tenant_id, "editor")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/documents",
+            headers=headers,
+            data={"corpus_id": corpus_id},
+            files={"file": ("guide.html", html, "text/html")},
+        )
+        assert response.status_code == 202
+        document_id = response.json()["document_id"]
+        assert await _wait_for_status(client, headers, document_id) == "succeeded"
+
+    async with SessionLocal() as db_session:
+        doc = await db_session.get(Document, document_id)
+        # The upload is stored as sent so a reindex re-extracts it.
+        assert doc.storage_path.endswith(".html")
+        assert Path(doc.storage_path).read_bytes() == html
+        results = await RetrievalRouter(db_session).retrieve(tenant_id, corpus_id, "retrievable widget", top_k=3)
+        hit = next(item for item in results if "retrievable" in item["text"])
+        assert hit["metadata"]["section"] == "Setup"
+
+    await _cleanup_document(corpus_id, document_id)
+
+
 @pytest.mark.asyncio
 async def test_documents_text_ingest_is_idempotent(monkeypatch) -> None:
     app = _create_app_with_inline_ingest(monkeypatch)
@@ -299,6 +344,173 @@ async def test_documents_reindex_updates_chunking(monkeypatch) -> None:
     await _cleanup_document(corpus_id, document_id)
 
 
+@pytest.mark.asyncio
+async def test_documents_full_reindex_keeps_chunks_when_embedding_fails(monkeypatch) -> None:
+    app = _create_app_with_inline_ingest(monkeypatch)
+    corpus_id = f"c-docs-{uuid4()}"
+    tenant_id = "t1"
+    text = "B" * 2600
+
+    await _create_corpus(corpus_id, tenant_id)
+    # Use an editor key to allow document ingestion endpoints.
+    headers = await _auth_headers(tenant_id, "editor")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/documents/text",
+            headers=headers,
+            json={"corpus_id": corpus_id, "text": text},
+        )
+        document_id = response.json()["document_id"]
+        assert await _wait_for_status(client, headers, document_id) == "succeeded"
+
+        async with SessionLocal() as db_session:
+            original_chunks = await documents_repo.count_chunks(db_session, document_id)
+
+        async def _failing_embed(*_args, **_kwargs):
+            raise RuntimeError("embedding provider down")
+
+        monkeypatch.setattr("nexusrag.services.ingest.ingestion.embed_with_cache", _failing_embed)
+        response = await client.post(
+            f"/documents/{document_id}/reindex",
+            headers=headers,
+            json={"mode": "full", "chunk_size_chars": 800, "chunk_overlap_chars": 100},
+        )
+        assert response.status_code == 202
+        assert await _wait_for_status(client, headers, document_id, target="failed") == "failed"
+
+        # Nothing is deleted until embedding succeeds, so the old chunks still serve.
+        async with SessionLocal() as db_session:
+            assert await documents_repo.count_chunks(db_session, document_id) == original_chunks
+
+    await _cleanup_document(corpus_id, document_id)
+
+
+@pytest.mark.asyncio
+async def test_documents_incremental_reindex_keeps_unchanged_chunks(monkeypatch) -> None:
+    app = _create_app_with_inline_ingest(monkeypatch)
+    corpus_id = f"c-docs-{uuid4()}"
+    tenant_id = "t1"
+    paragraphs = ["Alpha paragraph.", "Beta paragraph.", "Gamma paragraph."]
+
+    await _create_corpus(corpus_id, tenant_id)
+    headers = await _auth_headers(tenant_id, "editor")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/documents/text",
+            headers=headers,
+            json={"corpus_id": corpus_id, "text": "\n\n".join(paragraphs)},
+        )
+        document_id = response.json()["document_id"]
+        assert await _wait_for_status(client, headers, document_id) == "succeeded"
+
+        async with SessionLocal() as db_session:
+            before = {
+                chunk.text: list(chunk.embedding)
+                for chunk in (
+                    await db_session.execute(select(Chunk).where(Chunk.document_id == document_id))
+                ).scalars()
+            }
+            doc = await db_session.get(Document, document_id)
+            storage_path = doc.storage_path
+            first_generation = doc.active_generation
+
+        # Edit only the middle paragraph in the stored source text.
+        edited = ["Alpha paragraph.", "Beta paragraph, revised.", "Gamma paragraph."]
+        Path(storage_path).write_text("\n\n".join(edited), encoding="utf-8")
+
+        response = await client.post(
+            f"/documents/{document_id}/reindex",
+            headers=headers,
+            json={"mode": "incremental"},
+        )
+        assert response.status_code == 202
+        request_id = response.json()["job_id"]
+        assert await _wait_for_status(client, headers, document_id) == "succeeded"
+
+        async with SessionLocal() as db_session:
+            rows = (
+                await db_session.execute(select(Chunk).where(Chunk.document_id == document_id))
+            ).scalars().all()
+            after = {chunk.text: list(chunk.embedding) for chunk in rows}
+            doc = await db_session.get(Document, document_id)
+            completed = (
+                await db_session.execute(
+                    select(AuditEvent).where(
+                        AuditEvent.event_type == "documents.reindex.completed",
+                        AuditEvent.request_id == request_id,
+                    )
+                )
+            ).scalar_one()
+
+    # The new generation replaced the old one and the superseded rows were reclaimed;
+    # unchanged chunks carried their vectors over instead of being re-embedded.
+    assert doc.active_generation > first_generation
+    assert {chunk.generation for chunk in rows} == {doc.active_generation}
+    assert len(rows) == len(edited)
+    assert set(after) == set(edited)
+    assert after["Alpha paragraph."] == before["Alpha paragraph."]
+    assert after["Gamma paragraph."] == before["Gamma paragraph."]
+    assert completed.metadata_json["chunks_reused"] == 2
+    assert completed.metadata_json["chunks_added"] == 1
+    assert completed.metadata_json["chunks_removed"] == 1
+
+    await _cleanup_document(corpus_id, document_id)
+
+
+@pytest.mark.asyncio
+async def test_documents_inactive_chunk_generations_are_hidden_and_pruned(monkeypatch) -> None:
+    app = _create_app_with_inline_ingest(monkeypatch)
+    corpus_id = f"c-docs-{uuid4()}"
+    tenant_id = "t1"
+
+    await _create_corpus(corpus_id, tenant_id)
+    headers = await _auth_headers(tenant_id, "editor")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/documents/text",
+            headers=headers,
+            json={"corpus_id": corpus_id, "text": "Served generation."},
+        )
+        document_id = response.json()["document_id"]
+        assert await _wait_for_status(client, headers, document_id) == "succeeded"
+
+    async with SessionLocal() as db_session:
+        doc = await db_session.get(Document, document_id)
+        served = await documents_repo.count_chunks(db_session, document_id)
+        # A superseded generation and one abandoned by a crashed reindex.
+        for generation in (doc.active_generation - 1, doc.active_generation + 1000):
+            db_session.add(
+                Chunk(
+                    tenant_id=tenant_id,
+                    corpus_id=corpus_id,
+                    document_id=document_id,
+                    document_uri=f"document://{document_id}",
+                    chunk_index=0,
+                    text="Stale generation.",
+                    embedding=[0.0] * EMBED_DIM,
+                    metadata_json={},
+                    generation=generation,
+                )
+            )
+        await db_session.commit()
+        assert await documents_repo.count_chunks(db_session, document_id) == served
+
+        assert await prune_chunk_generations(db_session) >= 2
+        await db_session.commit()
+        remaining = (
+            await db_session.execute(select(Chunk.generation).where(Chunk.document_id == document_id))
+        ).scalars().all()
+        assert set(remaining) == {doc.active_generation}
+
+    await _cleanup_document(corpus_id, document_id)
+
+
 @pytest.mark.asyncio
 async def test_documents_failure_sets_failure_reason(monkeypatch) -> None:
     app = _create_app_with_inline_ingest(monkeypatch)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from nexusrag.core.config import EMBED_DIM
+from nexusrag.domain.models import EmbeddingCacheEntry
+from nexusrag.persistence.db import SessionLocal
+from nexusrag.services.ingest import embedding_cache
+from nexusrag.services.maintenance import prune_embedding_cache
+
+
+class CountingProvider:
+    name = "test"
+    cacheable = True
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+        self.embedded: list[str] = []
+
+    async def embed_many(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)) / 100.0] * EMBED_DIM for text in texts]
+
+
+async def _cleanup(model: str) -> None:
+    async with SessionLocal() as session:
+        await session.execute(delete(EmbeddingCacheEntry).where(EmbeddingCacheEntry.model == model))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_embed_with_cache_only_embeds_misses(monkeypatch) -> None:
+    # A unique model name isolates this test's rows from other cache users.
+    provider = CountingProvider(model=f"model-{uuid4()}")
+    monkeypatch.setattr(embedding_cache, "get_embedding_provider", lambda: provider)
+
+    try:
+        async with SessionLocal() as session:
+            first = await embedding_cache.embed_with_cache(session, ["alpha", "beta", "alpha"])
+            await session.commit()
+        # Repeated text within one call is embedded once.
+        assert provider.embedded == ["alpha", "beta"]
+
+        async with SessionLocal() as session:
+            second = await embedding_cache.embed_with_cache(session, ["alpha", "beta", "gamma"])
+            await session.commit()
+        assert provider.embedded == ["alpha", "beta", "gamma"]
+        assert second[:2] == pytest.approx(first[:2])
+    finally:
+        await _cleanup(provider.model)
+
+
+@pytest.mark.asyncio
+async def test_prune_embedding_cache_evicts_cold_entries(monkeypatch) -> None:
+    provider = CountingProvider(model=f"model-{uuid4()}")
+    monkeypatch.setattr(embedding_cache, "get_embedding_provider", lambda: provider)
+
+    try:
+        async with SessionLocal() as session:
+            await embedding_cache.embed_with_cache(session, ["stale", "fresh"])
+            await session.execute(
+                update(EmbeddingCacheEntry)
+                .where(
+                    EmbeddingCacheEntry.model == provider.model,
+                    EmbeddingCacheEntry.text_sha256 == embedding_cache.text_sha256("stale"),
+                )
+                .values(last_used_at=datetime.now(timezone.utc) - timedelta(days=365))
+            )
+            await session.commit()
+
+        async with SessionLocal() as session:
+            assert await prune_embedding_cache(session) >= 1
+            await session.commit()
+            remaining = (
+                await session.execute(
+                    select(EmbeddingCacheEntry.text_sha256).where(EmbeddingCacheEntry.model == provider.model)
+                )
+            ).scalars().all()
+        assert remaining == [embedding_cache.text_sha256("fresh")]
+    finally:
+        await _cleanup(provider.model)
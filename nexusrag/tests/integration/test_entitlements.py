@@ -162,7 +162,7 @@ async def test_provider_gating_blocks_and_allows(monkeypatch) -> None:
             self.knowledge_base_id = knowledge_base_id
             self.region = region
 
-        async def retrieve(self, _tenant_id: str, _corpus_id: str, _query: str, _top_k: int):
+        async def retrieve(self, _tenant_id: str, _corpus_id: str, _query: str, _top_k: int, filters=None):
             return []
 
     from nexusrag.providers.retrieval import router as retrieval_router
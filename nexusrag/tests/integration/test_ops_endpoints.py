@@ -11,6 +11,7 @@ from nexusrag.core.config import get_settings
 from nexusrag.domain.models import Document, DocumentLabel, DocumentPermission
 from nexusrag.persistence.db import SessionLocal
 from nexusrag.services.ingest import queue as ingest_queue
+from nexusrag.services.ingest.pipeline import StageStats
 from nexusrag.tests.utils.auth import create_test_api_key
 
 
@@ -173,9 +174,19 @@ async def test_ops_ingestion_returns_counts(monkeypatch) -> None:
         failure_reason="chunk_overlap_chars must be smaller than chunk_size_chars",
     )
 
+    # Publish one worker's stage stats the way the worker heartbeat does.
+    stage = StageStats(concurrency=2, queue_capacity=4)
+    stage.record(10, 1.0)
+    await ingest_queue.set_pipeline_stats(
+        "ops-test-worker", {"embed": stage.snapshot(queue_depth=1, window_s=10.0)}
+    )
+
     transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        response = await client.get("/ops/ingestion?hours=24", headers=headers)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/ops/ingestion?hours=24", headers=headers)
+    finally:
+        await ingest_queue.clear_pipeline_stats("ops-test-worker")
     payload = response.json()
     assert response.status_code == 200
     assert payload["documents"]["queued"] >= 1
@@ -183,6 +194,12 @@ async def test_ops_ingestion_returns_counts(monkeypatch) -> None:
     assert payload["documents"]["succeeded"] >= 1
     assert payload["documents"]["failed"] >= 1
     assert "queue_depth" in payload
+    assert payload["pipeline"]["workers"] >= 1
+    embed = payload["pipeline"]["stages"]["embed"]
+    assert embed["concurrency"] >= 2
+    assert embed["queue_depth"] >= 1
+    assert embed["chunks_per_s"] > 0
+    assert 0 < embed["busy_ratio"] <= 1
     assert payload["durations_ms"]["max"] is not None
     assert any(
         item["reason"] == "INGEST_VALIDATION_ERROR"
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from nexusrag.services.caching import AsyncLRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(*, max_bytes: int = 100, ttl_s: float = 60.0, clock=None) -> AsyncLRUCache[str, str]:
+    return AsyncLRUCache(
+        max_bytes=max_bytes,
+        ttl_s=ttl_s,
+        size_of=lambda _key, value: len(value),
+        clock=clock or FakeClock(),
+    )
+
+
+def test_evicts_least_recently_used_over_byte_ceiling() -> None:
+    cache = _cache(max_bytes=10)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    # Touch "a" so "b" is the coldest entry when "c" overflows the ceiling.
+    assert cache.get("a") == "xxxx"
+    cache.put("c", "xxxx")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "xxxx"
+    assert cache.stats().bytes == 8
+    assert cache.stats().evictions == 1
+
+
+def test_entries_expire_after_ttl() -> None:
+    clock = FakeClock()
+    cache = _cache(ttl_s=5.0, clock=clock)
+    cache.put("a", "x")
+    clock.now = 4.9
+    assert cache.get("a") == "x"
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert cache.stats().entries == 0
+
+
+def test_zero_ceiling_disables_storage() -> None:
+    cache = _cache(max_bytes=0)
+    cache.put("a", "x")
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load() -> None:
+    cache = _cache()
+    calls = 0
+
+    async def loader() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(4)))
+
+    assert results == ["value"] * 4
+    assert calls == 1
+    assert await cache.get_or_load("k", loader) == "value"
+    stats = cache.stats()
+    assert (stats.misses, stats.coalesced, stats.hits) == (1, 3, 1)
+    assert stats.hit_ratio == 0.8
+
+
+@pytest.mark.asyncio
+async def test_failed_loads_propagate_and_are_not_cached() -> None:
+    cache = _cache()
+
+    async def failing() -> str:
+        await asyncio.sleep(0)
+        raise RuntimeError("provider down")
+
+    results = await asyncio.gather(
+        cache.get_or_load("k", failing), cache.get_or_load("k", failing), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def recovered() -> str:
+        return "ok"
+
+    assert await cache.get_or_load("k", recovered) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_abort_shared_load() -> None:
+    cache = _cache()
+    release = asyncio.Event()
+
+    async def loader() -> str:
+        await release.wait()
+        return "value"
+
+    leader = asyncio.ensure_future(cache.get_or_load("k", loader))
+    follower = asyncio.ensure_future(cache.get_or_load("k", loader))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert await follower == "value"
+    assert cache.get("k") == "value"
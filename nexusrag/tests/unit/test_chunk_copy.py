@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+from uuid import uuid4
+
+import pytest
+from pgvector import Vector
+
+from nexusrag.persistence.repos import chunks as chunks_repo
+from nexusrag.persistence.vector_codec import VECTOR_CODEC_INFO_KEY
+from nexusrag.services.ingest.ingestion import _diff_batch, _PlannedChunk
+
+
+class FakeAsyncpgConnection:
+    # Capture COPY batches and codec registrations the way asyncpg would receive them.
+    def __init__(self, vector_schema: str | None = "extensions") -> None:
+        self.vector_schema = vector_schema
+        self.codec_calls: list[tuple[str, str]] = []
+        self.copies: list[dict] = []
+        self.encoder = None
+
+    async def fetchval(self, query):
+        assert "to_regtype('vector')" in query
+        return self.vector_schema
+
+    async def set_type_codec(self, typename, *, schema, encoder, decoder, format):
+        self.codec_calls.append((typename, schema))
+        self.encoder = encoder
+
+    async def copy_records_to_table(self, table_name, *, records, columns):
+        self.copies.append({"table": table_name, "records": list(records), "columns": columns})
+
+
+class _RawConnection:
+    def __init__(self, driver, info: dict) -> None:
+        self.driver_connection = driver
+        # The pool's per-connection info dict.
+        self.info = info
+
+
+class _Connection:
+    def __init__(self, driver, info: dict) -> None:
+        self._driver = driver
+        self._info = info
+
+    async def get_raw_connection(self):
+        return _RawConnection(self._driver, self._info)
+
+
+class CopySession:
+    def __init__(self, driver) -> None:
+        self.driver = driver
+        self.info: dict = {}
+        self.executed: list = []
+
+    async def connection(self):
+        return _Connection(self.driver, self.info)
+
+    async def execute(self, stmt, params=None):
+        self.executed.append((stmt, params))
+
+
+def _rows(count: int) -> list[dict]:
+    return [
+        {
+            "id": uuid4(),
+            "tenant_id": "t1",
+            "corpus_id": "c1",
+            "document_id": "d1",
+            "document_uri": "document://d1",
+            "chunk_index": index,
+            "text": f"chunk {index}",
+            "content_hash": f"{index:064d}",
+            "embedding": [0.5, 0.25],
+            "metadata_json": {"offset_start": index},
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_copy_chunks_streams_bounded_batches() -> None:
+    driver = FakeAsyncpgConnection()
+    written = await chunks_repo.copy_chunks(CopySession(driver), iter(_rows(5)), batch_size=2)
+
+    assert written == 5
+    assert [len(copy["records"]) for copy in driver.copies] == [2, 2, 1]
+    first = driver.copies[0]
+    assert first["table"] == "chunks"
+    assert tuple(first["columns"]) == chunks_repo.COPY_COLUMNS
+    record = dict(zip(first["columns"], first["records"][0], strict=True))
+    # JSONB travels as text; vectors go through the binary codec.
+    assert json.loads(record["metadata_json"]) == {"offset_start": 0}
+    # Rows without a generation land in the legacy generation 0.
+    assert record["generation"] == 0
+    assert driver.encoder(record["embedding"]) == Vector([0.5, 0.25]).to_binary()
+
+
+@pytest.mark.asyncio
+async def test_copy_chunks_registers_vector_codec_once_per_connection() -> None:
+    driver = FakeAsyncpgConnection()
+    session = CopySession(driver)
+    await chunks_repo.copy_chunks(session, _rows(1), batch_size=10)
+    await chunks_repo.copy_chunks(session, _rows(1), batch_size=10)
+
+    # Registered in the schema pg_type reports, and never reset between COPYs.
+    assert driver.codec_calls == [("vector", "extensions")]
+    # Later statements on the connection bind vectors as text through the same codec.
+    assert driver.encoder("[0.5,0.25]") == Vector([0.5, 0.25]).to_binary()
+
+    # A connection registered when the pool connected skips the lookup entirely.
+    registered = FakeAsyncpgConnection()
+    session = CopySession(registered)
+    session.info[VECTOR_CODEC_INFO_KEY] = True
+    await chunks_repo.copy_chunks(session, _rows(1), batch_size=10)
+    assert registered.codec_calls == []
+
+
+@pytest.mark.asyncio
+async def test_copy_chunks_falls_back_to_executemany_without_asyncpg() -> None:
+    session = CopySession(driver=object())
+    written = await chunks_repo.copy_chunks(session, _rows(3), batch_size=2)
+
+    assert written == 3
+    assert [len(params) for _stmt, params in session.executed] == [2, 1]
+
+
+class CloneSession:
+    class _Result:
+        rowcount = 1
+
+    def __init__(self) -> None:
+        self.executed: list = []
+
+    async def execute(self, stmt, params=None):
+        self.executed.append(stmt)
+        return self._Result()
+
+
+@pytest.mark.asyncio
+async def test_clone_chunks_copies_vectors_server_side() -> None:
+    session = CloneSession()
+    clone = {
+        "id": uuid4(),
+        "source_id": uuid4(),
+        "chunk_index": 3,
+        "content_hash": "a" * 64,
+        "metadata_json": {"offset_start": 9, "offset_end": 12},
+    }
+
+    written = await chunks_repo.clone_chunks(session, [clone], generation=7)
+
+    assert written == 1
+    stmt = session.executed[0]
+    sql = str(stmt)
+    # One INSERT ... SELECT; text and every embedding column come from the source row.
+    assert sql.startswith("INSERT INTO chunks")
+    assert "chunks.text" in sql
+    for column in chunks_repo.EMBEDDING_COLUMNS:
+        assert f"chunks.{column}" in sql
+    assert stmt.compile().params["param_1"] == 7
+    # Vectors stored under embedding generations follow the clone too.
+    assert str(session.executed[1]).startswith("INSERT INTO chunk_embedding_shadows")
+    assert await chunks_repo.clone_chunks(session, [], generation=7) == 0
+    assert len(session.executed) == 2
+
+
+def _planned(index: int, text: str, start: int) -> _PlannedChunk:
+    return _PlannedChunk(
+        index=index,
+        text=text,
+        content_hash=text * 4,
+        metadata={"offset_start": start, "offset_end": start + len(text)},
+    )
+
+
+def test_diff_batch_clones_matches_into_new_generation() -> None:
+    kept, moved, dropped = uuid4(), uuid4(), uuid4()
+    stored = {
+        "aaaa": [(kept, 0, {"offset_start": 0, "offset_end": 1})],
+        "bbbb": [(moved, 1, {"offset_start": 1, "offset_end": 2})],
+        "cccc": [(dropped, 2, {"offset_start": 2, "offset_end": 3})],
+    }
+    batch = [_planned(0, "a", 0), _planned(1, "x", 1), _planned(2, "b", 2)]
+
+    to_embed, clones, renumbered = _diff_batch(stored, batch)
+
+    assert [item.text for item in to_embed] == ["x"]
+    # Every match is cloned under a fresh id; only the moved one counts as renumbered.
+    assert [(clone["source_id"], clone["chunk_index"]) for clone in clones] == [(kept, 0), (moved, 2)]
+    assert all(clone["id"] not in {kept, moved} for clone in clones)
+    assert renumbered == 1
+    assert stored["cccc"] == [(dropped, 2, {"offset_start": 2, "offset_end": 3})]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from nexusrag.persistence.repos import chunks as chunks_repo
+from nexusrag.persistence.repos import corpora as corpora_repo
+
+
+class _Result:
+    def __init__(self, value) -> None:
+        self._value = value
+
+    def scalar(self):
+        return self._value
+
+    def scalar_one(self):
+        return self._value
+
+
+class CatalogSession:
+    # Answer the catalog probes and record every statement the helpers issue.
+    def __init__(self, *, partitioned: bool, existing: set[str] | None = None, rows: int = 0) -> None:
+        self.partitioned = partitioned
+        self.existing = existing or set()
+        self.rows = rows
+        self.statements: list[str] = []
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.statements.append(sql)
+        if "pg_partitioned_table" in sql:
+            return _Result(self.partitioned)
+        if "to_regclass(:name)" in sql:
+            return _Result(params["name"] in self.existing)
+        if sql.startswith("SELECT format("):
+            return _Result(f"CREATE TABLE IF NOT EXISTS {params['name']} PARTITION OF chunks")
+        if sql.startswith("SELECT count(*)"):
+            return _Result(self.rows)
+        return _Result(None)
+
+
+def test_corpus_partition_name_is_stable_identifier() -> None:
+    name = chunks_repo.corpus_partition_name("Tenant A's corpus / 1")
+    assert name == chunks_repo.corpus_partition_name("Tenant A's corpus / 1")
+    assert re.fullmatch(r"chunks_c_[0-9a-f]{24}", name)
+    assert name != chunks_repo.corpus_partition_name("c2")
+
+
+@pytest.mark.asyncio
+async def test_ensure_corpus_partition_is_noop_without_partitioning() -> None:
+    session = CatalogSession(partitioned=False)
+    assert await chunks_repo.ensure_corpus_partition(session, "c1") is False
+    assert not any("CREATE TABLE" in sql for sql in session.statements)
+
+
+@pytest.mark.asyncio
+async def test_ensure_corpus_partition_creates_missing_partition_once() -> None:
+    session = CatalogSession(partitioned=True)
+    assert await chunks_repo.ensure_corpus_partition(session, "c1") is True
+    assert session.statements[-1].startswith("CREATE TABLE IF NOT EXISTS chunks_c_")
+
+    session = CatalogSession(partitioned=True, existing={chunks_repo.corpus_partition_name("c1")})
+    assert await chunks_repo.ensure_corpus_partition(session, "c1") is False
+
+
+@pytest.mark.asyncio
+async def test_drop_corpus_partition_detaches_and_drops() -> None:
+    name = chunks_repo.corpus_partition_name("c1")
+    session = CatalogSession(partitioned=True, existing={name}, rows=42)
+
+    assert await chunks_repo.drop_corpus_partition(session, "c1") == 42
+    assert session.statements[-2:] == [f"ALTER TABLE chunks DETACH PARTITION {name}", f"DROP TABLE {name}"]
+    # Callers fall back to row deletes when there is nothing to drop.
+    assert await chunks_repo.drop_corpus_partition(CatalogSession(partitioned=False), "c1") is None
+
+
+@pytest.mark.asyncio
+async def test_create_corpus_creates_its_partition_up_front() -> None:
+    session = CatalogSession(partitioned=True)
+    added: list = []
+    session.add = added.append  # type: ignore[attr-defined]
+
+    async def _flush() -> None:
+        session.statements.append("FLUSH")
+
+    session.flush = _flush  # type: ignore[attr-defined]
+    corpus = await corpora_repo.create_corpus(session, corpus_id="c1", tenant_id="t1", name="Corpus")
+
+    # The parent-locking DDL runs with the corpus insert, never on a later ingest.
+    assert added == [corpus]
+    assert session.statements[0] == "FLUSH"
+    assert session.statements[-1].startswith("CREATE TABLE IF NOT EXISTS chunks_c_")
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from nexusrag.ingestion.chunking import chunk_text, iter_chunks
+from nexusrag.ingestion.streaming import iter_text_file, prefetch_batches
+
+
+def _pieces(text: str, size: int) -> list[str]:
+    return [text[index : index + size] for index in range(0, len(text), size)]
+
+
+def test_windowed_paragraph_offsets_are_absolute() -> None:
+    # Long paragraphs used to report offsets relative to the paragraph itself.
+    text = "intro\n\n" + "x" * 25
+    chunks = list(chunk_text(text, chunk_size=10, chunk_overlap=2))
+
+    assert chunks[0] == ("intro", 0, 5)
+    for chunk, start, end in chunks:
+        assert text[start:end] == chunk
+    assert chunks[1][1] == 7
+
+
+@pytest.mark.parametrize("piece_size", [1, 3, 7, 64])
+def test_streamed_pieces_match_whole_text(piece_size: int) -> None:
+    text = "  alpha beta\n\n\n" + "gamma " * 30 + "\n\n delta\n \n\nepsilon" + "z" * 41
+    expected = list(chunk_text(text, chunk_size=16, chunk_overlap=4))
+
+    streamed = list(iter_chunks(_pieces(text, piece_size), chunk_size=16, chunk_overlap=4))
+
+    assert streamed == expected
+
+
+def test_iter_text_file_reads_incrementally(tmp_path) -> None:
+    path = tmp_path / "doc.txt"
+    path.write_text("héllo wörld", encoding="utf-8")
+
+    pieces = list(iter_text_file(path, chunk_chars=3))
+
+    assert "".join(pieces) == "héllo wörld"
+    assert max(len(piece) for piece in pieces) == 3
+
+
+@pytest.mark.asyncio
+async def test_prefetch_batches_applies_backpressure() -> None:
+    pulled: list[int] = []
+
+    def source():
+        for value in range(10):
+            pulled.append(value)
+            yield value
+
+    batches = []
+    async for batch in prefetch_batches(source(), batch_size=2, max_pending=1):
+        # Give the producer time to run ahead; the bounded queue must stop it.
+        await asyncio.sleep(0.01)
+        batches.append(batch)
+        assert len(pulled) <= (len(batches) + 2) * 2
+    assert batches == [[0, 1], [2, 3], [4, 5], [6, 7], [8, 9]]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_batches_surfaces_source_errors() -> None:
+    def source():
+        yield 1
+        raise ValueError("bad source")
+
+    with pytest.raises(ValueError, match="bad source"):
+        async for _batch in prefetch_batches(source(), batch_size=5):
+            pass
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from nexusrag.core.config import get_settings
+from nexusrag.domain.models import CorpusEmbeddingGeneration
+from nexusrag.services import resilience
+from nexusrag.services.ingest import embedding_migration
+
+
+@pytest.fixture(autouse=True)
+def _reset_bulkheads(monkeypatch):
+    monkeypatch.setenv("INGEST_MAX_CONCURRENCY", "4")
+    monkeypatch.setenv("EMBEDDING_MIGRATION_CAPACITY_SHARE", "0.5")
+    monkeypatch.setenv("EMBEDDING_MIGRATION_BACKOFF_S", "0")
+    get_settings.cache_clear()
+    resilience.reset_bulkheads()
+    yield
+    get_settings.cache_clear()
+    resilience.reset_bulkheads()
+
+
+@pytest.mark.asyncio
+async def test_backfill_capacity_is_a_share_of_ingest_slots() -> None:
+    assert resilience.get_embedding_migration_bulkhead().limit == 2
+    first = await embedding_migration._acquire_backfill_capacity()
+    second = await embedding_migration._acquire_backfill_capacity()
+
+    # The share is used up, so a third backfill batch waits even though ingest has two slots left.
+    third = asyncio.create_task(embedding_migration._acquire_backfill_capacity())
+    await asyncio.sleep(0.01)
+    assert not third.done()
+    ingest_leases = [await resilience.get_ingest_bulkhead().acquire() for _ in range(2)]
+    assert all(lease is not None for lease in ingest_leases)
+
+    # A freed share slot is not enough while every ingest slot is held.
+    first[0].release()
+    await asyncio.sleep(0.01)
+    assert not third.done()
+    ingest_leases[0].release()
+    share, ingest = await asyncio.wait_for(third, timeout=1)
+
+    for lease in (first[1], *second, share, ingest, ingest_leases[1]):
+        lease.release()
+
+
+def test_pinned_config_records_generation_space() -> None:
+    config = {"retrieval": {"provider": "local_pgvector", "embedding_dim": 256, "mode": "hybrid"}}
+    native = CorpusEmbeddingGeneration(provider="openai", model="text-embedding-3-large", embedding_dim=768)
+
+    pinned = embedding_migration._pinned_config(config, native)
+    assert pinned["retrieval"] == {
+        "provider": "local_pgvector",
+        "mode": "hybrid",
+        "embedding": {"provider": "openai", "model": "text-embedding-3-large"},
+    }
+    assert config["retrieval"]["embedding_dim"] == 256
+    assert embedding_migration.corpus_embedding_space(pinned) == ("openai", "text-embedding-3-large", 768)
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import math
+import struct
 
+import httpx
 import pytest
 
 from nexusrag.core.config import EMBED_DIM, get_settings
@@ -12,11 +17,13 @@ from nexusrag.ingestion.embeddings import embed_text
 
 @pytest.fixture(autouse=True)
 def _clear_settings_cache():
-    # Settings is lru_cached; clear before and after so env changes via
-    # monkeypatch take effect and never leak between tests.
+    # Settings and the query embedding cache are process-wide; clear before and
+    # after so env changes via monkeypatch take effect and never leak between tests.
     get_settings.cache_clear()
+    embeddings.reset_query_embedding_cache()
     yield
     get_settings.cache_clear()
+    embeddings.reset_query_embedding_cache()
 
 
 def test_embed_text_is_deterministic() -> None:
@@ -42,6 +49,33 @@ def test_fake_is_default_and_normalized() -> None:
     assert norm == pytest.approx(1.0, abs=1e-6)
 
 
+# sha256 over the little-endian float64 bytes of each vector, captured from the
+# pre-NumPy pure-Python implementation; any drift would invalidate stored vectors.
+_FAKE_GOLDEN_DIGESTS = {
+    "": "fd9243e1ba57263ed469c3bdbd7ade6ec5254e7ed924a9f5737fa44749933cc0",
+    "Hello, world!": "6d0b3d0535782d337a3ed1a1c2510d0b3f8cee72c65c3607960d44cb40d0cfb4",
+    "The quick brown fox jumps over the lazy dog": "ec175e8e624a52b0da35c0ecd5a3ea7b45b20b3d305d70451d9d5c2339f904bf",
+    "repeat repeat repeat token": "3c12725633c4efbac0a003a07cfcc517a7b36631a17fd10ae9298f5228d4591a",
+    "ÜNICODE café naïve 123_abc": "b1e29bec43020c35047fdd96fb4f38ea413279cc02990e2cad5dd79db7e18d93",
+    "a " * 500: "96870fbb04c374434245b294a1b6e7b1adf017881fc9fbf9fe01caf465a7dd92",
+    "pgvector hnsw ef_search recall latency benchmark\n\nsecond paragraph": (
+        "8bad1f80bf29d97581050c932836a86e84fd320a7b214b962e43ac7b4e51dd60"
+    ),
+}
+
+
+def _vector_digest(vector: list[float]) -> str:
+    return hashlib.sha256(struct.pack(f"<{EMBED_DIM}d", *vector)).hexdigest()
+
+
+def test_fake_embeddings_match_golden_vectors() -> None:
+    texts = list(_FAKE_GOLDEN_DIGESTS)
+    # Single-text and batched paths must both reproduce the stored vectors exactly.
+    assert {text: _vector_digest(embed_text(text)) for text in texts} == _FAKE_GOLDEN_DIGESTS
+    batched = embeddings._embed_many_fake(texts)
+    assert {text: _vector_digest(vector) for text, vector in zip(texts, batched, strict=True)} == _FAKE_GOLDEN_DIGESTS
+
+
 def test_vertex_provider_missing_creds_raises(monkeypatch) -> None:
     monkeypatch.setenv("EMBEDDING_PROVIDER", "vertex")
     monkeypatch.delenv("GOOGLE_CLOUD_PROJECT", raising=False)
@@ -119,3 +153,186 @@ def test_openai_provider_uses_real_embeddings_no_fallback(monkeypatch) -> None:
     vec = embed_text("semantic please")
     assert vec == sentinel
     assert vec != embeddings._embed_text_fake("semantic please")
+
+
+def test_get_embedding_provider_accepts_corpus_override(monkeypatch) -> None:
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "fake")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+    assert embeddings.resolve_embedding_model() == ("fake", "sha256-bow-v1")
+    assert embeddings.resolve_embedding_model("openai") == ("openai", "text-embedding-3-small")
+
+    # A pinned corpus embeds with its own generation's model, not the deployment default.
+    provider = embeddings.get_embedding_provider("openai", "text-embedding-3-large")
+    assert (provider.name, provider.model) == ("openai", "text-embedding-3-large")
+    assert embeddings.get_embedding_provider().name == "fake"
+
+
+@pytest.mark.asyncio
+async def test_fake_provider_embed_many_matches_embed_text() -> None:
+    provider = embeddings.get_embedding_provider()
+    assert provider.name == "fake"
+    texts = ["alpha beta", "gamma"]
+    assert await provider.embed_many(texts) == [embed_text(text) for text in texts]
+    assert await embeddings.embed_query("alpha beta") == embed_text("alpha beta")
+
+
+@pytest.mark.asyncio
+async def test_embed_query_caches_and_coalesces_provider_calls(monkeypatch) -> None:
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    get_settings.cache_clear()
+    requests: list[list[str]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body["input"])
+        # Yield so concurrent identical misses overlap with this request.
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"data": [{"index": 0, "embedding": [0.5] * EMBED_DIM}]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(embeddings, "_get_http_client", lambda: client)
+
+    first = await asyncio.gather(*(embeddings.embed_query("What is  NexusRAG?") for _ in range(5)))
+    again = await embeddings.embed_query("What is NexusRAG? ")
+    await client.aclose()
+
+    # Five concurrent misses share one request; whitespace variants hit the cache.
+    assert requests == [["What is NexusRAG?"]]
+    assert all(vector == [0.5] * EMBED_DIM for vector in [*first, again])
+    stats = embeddings.get_query_embedding_cache().stats()
+    assert (stats.misses, stats.coalesced, stats.hits, stats.entries) == (1, 4, 1, 1)
+    # Callers get copies, so mutating a result cannot poison the cache.
+    again[0] = 9.0
+    assert (await embeddings.embed_query("What is NexusRAG?"))[0] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_batches_array_input_in_order(monkeypatch) -> None:
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("EMBEDDING_BATCH_SIZE", "2")
+    get_settings.cache_clear()
+
+    requests: list[list[str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)["input"]
+        requests.append(inputs)
+        # Return items out of order; the provider must restore input order by index.
+        data = [
+            {"index": i, "embedding": [float(len(text))] * EMBED_DIM}
+            for i, text in reversed(list(enumerate(inputs)))
+        ]
+        return httpx.Response(200, json={"data": data})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(embeddings, "_get_http_client", lambda: client)
+
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+    vectors = await embeddings.embed_texts(texts)
+
+    assert sorted(requests) == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_dim_mismatch_raises(monkeypatch) -> None:
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    get_settings.cache_clear()
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"data": [{"index": 0, "embedding": [0.1, 0.2]}]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(embeddings, "_get_http_client", lambda: client)
+
+    with pytest.raises(ValueError):
+        await embeddings.embed_query("wrong dim")
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_http_error_never_falls_back(monkeypatch) -> None:
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    get_settings.cache_clear()
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda _request: httpx.Response(500)))
+    monkeypatch.setattr(embeddings, "_get_http_client", lambda: client)
+
+    with pytest.raises(ProviderConfigError):
+        await embeddings.embed_query("provider down")
+    await client.aclose()
+
+
+def test_batching_provider_requires_embed_batch() -> None:
+    class _Incomplete(embeddings._BatchingEmbeddingProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        _Incomplete(model="m", batch_size=8, max_concurrency=1)
+
+
+@pytest.mark.asyncio
+async def test_async_openai_provider_missing_key_raises(monkeypatch) -> None:
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "openai")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    get_settings.cache_clear()
+
+    with pytest.raises(ProviderConfigError):
+        await embeddings.embed_query("needs openai key")
+
+
+@pytest.mark.asyncio
+async def test_vertex_provider_batches_get_embeddings(monkeypatch) -> None:
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "vertex")
+    monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", "proj")
+    monkeypatch.setenv("GOOGLE_CLOUD_LOCATION", "us-central1")
+    monkeypatch.setenv("EMBEDDING_BATCH_SIZE", "3")
+    get_settings.cache_clear()
+
+    calls: list[list[str]] = []
+
+    class _StubEmbedding:
+        def __init__(self, text: str) -> None:
+            self.values = [float(len(text))] * EMBED_DIM
+
+    class _StubModel:
+        def get_embeddings(self, texts):
+            calls.append(list(texts))
+            return [_StubEmbedding(text) for text in texts]
+
+    monkeypatch.setattr(embeddings, "_get_vertex_model", lambda _model_name=None: _StubModel())
+
+    vectors = await embeddings.embed_texts(["a", "bb", "ccc", "dddd"])
+    assert sorted(calls) == [["a", "bb", "ccc"], ["dddd"]]
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0, 4.0]
+
+
+@pytest.mark.asyncio
+async def test_embed_with_cache_bypasses_db_for_fake_provider() -> None:
+    from nexusrag.services.ingest.embedding_cache import embed_with_cache
+
+    class _NoDbSession:
+        async def execute(self, *_args, **_kwargs):
+            raise AssertionError("fake embeddings are cheaper than a cache lookup")
+
+    vectors = await embed_with_cache(_NoDbSession(), ["alpha"])
+    assert vectors == [embed_text("alpha")]
+
+
+def test_truncate_embedding_renormalizes_prefix() -> None:
+    vector = embed_text("matryoshka truncation keeps the leading components")
+    truncated = embeddings.truncate_embedding(vector, 256)
+    assert len(truncated) == 256
+    assert math.isclose(math.sqrt(sum(v * v for v in truncated)), 1.0, rel_tol=1e-9)
+    # Same direction as the prefix: only the scale changes.
+    norm = math.sqrt(sum(v * v for v in vector[:256]))
+    assert truncated == pytest.approx([v / norm for v in vector[:256]])
+    assert embeddings.truncate_embedding(vector, EMBED_DIM) == vector
+    with pytest.raises(ValueError):
+        embeddings.truncate_embedding(vector, EMBED_DIM + 1)
@@ -6,9 +6,11 @@ from uuid import uuid4
 import pytest
 from sqlalchemy import delete, func, select
 
+from nexusrag.core.config import get_settings
 from nexusrag.domain.models import (
     Checkpoint,
     Chunk,
+    Corpus,
     Document,
     DocumentLabel,
     DocumentPermission,
@@ -20,6 +22,9 @@ from nexusrag.domain.models import (
     Session,
 )
 from nexusrag.persistence.db import SessionLocal
+from nexusrag.providers.retrieval.cache import reset_retrieval_cache
+from nexusrag.providers.retrieval.config_cache import reset_corpus_config_cache
+from nexusrag.providers.retrieval.router import RetrievalRouter
 from nexusrag.services.governance import (
     DSAR_STATUS_COMPLETED,
     DSAR_STATUS_REJECTED,
@@ -248,3 +253,94 @@ async def test_dsar_state_transitions_and_hold_blocking() -> None:
     assert exported.status == DSAR_STATUS_COMPLETED
     assert exported.artifact_uri is not None
     assert exported.artifact_uri.startswith("encrypted_blob:")
+
+
+@pytest.mark.asyncio
+async def test_retention_invalidates_cached_retrieval_results(monkeypatch) -> None:
+    await _reset_governance_rows()
+    monkeypatch.setenv("RETRIEVAL_CACHE_ENABLED", "true")
+    monkeypatch.setenv("RETRIEVAL_CACHE_REDIS_ENABLED", "false")
+    get_settings.cache_clear()
+    reset_retrieval_cache()
+    reset_corpus_config_cache()
+    tenant_id = f"t-ret-cache-{uuid4().hex}"
+    corpus_id = f"c-ret-cache-{uuid4().hex}"
+    calls: list[str] = []
+
+    class CountingProvider:
+        async def retrieve(self, tenant_id, corpus_id, query, top_k, filters=None) -> list[dict]:
+            calls.append(query)
+            return [{"text": "erasable text", "score": 1.0, "source": "stub", "metadata": {}}]
+
+    async def allow_entitlements(**_kwargs) -> None:
+        return None
+
+    async def retrieve() -> None:
+        # A fresh session per query, as requests get, so the corpus version is re-read.
+        async with SessionLocal() as session:
+            router = RetrievalRouter(
+                session,
+                provider_factories={"local_pgvector": lambda _cfg: CountingProvider()},
+                entitlement_checker=allow_entitlements,
+            )
+            await router.retrieve(tenant_id, corpus_id, "erasable", top_k=3)
+
+    try:
+        async with SessionLocal() as session:
+            session.add(
+                Corpus(
+                    id=corpus_id,
+                    tenant_id=tenant_id,
+                    name="Retention Cache",
+                    provider_config_json={"retrieval": {"provider": "local_pgvector"}},
+                )
+            )
+            session.add(
+                Document(
+                    id=f"d-ret-cache-{uuid4().hex}",
+                    tenant_id=tenant_id,
+                    corpus_id=corpus_id,
+                    filename="doc.txt",
+                    content_type="text/plain",
+                    source="raw_text",
+                    ingest_source="raw_text",
+                    storage_path=None,
+                    metadata_json={},
+                    status="succeeded",
+                    created_at=datetime.now(timezone.utc) - timedelta(days=10),
+                )
+            )
+            session.add(
+                RetentionPolicy(
+                    tenant_id=tenant_id,
+                    documents_ttl_days=1,
+                    hard_delete_enabled=True,
+                    anonymize_instead_of_delete=False,
+                )
+            )
+            await session.commit()
+
+        await retrieve()
+        await retrieve()
+        assert len(calls) == 1
+
+        async with SessionLocal() as session:
+            run = await run_retention_for_tenant(
+                session=session,
+                tenant_id=tenant_id,
+                actor_id="ak1",
+                actor_role="admin",
+                request_id="req-retention-cache",
+            )
+        assert run.report_json["categories"]["documents"]["deleted"] == 1
+
+        # Retention bumped corpus_version, so the erased document's results are not replayed.
+        await retrieve()
+        assert len(calls) == 2
+    finally:
+        reset_retrieval_cache()
+        reset_corpus_config_cache()
+        get_settings.cache_clear()
+        async with SessionLocal() as session:
+            await session.execute(delete(Corpus).where(Corpus.id == corpus_id))
+            await session.commit()
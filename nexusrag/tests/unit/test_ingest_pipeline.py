@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from nexusrag.services.ingest import ingestion
+from nexusrag.services.ingest import pipeline as pipeline_module
+from nexusrag.services.ingest.ingestion import GenerationWrite, IngestStats
+from nexusrag.services.ingest.pipeline import IngestionPipeline, PipelineStoppedError, StageStats
+from nexusrag.services.ingest.queue import _aggregate_pipeline_stats
+
+
+class FakeSession:
+    async def __aenter__(self) -> FakeSession:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def commit(self) -> None:
+        return None
+
+
+def _write(document_id: str) -> GenerationWrite:
+    return GenerationWrite(
+        document_id=document_id,
+        tenant_id="t1",
+        corpus_id="c1",
+        generation=1,
+        embedding_provider=None,
+        embedding_dim=768,
+        stats=IngestStats(),
+        batch_rows=2,
+    )
+
+
+async def _batches(count: int, *, clones_every: int = 0):
+    for index in range(count):
+        if clones_every and index % clones_every == 0:
+            yield [], [{"source_id": index}]
+        else:
+            yield [f"chunk-{index}"], []
+
+
+def _pipeline(**overrides) -> IngestionPipeline:
+    options = {
+        "read_concurrency": 2,
+        "embed_concurrency": 3,
+        "write_concurrency": 1,
+        "queue_batches": 2,
+        "stats_window_s": 60,
+        "session_factory": FakeSession,
+    }
+    options.update(overrides)
+    return IngestionPipeline(**options)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_overlaps_documents_across_stages(monkeypatch) -> None:
+    embedding = {"active": 0, "peak": 0}
+    written: list[tuple[str, int]] = []
+
+    async def fake_embed(session, write, items):
+        embedding["active"] += 1
+        embedding["peak"] = max(embedding["peak"], embedding["active"])
+        await asyncio.sleep(0.01)
+        embedding["active"] -= 1
+        return [{"text": item} for item in items]
+
+    async def fake_write(session, write, clones, rows):
+        written.append((write.document_id, len(clones) + len(rows)))
+        write.stats.added += len(rows)
+
+    monkeypatch.setattr(pipeline_module, "embed_generation_rows", fake_embed)
+    monkeypatch.setattr(pipeline_module, "write_generation_rows", fake_write)
+    pipeline = _pipeline()
+    pipeline.start()
+    try:
+        first, second = _write("d1"), _write("d2")
+        await asyncio.gather(
+            pipeline.write(first, _batches(6)),
+            pipeline.write(second, _batches(6, clones_every=3)),
+        )
+        stages = pipeline.snapshot()
+    finally:
+        await pipeline.stop()
+
+    # Embeds of both documents ran concurrently; clone-only batches skipped the embed stage.
+    assert embedding["peak"] > 1
+    assert first.stats.added == 6 and second.stats.added == 4
+    assert sum(count for doc, count in written if doc == "d2") == 6
+    assert stages["read"]["chunks_total"] == 12
+    assert stages["embed"]["chunks_total"] == 10
+    assert stages["write"]["chunks_total"] == 12
+    assert all(values["queue_depth"] == 0 for values in stages.values())
+    assert ingestion._generation_writer is None
+
+
+@pytest.mark.asyncio
+async def test_pipeline_raises_batch_error_after_draining(monkeypatch) -> None:
+    writes: list[str] = []
+
+    async def fake_embed(session, write, items):
+        if write.document_id == "bad" and items == ["chunk-1"]:
+            raise RuntimeError("provider down")
+        await asyncio.sleep(0)
+        return list(items)
+
+    async def fake_write(session, write, clones, rows):
+        writes.append(write.document_id)
+
+    monkeypatch.setattr(pipeline_module, "embed_generation_rows", fake_embed)
+    monkeypatch.setattr(pipeline_module, "write_generation_rows", fake_write)
+    pipeline = _pipeline()
+    pipeline.start()
+    try:
+        results = await asyncio.gather(
+            pipeline.write(_write("bad"), _batches(5)),
+            pipeline.write(_write("good"), _batches(5)),
+            return_exceptions=True,
+        )
+    finally:
+        await pipeline.stop()
+
+    assert isinstance(results[0], RuntimeError) and str(results[0]) == "provider down"
+    assert results[1] is None
+    assert writes.count("good") == 5
+    # Batches queued behind the failure are dropped rather than written.
+    assert writes.count("bad") < 5
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stop_fails_each_job_with_its_own_error(monkeypatch) -> None:
+    embedding = asyncio.Event()
+    started: list[str] = []
+
+    async def fake_embed(session, write, items):
+        started.append(write.document_id)
+        await embedding.wait()
+
+    monkeypatch.setattr(pipeline_module, "embed_generation_rows", fake_embed)
+    pipeline = _pipeline()
+    pipeline.start()
+    jobs = [asyncio.create_task(pipeline.write(_write(doc), _batches(1))) for doc in ("d1", "d2")]
+    while len(started) < 2:
+        await asyncio.sleep(0)
+    await pipeline.stop()
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+
+    # A shared instance would pile every job's traceback onto one exception.
+    assert all(isinstance(result, PipelineStoppedError) for result in results)
+    assert results[0] is not results[1]
+
+
+def test_stage_stats_window_throughput_and_busy_ratio() -> None:
+    stats = StageStats(concurrency=2, queue_capacity=4)
+    stats.record(100, 5.0, now=0.0)
+    stats.record(50, 10.0, now=30.0)
+
+    snapshot = stats.snapshot(queue_depth=3, window_s=20.0, now=40.0)
+
+    # Only the sample inside the window counts towards rates.
+    assert snapshot["chunks_per_s"] == 2.5
+    assert snapshot["busy_ratio"] == 0.25
+    assert snapshot["chunks_total"] == 150
+    assert snapshot["queue_depth"] == 3
+
+
+def test_aggregate_pipeline_stats_sums_workers() -> None:
+    report = {
+        "stages": {
+            "embed": {
+                "concurrency": 2,
+                "active": 1,
+                "queue_depth": 3,
+                "queue_capacity": 8,
+                "batches_total": 4,
+                "chunks_total": 40,
+                "chunks_per_s": 1.5,
+                "busy_ratio": 1.0,
+            }
+        }
+    }
+    idle = {"stages": {"embed": {**report["stages"]["embed"], "concurrency": 6, "busy_ratio": 0.0}}}
+
+    aggregated = _aggregate_pipeline_stats([report, idle])
+
+    embed = aggregated["stages"]["embed"]
+    assert aggregated["workers"] == 2
+    assert embed["queue_depth"] == 6 and embed["queue_capacity"] == 16
+    assert embed["chunks_per_s"] == 3.0
+    assert embed["busy_ratio"] == 0.25
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import io
+import zipfile
+
+import pytest
+
+from nexusrag.benchmark import runner
+from nexusrag.core.config import get_settings
+from nexusrag.ingestion import loaders
+from nexusrag.ingestion.loaders import (
+    DocumentExtractionError,
+    DocumentLoader,
+    extract_csv,
+    extract_docx,
+    extract_file,
+    extract_html,
+    loader_for_content_type,
+    loader_for_path,
+    spool_file,
+)
+from nexusrag.services.ingest.ingestion import _plan_chunks
+
+_W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+@pytest.fixture(autouse=True)
+def _clear_settings_cache():
+    # Pool size comes from settings; clear so monkeypatched env applies and the pool never leaks.
+    get_settings.cache_clear()
+    yield
+    loaders.shutdown_loader_pool()
+    get_settings.cache_clear()
+
+
+def _docx(body: str) -> bytes:
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as archive:
+        archive.writestr("word/document.xml", f"<w:document {_W}><w:body>{body}</w:body></w:document>")
+    return out.getvalue()
+
+
+def test_loader_registry_resolves_content_types_and_stored_extensions() -> None:
+    assert loader_for_content_type("text/html; charset=utf-8").name == "html"
+    assert loader_for_content_type("TEXT/CSV").name == "csv"
+    assert loader_for_content_type("text/plain") is None
+    assert loader_for_path("var/documents/doc-1.docx").name == "docx"
+    assert loader_for_path("var/documents/doc-1.txt") is None
+
+
+def test_extract_html_keeps_sections_and_drops_scripts() -> None:
+    source = (
+        b"<html><head><title>Ignored</title><script>var x = 1;</script></head><body>"
+        b"<p>Intro   text.</p><h2>Setup</h2><p>Install &amp; run.</p>"
+        b"<table><tr><th>key</th><td>value</td></tr></table></body></html>"
+    )
+
+    extracted = extract_html(source)
+
+    assert extracted.text == "Intro text.\n\nSetup\n\nInstall & run.\n\nkey | value"
+    assert [span.location for span in extracted.spans] == [{}, {"section": "Setup"}]
+    assert extracted.locate(extracted.text.index("Install"), len(extracted.text)) == {"section": "Setup"}
+
+
+def test_extract_csv_names_fields_and_cites_spreadsheet_rows() -> None:
+    extracted = extract_csv(b"\xef\xbb\xbfname,role\nAda,engineer\n,\nGrace,admiral,extra\n")
+
+    assert extracted.text == "name: Ada; role: engineer\n\nname: Grace; role: admiral; column 3: extra"
+    # The blank record is skipped but still counts towards row numbers.
+    assert [span.location for span in extracted.spans] == [{"row": 2}, {"row": 4}]
+    assert extracted.locate(0, len(extracted.text)) == {"row": 2, "row_end": 4}
+
+
+def test_extract_docx_tracks_headings_and_saved_page_breaks() -> None:
+    body = (
+        '<w:p><w:pPr><w:pStyle w:val="Heading1"/></w:pPr><w:r><w:t>Overview</w:t></w:r></w:p>'
+        "<w:p><w:r><w:t>First page.</w:t></w:r></w:p>"
+        '<w:p><w:r><w:br w:type="page"/><w:t>Second page.</w:t></w:r></w:p>'
+        "<w:tbl><w:tr><w:tc><w:p><w:r><w:t>a</w:t></w:r></w:p></w:tc>"
+        "<w:tc><w:p><w:r><w:t>b</w:t></w:r></w:p></w:tc></w:tr></w:tbl>"
+    )
+
+    extracted = extract_docx(_docx(body))
+
+    assert extracted.text == "Overview\n\nFirst page.\n\nSecond page.\n\na | b"
+    assert [span.location for span in extracted.spans] == [
+        {"page": 1, "section": "Overview"},
+        {"page": 2, "section": "Overview"},
+    ]
+    # Without saved page breaks only sections are cited.
+    unpaged = extract_docx(_docx("<w:p><w:r><w:t>Only text.</w:t></w:r></w:p>"))
+    assert [span.location for span in unpaged.spans] == [{}]
+
+
+def test_extract_docx_rejects_non_zip_sources() -> None:
+    with pytest.raises(DocumentExtractionError):
+        extract_docx(b"not a zip archive")
+
+
+def test_extract_pdf_cites_pages() -> None:
+    pytest.importorskip("pypdf")
+    source = runner._synthetic_pdf([("One", "alpha body"), ("Two", "beta (body)")])
+
+    extracted = loaders.extract_pdf(source)
+
+    assert "beta (body)" in extracted.text
+    assert [span.location for span in extracted.spans] == [{"page": 1}, {"page": 2}]
+
+
+def test_plan_chunks_carry_source_locations() -> None:
+    extracted = extract_html(b"<h1>A</h1><p>alpha</p><h1>B</h1><p>beta</p>")
+
+    planned = list(_plan_chunks([extracted.text], chunk_size=50, chunk_overlap=5, locate=extracted.locate))
+
+    assert [chunk.text for chunk in planned] == ["A", "alpha", "B", "beta"]
+    assert planned[3].metadata == {"offset_start": 13, "offset_end": 17, "section": "B"}
+
+
+@pytest.mark.asyncio
+async def test_extract_file_runs_in_the_process_pool(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("INGEST_LOADER_PROCESSES", "1")
+    path = tmp_path / "doc.csv"
+    path.write_bytes(b"a,b\n1,2\n")
+
+    extracted = await extract_file(loader_for_path(path), path)
+
+    assert extracted.text == "a: 1; b: 2"
+    assert loaders._pool is not None
+    with pytest.raises(FileNotFoundError):
+        await extract_file(loader_for_path(path), tmp_path / "missing.csv")
+
+
+@pytest.mark.asyncio
+async def test_spool_file_streams_extracted_text_in_pieces(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("INGEST_LOADER_PROCESSES", "1")
+    path = tmp_path / "doc.csv"
+    body = b'a,b\n"x\r\ny",2\n' + b"".join(b"%d,%d\n" % (row, row) for row in range(40))
+    path.write_bytes(body)
+    expected = extract_csv(body)
+
+    spooled = await spool_file(loader_for_path(path), path, tmp_path / "spool.txt")
+    pieces = list(spooled.iter_text(chunk_chars=16))
+
+    # Carriage returns survive the spool, so chunk offsets still resolve to the right rows.
+    assert max(len(piece) for piece in pieces) <= 16
+    assert "".join(pieces) == expected.text
+    planned = list(_plan_chunks(spooled.iter_text(chunk_chars=16), chunk_size=20, chunk_overlap=2, locate=spooled.locate))
+    assert planned == list(_plan_chunks([expected.text], chunk_size=20, chunk_overlap=2, locate=expected.locate))
+
+
+@pytest.mark.asyncio
+async def test_extract_file_reports_unavailable_parsers(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("INGEST_LOADER_PROCESSES", "0")
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    loader = DocumentLoader("pdf", ("application/pdf",), "pdf", loaders.extract_pdf, available=False)
+
+    with pytest.raises(loaders.LoaderUnavailableError):
+        await extract_file(loader, path)
+
+
+@pytest.mark.asyncio
+async def test_loader_check_reports_throughput_per_format(monkeypatch) -> None:
+    monkeypatch.setenv("INGEST_LOADER_PROCESSES", "0")
+    docs, _cases = runner.load_fixture()
+
+    report = await runner.loader_check(docs, copies=1, documents=2)
+
+    assert report["processes"] == 0
+    for name in ("html", "docx", "csv"):
+        values = report["formats"][name]
+        assert values["available"] is True
+        assert values["spans_per_document"] == len(docs)
+        assert values["mb_per_s"] > 0 and values["chars_per_s"] > 0
+    assert "pdf" in report["formats"]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import types
+
+import pytest
+
+from nexusrag.providers import clients
+from nexusrag.providers.clients import ProviderClientRegistry
+from nexusrag.providers.retrieval.bedrock_kb import BedrockKnowledgeBaseRetriever, ClientError
+from nexusrag.services.telemetry import counters_snapshot
+
+
+class FakeClient:
+    def __init__(self, region: str) -> None:
+        self.region = region
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _client_error(status: int) -> Exception:
+    # Works for both botocore's ClientError and the stub used without the aws extra.
+    error = ClientError.__new__(ClientError)
+    error.response = {"ResponseMetadata": {"HTTPStatusCode": status}}
+    return error
+
+
+def _counter(name: str) -> int:
+    return counters_snapshot().get(name, 0)
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_clients_until_unhealthy_or_stale() -> None:
+    now = {"t": 0.0}
+    registry = ProviderClientRegistry(max_consecutive_failures=2, max_age_s=60, clock=lambda: now["t"])
+    built: list[FakeClient] = []
+
+    def factory() -> FakeClient:
+        built.append(FakeClient("us-east-1"))
+        return built[-1]
+
+    cold, warm = _counter("provider_client.cold_total.test"), _counter("provider_client.warm_total.test")
+    first = registry.get("test", "us-east-1", factory, close=FakeClient.close)
+    assert registry.get("test", "us-east-1", factory, close=FakeClient.close) is first
+    assert _counter("provider_client.cold_total.test") - cold == 1
+    assert _counter("provider_client.warm_total.test") - warm == 1
+
+    # A success in between resets the streak; two consecutive failures evict.
+    registry.record_failure("test", "us-east-1")
+    registry.record_success("test", "us-east-1")
+    registry.record_failure("test", "us-east-1")
+    assert registry.get("test", "us-east-1", factory) is first
+    registry.record_failure("test", "us-east-1")
+    registry.record_failure("test", "us-east-1")
+    second = registry.get("test", "us-east-1", factory, close=FakeClient.close)
+    assert second is not first and not first.closed
+
+    now["t"] = 61.0
+    third = registry.get("test", "us-east-1", factory, close=FakeClient.close)
+    assert third is not second and len(built) == 3
+
+    await registry.aclose()
+    assert third.closed and registry.size() == 0
+
+
+@pytest.mark.asyncio
+async def test_bedrock_retrievers_share_registry_client(monkeypatch) -> None:
+    built: list[FakeClient] = []
+
+    def client(service: str, region_name: str) -> FakeClient:
+        assert service == "bedrock-agent-runtime"
+        built.append(FakeClient(region_name))
+        return built[-1]
+
+    monkeypatch.setitem(sys.modules, "boto3", types.SimpleNamespace(client=client))
+    monkeypatch.setattr(clients, "_registry", None)
+
+    first = await BedrockKnowledgeBaseRetriever(knowledge_base_id="kb1", region="us-east-1")._get_client()
+    second = await BedrockKnowledgeBaseRetriever(knowledge_base_id="kb2", region="us-east-1")._get_client()
+    other_region = await BedrockKnowledgeBaseRetriever(
+        knowledge_base_id="kb1", region="eu-west-1"
+    )._get_client()
+    assert first is second and other_region is not first
+    assert [item.region for item in built] == ["us-east-1", "eu-west-1"]
+
+    # Request errors (4xx) keep the client; transport failures count toward a rebuild.
+    retriever = BedrockKnowledgeBaseRetriever(knowledge_base_id="kb1", region="us-east-1")
+    bad_request = _client_error(400)
+    for _ in range(5):
+        retriever._record_client_health(bad_request)
+    assert await retriever._get_client() is first
+    for _ in range(3):
+        retriever._record_client_health(TimeoutError("read timeout"))
+    assert await retriever._get_client() is not first
+
+    await clients.close_provider_clients()
+    assert built[-1].closed
+
+
+@pytest.mark.asyncio
+async def test_registry_builds_outside_the_lock_once_per_key() -> None:
+    registry = ProviderClientRegistry(max_consecutive_failures=3, max_age_s=0)
+    release = threading.Event()
+    built: list[str] = []
+
+    def slow_factory() -> FakeClient:
+        built.append("slow")
+        # Credential resolution and TLS setup can take seconds.
+        release.wait(timeout=5)
+        return FakeClient("us-east-1")
+
+    cold = [asyncio.ensure_future(registry.aget("test", "slow", slow_factory)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    # The event loop keeps running, and other keys build while the slow one is in flight.
+    assert not any(task.done() for task in cold)
+    other = await registry.aget("test", "fast", lambda: FakeClient("eu-west-1"))
+    assert other.region == "eu-west-1"
+
+    release.set()
+    clients_built = await asyncio.gather(*cold)
+    # Concurrent cold lookups waited for the one build instead of repeating it.
+    assert built == ["slow"]
+    assert clients_built[0] is clients_built[1] is clients_built[2]
+
+    # A failed build reaches every waiter and leaves nothing cached.
+    def broken() -> FakeClient:
+        raise RuntimeError("no credentials")
+
+    with pytest.raises(RuntimeError):
+        await registry.aget("test", "broken", broken)
+    assert await registry.aget("test", "broken", lambda: FakeClient("us-east-1")) is not None
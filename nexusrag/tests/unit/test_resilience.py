@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 
 from nexusrag.core.config import get_settings
@@ -8,8 +10,10 @@ from nexusrag.services import rollouts
 from nexusrag.services.resilience import (
     CircuitBreaker,
     CircuitBreakerConfig,
+    HedgeBudget,
     RetryPolicy,
     deterministic_canary,
+    hedged_call,
     retry_async,
 )
 
@@ -57,6 +61,59 @@ async def test_circuit_breaker_transitions() -> None:
     await breaker.before_call()
 
 
+@pytest.mark.asyncio
+async def test_hedged_call_first_response_wins_and_loser_is_cancelled() -> None:
+    cancelled: list[str] = []
+
+    async def call(name: str, delay_s: float) -> str:
+        try:
+            await asyncio.sleep(delay_s)
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+        return name
+
+    budget = HedgeBudget("test", ratio=0.5, burst=1)
+    result = await hedged_call(lambda: call("primary", 1.0), lambda: call("hedge", 0.01), delay_s=0.01, budget=budget)
+    assert result == ("hedge", True)
+    assert cancelled == ["primary"]
+
+    # The bucket is drained: the next slow call waits for its primary instead of hedging.
+    result = await hedged_call(lambda: call("primary", 0.05), lambda: call("hedge", 0.0), delay_s=0.01, budget=budget)
+    assert result == ("primary", False)
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_falls_back_when_primary_fails() -> None:
+    async def failing() -> str:
+        raise TimeoutError("upstream")
+
+    async def fallback() -> str:
+        return "fallback"
+
+    budget = HedgeBudget("test", ratio=0.0, burst=0)
+    assert await hedged_call(failing, fallback, delay_s=None, budget=budget, hedge_on_error=True) == ("fallback", True)
+    with pytest.raises(TimeoutError):
+        await hedged_call(failing, fallback, delay_s=None, budget=budget)
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_rejected_hedge_waits_for_primary() -> None:
+    async def call(result: list[str], delay_s: float) -> list[str]:
+        await asyncio.sleep(delay_s)
+        return result
+
+    budget = HedgeBudget("test", ratio=0.5, burst=1)
+    result = await hedged_call(
+        lambda: call(["primary"], 0.05),
+        lambda: call([], 0.0),
+        delay_s=0.01,
+        budget=budget,
+        accept_hedge=bool,
+    )
+    assert result == (["primary"], False)
+
+
 def test_deterministic_canary() -> None:
     tenant_id = "tenant-alpha"
     assert deterministic_canary(tenant_id, 0) is False
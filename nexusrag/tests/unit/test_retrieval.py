@@ -1,9 +1,18 @@
 from __future__ import annotations
 
 import pytest
+from sqlalchemy.exc import SQLAlchemyError
 
+from nexusrag.core.config import EMBED_DIM, get_settings
 from nexusrag.core.errors import RetrievalError
 from nexusrag.providers.retrieval import local_pgvector
+from nexusrag.providers.retrieval.filters import EqFilter
+
+
+@pytest.fixture(autouse=True)
+def _reset_chunks_layout(monkeypatch) -> None:
+    # The partitioning probe is cached per process; each test sees its own session's answer.
+    monkeypatch.setattr(local_pgvector, "_chunks_partitioned", None)
 
 
 class DummySession:
@@ -15,8 +24,364 @@ class DummySession:
 @pytest.mark.asyncio
 async def test_retriever_rejects_dimension_mismatch(monkeypatch) -> None:
     # Force an invalid embedding length to exercise the dimension guard.
-    monkeypatch.setattr(local_pgvector, "embed_text", lambda _text: [0.0])
+    async def _embed_query(_text: str, provider=None) -> list[float]:
+        return [0.0]
+
+    monkeypatch.setattr(local_pgvector, "embed_query", _embed_query)
 
     retriever = local_pgvector.LocalPgVectorRetriever(DummySession())
     with pytest.raises(RetrievalError):
         await retriever.retrieve("t1", "c1", "query", top_k=5)
+
+
+async def _fixed_query_embedding(_text: str, provider=None) -> list[float]:
+    return [0.1] * EMBED_DIM
+
+
+class _Result:
+    def __init__(self, *, scalar=None, rows=None) -> None:
+        self._scalar = scalar
+        self._rows = rows or []
+
+    def scalar_one(self):
+        return self._scalar
+
+    def scalar(self):
+        return self._scalar
+
+    def all(self):
+        return self._rows
+
+
+class RecordingSession:
+    # Answer the bounded corpus-size count, layout probe and current_setting; capture set_config calls in order.
+    def __init__(self, corpus_size: int, *, partitioned: bool = False, indexscan: str = "on") -> None:
+        self.corpus_size = corpus_size
+        self.partitioned = partitioned
+        self.indexscan = indexscan
+        self.layout_probes = 0
+        self.settings: list[tuple[str, str]] = []
+        self.counted = False
+        self.rows: list = []
+        self.query_error: Exception | None = None
+
+    async def execute(self, stmt, params=None):
+        if params and "setting" in params:
+            return _Result(scalar=self.indexscan)
+        if params and "name" in params:
+            self.settings.append((params["name"], params["value"]))
+            return _Result()
+        if "pg_partitioned_table" in str(stmt):
+            self.layout_probes += 1
+            return _Result(scalar=self.partitioned)
+        if "count(" in str(stmt):
+            self.counted = True
+            return _Result(scalar=self.corpus_size)
+        if self.query_error is not None:
+            raise self.query_error
+        return _Result(rows=self.rows)
+
+
+@pytest.mark.asyncio
+async def test_retriever_uses_exact_scan_for_small_corpus(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+    session = RecordingSession(corpus_size=3)
+
+    retriever = local_pgvector.LocalPgVectorRetriever(
+        session, retrieval_config={"ann": {"exact_scan_threshold": 10}}
+    )
+    await retriever.retrieve("t1", "c1", "query", top_k=5)
+
+    assert retriever.last_scan == "exact"
+    # Index scans are disabled for the query and restored afterwards.
+    assert session.settings == [("enable_indexscan", "off"), ("enable_indexscan", "on")]
+
+
+@pytest.mark.asyncio
+async def test_exact_scan_restores_the_callers_indexscan_setting(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+    session = RecordingSession(corpus_size=3, indexscan="off")
+    retriever = local_pgvector.LocalPgVectorRetriever(
+        session, retrieval_config={"ann": {"exact_scan_threshold": 10}}
+    )
+
+    await retriever.retrieve("t1", "c1", "query", top_k=5)
+
+    assert session.settings == [("enable_indexscan", "off"), ("enable_indexscan", "off")]
+
+    # A failed statement aborts the transaction, so nothing is restored after it.
+    session.settings.clear()
+    session.query_error = SQLAlchemyError("boom")
+    with pytest.raises(RetrievalError):
+        await retriever.retrieve("t1", "c1", "query", top_k=5)
+
+    assert session.settings == [("enable_indexscan", "off")]
+
+
+@pytest.mark.asyncio
+async def test_retriever_applies_ann_params_for_large_corpus(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+    session = RecordingSession(corpus_size=11)
+
+    retriever = local_pgvector.LocalPgVectorRetriever(
+        session,
+        retrieval_config={"ann": {"ef_search": 120, "probes": 8, "exact_scan_threshold": 10}},
+    )
+    await retriever.retrieve("t1", "c1", "query", top_k=5)
+
+    assert retriever.last_scan == "ann"
+    # The shared, unpartitioned index scans past other corpora's rows, so the scan is iterative.
+    assert session.settings == [
+        ("hnsw.ef_search", "120"),
+        ("ivfflat.probes", "8"),
+        ("hnsw.iterative_scan", "relaxed_order"),
+        ("ivfflat.iterative_scan", "relaxed_order"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_partitioned_chunks_skip_iterative_scan_without_filters(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+    # The table layout decides, not the setting that only applies at migration time.
+    monkeypatch.setenv("CHUNKS_PARTITION_BY_CORPUS", "false")
+    get_settings.cache_clear()
+    session = RecordingSession(corpus_size=11, partitioned=True)
+
+    try:
+        retriever = local_pgvector.LocalPgVectorRetriever(
+            session, retrieval_config={"ann": {"ef_search": 40, "exact_scan_threshold": 10}}
+        )
+        await retriever.retrieve("t1", "c1", "query", top_k=5)
+        await retriever.retrieve("t1", "c1", "query", top_k=5)
+    finally:
+        get_settings.cache_clear()
+
+    # A corpus partition has its own index, so every candidate already matches the corpus scope.
+    assert session.settings == [("hnsw.ef_search", "40")] * 2
+    # The layout is probed once per process.
+    assert session.layout_probes == 1
+
+
+@pytest.mark.asyncio
+async def test_retriever_skips_size_probe_when_fallback_disabled(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+    session = RecordingSession(corpus_size=1)
+
+    retriever = local_pgvector.LocalPgVectorRetriever(
+        session, retrieval_config={"ann": {"exact_scan_threshold": 0}}
+    )
+    await retriever.retrieve("t1", "c1", "query", top_k=5)
+
+    assert session.counted is False
+    assert retriever.last_scan == "ann"
+
+
+def test_lexical_query_text_ors_unique_terms() -> None:
+    # Error codes and SKUs survive as standalone terms; punctuation never reaches to_tsquery.
+    assert local_pgvector.lexical_query_text("Error E1234: error in SKU-9!") == "error | e1234 | in | sku | 9"
+    assert local_pgvector.lexical_query_text("?!") is None
+
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_normalizes_fused_scores(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+
+    session = RecordingSession(corpus_size=100)
+    # Rank 1 in both lists with rrf_k=60 is the fused ceiling of 2/61.
+    session.rows = [("E1234 means disk full", "doc-1", {}, None, None, None, 2.0 / 61.0)]
+    retriever = local_pgvector.LocalPgVectorRetriever(
+        session,
+        retrieval_config={"mode": "hybrid", "ann": {"exact_scan_threshold": 10}},
+    )
+    results = await retriever.retrieve("t1", "c1", "E1234", top_k=5)
+
+    assert results[0]["score"] == pytest.approx(1.0)
+    # ef_search is widened so HNSW can return every fusion candidate.
+    assert session.settings == [("hnsw.ef_search", "50"), ("hnsw.iterative_scan", "relaxed_order")]
+
+
+@pytest.mark.asyncio
+async def test_quantized_retrieval_widens_ef_search_for_shortlist(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+    session = RecordingSession(corpus_size=100)
+
+    retriever = local_pgvector.LocalPgVectorRetriever(
+        session,
+        retrieval_config={
+            "ann": {"exact_scan_threshold": 10},
+            "quantization": {"type": "binary", "oversample": 10},
+        },
+    )
+    await retriever.retrieve("t1", "c1", "query", top_k=5)
+
+    # HNSW must surface the whole top_k * oversample shortlist for re-ranking.
+    assert session.settings == [("hnsw.ef_search", "50"), ("hnsw.iterative_scan", "relaxed_order")]
+
+
+def test_quantized_statement_reranks_shortlist_at_full_precision() -> None:
+    sql = str(local_pgvector.vector_statement("halfvec"))
+
+    # First pass orders by the halfvec index expression; the outer order uses the
+    # shortlist's own column so it cannot fall back to the full-precision index.
+    assert "CAST(chunks.embedding AS HALFVEC(768))" in sql
+    assert "ORDER BY (quantized_shortlist.embedding <=>" in sql
+
+
+def test_vector_statement_joins_documents_after_top_k() -> None:
+    sql = str(local_pgvector.vector_statement(None))
+
+    # Document-level metadata is joined only for the limited top_k rows.
+    assert "LIMIT :top_k) AS top_hits LEFT OUTER JOIN documents" in sql
+    assert "embedding" not in sql.split("FROM", 1)[0]
+
+
+def test_statements_scope_to_tenant_and_corpus() -> None:
+    for stmt in (local_pgvector.vector_statement("binary"), local_pgvector.hybrid_statement(None, True)):
+        sql = str(stmt)
+        # Every candidate scan filters on both keys; corpus_id also prunes a partitioned table.
+        assert sql.count("chunks.corpus_id = :corpus_id") == sql.count("chunks.tenant_id = :tenant_id") >= 1
+
+
+def test_statements_hide_inactive_chunk_generations() -> None:
+    for stmt in (local_pgvector.vector_statement("binary"), local_pgvector.hybrid_statement(None, True)):
+        sql = str(stmt)
+        # A reindex's unflipped generation must be filtered inside every candidate scan.
+        assert sql.count("documents.active_generation != chunks.generation") == sql.count(
+            "chunks.corpus_id = :corpus_id"
+        )
+
+
+def test_hit_metadata_rebuilds_per_chunk_shape() -> None:
+    metadata = local_pgvector.hit_metadata(
+        {"offset_start": 0, "offset_end": 10}, "notes.txt", "text/plain", {"team": "ops"}
+    )
+    assert metadata == {
+        "filename": "notes.txt",
+        "content_type": "text/plain",
+        "offset_start": 0,
+        "offset_end": 10,
+        "document_metadata": {"team": "ops"},
+    }
+    # Chunks without a documents row keep what they stored.
+    assert local_pgvector.hit_metadata({"doc_id": "d1"}, None, None, None) == {"doc_id": "d1"}
+
+
+@pytest.mark.asyncio
+async def test_exact_scan_ignores_quantization(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+    session = RecordingSession(corpus_size=3)
+    statements: list[str] = []
+    execute = session.execute
+
+    async def _record(stmt, params=None):
+        statements.append(str(stmt))
+        return await execute(stmt, params)
+
+    session.execute = _record  # type: ignore[method-assign]
+    retriever = local_pgvector.LocalPgVectorRetriever(
+        session,
+        retrieval_config={"ann": {"exact_scan_threshold": 10}, "quantization": {"type": "halfvec"}},
+    )
+    await retriever.retrieve("t1", "c1", "query", top_k=5)
+
+    assert retriever.last_scan == "exact"
+    assert not any("quantized_shortlist" in sql for sql in statements)
+
+
+@pytest.mark.asyncio
+async def test_filtered_retrieval_enables_iterative_scan(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+    session = RecordingSession(corpus_size=11)
+    captured: list[dict] = []
+    execute = session.execute
+
+    async def _record(stmt, params=None):
+        if params and "query_embedding" in params:
+            captured.append(params)
+        return await execute(stmt, params)
+
+    session.execute = _record  # type: ignore[method-assign]
+    retriever = local_pgvector.LocalPgVectorRetriever(
+        session, retrieval_config={"ann": {"ef_search": 40, "exact_scan_threshold": 10}}
+    )
+    filters = [EqFilter(op="eq", key="language", value="en")]
+    await retriever.retrieve("t1", "c1", "query", top_k=5, filters=filters)
+
+    # Filtered ANN keeps walking the index until top_k rows pass the predicate.
+    assert session.settings == [("hnsw.ef_search", "40"), ("hnsw.iterative_scan", "relaxed_order")]
+    assert captured[0]["mf0"] == {"language": "en"}
+
+
+def test_filters_apply_inside_every_candidate_scan() -> None:
+    shape = (("eq",),)
+    for stmt in (
+        local_pgvector.vector_statement(None, shape),
+        local_pgvector.vector_statement("binary", shape),
+        local_pgvector.hybrid_statement(None, True, shape),
+    ):
+        sql = str(stmt)
+        # Each scan that feeds a LIMIT carries the predicate, so filtering never thins top_k.
+        assert sql.count("documents.metadata_json @> :mf0") == sql.count("chunks.corpus_id = :corpus_id")
+
+
+@pytest.mark.asyncio
+async def test_truncated_dimension_queries_its_own_column(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+    captured: list = []
+
+    class CapturingSession(RecordingSession):
+        async def execute(self, stmt, params=None):
+            if params and "query_embedding" in params:
+                captured.append((str(stmt), params["query_embedding"]))
+            return await super().execute(stmt, params)
+
+    retriever = local_pgvector.LocalPgVectorRetriever(
+        CapturingSession(corpus_size=100),
+        retrieval_config={"embedding_dim": 256, "ann": {"exact_scan_threshold": 0}},
+    )
+    await retriever.retrieve("t1", "c1", "query", top_k=5)
+
+    sql, query_embedding = captured[0]
+    assert "chunks.embedding_256 <=>" in sql and "chunks.embedding <=>" not in sql
+    # The query is truncated and re-normalised like the stored vectors.
+    assert len(query_embedding) == 256
+    assert sum(value * value for value in query_embedding) == pytest.approx(1.0)
+
+
+def test_embedding_generation_statements_read_its_indexed_vectors() -> None:
+    generation_id = "0b7e4c1e-5f0a-4d55-9d8e-3f1f6a2b9c10"
+    for stmt in (
+        local_pgvector.vector_statement(None, (), None, 256, generation_id),
+        local_pgvector.hybrid_statement(None, True, (), None, 256, generation_id),
+    ):
+        sql = str(stmt)
+        # The cast and literal predicate must match the generation's partial HNSW index.
+        assert "CAST(chunk_embedding_shadows.embedding AS VECTOR(256)) <=>" in sql
+        assert f"chunk_embedding_shadows.generation_id = '{generation_id}'" in sql
+        assert "chunks.embedding_256" not in sql
+
+
+@pytest.mark.asyncio
+async def test_embedding_generation_skips_chunk_quantization(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+    statements: list[str] = []
+
+    class CapturingSession(RecordingSession):
+        async def execute(self, stmt, params=None):
+            if params and "query_embedding" in params:
+                statements.append(str(stmt))
+            return await super().execute(stmt, params)
+
+    retriever = local_pgvector.LocalPgVectorRetriever(
+        CapturingSession(corpus_size=100),
+        retrieval_config={
+            "ann": {"exact_scan_threshold": 0},
+            "quantization": {"type": "halfvec"},
+            "vector_generation_id": "0b7e4c1e-5f0a-4d55-9d8e-3f1f6a2b9c10",
+        },
+    )
+    await retriever.retrieve("t1", "c1", "query", top_k=5)
+
+    # The quantised indexes cover the chunks column, not a shadow generation.
+    assert "quantized_shortlist" not in statements[0]
+    assert "chunk_embedding_shadows" in statements[0]
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from nexusrag.core.config import EMBED_DIM
+from nexusrag.domain.models import AuthorizationPolicy, Chunk
+from nexusrag.providers.retrieval import local_pgvector
+from nexusrag.providers.retrieval.cache import retrieval_cache_key
+from nexusrag.services.authz.abac import evaluate_policy_set
+from nexusrag.services.authz.retrieval import RetrievalAccess, access_clauses, compile_policies
+
+_PRINCIPAL_CONTEXT = {
+    "principal": {"id": "u1", "tenant_id": "t1", "role": "reader", "groups": ["eng"], "plan": "pro"},
+    "request": {"time": "2026-10-16T12:00:00+00:00"},
+}
+_DOCUMENTS = [
+    {"id": "d1", "status": "succeeded", "content_type": "text/plain", "labels": {"team": "eng"}, "metadata": {"year": 2024}},
+    {"id": "d2", "status": "succeeded", "content_type": None, "labels": {"team": "ops"}, "metadata": {"year": "2024"}},
+    {"id": "d3", "status": "failed", "content_type": "text/markdown", "labels": {}, "metadata": {"tags": ["public"]}},
+]
+
+
+def _policy(effect: str, condition: dict, *, priority: int = 10) -> AuthorizationPolicy:
+    return AuthorizationPolicy(
+        id=uuid4().hex,
+        tenant_id="t1",
+        name=f"policy-{uuid4().hex}",
+        version=1,
+        effect=effect,
+        resource_type="document",
+        action="read",
+        condition_json=condition,
+        priority=priority,
+        enabled=True,
+        created_by="test",
+    )
+
+
+def _evaluate(predicate, document: dict) -> bool:
+    # Reference interpreter for compiled predicates, mirroring the SQL rendering.
+    if isinstance(predicate, bool):
+        return predicate
+    kind = predicate[0]
+    if kind == "and":
+        return all(_evaluate(child, document) for child in predicate[1])
+    if kind == "or":
+        return any(_evaluate(child, document) for child in predicate[1])
+    if kind == "not":
+        return not _evaluate(predicate[1], document)
+    _kind, op, key, value_json = predicate
+    value = json.loads(value_json)
+    if kind == "column":
+        actual = document.get(key)
+    elif kind == "label":
+        actual = document["labels"].get(key)
+    else:
+        actual = document["metadata"]
+        for part in json.loads(key):
+            actual = actual.get(part) if isinstance(actual, dict) else None
+    if op == "eq":
+        return actual == value and type(actual) is type(value)
+    if op == "in":
+        return actual in value
+    if op == "contains":
+        return str(value) in actual if isinstance(actual, str) else isinstance(actual, list) and value in actual
+    return isinstance(actual, type(value)) and getattr(actual, {"gt": "__gt__", "lt": "__lt__"}[op])(value)
+
+
+@pytest.mark.parametrize(
+    "policies",
+    [
+        [_policy("allow", {})],
+        [_policy("allow", {"eq": ["eng", {"var": "resource.labels.team"}]})],
+        [_policy("allow", {"in": [{"var": "resource.labels.team"}, ["eng", "ops"]]})],
+        [
+            _policy("allow", {}),
+            _policy("deny", {"eq": [{"var": "resource.status"}, "failed"]}),
+        ],
+        [_policy("allow", {"all": [{"eq": [{"var": "principal.role"}, "reader"]}, {"gt": [{"var": "resource.metadata.year"}, 2020]}]})],
+        [_policy("allow", {"contains": [{"var": "resource.metadata.tags"}, "public"]})],
+        [_policy("allow", {"not": {"eq": [{"var": "resource.content_type"}, None]}})],
+        [_policy("allow", {"eq": [{"var": "principal.role"}, "admin"]})],
+    ],
+)
+def test_compiled_policies_match_per_document_evaluation(policies) -> None:
+    predicate = compile_policies(policies, action="read", context=_PRINCIPAL_CONTEXT, default_deny=True)
+    for document in _DOCUMENTS:
+        context = {**_PRINCIPAL_CONTEXT, "resource": document}
+        expected = evaluate_policy_set(
+            policies=policies,
+            resource_type="document",
+            action="read",
+            context=context,
+            include_trace=False,
+            default_deny=True,
+        ).allowed
+        assert _evaluate(predicate, document) is expected, document["id"]
+
+
+def test_compile_policies_folds_principal_only_conditions() -> None:
+    allow_readers = [_policy("allow", {"eq": [{"var": "principal.role"}, "reader"]})]
+    assert compile_policies(allow_readers, action="read", context=_PRINCIPAL_CONTEXT, default_deny=True) is True
+    # No document-level policy at all falls back to the default decision.
+    assert compile_policies([], action="read", context=_PRINCIPAL_CONTEXT, default_deny=True) is False
+
+
+def test_untranslatable_conditions_fail_closed() -> None:
+    window = {"date_between": [{"var": "resource.metadata.published"}, {"start": "2026-01-01", "end": "2026-12-31"}]}
+    allow = compile_policies([_policy("allow", window)], action="read", context=_PRINCIPAL_CONTEXT, default_deny=False)
+    assert allow is True
+    deny = compile_policies(
+        [_policy("allow", {}), _policy("deny", window)], action="read", context=_PRINCIPAL_CONTEXT, default_deny=True
+    )
+    assert deny is False
+    # Invalid policies deny, as evaluate_policy_set does.
+    invalid = compile_policies(
+        [_policy("allow", {"regex": [{"var": "resource.id"}, "d.*"]})],
+        action="read",
+        context=_PRINCIPAL_CONTEXT,
+        default_deny=False,
+    )
+    assert invalid is False
+
+
+def _access(policy=True) -> RetrievalAccess:
+    return RetrievalAccess(
+        acl=True,
+        principals=("role:reader", "user:u1"),
+        permissions=("owner", "read"),
+        policy=policy,
+    )
+
+
+def test_access_clauses_correlate_on_candidate_document() -> None:
+    policy = ("label", "eq", "team", json.dumps("eng"))
+    (clause,) = access_clauses(_access(policy).shape, Chunk.__table__)
+    sql = str(clause.compile(dialect=postgresql.dialect()))
+
+    assert "chunks.document_id IS NULL OR" in sql
+    assert "acl_permissions.document_id = chunks.document_id" in sql
+    assert "= any(%(acl_principals)s::VARCHAR[])" in sql
+    assert "acl_documents.id = chunks.document_id" in sql
+    assert "acl_labels.key = %(key_1)s" in sql
+    assert access_clauses(RetrievalAccess(False, (), (), True).shape, Chunk.__table__) == []
+
+
+async def _fixed_query_embedding(_text: str, provider=None) -> list[float]:
+    return [0.1] * EMBED_DIM
+
+
+class _Result:
+    def scalar_one(self):
+        return 100
+
+    def all(self):
+        return []
+
+
+class RecordingSession:
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, dict]] = []
+        self.settings: list[tuple[str, str]] = []
+
+    async def execute(self, stmt, params=None):
+        if params and "name" in params:
+            self.settings.append((params["name"], params["value"]))
+        else:
+            self.statements.append((str(stmt), params or {}))
+        return _Result()
+
+
+@pytest.mark.asyncio
+async def test_retriever_enforces_access_in_every_candidate_scan(monkeypatch) -> None:
+    monkeypatch.setattr(local_pgvector, "embed_query", _fixed_query_embedding)
+    session = RecordingSession()
+    retriever = local_pgvector.LocalPgVectorRetriever(
+        session,
+        retrieval_config={"mode": "hybrid", "ann": {"exact_scan_threshold": 0}},
+        access=_access(),
+    )
+    await retriever.retrieve("t1", "c1", "query", top_k=5)
+
+    sql, params = session.statements[-1]
+    assert sql.count("acl_permissions.permission = any") == sql.count("chunks.corpus_id = :corpus_id") == 2
+    assert params["acl_principals"] == ["role:reader", "user:u1"]
+    assert ("hnsw.iterative_scan", "relaxed_order") in session.settings
+
+
+def test_cache_key_separates_principals() -> None:
+    keys = {
+        retrieval_cache_key(
+            tenant_id="t1",
+            corpus_id="c1",
+            corpus_version=1,
+            provider="local_pgvector",
+            query="q",
+            top_k=5,
+            access=access.cache_token(),
+        )
+        for access in (_access(), _access(("column", "eq", "status", json.dumps("succeeded"))))
+    }
+    assert len(keys) == 2
@@ -3,6 +3,7 @@ from __future__ import annotations
 import pytest
 
 from nexusrag.providers.retrieval.bedrock_kb import BedrockKnowledgeBaseRetriever
+from nexusrag.providers.retrieval.filters import EqFilter, ExistsFilter
 from nexusrag.providers.retrieval.vertex_ai import VertexAIRetriever
 
 
@@ -58,3 +59,26 @@ async def test_vertex_adapter_normalization() -> None:
     assert results[0]["text"] == "hello vertex"
     assert results[0]["source"].startswith("gs://")
     assert 0.0 <= results[0]["score"] <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_bedrock_adapter_pushes_down_filters() -> None:
+    captured: dict = {}
+
+    class FilteringBedrockClient(DummyBedrockClient):
+        def retrieve(self, **kwargs):
+            captured.update(kwargs)
+            return super().retrieve(**kwargs)
+
+    retriever = BedrockKnowledgeBaseRetriever(
+        knowledge_base_id="kb1",
+        region="us-east-1",
+        client=FilteringBedrockClient(),
+    )
+    filters = [EqFilter(op="eq", key="title", value="Demo"), ExistsFilter(op="exists", key="owner")]
+    results = await retriever.retrieve("t1", "c1", "query", top_k=3, filters=filters)
+
+    search = captured["retrievalConfiguration"]["vectorSearchConfiguration"]
+    assert search["filter"] == {"equals": {"key": "title", "value": "Demo"}}
+    # key-exists has no Bedrock operator and is applied to the returned metadata.
+    assert results == []
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.dialects import postgresql
+
+from nexusrag.domain.models import Chunk, Document
+from nexusrag.providers.retrieval import filters as metadata_filters
+
+_ADAPTER = TypeAdapter(metadata_filters.MetadataFilters)
+
+
+def _parse(payload: list[dict]) -> metadata_filters.MetadataFilters:
+    return _ADAPTER.validate_python(payload)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"op": "range", "key": "year"},
+        {"op": "range", "key": "year", "gte": 2020, "lt": "2024"},
+        {"op": "in", "key": "lang", "values": []},
+        {"op": "eq", "key": "bad key", "value": "x"},
+        {"op": "eq", "key": "document_id", "value": 7},
+        {"op": "exists", "key": "document_id"},
+        {"op": "eq", "key": "lang", "value": "en", "extra": 1},
+        {"op": "regex", "key": "lang", "value": "e.*"},
+    ],
+)
+def test_filters_reject_invalid_expressions(payload) -> None:
+    with pytest.raises(ValidationError):
+        _parse([payload])
+
+
+def test_filter_shape_and_params_line_up() -> None:
+    filters = _parse(
+        [
+            {"op": "eq", "key": "lang", "value": "en"},
+            {"op": "in", "key": "product", "values": ["a", "b"]},
+            {"op": "range", "key": "year", "gte": 2020, "lt": 2024},
+            {"op": "exists", "key": "reviewed"},
+            {"op": "in", "key": "document_id", "values": ["d1", "d2"]},
+        ]
+    )
+    # Values never enter the shape, so one cached statement serves every value.
+    assert metadata_filters.filter_shape(filters) == (
+        ("eq",),
+        ("in", 2),
+        ("range", ("gte", "lt")),
+        ("exists",),
+        ("document_id",),
+    )
+    assert metadata_filters.filter_params(filters) == {
+        "mf0": {"lang": "en"},
+        "mf1_0": {"product": "a"},
+        "mf1_1": {"product": "b"},
+        "mf2_key": "year",
+        "mf2_type": "number",
+        "mf2_gte": 2020,
+        "mf2_lt": 2024,
+        "mf3": '$."reviewed"',
+        "mf4": ["d1", "d2"],
+    }
+
+
+def test_filter_clauses_use_index_backed_operators() -> None:
+    shape = (("eq",), ("range", ("gte",)), ("exists",), ("document_id",))
+    clauses = metadata_filters.filter_clauses(shape, Chunk.__table__, Document.__table__)
+    sql = " AND ".join(str(clause.compile(dialect=postgresql.dialect())) for clause in clauses)
+
+    assert "chunks.document_id = any(%(mf3)s::VARCHAR[])" in sql
+    assert "documents.metadata_json @> %(mf0)s" in sql
+    assert "documents.metadata_json @? %(mf2)s" in sql
+    assert "jsonb_typeof(documents.metadata_json -> %(mf1_key)s::VARCHAR) = %(mf1_type)s::VARCHAR" in sql
+    # Metadata conditions are one semi-join scoped to the same tenant and corpus.
+    assert sql.count("SELECT documents.id") == 1
+    assert "documents.tenant_id = %(tenant_id)s" in sql
+
+
+def test_matches_post_filters_provider_metadata() -> None:
+    filters = _parse(
+        [
+            {"op": "range", "key": "published", "gte": "2026-01-01"},
+            {"op": "exists", "key": "reviewed"},
+        ]
+    )
+    assert metadata_filters.matches(filters, {"published": "2026-03-01", "reviewed": False})
+    assert not metadata_filters.matches(filters, {"published": "2025-12-31", "reviewed": True})
+    # Type mismatches never satisfy a range.
+    assert not metadata_filters.matches(filters, {"published": 20260301, "reviewed": True})
+
+
+def test_cache_token_is_canonical() -> None:
+    first = _parse([{"op": "range", "key": "year", "lt": 2024, "gte": 2020}])
+    second = _parse([{"key": "year", "gte": 2020, "op": "range", "lt": 2024}])
+    assert metadata_filters.cache_token(first) == metadata_filters.cache_token(second)
+    assert metadata_filters.cache_token(None) == ""
+
+
+def test_bedrock_filter_translation() -> None:
+    filters = _parse(
+        [
+            {"op": "eq", "key": "lang", "value": "en"},
+            {"op": "range", "key": "year", "gte": 2020},
+            {"op": "exists", "key": "reviewed"},
+        ]
+    )
+    retrieval_filter, residual = metadata_filters.bedrock_filter(filters)
+    assert retrieval_filter == {
+        "andAll": [
+            {"equals": {"key": "lang", "value": "en"}},
+            {"greaterThanOrEquals": {"key": "year", "value": 2020}},
+        ]
+    }
+    assert [item.op for item in residual] == ["exists"]
+
+
+def test_vertex_filter_translation() -> None:
+    filters = _parse(
+        [
+            {"op": "in", "key": "lang", "values": ["en", "de"]},
+            {"op": "range", "key": "year", "gt": 2020, "lte": 2024},
+            {"op": "eq", "key": "public", "value": True},
+        ]
+    )
+    expression, residual = metadata_filters.vertex_filter(filters)
+    assert expression == 'lang: ANY("en", "de") AND year > 2020 AND year <= 2024'
+    assert [item.key for item in residual] == ["public"]
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from dataclasses import dataclass
 
 import pytest
+from fastapi import HTTPException
 
-from nexusrag.core.errors import RetrievalConfigError
+from nexusrag.core.errors import RetrievalConfigError, RetrievalError
 from nexusrag.providers.retrieval.config import parse_retrieval_config
-from nexusrag.providers.retrieval.router import RetrievalRouter
+from nexusrag.providers.retrieval.filters import EqFilter
+from nexusrag.providers.retrieval.router import RetrievalRouter, merge_ranked
 
 
 @dataclass
@@ -18,8 +22,9 @@ class StubProvider:
     def __init__(self) -> None:
         self.called = None
 
-    async def retrieve(self, tenant_id: str, corpus_id: str, query: str, top_k: int) -> list[dict]:
+    async def retrieve(self, tenant_id: str, corpus_id: str, query: str, top_k: int, filters=None) -> list[dict]:
         self.called = (tenant_id, corpus_id, query, top_k)
+        self.filters = filters
         return [{"text": "x", "score": 1.0, "source": "stub", "metadata": {}}]
 
 
@@ -58,3 +63,476 @@ def test_parse_retrieval_config_defaults() -> None:
     retrieval = parse_retrieval_config({})
     assert retrieval["provider"] == "local_pgvector"
     assert retrieval["top_k_default"] == 5
+
+
+def test_parse_retrieval_config_accepts_ann_params() -> None:
+    retrieval = parse_retrieval_config(
+        {
+            "retrieval": {
+                "provider": "local_pgvector",
+                "ann": {"ef_search": 80, "probes": 10, "exact_scan_threshold": 0},
+            }
+        }
+    )
+    assert retrieval["ann"]["ef_search"] == 80
+
+
+@pytest.mark.parametrize(
+    "ann",
+    [
+        "fast",
+        {"ef_search": 0},
+        {"ef_search": True},
+        {"probes": 50000},
+        {"exact_scan_threshold": -1},
+        {"m": 16},
+    ],
+)
+def test_parse_retrieval_config_rejects_invalid_ann(ann) -> None:
+    # Out-of-range tuning would fail at query time; reject it at PATCH time instead.
+    with pytest.raises(RetrievalConfigError):
+        parse_retrieval_config({"retrieval": {"provider": "local_pgvector", "ann": ann}})
+
+
+def test_parse_retrieval_config_accepts_hybrid_mode() -> None:
+    retrieval = parse_retrieval_config(
+        {"retrieval": {"provider": "local_pgvector", "mode": "hybrid", "hybrid": {"rrf_k": 30, "candidates": 80}}}
+    )
+    assert retrieval["mode"] == "hybrid"
+
+
+@pytest.mark.parametrize(
+    "retrieval",
+    [
+        {"provider": "local_pgvector", "mode": "bm25"},
+        {"provider": "local_pgvector", "mode": "hybrid", "hybrid": {"rrf_k": 0}},
+        {"provider": "local_pgvector", "mode": "hybrid", "hybrid": {"candidates": 500}},
+        {"provider": "aws_bedrock_kb", "knowledge_base_id": "kb", "region": "us-east-1", "mode": "hybrid"},
+    ],
+)
+def test_parse_retrieval_config_rejects_invalid_mode(retrieval) -> None:
+    with pytest.raises(RetrievalConfigError):
+        parse_retrieval_config({"retrieval": retrieval})
+
+
+@dataclass
+class VersionedCorpus:
+    provider_config_json: dict
+    corpus_version: int
+
+
+class CountingProvider(StubProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def retrieve(self, tenant_id: str, corpus_id: str, query: str, top_k: int, filters=None) -> list[dict]:
+        self.calls += 1
+        return await super().retrieve(tenant_id, corpus_id, query, top_k, filters)
+
+
+def _versioned_router(provider_name: str, corpus: VersionedCorpus, stub: StubProvider) -> RetrievalRouter:
+    async def loader(_session, _corpus_id: str, _tenant_id: str):
+        return corpus
+
+    async def allow_entitlements(**_kwargs):
+        return None
+
+    return RetrievalRouter(
+        session=None,  # type: ignore[arg-type]
+        corpus_loader=loader,
+        provider_factories={provider_name: lambda _cfg: stub},
+        entitlement_checker=allow_entitlements,
+    )
+
+
+@pytest.fixture
+def retrieval_cache(monkeypatch):
+    from nexusrag.core.config import get_settings
+    from nexusrag.providers.retrieval.cache import reset_retrieval_cache
+
+    monkeypatch.setenv("RETRIEVAL_CACHE_ENABLED", "true")
+    monkeypatch.setenv("RETRIEVAL_CACHE_REDIS_ENABLED", "false")
+    get_settings.cache_clear()
+    reset_retrieval_cache()
+    yield monkeypatch
+    reset_retrieval_cache()
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_router_caches_until_corpus_version_changes(retrieval_cache) -> None:
+    corpus = VersionedCorpus(provider_config_json={"retrieval": {"provider": "local_pgvector"}}, corpus_version=1)
+    stub = CountingProvider()
+    router = _versioned_router("local_pgvector", corpus, stub)
+
+    first = await router.retrieve("t1", "c1", "what  is RAG", top_k=3)
+    # Whitespace/NFKC variants share the cache entry; results are fresh copies.
+    first[0]["text"] = "mutated"
+    second = await router.retrieve("t1", "c1", "what is RAG", top_k=3)
+    assert stub.calls == 1
+    assert second[0]["text"] == "x"
+
+    # Any ingest/delete bumps corpus_version, which moves to a fresh key.
+    corpus.corpus_version = 2
+    await router.retrieve("t1", "c1", "what is RAG", top_k=3)
+    assert stub.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_router_skips_cache_for_external_provider_without_ttl(retrieval_cache) -> None:
+    retrieval_cache.setenv("RETRIEVAL_CACHE_EXTERNAL_TTL_S", "0")
+    corpus = VersionedCorpus(
+        provider_config_json={"retrieval": {"provider": "aws_bedrock_kb", "knowledge_base_id": "kb", "region": "us-east-1"}},
+        corpus_version=1,
+    )
+    stub = CountingProvider()
+    router = _versioned_router("aws_bedrock_kb", corpus, stub)
+
+    await router.retrieve("t1", "c1", "query", top_k=3)
+    await router.retrieve("t1", "c1", "query", top_k=3)
+    assert stub.calls == 2
+
+
+@pytest.mark.parametrize(
+    "quantization",
+    ["halfvec", {"type": "pq"}, {"type": "binary", "oversample": 0}, {"type": "halfvec", "bits": 4}],
+)
+def test_parse_retrieval_config_rejects_invalid_quantization(quantization) -> None:
+    with pytest.raises(RetrievalConfigError):
+        parse_retrieval_config({"retrieval": {"provider": "local_pgvector", "quantization": quantization}})
+
+
+def test_parse_retrieval_config_rejects_quantization_for_external_provider() -> None:
+    with pytest.raises(RetrievalConfigError):
+        parse_retrieval_config(
+            {
+                "retrieval": {
+                    "provider": "aws_bedrock_kb",
+                    "knowledge_base_id": "kb",
+                    "region": "us-east-1",
+                    "quantization": {"type": "halfvec"},
+                }
+            }
+        )
+
+
+@pytest.mark.asyncio
+async def test_router_passes_filters_and_keys_cache_by_them(retrieval_cache) -> None:
+    corpus = VersionedCorpus(provider_config_json={"retrieval": {"provider": "local_pgvector"}}, corpus_version=1)
+    stub = CountingProvider()
+    router = _versioned_router("local_pgvector", corpus, stub)
+    english = [EqFilter(op="eq", key="lang", value="en")]
+
+    await router.retrieve("t1", "c1", "query", top_k=3, filters=english)
+    assert stub.filters == english
+    await router.retrieve("t1", "c1", "query", top_k=3, filters=[EqFilter(op="eq", key="lang", value="en")])
+    assert stub.calls == 1
+    # A different filter is a different result set.
+    await router.retrieve("t1", "c1", "query", top_k=3, filters=[EqFilter(op="eq", key="lang", value="de")])
+    assert stub.calls == 2
+
+
+class FanoutProvider:
+    def __init__(self, hits: dict[str, list[dict] | Exception], delays: dict[str, float] | None = None) -> None:
+        self.hits = hits
+        self.delays = delays or {}
+
+    async def retrieve(self, tenant_id: str, corpus_id: str, query: str, top_k: int, filters=None) -> list[dict]:
+        await asyncio.sleep(self.delays.get(corpus_id, 0.0))
+        hits = self.hits[corpus_id]
+        if isinstance(hits, Exception):
+            raise hits
+        return [dict(hit) for hit in hits]
+
+
+def _hit(source: str, score: float) -> dict:
+    return {"text": source, "score": score, "source": source, "metadata": {}}
+
+
+def _fanout_router(providers: dict[str, str], factories: dict[str, FanoutProvider]) -> RetrievalRouter:
+    configs = {
+        "local_pgvector": {"provider": "local_pgvector"},
+        "aws_bedrock_kb": {"provider": "aws_bedrock_kb", "knowledge_base_id": "kb", "region": "us-east-1"},
+    }
+
+    async def loader(_session, corpus_id: str, _tenant_id: str):
+        return DummyCorpus(provider_config_json={"retrieval": configs[providers[corpus_id]]})
+
+    async def allow_entitlements(**_kwargs):
+        return None
+
+    return RetrievalRouter(
+        session=None,  # type: ignore[arg-type]
+        corpus_loader=loader,
+        provider_factories={name: (lambda _cfg, stub=stub: stub) for name, stub in factories.items()},
+        entitlement_checker=allow_entitlements,
+    )
+
+
+def test_merge_ranked_normalizes_each_corpus() -> None:
+    merged = merge_ranked(
+        [
+            # RRF-style scores cluster low; Bedrock-style relevance clusters high.
+            ("c1", [_hit("a", 0.032), _hit("b", 0.016), _hit("dup", 0.010)]),
+            ("c2", [_hit("x", 0.91), _hit("dup", 0.90), _hit("y", 0.85)]),
+        ],
+        top_k=5,
+    )
+    assert [hit["source"] for hit in merged] == ["x", "a", "dup", "b", "y"]
+    assert merged[0]["score"] == 1.0 and merged[0]["raw_score"] == 0.91
+    assert merged[2]["corpus_id"] == "c2"
+
+
+def test_merge_ranked_maps_single_hit_corpus_to_top_score() -> None:
+    merged = merge_ranked(
+        [
+            # A lone hit's raw score says nothing about how it compares with other corpora.
+            ("c1", [_hit("only", 0.02)]),
+            ("c2", [_hit("x", 0.91), _hit("y", 0.85)]),
+            ("c3", [_hit("tie1", 0.3), _hit("tie2", 0.3)]),
+        ],
+        top_k=5,
+    )
+    scores = {hit["source"]: hit["score"] for hit in merged}
+    assert scores == {"only": 1.0, "x": 1.0, "tie1": 1.0, "tie2": 1.0, "y": 0.0}
+    assert next(hit for hit in merged if hit["source"] == "only")["raw_score"] == 0.02
+
+
+@pytest.mark.asyncio
+async def test_retrieve_many_runs_corpora_concurrently() -> None:
+    local = FanoutProvider({"c1": [_hit("a", 0.5)], "c2": [_hit("b", 0.7)]}, delays={"c1": 0.2, "c2": 0.2})
+    bedrock = FanoutProvider({"c3": [_hit("c", 0.9)]}, delays={"c3": 0.2})
+    router = _fanout_router(
+        {"c1": "local_pgvector", "c2": "local_pgvector", "c3": "aws_bedrock_kb"},
+        {"local_pgvector": local, "aws_bedrock_kb": bedrock},
+    )
+
+    started = time.monotonic()
+    results = await router.retrieve_many("t1", ["c1", "c2", "c3", "c1"], "query", top_k=5)
+    assert time.monotonic() - started < 0.5
+    assert {hit["corpus_id"] for hit in results} == {"c1", "c2", "c3"}
+    assert router.last_fanout == {"c1": "ok", "c2": "ok", "c3": "ok"}
+    assert router.last_provider == "local_pgvector,aws_bedrock_kb"
+
+
+@pytest.mark.asyncio
+async def test_retrieve_many_returns_partial_results_at_deadline(monkeypatch) -> None:
+    from nexusrag.core.config import get_settings
+
+    monkeypatch.setenv("RETRIEVAL_FANOUT_TIMEOUT_MS", "100")
+    get_settings.cache_clear()
+    try:
+        local = FanoutProvider({"c1": [_hit("a", 0.5)], "c2": RetrievalError("boom")})
+        bedrock = FanoutProvider({"c3": [_hit("slow", 0.9)]}, delays={"c3": 5.0})
+        router = _fanout_router(
+            {"c1": "local_pgvector", "c2": "local_pgvector", "c3": "aws_bedrock_kb"},
+            {"local_pgvector": local, "aws_bedrock_kb": bedrock},
+        )
+        results = await router.retrieve_many("t1", ["c1", "c2", "c3"], "query", top_k=5)
+        assert [hit["source"] for hit in results] == ["a"]
+        assert router.last_fanout == {"c1": "ok", "c2": "error", "c3": "timeout"}
+
+        stalled = _fanout_router(
+            {"c3": "aws_bedrock_kb", "c4": "aws_bedrock_kb"},
+            {"aws_bedrock_kb": FanoutProvider({}, delays={"c3": 5.0, "c4": 5.0})},
+        )
+        with pytest.raises(RetrievalError, match="deadline"):
+            await stalled.retrieve_many("t1", ["c3", "c4"], "query", top_k=5)
+    finally:
+        get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_slow_external_corpus_hedges_to_fallback_provider(monkeypatch) -> None:
+    from nexusrag.providers.retrieval import router as router_module
+    from nexusrag.services.resilience import reset_hedge_budgets
+
+    reset_hedge_budgets()
+    # Live p95 of recent Bedrock calls: 20ms.
+    monkeypatch.setattr(router_module, "external_latency_percentile", lambda *_args, **_kwargs: 20.0)
+    bedrock = FanoutProvider({"c1": [_hit("kb", 0.9)]}, delays={"c1": 5.0})
+    local = FanoutProvider({"c1": [_hit("local", 0.5)]})
+    providers = {"aws_bedrock_kb": bedrock, "local_pgvector": local}
+
+    async def loader(_session, _corpus_id: str, _tenant_id: str):
+        retrieval = {
+            "provider": "aws_bedrock_kb",
+            "knowledge_base_id": "kb",
+            "region": "us-east-1",
+            "hedge": {"fallback": "local_pgvector"},
+        }
+        return DummyCorpus(provider_config_json={"retrieval": retrieval})
+
+    async def allow_entitlements(**_kwargs):
+        return None
+
+    router = RetrievalRouter(
+        session=None,  # type: ignore[arg-type]
+        corpus_loader=loader,
+        provider_factories={name: (lambda _cfg, stub=stub: stub) for name, stub in providers.items()},
+        entitlement_checker=allow_entitlements,
+    )
+    started = time.monotonic()
+    results = await router.retrieve("t1", "c1", "query", top_k=3)
+    assert time.monotonic() - started < 1.0
+    assert [hit["source"] for hit in results] == ["local"]
+    assert router.last_provider == "local_pgvector"
+    reset_hedge_budgets()
+
+
+def _hedged_router(providers: dict[str, FanoutProvider], entitled: set[str] | None = None) -> RetrievalRouter:
+    async def loader(_session, _corpus_id: str, _tenant_id: str):
+        retrieval = {
+            "provider": "aws_bedrock_kb",
+            "knowledge_base_id": "kb",
+            "region": "us-east-1",
+            "hedge": {"fallback": "local_pgvector"},
+        }
+        return DummyCorpus(provider_config_json={"retrieval": retrieval})
+
+    async def check_entitlements(*, provider_name: str, **_kwargs):
+        if entitled is not None and provider_name not in entitled:
+            raise HTTPException(status_code=403, detail="not entitled")
+
+    return RetrievalRouter(
+        session=None,  # type: ignore[arg-type]
+        corpus_loader=loader,
+        provider_factories={name: (lambda _cfg, stub=stub: stub) for name, stub in providers.items()},
+        entitlement_checker=check_entitlements,
+    )
+
+
+@pytest.mark.asyncio
+async def test_empty_fallback_does_not_beat_the_primary(monkeypatch) -> None:
+    from nexusrag.providers.retrieval import router as router_module
+    from nexusrag.services.resilience import reset_hedge_budgets
+
+    reset_hedge_budgets()
+    monkeypatch.setattr(router_module, "external_latency_percentile", lambda *_args, **_kwargs: 20.0)
+    bedrock = FanoutProvider({"c1": [_hit("kb", 0.9)]}, delays={"c1": 0.2})
+    local = FanoutProvider({"c1": []})
+    router = _hedged_router({"aws_bedrock_kb": bedrock, "local_pgvector": local})
+
+    results = await router.retrieve("t1", "c1", "query", top_k=3)
+    # The fallback answered first with nothing; the slower primary's hits stand.
+    assert [hit["source"] for hit in results] == ["kb"]
+    assert router.last_provider == "aws_bedrock_kb"
+
+    # When the primary fails, an empty fallback answer still beats an error.
+    failing = FanoutProvider({"c1": RetrievalError("upstream")})
+    router = _hedged_router({"aws_bedrock_kb": failing, "local_pgvector": local})
+    assert await router.retrieve("t1", "c1", "query", top_k=3) == []
+    assert router.last_provider == "local_pgvector"
+    reset_hedge_budgets()
+
+
+@pytest.mark.asyncio
+async def test_fallback_requires_its_own_entitlement(monkeypatch) -> None:
+    from nexusrag.providers.retrieval import router as router_module
+    from nexusrag.services.resilience import reset_hedge_budgets
+
+    reset_hedge_budgets()
+    monkeypatch.setattr(router_module, "external_latency_percentile", lambda *_args, **_kwargs: None)
+    failing = FanoutProvider({"c1": RetrievalError("upstream")})
+    local = FanoutProvider({"c1": [_hit("local", 0.5)]})
+    router = _hedged_router({"aws_bedrock_kb": failing, "local_pgvector": local}, entitled={"aws_bedrock_kb"})
+
+    # Without the fallback entitlement the primary's failure surfaces instead of a local answer.
+    with pytest.raises(RetrievalError, match="upstream"):
+        await router.retrieve("t1", "c1", "query", top_k=3)
+    reset_hedge_budgets()
+
+
+@pytest.mark.parametrize(
+    "hedge",
+    [{"fallback": "gcp_vertex"}, {"percentile": 10}, {"enabled": "yes"}, {"delay_ms": 5}],
+)
+def test_parse_retrieval_config_rejects_invalid_hedge(hedge) -> None:
+    config = {"retrieval": {"provider": "aws_bedrock_kb", "knowledge_base_id": "kb", "region": "us-east-1"}}
+    config["retrieval"]["hedge"] = hedge
+    with pytest.raises(RetrievalConfigError):
+        parse_retrieval_config(config)
+
+
+@pytest.mark.parametrize(
+    "retrieval",
+    [
+        {"provider": "local_pgvector", "embedding_dim": 300},
+        {"provider": "local_pgvector", "embedding_dim": "256"},
+        {"provider": "local_pgvector", "embedding_dim": 256, "quantization": {"type": "halfvec"}},
+        {"provider": "aws_bedrock_kb", "knowledge_base_id": "kb", "region": "us-east-1", "embedding_dim": 256},
+    ],
+)
+def test_parse_retrieval_config_rejects_invalid_embedding_dim(retrieval) -> None:
+    with pytest.raises(RetrievalConfigError):
+        parse_retrieval_config({"retrieval": retrieval})
+
+
+@pytest.mark.parametrize(
+    "embedding",
+    [{"provider": "cohere"}, {"provider": "openai", "model": ""}, {"provider": "fake", "dims": 256}, "openai"],
+)
+def test_parse_retrieval_config_rejects_invalid_embedding_model(embedding) -> None:
+    with pytest.raises(RetrievalConfigError):
+        parse_retrieval_config({"retrieval": {"provider": "local_pgvector", "embedding": embedding}})
+    pinned = {"provider": "local_pgvector", "embedding": {"provider": "openai", "model": "text-embedding-3-large"}}
+    assert parse_retrieval_config({"retrieval": pinned})["embedding"]["provider"] == "openai"
+
+
+@pytest.mark.asyncio
+async def test_router_serves_corpus_config_from_cache_until_invalidated(retrieval_cache) -> None:
+    from nexusrag.providers.retrieval import router as router_module
+    from nexusrag.providers.retrieval.config_cache import (
+        apply_invalidation_message,
+        get_corpus_config_cache,
+        reset_corpus_config_cache,
+    )
+
+    corpus = VersionedCorpus(provider_config_json={"retrieval": {"provider": "local_pgvector"}}, corpus_version=1)
+    reads = {"rows": 0, "versions": 0}
+
+    async def load_row(_session, _corpus_id: str, _tenant_id: str):
+        reads["rows"] += 1
+        return corpus
+
+    async def load_version(_session, _corpus_id: str, _tenant_id: str):
+        reads["versions"] += 1
+        return corpus.corpus_version
+
+    async def allow_entitlements(**_kwargs):
+        return None
+
+    retrieval_cache.setattr(router_module, "get_corpus_for_tenant", load_row)
+    retrieval_cache.setattr(router_module, "get_corpus_version", load_version)
+    reset_corpus_config_cache()
+    stub = CountingProvider()
+    router = RetrievalRouter(
+        session=None,  # type: ignore[arg-type]
+        provider_factories={"local_pgvector": lambda _cfg: stub, "gcp_vertex": lambda _cfg: stub},
+        entitlement_checker=allow_entitlements,
+    )
+
+    # /run resolves the provider, then retrieves: one row read, then a version-only read.
+    assert await router.resolve_provider("t1", "c1") == "local_pgvector"
+    await router.retrieve("t1", "c1", "query", top_k=3)
+    assert reads == {"rows": 1, "versions": 1}
+
+    # An ingest bumps the version without touching the cached config.
+    corpus.corpus_version = 2
+    await router.retrieve("t1", "c1", "query", top_k=3)
+    assert reads == {"rows": 1, "versions": 2} and stub.calls == 2
+
+    # A PATCH on another replica arrives as a pub/sub message and forces a reload.
+    corpus.provider_config_json = {"retrieval": {"provider": "gcp_vertex", "project": "p", "location": "l", "resource_id": "r"}}
+    apply_invalidation_message('{"tenant_id": "t1", "corpus_id": "c1"}')
+    assert await router.resolve_provider("t1", "c1") == "gcp_vertex"
+    assert reads["rows"] == 2
+
+    # A load that raced an invalidation is not stored.
+    cache = get_corpus_config_cache()
+    generation = cache.generation()
+    cache.discard("t1", "c2")
+    cache.put("t1", "c2", {"provider": "local_pgvector"}, generation=generation)
+    assert cache.get("t1", "c2") is None
+    reset_corpus_config_cache()
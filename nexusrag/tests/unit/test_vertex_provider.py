@@ -17,3 +17,82 @@ def test_vertex_provider_missing_config(monkeypatch) -> None:
     provider = GeminiVertexProvider()
     with pytest.raises(ProviderConfigError):
         next(iter(provider.stream([])))
+
+
+def _fake_vertex_sdk(monkeypatch, errors: list[Exception]) -> list[object]:
+    # Minimal google/vertexai modules: each stream raises the next queued error.
+    import sys
+    import types
+
+    class ServerError(Exception):
+        pass
+
+    class InvalidArgument(Exception):
+        pass
+
+    api_exceptions = types.SimpleNamespace(
+        PermissionDenied=type("PermissionDenied", (Exception,), {}),
+        Unauthenticated=type("Unauthenticated", (Exception,), {}),
+        RetryError=type("RetryError", (Exception,), {}),
+        ServerError=ServerError,
+        InvalidArgument=InvalidArgument,
+    )
+    auth_exceptions = types.SimpleNamespace(
+        DefaultCredentialsError=type("DefaultCredentialsError", (Exception,), {}),
+        RefreshError=type("RefreshError", (Exception,), {}),
+        TransportError=type("TransportError", (Exception,), {}),
+    )
+    built: list[object] = []
+
+    class GenerativeModel:
+        def __init__(self, _name: str) -> None:
+            built.append(self)
+
+        def generate_content(self, _prompt, stream: bool):
+            raise errors.pop(0)
+
+    modules = {
+        "google": types.ModuleType("google"),
+        "google.api_core": types.ModuleType("google.api_core"),
+        "google.api_core.exceptions": api_exceptions,
+        "google.auth": types.ModuleType("google.auth"),
+        "google.auth.exceptions": auth_exceptions,
+        "vertexai": types.SimpleNamespace(init=lambda **_kwargs: None),
+        "vertexai.generative_models": types.SimpleNamespace(GenerativeModel=GenerativeModel),
+    }
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    return built
+
+
+def test_vertex_provider_rebuilds_model_only_for_client_faults(monkeypatch) -> None:
+    from nexusrag.providers import clients
+    from nexusrag.providers.clients import ProviderClientRegistry
+
+    monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", "p")
+    monkeypatch.setenv("GOOGLE_CLOUD_LOCATION", "us-central1")
+    monkeypatch.setenv("GEMINI_MODEL", "gemini")
+    get_settings.cache_clear()
+    monkeypatch.setattr(clients, "_registry", ProviderClientRegistry(max_consecutive_failures=1, max_age_s=0))
+    errors: list[Exception] = []
+    built = _fake_vertex_sdk(monkeypatch, errors)
+    import sys
+
+    api_exceptions = sys.modules["google.api_core.exceptions"]
+    try:
+        # A rejected request (4xx) says nothing about the cached model handle.
+        errors.append(api_exceptions.InvalidArgument("bad prompt"))
+        with pytest.raises(ProviderConfigError):
+            next(iter(GeminiVertexProvider().stream([])))
+        errors.append(api_exceptions.ServerError("unavailable"))
+        with pytest.raises(ProviderConfigError):
+            next(iter(GeminiVertexProvider().stream([])))
+        assert len(built) == 1
+
+        # The 5xx counted against the handle, so the next stream builds a fresh one.
+        errors.append(api_exceptions.InvalidArgument("bad prompt"))
+        with pytest.raises(ProviderConfigError):
+            next(iter(GeminiVertexProvider().stream([])))
+        assert len(built) == 2
+    finally:
+        get_settings.cache_clear()
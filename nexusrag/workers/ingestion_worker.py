@@ -2,20 +2,32 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import socket
+from typing import Any
 
 from arq.connections import RedisSettings
 
 from nexusrag.core.config import get_settings
+from nexusrag.ingestion.embeddings import close_embedding_clients
+from nexusrag.ingestion.loaders import shutdown_loader_pool
+from nexusrag.services.ingest.embedding_migration import (
+    EmbeddingMigrationJobPayload,
+    run_embedding_migration,
+)
+from nexusrag.services.ingest.pipeline import IngestionPipeline
 from nexusrag.services.ingest.queue import (
     IngestionJobPayload,
+    clear_pipeline_stats,
     process_ingestion_job,
+    set_pipeline_stats,
     set_worker_heartbeat,
 )
 
 logger = logging.getLogger(__name__)
 
 
-async def ingest_document(ctx, payload: dict) -> int:
+async def ingest_document(ctx, payload: dict) -> dict[str, Any]:
     # Parse and validate payloads in the worker to enforce schema contracts.
     job_payload = IngestionJobPayload.model_validate(payload)
     settings = get_settings()
@@ -29,17 +41,39 @@ async def ingest_document(ctx, payload: dict) -> int:
     )
 
 
-async def _heartbeat_loop() -> None:
-    # Emit heartbeats on a fixed interval for ops health reporting.
+async def migrate_corpus_embeddings(ctx, payload: dict) -> dict[str, Any]:
+    # Backfill shadow vectors for an embedding generation; throttled against ingest capacity.
+    job_payload = EmbeddingMigrationJobPayload.model_validate(payload)
+    return await run_embedding_migration(job_payload.generation_id)
+
+
+def _worker_id() -> str:
+    # Identifies this process's entry in the shared pipeline stats hash.
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def _heartbeat_loop(pipeline: IngestionPipeline | None = None) -> None:
+    # Emit heartbeats (and pipeline stage stats) on a fixed interval for ops health reporting.
     settings = get_settings()
+    worker_id = _worker_id()
     while True:
         await set_worker_heartbeat()
+        if pipeline is not None:
+            try:
+                await set_pipeline_stats(worker_id, pipeline.snapshot())
+            except Exception as exc:  # noqa: BLE001 - stats are best effort; the heartbeat is what matters
+                logger.warning("ingest_pipeline_stats_publish_failed", exc_info=exc)
         await asyncio.sleep(settings.worker_heartbeat_interval_s)
 
 
 async def _startup(ctx) -> None:
-    # Start the heartbeat task when the worker boots.
-    ctx["heartbeat_task"] = asyncio.create_task(_heartbeat_loop())
+    # Start the staged ingestion pipeline and the heartbeat task when the worker boots.
+    pipeline = None
+    if get_settings().ingest_pipeline_enabled:
+        pipeline = IngestionPipeline.from_settings()
+        pipeline.start()
+    ctx["ingest_pipeline"] = pipeline
+    ctx["heartbeat_task"] = asyncio.create_task(_heartbeat_loop(pipeline))
 
 
 async def _shutdown(ctx) -> None:
@@ -47,6 +81,17 @@ async def _shutdown(ctx) -> None:
     task = ctx.get("heartbeat_task")
     if task:
         task.cancel()
+    pipeline = ctx.get("ingest_pipeline")
+    if pipeline is not None:
+        await pipeline.stop()
+        try:
+            await clear_pipeline_stats(_worker_id())
+        except Exception:  # noqa: BLE001 - the entry ages out with the stale window
+            pass
+    # Extraction processes are spawned lazily on the first PDF/HTML/DOCX/CSV job.
+    shutdown_loader_pool()
+    # Ingestion embeds through the same pooled HTTP client as the API.
+    await close_embedding_clients()
 
 
 class WorkerSettings:
@@ -55,6 +100,6 @@ class WorkerSettings:
     redis_settings = RedisSettings.from_dsn(settings.redis_url)
     queue_name = settings.ingest_queue_name
     max_tries = settings.ingest_max_retries
-    functions = [ingest_document]
+    functions = [ingest_document, migrate_corpus_embeddings]
     on_startup = _startup
     on_shutdown = _shutdown
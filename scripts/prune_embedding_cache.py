@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import asyncio
+
+from nexusrag.persistence.db import SessionLocal
+from nexusrag.services.maintenance import prune_embedding_cache
+
+
+async def prune() -> None:
+    async with SessionLocal() as session:
+        deleted = await prune_embedding_cache(session)
+        await session.commit()
+        print(f"pruned_embedding_cache={deleted}")
+
+
+if __name__ == "__main__":
+    asyncio.run(prune())
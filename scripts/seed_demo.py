@@ -11,6 +11,7 @@ from nexusrag.core.config import EMBED_DIM
 from nexusrag.domain.models import Chunk, Corpus
 from nexusrag.ingestion.embeddings import embed_text
 from nexusrag.persistence.db import SessionLocal
+from nexusrag.persistence.repos import corpora as corpora_repo
 
 DEMO_TENANT_ID = "t1"
 DEMO_CORPUS_ID = "c1"
@@ -108,6 +109,7 @@ def build_demo_chunks() -> list[Chunk]:
             chunks.append(
                 Chunk(
                     id=uuid4(),
+                    tenant_id=DEMO_TENANT_ID,
                     corpus_id=DEMO_CORPUS_ID,
                     document_uri=document.document_uri,
                     chunk_index=index,
@@ -128,8 +130,10 @@ async def seed_demo() -> int:
     async with SessionLocal() as session:
         corpus = await session.get(Corpus, DEMO_CORPUS_ID)
         if corpus is None:
-            corpus = Corpus(
-                id=DEMO_CORPUS_ID,
+            # Creates the corpus's chunks partition too when chunks is partitioned.
+            corpus = await corpora_repo.create_corpus(
+                session,
+                corpus_id=DEMO_CORPUS_ID,
                 tenant_id=DEMO_TENANT_ID,
                 name=DEMO_CORPUS_NAME,
                 # Configure local retrieval so the router works out of the box.
@@ -137,7 +141,6 @@ async def seed_demo() -> int:
                     "retrieval": {"provider": "local_pgvector", "top_k_default": 5}
                 },
             )
-            session.add(corpus)
         else:
             # Keep demo corpus metadata aligned without touching non-demo corpora.
             corpus.tenant_id = DEMO_TENANT_ID
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT_DIR = Path(__file__).resolve().parents[3]
+if str(ROOT_DIR) not in sys.path:
+    # Ensure local package imports work when invoked as a script path.
+    sys.path.insert(0, str(ROOT_DIR))
+
+from nexusrag.core.config import EMBED_DIM
+from nexusrag.ingestion import embeddings
+
+
+def _reference_embed(text: str) -> list[float]:
+    # The pre-vectorisation implementation, kept here as the speedup baseline.
+    vector = [0.0] * EMBED_DIM
+    tokens = embeddings._TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return vector
+    for token in tokens:
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        idx = int(digest[:8], 16) % EMBED_DIM
+        sign = 1.0 if int(digest[8:12], 16) % 2 == 0 else -1.0
+        magnitude = (int(digest[12:20], 16) % 1000) / 1000.0
+        vector[idx] += sign * (0.2 + magnitude)
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        return vector
+    return [v / norm for v in vector]
+
+
+def _corpus(count: int, words_per_text: int, vocabulary: int, seed: int) -> list[str]:
+    # Zipf-ish draws so the token memo sees a realistic repeat rate.
+    rng = random.Random(seed)
+    words = [f"term{index}" for index in range(vocabulary)]
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    return [" ".join(rng.choices(words, weights=weights, k=words_per_text)) for _ in range(count)]
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmark the fake embedding provider")
+    parser.add_argument("--texts", type=int, default=500)
+    parser.add_argument("--words", type=int, default=200, help="tokens per text (~1200-char chunk)")
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = _corpus(args.texts, args.words, args.vocabulary, seed=7)
+    results = {
+        "reference_s": _time(lambda: [_reference_embed(text) for text in texts], args.repeat),
+        "per_text_s": _time(lambda: [embeddings._embed_text_fake(text) for text in texts], args.repeat),
+        "batched_s": _time(lambda: embeddings._embed_many_fake(texts), args.repeat),
+    }
+    # Guard the comparison: a faster path that drifts from the baseline is a bug.
+    if embeddings._embed_many_fake(texts[:20]) != [_reference_embed(text) for text in texts[:20]]:
+        raise SystemExit("vectorised fake embeddings diverged from the reference implementation")
+
+    summary: dict[str, Any] = {"texts": args.texts, "words_per_text": args.words}
+    for key, seconds in results.items():
+        summary[key] = round(seconds, 4)
+        summary[key.replace("_s", "_texts_per_s")] = round(args.texts / seconds, 1)
+    summary["batched_speedup"] = round(results["reference_s"] / results["batched_s"], 2)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
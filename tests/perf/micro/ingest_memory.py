@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+ROOT_DIR = Path(__file__).resolve().parents[3]
+if str(ROOT_DIR) not in sys.path:
+    # Ensure local package imports work when invoked as a script path.
+    sys.path.insert(0, str(ROOT_DIR))
+
+from nexusrag.core.config import EMBED_DIM, get_settings
+from nexusrag.ingestion.chunking import chunk_text
+from nexusrag.ingestion.streaming import prefetch_batches
+from nexusrag.services.ingest.ingestion import _plan_chunks, stream_text_from_storage
+
+DEFAULT_SIZES_MB = (4, 16, 64)
+# One ~1 KB paragraph repeated; every fourth one is long enough to be windowed.
+_PARAGRAPH = "lorem ipsum dolor sit amet " * 40
+_LONG_PARAGRAPH = _PARAGRAPH * 3
+
+
+def _peak_rss_mb() -> float:
+    # Linux reports ru_maxrss in KiB, macOS in bytes.
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    if sys.platform == "darwin":
+        return usage.ru_maxrss / (1024.0 * 1024.0)
+    return usage.ru_maxrss / 1024.0
+
+
+def _write_document(path: Path, size_mb: int) -> None:
+    target = size_mb * 1024 * 1024
+    written = 0
+    index = 0
+    with open(path, "w", encoding="utf-8") as handle:
+        while written < target:
+            paragraph = _LONG_PARAGRAPH if index % 4 == 3 else _PARAGRAPH
+            handle.write(paragraph + "\n\n")
+            written += len(paragraph) + 2
+            index += 1
+
+
+async def _run_streaming(path: str, batch_rows: int) -> int:
+    # Mirror _ingest_with_session minus the DB: stream, chunk, batch, and hold one
+    # batch of vectors at a time the way the embed/COPY stages do.
+    planned = _plan_chunks(stream_text_from_storage(path), chunk_size=1200, chunk_overlap=150)
+    chunks = 0
+    async for batch in prefetch_batches(planned, batch_size=batch_rows):
+        vectors = [[0.0] * EMBED_DIM for _ in batch]
+        chunks += len(vectors)
+    return chunks
+
+
+def _run_whole(path: str) -> int:
+    # Pre-streaming behaviour: read the whole file and keep every chunk and vector.
+    text = Path(path).read_text(encoding="utf-8")
+    pieces = list(chunk_text(text, chunk_size=1200, chunk_overlap=150))
+    vectors = [[0.0] * EMBED_DIM for _ in pieces]
+    return len(vectors)
+
+
+def _worker(path: str, mode: str, batch_rows: int) -> dict[str, Any]:
+    started = time.monotonic()
+    if mode == "streaming":
+        chunks = asyncio.run(_run_streaming(path, batch_rows))
+    else:
+        chunks = _run_whole(path)
+    return {
+        "mode": mode,
+        "chunks": chunks,
+        "elapsed_s": round(time.monotonic() - started, 3),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def _measure(path: Path, mode: str, batch_rows: int) -> dict[str, Any]:
+    # A fresh interpreter per run keeps ru_maxrss from carrying over between sizes.
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", str(path), "--mode", mode, "--batch-rows", str(batch_rows)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Record peak ingest RSS against document size")
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=list(DEFAULT_SIZES_MB))
+    parser.add_argument("--batch-rows", type=int, default=get_settings().ingest_write_batch_rows)
+    parser.add_argument("--modes", nargs="+", choices=("streaming", "whole"), default=["streaming", "whole"])
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", default="streaming", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_worker(args.worker, args.mode, args.batch_rows)))
+        return 0
+
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes_mb:
+            path = Path(tmp) / f"doc-{size_mb}mb.txt"
+            _write_document(path, size_mb)
+            for mode in args.modes:
+                row = {"size_mb": size_mb, **_measure(path, mode, args.batch_rows)}
+                results.append(row)
+                print(
+                    f"{mode:>9} {size_mb:>5} MB  chunks={row['chunks']:>7}  "
+                    f"peak_rss={row['peak_rss_mb']:>8.1f} MB  {row['elapsed_s']:.2f}s"
+                )
+
+    report_dir = Path(get_settings().perf_report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    report_path = report_dir / f"ingest_memory-{stamp}.json"
+    report_path.write_text(
+        json.dumps({"batch_rows": args.batch_rows, "results": results}, indent=2), encoding="utf-8"
+    )
+    print(f"report: {report_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT_DIR = Path(__file__).resolve().parents[3]
+if str(ROOT_DIR) not in sys.path:
+    # Ensure local package imports work when invoked as a script path.
+    sys.path.insert(0, str(ROOT_DIR))
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg as pg_asyncpg
+
+from nexusrag.core.config import EMBED_DIM
+from nexusrag.domain.models import Chunk
+from nexusrag.providers.retrieval import local_pgvector
+
+# Client-side work only: no database is involved. Each "query" replays what the
+# driver and SQLAlchemy do with one result set of top_k rows.
+_DIALECT = pg_asyncpg.dialect()
+_DECODE_VECTOR = Vector(EMBED_DIM).result_processor(_DIALECT, None)
+
+
+def _reference_statement(corpus_id: str, query_embedding: list[float], top_k: int) -> Any:
+    # The pre-projection statement: whole ORM entities, rebuilt per query.
+    distance_expr = Chunk.embedding.cosine_distance(query_embedding)
+    return (
+        select(Chunk, distance_expr.label("distance"))
+        .where(Chunk.corpus_id == corpus_id)
+        .order_by(distance_expr.asc(), Chunk.id.asc())
+        .limit(top_k)
+    )
+
+
+def _wire_rows(top_k: int, seed: int) -> list[dict[str, Any]]:
+    # Column values as asyncpg hands them over; pgvector's text form for embeddings.
+    rng = random.Random(seed)
+    rows = []
+    for index in range(top_k):
+        embedding = [rng.uniform(-1.0, 1.0) for _ in range(EMBED_DIM)]
+        rows.append(
+            {
+                "id": f"00000000-0000-0000-0000-{index:012d}",
+                "corpus_id": "bench",
+                "document_id": f"doc-{index}",
+                "document_uri": f"s3://bench/doc-{index}.txt",
+                "chunk_index": index,
+                "text": "lorem ipsum dolor sit amet " * 44,
+                "content_hash": "0" * 64,
+                "embedding": "[" + ",".join(repr(value) for value in embedding) + "]",
+                "metadata_json": {"document_id": f"doc-{index}", "chunk_index": index},
+                "distance": rng.random(),
+            }
+        )
+    return rows
+
+
+def _orm_query(rows: list[dict[str, Any]], query_embedding: list[float], top_k: int) -> int:
+    stmt = _reference_statement("bench", query_embedding, top_k)
+    stmt._generate_cache_key()
+    hits = 0
+    for row in rows:
+        # Hydration decodes every vector and builds an instrumented Chunk per hit.
+        chunk = Chunk(
+            id=row["id"],
+            corpus_id=row["corpus_id"],
+            document_id=row["document_id"],
+            document_uri=row["document_uri"],
+            chunk_index=row["chunk_index"],
+            text=row["text"],
+            content_hash=row["content_hash"],
+            embedding=_DECODE_VECTOR(row["embedding"]),
+            metadata_json=row["metadata_json"],
+        )
+        hits += len(chunk.text) > 0
+    return hits
+
+
+def _projection_query(rows: list[dict[str, Any]], top_k: int) -> int:
+    stmt = local_pgvector.vector_statement(None)
+    stmt._generate_cache_key()
+    hits = 0
+    for row in rows:
+        values = tuple(row[name] for name in local_pgvector.RESULT_COLUMNS) + (row["distance"],)
+        hits += len(values[0]) > 0
+    return hits
+
+
+def _time_per_query(fn: Callable[[], Any], queries: int, repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        started = time.process_time()
+        for _ in range(queries):
+            fn()
+        best = min(best, time.process_time() - started)
+    return best / queries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmark per-query client CPU of retrieval row loading")
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = _wire_rows(args.top_k, seed=7)
+    query_embedding = [1.0 / math.sqrt(EMBED_DIM)] * EMBED_DIM
+    orm_s = _time_per_query(lambda: _orm_query(rows, query_embedding, args.top_k), args.queries, args.repeat)
+    projection_s = _time_per_query(lambda: _projection_query(rows, args.top_k), args.queries, args.repeat)
+
+    # Bytes the result set carries per query, ignoring protocol framing.
+    orm_bytes = sum(len(row["embedding"]) + len(row["text"]) for row in rows)
+    projection_bytes = sum(len(row["text"]) for row in rows)
+    summary = {
+        "top_k": args.top_k,
+        "orm_cpu_us_per_query": round(orm_s * 1e6, 1),
+        "projection_cpu_us_per_query": round(projection_s * 1e6, 1),
+        "cpu_saved_us_per_query": round((orm_s - projection_s) * 1e6, 1),
+        "orm_result_bytes": orm_bytes,
+        "projection_result_bytes": projection_bytes,
+        "speedup": round(orm_s / projection_s, 1),
+    }
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())